@@ -96,6 +96,9 @@ class ContentRawDestockRequest(BaseModel):
     id_raw: Optional[str] = None
     limit: int = 20
 
+    # > 1 : pool de workers (LLM borné par le budget "destock")
+    workers: Optional[int] = None
+
 
 class BulkIdsRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -17,7 +17,7 @@ from api.content.models import (
 
 from core.content.service import (
     create_content,
-    list_contents_admin,
+    iter_contents_admin,
     get_content,
     update_content,
     archive_content,
@@ -32,7 +32,7 @@ from core.content.service import (
     destock_all_raw_contents,
     delete_raw_content,
     retry_raw_content,
-    get_source_monitoring,
+    iter_source_monitoring,
     get_raw_stats,
     mark_content_ready,
     bulk_publish,
@@ -64,6 +64,7 @@ from config import (
 from utils.bigquery_utils import (
     query_bq,
 )
+from utils.streaming import stream_json_list
 
 import logging
 
@@ -108,12 +109,12 @@ def list_route():
 
     try:
 
-        contents = list_contents_admin()
-
-        return {
-            "status": "ok",
-            "contents": contents
-        }
+        # Streamé : la mémoire ne croît pas avec la table
+        return stream_json_list(
+            "contents",
+            iter_contents_admin(),
+            status="ok",
+        )
 
     except Exception as e:
 
@@ -622,7 +623,8 @@ def destock_raw_route(
     # ========================================================
 
     result = destock_all_raw_contents(
-        batch_size=payload.limit or 50
+        batch_size=payload.limit or 50,
+        workers=payload.workers or 1,
     )
 
     return {
@@ -788,12 +790,11 @@ def source_monitoring_route():
 
     try:
 
-        rows = get_source_monitoring()
-
-        return {
-            "status": "ok",
-            "sources": rows
-        }
+        return stream_json_list(
+            "sources",
+            iter_source_monitoring(),
+            status="ok",
+        )
 
     except Exception as e:
 
@@ -1010,11 +1011,17 @@ def bulk_publish_route(
 # ============================================================
 
 @router.post("/sync-all-published")
-def sync_all_published_route():
+def sync_all_published_route(full: bool = False):
+    """
+    full=true : resynchronise tout le catalogue publié
+    (sinon uniquement les contenus modifiés depuis le dernier run).
+    """
 
     try:
 
-        result = sync_all_published_contents()
+        result = sync_all_published_contents(
+            full=full,
+        )
 
         return {
             "status": "ok",
@@ -16,8 +16,8 @@ from typing import (
 # ============================================================
 
 from core.curator.service import (
-    search,
-    latest,
+    asearch,
+    alatest,
     get_item_curator,
     get_item_detail,
     get_content_stats,
@@ -52,6 +52,9 @@ from utils.auth import (
     get_user_id_from_request
 )
 
+from utils.pagination import next_cursor
+from utils.http_cache import http_cache
+
 router = APIRouter()
 
 
@@ -80,7 +83,8 @@ def require_user(request: Request) -> str:
 # ============================================================
 
 @router.get("/search")
-def search_route(
+@http_cache(ttl=60, tags=("content", "user"))
+async def search_route(
     request: Request,
 
     q: str = Query(...),
@@ -89,6 +93,8 @@ def search_route(
 
     offset: int = Query(0),
 
+    cursor: Optional[str] = Query(None),
+
     content_type: Optional[str] = Query(None),
 
     universe_id: Optional[str] = Query(None),
@@ -106,7 +112,7 @@ def search_route(
         # FETCH
         # --------------------------------------------------------
 
-        items = search(
+        items = await asearch(
 
             q=q,
 
@@ -121,6 +127,8 @@ def search_route(
             content_type=content_type,
 
             feed_mode=feed_mode,
+
+            cursor=cursor,
         )
 
         return {
@@ -128,8 +136,17 @@ def search_route(
             "items": items,
 
             "count": len(items),
+
+            "next_cursor": next_cursor(items, limit=limit),
         }
 
+    except ValueError as e:
+
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+
     except Exception as e:
 
         print(
@@ -364,13 +381,16 @@ def numbers_insight_route(
 # ============================================================
 
 @router.get("/latest")
-def latest_route(
+@http_cache(ttl=60, tags=("content", "user"))
+async def latest_route(
     request: Request,
 
     limit: int = Query(50),
 
     offset: int = Query(0),
 
+    cursor: Optional[str] = Query(None),
+
     content_type: Optional[str] = Query(None),
 
     universe_id: Optional[str] = Query(None),
@@ -388,7 +408,7 @@ def latest_route(
         # FETCH
         # --------------------------------------------------------
 
-        items = latest(
+        items = await alatest(
 
             limit=limit,
 
@@ -401,6 +421,8 @@ def latest_route(
             content_type=content_type,
 
             feed_mode=feed_mode,
+
+            cursor=cursor,
         )
 
         return {
@@ -408,8 +430,17 @@ def latest_route(
             "items": items,
 
             "count": len(items),
+
+            "next_cursor": next_cursor(items, limit=limit),
         }
 
+    except ValueError as e:
+
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+
     except Exception as e:
 
         print(
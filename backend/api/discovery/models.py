@@ -44,6 +44,25 @@ class DiscoveryListOut(BaseModel):
 # SCAN RESPONSE
 # ============================================================
 
+class ScanSourceReport(BaseModel):
+
+    source_id: str
+    name: Optional[str] = None
+
+    status: str
+
+    links: int = 0
+    discovered_urls: int = 0
+
+    fetch_ms: Optional[int] = None
+    elapsed_ms: Optional[int] = None
+
+    error: Optional[str] = None
+
+    class Config:
+        extra = "forbid"
+
+
 class ScanResponse(BaseModel):
 
     status: str
@@ -51,6 +70,15 @@ class ScanResponse(BaseModel):
     scanned_sources: int
     discovered_urls: int
 
+    # rapport de scan (crawl concurrent)
+    errors: int = 0
+    not_modified: int = 0
+    known_urls: Optional[int] = None
+    insert_ms: Optional[int] = None
+    elapsed_ms: Optional[int] = None
+
+    sources: List[ScanSourceReport] = []
+
     class Config:
         extra = "forbid"
 
@@ -1,5 +1,13 @@
 from fastapi import APIRouter
 
+from utils.bigquery_utils import get_bigquery_client_stats
+from core.user.user_context_cache import get_user_context_cache_stats
+from core.vectorization.embedding_cache import get_embedding_cache_stats
+from core.matching.resolver import get_alias_index_stats
+from core.news.stats_service import get_public_stats_cache_stats
+from utils.http_cache import get_http_cache_stats
+from utils.llm import get_llm_stats
+
 router = APIRouter()
 
 @router.get("/")
@@ -9,3 +17,40 @@ def health():
         "service": "ratecard-backend",
         "message": "Ratecard backend running"
     }
+
+
+@router.get("/bigquery")
+def health_bigquery():
+    """
+    Stats du client BigQuery partagé (nombre de constructions, pool HTTP).
+    """
+    return {
+        "status": "ok",
+        "client": get_bigquery_client_stats(),
+    }
+
+
+@router.get("/cache")
+def health_cache():
+    """
+    Hit / miss des caches (in-process et embeddings).
+    """
+    return {
+        "status": "ok",
+        "user_context": get_user_context_cache_stats(),
+        "embeddings": get_embedding_cache_stats(),
+        "alias_index": get_alias_index_stats(),
+        "public_stats": get_public_stats_cache_stats(),
+        "http": get_http_cache_stats(),
+    }
+
+
+@router.get("/llm")
+def health_llm():
+    """
+    Passerelle OpenAI : budget RPM / TPM, retries, usage et latence par appelant.
+    """
+    return {
+        "status": "ok",
+        "llm": get_llm_stats(),
+    }
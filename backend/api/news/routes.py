@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import Optional, List
+from email.utils import format_datetime, parsedate_to_datetime
 
 from api.news.models import (
     NewsCreate,
@@ -20,7 +21,6 @@ from core.news.service import (
     list_breves_public,
     duplicate_company_visual_for_news,
     search_breves_public,
-    get_breves_stats_public,
     get_news,
     update_news,
     archive_news,
@@ -31,7 +31,14 @@ from core.news.service import (
     save_news_linkedin_post,
 )
 
+from core.news.stats_service import (
+    get_public_stats_snapshot,
+    schedule_public_stats_refresh,
+    get_public_stats_job,
+)
+
 from utils.llm import run_llm
+from utils.http_cache import http_cache
 
 import logging
 import json
@@ -181,6 +188,7 @@ def list_companies_route():
 # ============================================================
 
 @router.get("/breves/search")
+@http_cache(ttl=60, tags=("news",))
 def search_breves_route(
     topics: Optional[List[str]] = Query(default=None),
     news_types: Optional[List[str]] = Query(default=None),
@@ -212,24 +220,90 @@ def search_breves_route(
 # STATS BRÈVES — FILTRES UNIQUEMENT
 # ============================================================
 
+# Snapshot en mémoire : ETag / Last-Modified pour les 304 navigateur / CDN
+BREVES_STATS_MAX_AGE = int(os.getenv("BREVES_STATS_MAX_AGE", "60"))
+
+
+def _not_modified(request: Request, etag: str, last_modified) -> bool:
+
+    if_none_match = request.headers.get("if-none-match")
+
+    if if_none_match:
+        return etag in [
+            tag.strip().removeprefix("W/")
+            for tag in if_none_match.split(",")
+        ] or if_none_match.strip() == "*"
+
+    if_modified_since = request.headers.get("if-modified-since")
+
+    if if_modified_since and last_modified:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+
 @router.get("/breves/stats")
-def breves_stats_route():
+def breves_stats_route(request: Request, response: Response):
     try:
-        data = get_breves_stats_public()
+        snapshot = get_public_stats_snapshot()
+
+        headers = {
+            "ETag": snapshot["etag"],
+            "Cache-Control": f"public, max-age={BREVES_STATS_MAX_AGE}",
+        }
+
+        if snapshot["last_modified"]:
+            headers["Last-Modified"] = format_datetime(
+                snapshot["last_modified"], usegmt=True
+            )
+
+        if _not_modified(request, snapshot["etag"], snapshot["last_modified"]):
+            return Response(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+
         return {
             "status": "ok",
-            **data
+            **snapshot["payload"]
         }
     except Exception as e:
         logger.exception("Erreur stats brèves")
         raise HTTPException(400, str(e))
 
 
+@router.post("/breves/stats/refresh")
+def breves_stats_refresh_route():
+    """
+    Recalcul du snapshot (appel planifié ou manuel), en tâche de fond.
+    """
+    job_id = schedule_public_stats_refresh("route")
+
+    return {
+        "status": "ok",
+        "job_id": job_id,
+        "queued": job_id is not None,
+    }
+
+
+@router.get("/breves/stats/refresh/{job_id}")
+def breves_stats_refresh_job_route(job_id: str):
+    job = get_public_stats_job(job_id)
+
+    if not job:
+        raise HTTPException(404, "Job introuvable")
+
+    return {"status": "ok", "job": job}
+
+
 # ============================================================
 # LIST BRÈVES LEGACY (SI CONSERVÉ)
 # ============================================================
 
 @router.get("/breves")
+@http_cache(ttl=60, tags=("news",))
 def list_breves(
     year: int = Query(..., ge=2022, le=2030),
     limit: int = Query(20, ge=1, le=50),
@@ -6,6 +6,8 @@ from core.newsletter.service import (
     search_newsletter_content,
 )
 
+from utils.http_cache import http_cache
+
 router = APIRouter()
 
 # ============================================================
@@ -13,6 +15,7 @@ router = APIRouter()
 # ============================================================
 
 @router.post("/search")
+@http_cache(ttl=120, tags=("news", "content"))
 def newsletter_search(payload: dict):
 
     period = payload.get(
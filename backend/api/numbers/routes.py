@@ -20,6 +20,12 @@ from core.numbers.insight_service import (
     get_numbers_by_ids,
 )
 
+from core.numbers.backlog_jobs import (
+    enqueue_content_backlog,
+    get_backlog_job,
+    list_backlog_jobs,
+)
+
 router = APIRouter()
 
 
@@ -242,3 +248,48 @@ def numbers_insight(payload: dict):
 
     except Exception as e:
         raise HTTPException(400, f"Erreur numbers insight : {e}")
+
+
+# ============================================================
+# BACKLOG JOBS (extraction LLM en tâche de fond)
+# ============================================================
+
+@router.post("/backlog/from-content/{id_content}")
+def enqueue_backlog_route(id_content: str):
+
+    try:
+        job_id = enqueue_content_backlog(id_content)
+
+        return {
+            "status": "ok",
+            "job_id": job_id,
+        }
+
+    except Exception as e:
+        raise HTTPException(400, f"Erreur backlog job : {e}")
+
+
+@router.get("/backlog/jobs")
+def list_backlog_jobs_route(
+    id_content: Optional[str] = None,
+    limit: int = 50,
+):
+
+    return {
+        "status": "ok",
+        "items": list_backlog_jobs(id_content=id_content, limit=limit),
+    }
+
+
+@router.get("/backlog/jobs/{job_id}")
+def get_backlog_job_route(job_id: str):
+
+    job = get_backlog_job(job_id)
+
+    if not job:
+        raise HTTPException(404, "Job introuvable")
+
+    return {
+        "status": "ok",
+        "job": job,
+    }
@@ -5,6 +5,7 @@ import requests
 
 from config import BQ_PROJECT, BQ_DATASET
 from utils.bigquery_utils import query_bq
+from utils.http_cache import http_cache
 
 from api.public.models import (
     DrawerNewsResponse,
@@ -25,6 +26,7 @@ router = APIRouter()
 # ============================================================
 
 @router.get("/analysis/list")
+@http_cache(ttl=120, tags=("content",))
 def list_public_analyses():
     """
     Flux global des analyses (Curator + Ratecard)
@@ -43,6 +45,7 @@ def list_public_analyses():
 # ============================================================
 
 @router.get("/content/{id_content}")
+@http_cache(ttl=300, tags=("content",))
 def read_content(id_content: str):
     """
     Lecture détaillée d’une analyse
@@ -67,6 +70,7 @@ def read_content(id_content: str):
 # ============================================================
 
 @router.get("/news/{id_news}", response_model=DrawerNewsResponse)
+@http_cache(ttl=300, tags=("news",))
 def read_news(id_news: str):
     """
     Lecture d’une news (drawer)
@@ -106,6 +110,7 @@ def read_news(id_news: str):
 # ============================================================
 
 @router.get("/members", response_model=PublicMembersResponse)
+@http_cache(ttl=600, tags=("company",))
 def get_members():
     """
     Liste des partenaires (public)
@@ -148,6 +153,7 @@ def get_members():
 # ============================================================
 
 @router.get("/member/{id_company}", response_model=PublicMemberResponse)
+@http_cache(ttl=300, tags=("company", "news"))
 def get_member(id_company: str):
     """
     Fiche partenaire + ses news
@@ -12,6 +12,12 @@ from core.radar.service import (
     delete_radar_insight,
 )
 
+from core.radar.bulk_service import (
+    enqueue_bulk_radar,
+    get_bulk_radar_job,
+    list_bulk_radar_jobs,
+)
+
 # 👉 AJOUTS (pattern numbers)
 from core.radar.feed_service import get_radar_feed_service
 from core.radar.insight_service import (
@@ -50,6 +56,60 @@ def status(
         raise HTTPException(400, f"Erreur status radar : {e}")
 
 
+# ============================================================
+# BULK GENERATE (MISSING de V_RADAR_STATUS, en tâche de fond)
+# ============================================================
+
+@router.post("/bulk")
+def bulk_generate_route(payload: dict):
+
+    try:
+
+        frequency = payload.get("frequency")
+
+        if not frequency:
+            raise ValueError("frequency obligatoire")
+
+        job_id = enqueue_bulk_radar(
+            frequency=frequency,
+            entity_type=payload.get("entity_type"),
+            year=payload.get("year"),
+            limit=payload.get("limit"),
+            concurrency=payload.get("concurrency"),
+        )
+
+        return {
+            "status": "ok",
+            "job_id": job_id,
+        }
+
+    except Exception as e:
+        raise HTTPException(400, f"Erreur bulk radar : {e}")
+
+
+@router.get("/bulk/jobs")
+def bulk_jobs_route(limit: int = 20):
+
+    return {
+        "status": "ok",
+        "items": list_bulk_radar_jobs(limit=limit),
+    }
+
+
+@router.get("/bulk/jobs/{job_id}")
+def bulk_job_route(job_id: str):
+
+    job = get_bulk_radar_job(job_id)
+
+    if not job:
+        raise HTTPException(404, "Job introuvable")
+
+    return {
+        "status": "ok",
+        "job": job,
+    }
+
+
 # ============================================================
 # GET ONE (COMPAT FRONT)
 # ============================================================
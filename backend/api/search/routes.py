@@ -12,6 +12,7 @@ def search_route(
     limit: int = 20,
     offset: int = 0,
     type: Optional[str] = Query(None, description="news | analysis"),
+    cursor: Optional[str] = Query(None, description="next_cursor de la page précédente"),
 ):
     try:
         results = search(
@@ -19,7 +20,11 @@ def search_route(
             limit=limit,
             offset=offset,
             type=type,  # 🔥 NEW
+            cursor=cursor,
         )
         return {"results": results}
+    except ValueError as e:
+        raise HTTPException(400, str(e))
     except Exception as e:
-        raise HTTPException(400, f"Erreur search : {e}")
+        print(f"❌ Search error: {e}")
+        raise HTTPException(500, "Erreur search")
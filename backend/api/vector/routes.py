@@ -17,6 +17,7 @@ from api.vector.models import (
 # NEWS
 from core.vectorization.vector_service import (
     vectorize_news,
+    vectorize_news_batch,
     get_news_vector_status,
     get_news_to_vectorize,
 )
@@ -24,6 +25,7 @@ from core.vectorization.vector_service import (
 # CONTENT
 from core.vectorization.content_vector_service import (
     vectorize_content,
+    vectorize_contents_batch,
     get_content_vector_status,
     get_content_to_vectorize,
 )
@@ -40,11 +42,7 @@ router = APIRouter()
 # --------------------------------------------------
 
 @router.post("/news/batch", response_model=VectorNewsBatchResponse)
-def vectorize_news_batch(payload: VectorBatchRequest):
-
-    results = []
-    success = 0
-    error = 0
+def vectorize_news_batch_route(payload: VectorBatchRequest):
 
     try:
         # =========================
@@ -69,35 +67,21 @@ def vectorize_news_batch(payload: VectorBatchRequest):
             )
 
         # =========================
-        # PROCESS
+        # PROCESS (embeddings + upsert par paquets, flag en un MERGE)
         # =========================
-        for news_id in news_ids:
-            try:
-                res = vectorize_news(news_id)
-
-                results.append(
-                    VectorNewsBatchItem(
-                        news_id=news_id,
-                        status=res.get("status", "ok"),
-                        nb_vectors=res.get("nb_vectors"),
-                    )
-                )
-                success += 1
-
-            except Exception as e:
-                results.append(
-                    VectorNewsBatchItem(
-                        news_id=news_id,
-                        status="error",
-                        error=str(e),
-                    )
-                )
-                error += 1
+        batch = vectorize_news_batch(news_ids)
+
+        results = [
+            VectorNewsBatchItem(**r)
+            for r in batch["results"]
+        ]
+
+        error = sum(1 for r in results if r.status == "error")
 
         return VectorNewsBatchResponse(
             status="done",
-            processed=len(news_ids),
-            success=success,
+            processed=len(results),
+            success=len(results) - error,
             error=error,
             results=results
         )
@@ -144,11 +128,7 @@ def news_status(limit: int = 50, offset: int = 0):
 # --------------------------------------------------
 
 @router.post("/content/batch", response_model=VectorContentBatchResponse)
-def vectorize_content_batch(payload: VectorBatchRequest):
-
-    results = []
-    success = 0
-    error = 0
+def vectorize_content_batch_route(payload: VectorBatchRequest):
 
     try:
         # =========================
@@ -173,35 +153,21 @@ def vectorize_content_batch(payload: VectorBatchRequest):
             )
 
         # =========================
-        # PROCESS
+        # PROCESS (embeddings + upsert par paquets, flag en un MERGE)
         # =========================
-        for content_id in content_ids:
-            try:
-                res = vectorize_content(content_id)
-
-                results.append(
-                    VectorContentBatchItem(
-                        content_id=content_id,
-                        status=res.get("status", "ok"),
-                        nb_vectors=res.get("nb_vectors"),
-                    )
-                )
-                success += 1
-
-            except Exception as e:
-                results.append(
-                    VectorContentBatchItem(
-                        content_id=content_id,
-                        status="error",
-                        error=str(e),
-                    )
-                )
-                error += 1
+        batch = vectorize_contents_batch(content_ids)
+
+        results = [
+            VectorContentBatchItem(**r)
+            for r in batch["results"]
+        ]
+
+        error = sum(1 for r in results if r.status == "error")
 
         return VectorContentBatchResponse(
             status="done",
-            processed=len(content_ids),
-            success=success,
+            processed=len(results),
+            success=len(results) - error,
             error=error,
             results=results
         )
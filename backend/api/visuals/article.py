@@ -5,7 +5,7 @@ import base64
 from io import BytesIO
 from PIL import Image
 
-from openai import OpenAI
+from utils.llm import generate_image
 from google.cloud import bigquery
 
 from utils.bigquery_utils import get_bigquery_client
@@ -198,8 +198,6 @@ def generate_ai_visual(payload: ArticleAIGenerate):
 
         print("🧠 AI VISUAL PAYLOAD:", payload)
 
-        client_ai = OpenAI()
-
         topics_text = ", ".join(payload.topics)
 
         prompt = f"""
@@ -222,9 +220,10 @@ Contraintes graphiques :
 - aucun texte lisible dans l’image
 """
 
-        result = client_ai.images.generate(
-            model="gpt-image-1",
+        result = generate_image(
             prompt=prompt,
+            model="gpt-image-1",
+            caller="visuals.article",
             size="1024x1024",
             response_format="b64_json",
         )
@@ -13,6 +13,7 @@ from utils.bigquery_utils import (
     update_bq,
     get_bigquery_client,
 )
+from utils.http_cache import invalidate_http_cache
 
 from api.company.models import (
     CompanyCreate,
@@ -21,6 +22,7 @@ from api.company.models import (
 
 from core.matching.resolver import (
     normalize,
+    invalidate_alias_index,
 )
 
 TABLE_COMPANY = (
@@ -590,6 +592,8 @@ def update_company(id_company: str, data: CompanyUpdate) -> bool:
     if universes is not None:
         assign_company_universes(id_company, universes)
 
+    invalidate_http_cache("company")
+
     return True
 
 
@@ -599,7 +603,7 @@ def update_company(id_company: str, data: CompanyUpdate) -> bool:
 
 def delete_company(id_company: str) -> bool:
 
-    return update_bq(
+    deleted = update_bq(
         table=TABLE_COMPANY,
         fields={
             "IS_ACTIVE": False,
@@ -608,6 +612,10 @@ def delete_company(id_company: str) -> bool:
         where={"ID_COMPANY": id_company},
     )
 
+    invalidate_http_cache("company")
+
+    return deleted
+
 
 # ============================================================
 # COMPANY ALIASES
@@ -711,6 +719,8 @@ def create_company_alias(
         }
     )
 
+    invalidate_alias_index()
+
     return True
 
 # ============================================================
@@ -783,6 +793,8 @@ def add_company_alias(
         }
     )
 
+    invalidate_alias_index()
+
     return True
 
 # ============================================================
@@ -859,4 +871,6 @@ def delete_company_alias(
         }
     )
 
+    invalidate_alias_index()
+
     return True
@@ -3,7 +3,7 @@ import unicodedata
 from typing import Dict, Any, Optional, List
 
 from config import BQ_PROJECT, BQ_DATASET
-from utils.llm import run_llm
+from utils.llm import run_llm, forget_llm_response
 from utils.bigquery_utils import query_bq
 
 
@@ -26,7 +26,14 @@ def normalize_key(text: str) -> str:
 def generate_summary(
     source_id: Optional[str],
     source_text: str,
+    cache: bool = False,
 ) -> Dict[str, Any]:
+    """
+    cache=True (destock uniquement) : réponse LLM rejouée depuis le
+    cache pour un même raw (ex. échec BigQuery après génération) ;
+    une réponse inexploitable est alors retirée du cache et lève
+    ValueError. L'éditeur (/content generate) régénère toujours.
+    """
 
     if not isinstance(source_text, str) or not source_text.strip():
         raise ValueError("Source vide")
@@ -254,7 +261,7 @@ SIGNAL
 - Identifier la dynamique de marché
 """
 
-    raw = run_llm(prompt)
+    raw = run_llm(prompt, cache=cache)
 
     if not raw:
         raise ValueError("Réponse LLM vide")
@@ -356,6 +363,12 @@ SIGNAL
         if body_lines else ""
     )
 
+    # Réponse inexploitable (create_content la rejetterait) : retirée
+    # du cache pour que retry_raw_content reparte chez OpenAI
+    if cache and (not sections["TITLE"].strip() or not body):
+        forget_llm_response(prompt)
+        raise ValueError("Réponse LLM inexploitable (TITLE / POINTS CLES manquants)")
+
     # ============================================================
     # TOPICS
     # ============================================================
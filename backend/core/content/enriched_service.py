@@ -0,0 +1,570 @@
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from google.api_core.exceptions import NotFound
+
+from config import BQ_PROJECT, BQ_DATASET
+
+from utils.bigquery_utils import query_bq
+from utils.http_cache import invalidate_http_cache
+
+
+# ============================================================
+# TABLES
+# ============================================================
+
+TABLE_CONTENT = f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONTENT"
+
+TABLE_CONTENT_ENRICHED = (
+    f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONTENT_ENRICHED"
+)
+
+TABLE_CONTENT_COMPANY = (
+    f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONTENT_COMPANY"
+)
+
+TABLE_CONTENT_SOLUTION = (
+    f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONTENT_SOLUTION"
+)
+
+# Watermarks des synchros incrémentales (NAME → dernier UPDATED_AT traité)
+TABLE_SYNC_STATE = f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_SYNC_STATE"
+
+ENRICHED_WATERMARK = "CONTENT_ENRICHED"
+
+# Un seul MERGE sur la table enrichie à la fois dans le process
+# (lots de synchro parallèles, publications) : évite les conflits
+# de sérialisation BigQuery entre DML concurrents.
+_REFRESH_LOCK = threading.Lock()
+
+# Contenus en échec lors d'une synchro incrémentale : repris au run
+# suivant sans bloquer le watermark (NAME, ID_CONTENT, ERROR)
+TABLE_SYNC_RETRY = f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_SYNC_RETRY"
+
+
+# ============================================================
+# CONFIG
+# ============================================================
+# Reconstruction ensembliste de RATECARD_CONTENT_ENRICHED :
+# un seul script BigQuery (agrégats par contenu + MERGE) pour
+# N contenus, au lieu d'un DELETE + INSERT par contenu.
+#
+# universes_from :
+# - "source"  : univers de la source (synchro manuelle / globale)
+# - "company" : univers des sociétés liées (après publication)
+
+ENRICHED_COLUMNS = [
+    "id_content",
+    "source_id",
+    "id_raw",
+    "source_url",
+    "source_title",
+    "title",
+    "title_en",
+    "excerpt",
+    "excerpt_en",
+    "content_body",
+    "signal_analytique",
+    "mecanique_expliquee",
+    "enjeu_strategique",
+    "point_de_friction",
+    "chiffres",
+    "acteurs_cites",
+    "concepts_llm",
+    "solutions_llm",
+    "topics_llm",
+    "status",
+    "is_active",
+    "source_date",
+    "published_at",
+    "created_at",
+    "updated_at",
+    "universes",
+    "topics",
+    "companies",
+    "solutions",
+    "concepts",
+    "content_type",
+    "id_primary_company",
+]
+
+_UNIVERSES_SQL = {
+    "source": f"""
+        SELECT DISTINCT
+            ch.ID_CONTENT,
+            u.ID_UNIVERSE AS id_universe,
+            u.LABEL AS label
+
+        FROM changed ch
+
+        JOIN `{TABLE_CONTENT}` c
+          ON c.ID_CONTENT = ch.ID_CONTENT
+
+        JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_SOURCE_UNIVERSE` su
+          ON su.ID_SOURCE = c.SOURCE_ID
+
+        JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_UNIVERSE` u
+          ON su.ID_UNIVERSE = u.ID_UNIVERSE
+    """,
+    "company": f"""
+        SELECT DISTINCT
+            cc.ID_CONTENT,
+            u.ID_UNIVERSE AS id_universe,
+            u.LABEL AS label
+
+        FROM `{TABLE_CONTENT_COMPANY}` cc
+
+        JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_COMPANY_UNIVERSE` cu
+          ON cc.ID_COMPANY = cu.ID_COMPANY
+
+        JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_UNIVERSE` u
+          ON cu.ID_UNIVERSE = u.ID_UNIVERSE
+
+        WHERE cc.ID_CONTENT IN (SELECT ID_CONTENT FROM changed)
+    """,
+}
+
+
+def _ensure_state_sql() -> str:
+    return f"""
+        CREATE TABLE IF NOT EXISTS `{TABLE_SYNC_STATE}` (
+            NAME STRING,
+            WATERMARK TIMESTAMP,
+            UPDATED_AT TIMESTAMP
+        );
+    """
+
+
+# ============================================================
+# SQL BUILDER
+# ============================================================
+
+def _build_refresh_script(changed_sql: str, universes_from: str) -> str:
+    """
+    changed_sql : SELECT ID_CONTENT, UPDATED_AT (périmètre à rafraîchir).
+
+    Les contenus du périmètre qui ne sont plus PUBLISHED (ou supprimés)
+    sont retirés de la table enrichie, comme l'ancien DELETE + INSERT.
+    """
+
+    if universes_from not in _UNIVERSES_SQL:
+        raise ValueError(f"universes_from inconnu : {universes_from}")
+
+    insert_columns = ",\n            ".join(ENRICHED_COLUMNS)
+    insert_values = ",\n            ".join(f"S.{c}" for c in ENRICHED_COLUMNS)
+    update_set = ",\n            ".join(
+        f"{c} = S.{c}" for c in ENRICHED_COLUMNS if c != "id_content"
+    )
+
+    return f"""
+        DECLARE new_watermark TIMESTAMP;
+        DECLARE merged INT64;
+
+        CREATE TEMP TABLE changed AS
+        {changed_sql};
+
+        SET new_watermark = (SELECT MAX(UPDATED_AT) FROM changed);
+
+        MERGE `{TABLE_CONTENT_ENRICHED}` T
+
+        USING (
+
+            WITH
+
+            universes AS (
+                SELECT
+                    ID_CONTENT,
+                    ARRAY_AGG(STRUCT(id_universe, label)) AS items
+                FROM ({_UNIVERSES_SQL[universes_from]})
+                GROUP BY ID_CONTENT
+            ),
+
+            topics AS (
+                SELECT
+                    ID_CONTENT,
+                    ARRAY_AGG(STRUCT(id_topic, label, topic_axis)) AS items
+                FROM (
+                    SELECT DISTINCT
+                        ct.ID_CONTENT,
+                        t.ID_TOPIC AS id_topic,
+                        t.LABEL AS label,
+                        t.TOPIC_AXIS AS topic_axis
+                    FROM `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONTENT_TOPIC` ct
+                    JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_TOPIC` t
+                      ON ct.ID_TOPIC = t.ID_TOPIC
+                    WHERE ct.ID_CONTENT IN (SELECT ID_CONTENT FROM changed)
+                )
+                GROUP BY ID_CONTENT
+            ),
+
+            companies AS (
+                SELECT
+                    ID_CONTENT,
+                    ARRAY_AGG(STRUCT(id_company, name, media_logo_rectangle_id)) AS items
+                FROM (
+                    SELECT DISTINCT
+                        cc.ID_CONTENT,
+                        co.ID_COMPANY AS id_company,
+                        co.NAME AS name,
+                        co.MEDIA_LOGO_RECTANGLE_ID AS media_logo_rectangle_id
+                    FROM `{TABLE_CONTENT_COMPANY}` cc
+                    JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_COMPANY` co
+                      ON cc.ID_COMPANY = co.ID_COMPANY
+                    WHERE cc.ID_CONTENT IN (SELECT ID_CONTENT FROM changed)
+                )
+                GROUP BY ID_CONTENT
+            ),
+
+            solutions AS (
+                SELECT
+                    ID_CONTENT,
+                    ARRAY_AGG(STRUCT(id_solution, name)) AS items
+                FROM (
+                    SELECT DISTINCT
+                        cs.ID_CONTENT,
+                        s.ID_SOLUTION AS id_solution,
+                        s.NAME AS name
+                    FROM `{TABLE_CONTENT_SOLUTION}` cs
+                    JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_SOLUTION` s
+                      ON cs.ID_SOLUTION = s.ID_SOLUTION
+                    WHERE cs.ID_CONTENT IN (SELECT ID_CONTENT FROM changed)
+                )
+                GROUP BY ID_CONTENT
+            ),
+
+            concepts AS (
+                SELECT
+                    ID_CONTENT,
+                    ARRAY_AGG(STRUCT(id_concept, label)) AS items
+                FROM (
+                    SELECT DISTINCT
+                        cp.ID_CONTENT,
+                        cp.ID_CONCEPT AS id_concept,
+                        cpt.LABEL AS label
+                    FROM `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONTENT_CONCEPT` cp
+                    JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONCEPT` cpt
+                      ON cp.ID_CONCEPT = cpt.ID_CONCEPT
+                    WHERE cp.ID_CONTENT IN (SELECT ID_CONTENT FROM changed)
+                )
+                GROUP BY ID_CONTENT
+            ),
+
+            enriched AS (
+                SELECT
+                    c.ID_CONTENT AS id_content,
+                    c.SOURCE_ID AS source_id,
+                    c.ID_RAW AS id_raw,
+                    c.SOURCE_URL AS source_url,
+                    c.SOURCE_TITLE AS source_title,
+                    c.TITLE AS title,
+                    c.TITLE_EN AS title_en,
+                    c.EXCERPT AS excerpt,
+                    c.EXCERPT_EN AS excerpt_en,
+                    c.CONTENT_BODY AS content_body,
+                    c.SIGNAL_ANALYTIQUE AS signal_analytique,
+                    c.MECANIQUE_EXPLIQUEE AS mecanique_expliquee,
+                    c.ENJEU_STRATEGIQUE AS enjeu_strategique,
+                    c.POINT_DE_FRICTION AS point_de_friction,
+                    c.CHIFFRES AS chiffres,
+                    c.ACTEURS_CITES AS acteurs_cites,
+                    c.CONCEPTS_LLM AS concepts_llm,
+                    c.SOLUTIONS_LLM AS solutions_llm,
+                    c.TOPICS_LLM AS topics_llm,
+                    c.STATUS AS status,
+                    c.IS_ACTIVE AS is_active,
+                    c.SOURCE_DATE AS source_date,
+                    c.PUBLISHED_AT AS published_at,
+                    c.CREATED_AT AS created_at,
+                    c.UPDATED_AT AS updated_at,
+                    IFNULL(u.items, []) AS universes,
+                    IFNULL(t.items, []) AS topics,
+                    IFNULL(co.items, []) AS companies,
+                    IFNULL(s.items, []) AS solutions,
+                    IFNULL(cp.items, []) AS concepts,
+                    LOWER(COALESCE(c.CONTENT_TYPE, 'ANALYSIS')) AS content_type,
+                    c.ID_PRIMARY_COMPANY AS id_primary_company
+
+                FROM `{TABLE_CONTENT}` c
+
+                LEFT JOIN universes u ON u.ID_CONTENT = c.ID_CONTENT
+                LEFT JOIN topics t ON t.ID_CONTENT = c.ID_CONTENT
+                LEFT JOIN companies co ON co.ID_CONTENT = c.ID_CONTENT
+                LEFT JOIN solutions s ON s.ID_CONTENT = c.ID_CONTENT
+                LEFT JOIN concepts cp ON cp.ID_CONTENT = c.ID_CONTENT
+
+                WHERE c.ID_CONTENT IN (SELECT ID_CONTENT FROM changed)
+                AND c.STATUS = 'PUBLISHED'
+            )
+
+            SELECT
+                ch.ID_CONTENT AS key_id,
+                e.*
+            FROM (SELECT DISTINCT ID_CONTENT FROM changed) ch
+            LEFT JOIN enriched e
+              ON e.id_content = ch.ID_CONTENT
+
+        ) S
+
+        ON T.id_content = S.key_id
+
+        WHEN MATCHED AND S.id_content IS NULL THEN
+          DELETE
+
+        WHEN MATCHED THEN
+          UPDATE SET
+            {update_set}
+
+        WHEN NOT MATCHED AND S.id_content IS NOT NULL THEN
+          INSERT (
+            {insert_columns}
+          )
+          VALUES (
+            {insert_values}
+          );
+
+        SET merged = @@row_count;
+    """
+
+
+def _record_watermark_sql(name_param: str = "@state_name") -> str:
+    """
+    Avance le watermark ; la table d'état n'est créée (DDL) que
+    dans les scripts qui l'écrivent, pas à chaque refresh.
+    """
+
+    return f"""
+        {_ensure_state_sql()}
+
+        IF new_watermark IS NOT NULL THEN
+            MERGE `{TABLE_SYNC_STATE}` st
+            USING (SELECT {name_param} AS NAME) src
+            ON st.NAME = src.NAME
+            WHEN MATCHED THEN
+              UPDATE SET
+                WATERMARK = GREATEST(IFNULL(st.WATERMARK, new_watermark), new_watermark),
+                UPDATED_AT = CURRENT_TIMESTAMP()
+            WHEN NOT MATCHED THEN
+              INSERT (NAME, WATERMARK, UPDATED_AT)
+              VALUES (src.NAME, new_watermark, CURRENT_TIMESTAMP());
+        END IF;
+    """
+
+
+def _summary(rows: List[Dict]) -> Dict:
+
+    row = rows[0] if rows else {}
+
+    return {
+        "status": "ok",
+        "changed": row.get("changed") or 0,
+        "merged": row.get("merged") or 0,
+        "watermark": row.get("watermark"),
+    }
+
+
+_SUMMARY_SQL = """
+        SELECT
+            (SELECT COUNT(DISTINCT ID_CONTENT) FROM changed) AS changed,
+            merged,
+            new_watermark AS watermark;
+"""
+
+
+# ============================================================
+# WATERMARK
+# ============================================================
+
+def get_enriched_watermark(
+    name: str = ENRICHED_WATERMARK,
+) -> Optional[datetime]:
+
+    """
+    Lecture seule : la table d'état est créée par les écritures
+    (set_enriched_watermark, scripts de refresh). Absente → None.
+    """
+
+    try:
+        rows = query_bq(
+            f"""
+            SELECT WATERMARK
+            FROM `{TABLE_SYNC_STATE}`
+            WHERE NAME = @state_name
+            """,
+            {
+                "state_name": name,
+            }
+        )
+
+    except NotFound:
+        return None
+
+    return rows[0]["WATERMARK"] if rows else None
+
+
+def set_enriched_watermark(
+    watermark: datetime,
+    name: str = ENRICHED_WATERMARK,
+):
+
+    query_bq(
+        f"""
+        DECLARE new_watermark TIMESTAMP DEFAULT @watermark;
+
+        {_record_watermark_sql()}
+        """,
+        {
+            "watermark": watermark,
+            "state_name": name,
+        }
+    )
+
+
+# ============================================================
+# RETRY SET
+# ============================================================
+
+def list_sync_retries(
+    name: str = ENRICHED_WATERMARK,
+) -> List[str]:
+
+    try:
+        rows = query_bq(
+            f"""
+            SELECT ID_CONTENT
+            FROM `{TABLE_SYNC_RETRY}`
+            WHERE NAME = @state_name
+            """,
+            {
+                "state_name": name,
+            }
+        )
+
+    except NotFound:
+        return []
+
+    return [r["ID_CONTENT"] for r in rows if r.get("ID_CONTENT")]
+
+
+def set_sync_retries(
+    failed: List[Dict],
+    name: str = ENRICHED_WATERMARK,
+):
+    """
+    Remplace l'ensemble des contenus à reprendre
+    (failed : [{"id_content", "error"}], vide → ensemble vidé).
+    """
+
+    failed = [
+        {
+            "id_content": f["id_content"],
+            "error": str(f.get("error") or "")[:1000],
+        }
+        for f in failed
+        if f.get("id_content")
+    ]
+
+    insert_sql = f"""
+        INSERT INTO `{TABLE_SYNC_RETRY}` (NAME, ID_CONTENT, ERROR, UPDATED_AT)
+        SELECT @state_name, f.id_content, f.error, CURRENT_TIMESTAMP()
+        FROM UNNEST(@failed) AS f;
+    """ if failed else ""
+
+    params = {"state_name": name}
+
+    if failed:
+        params["failed"] = failed
+
+    query_bq(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{TABLE_SYNC_RETRY}` (
+            NAME STRING,
+            ID_CONTENT STRING,
+            ERROR STRING,
+            UPDATED_AT TIMESTAMP
+        );
+
+        DELETE FROM `{TABLE_SYNC_RETRY}`
+        WHERE NAME = @state_name;
+
+        {insert_sql}
+        """,
+        params
+    )
+
+
+def list_changed_contents(
+    since: Optional[datetime],
+) -> List[Dict]:
+    """
+    Contenus modifiés depuis le watermark (tous statuts : un contenu
+    dépublié doit aussi sortir de la table enrichie).
+    since=None → tout le catalogue publié.
+    """
+
+    if since is None:
+        return query_bq(f"""
+            SELECT ID_CONTENT, STATUS, UPDATED_AT
+            FROM `{TABLE_CONTENT}`
+            WHERE STATUS = 'PUBLISHED'
+        """)
+
+    return query_bq(
+        f"""
+        SELECT ID_CONTENT, STATUS, UPDATED_AT
+        FROM `{TABLE_CONTENT}`
+        WHERE UPDATED_AT > @since
+        """,
+        {
+            "since": since,
+        }
+    )
+
+
+# ============================================================
+# REFRESH
+# ============================================================
+
+def refresh_content_enriched(
+    ids: List[str],
+    universes_from: str = "source",
+    record_watermark: Optional[str] = None,
+) -> Dict:
+    """
+    Rafraîchit les lignes enrichies des contenus donnés en un seul job.
+    record_watermark : nom du watermark à avancer au MAX(UPDATED_AT)
+    des contenus traités (synchro incrémentale).
+    """
+
+    ids = list(dict.fromkeys(i for i in ids if i))
+
+    if not ids:
+        return {"status": "ok", "changed": 0, "merged": 0, "watermark": None}
+
+    script = _build_refresh_script(
+        f"""
+        SELECT id AS ID_CONTENT, c.UPDATED_AT
+        FROM UNNEST(@ids) AS id
+        LEFT JOIN `{TABLE_CONTENT}` c
+          ON c.ID_CONTENT = id
+        """,
+        universes_from,
+    )
+
+    params = {"ids": ids}
+
+    if record_watermark:
+        script += _record_watermark_sql()
+        params["state_name"] = record_watermark
+
+    with _REFRESH_LOCK:
+        rows = query_bq(script + _SUMMARY_SQL, params)
+
+    result = _summary(rows)
+
+    # flux curator (lus depuis CONTENT_ENRICHED)
+    invalidate_http_cache("content")
+
+    print("✅ CONTENT_ENRICHED REFRESHED:", result)
+
+    return result
@@ -1,14 +1,19 @@
+import os
 import re
 import uuid
+import queue
+import random
+import threading
 import requests
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, date
 from dateutil.parser import parse
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, Any, List
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
-from utils.bigquery_utils import get_bigquery_client
-from google.cloud import bigquery
+from utils.bigquery_utils import query_bq, insert_bq
 from config import BQ_PROJECT, BQ_DATASET
 
 
@@ -30,6 +35,48 @@ HEADERS = {
     )
 }
 
+# Domaines crawlés en parallèle ; un domaine = une file séquentielle
+URL_IMPORT_FETCH_WORKERS = int(os.getenv("URL_IMPORT_FETCH_WORKERS", "8"))
+URL_IMPORT_PARSE_WORKERS = int(os.getenv("URL_IMPORT_PARSE_WORKERS", "4"))
+
+# Délai anti-bot entre deux requêtes vers le MÊME domaine (secondes)
+URL_IMPORT_HOST_DELAY = (7, 12)
+
+# Lignes par insert BigQuery (flush au fil de l'eau)
+URL_IMPORT_INSERT_CHUNK = int(os.getenv("URL_IMPORT_INSERT_CHUNK", "25"))
+
+# Attente max sans aucune issue (URL traitée ou en erreur) : au-delà,
+# les URLs restantes sont comptées en erreur (thread mort, blocage)
+URL_IMPORT_OUTCOME_TIMEOUT = float(os.getenv("URL_IMPORT_OUTCOME_TIMEOUT", "180"))
+
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Session HTTP partagée (keep-alive, pool de connexions par hôte).
+    """
+    global _HTTP_SESSION
+
+    with _HTTP_SESSION_LOCK:
+
+        if _HTTP_SESSION is None:
+
+            session = requests.Session()
+            session.headers.update(HEADERS)
+
+            adapter = HTTPAdapter(
+                pool_connections=URL_IMPORT_FETCH_WORKERS * 2,
+                pool_maxsize=URL_IMPORT_FETCH_WORKERS * 2,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+
+            _HTTP_SESSION = session
+
+    return _HTTP_SESSION
+
 def clean_raw_file(text: str) -> str:
 
     """
@@ -277,8 +324,6 @@ def insert_raw_rows(
 
     print("[RAW_IMPORT] Début insertion BigQuery")
 
-    client = get_bigquery_client()
-
     table_id = f"{BQ_PROJECT}.{BQ_DATASET}.{TABLE}"
 
     payload = []
@@ -323,19 +368,12 @@ def insert_raw_rows(
 
     print(f"[RAW_IMPORT] Nombre de lignes à insérer : {len(payload)}")
 
-    job_config = bigquery.LoadJobConfig(
-        source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
-        write_disposition="WRITE_APPEND",
-    )
-
-    job = client.load_table_from_json(
-        payload,
+    insert_bq(
         table_id,
-        job_config=job_config,
+        payload,
+        mode="load",
     )
 
-    job.result()
-
     print("[RAW_IMPORT] Insertion BigQuery OK")
 
     return len(payload)
@@ -377,35 +415,42 @@ def clean_urls(urls_text: str) -> List[str]:
 
     return urls
 
-def url_already_exists(url: str) -> bool:
+def existing_urls(urls: List[str]) -> set:
+    """
+    URLs déjà présentes dans RATECARD_CONTENT_RAW (une seule requête).
+    """
 
-    client = get_bigquery_client()
+    if not urls:
+        return set()
 
-    query = f"""
-        SELECT 1
+    rows = query_bq(f"""
+        SELECT DISTINCT SOURCE_URL
         FROM `{BQ_PROJECT}.{BQ_DATASET}.{TABLE}`
-        WHERE SOURCE_URL = @url
-        LIMIT 1
-    """
+        WHERE SOURCE_URL IN UNNEST(@urls)
+    """, {"urls": list(urls)})
 
-    from google.cloud import bigquery
+    return {r["SOURCE_URL"] for r in rows}
 
-    job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ScalarQueryParameter("url", "STRING", url)
-        ]
-    )
 
-    rows = list(client.query(query, job_config=job_config))
+def url_already_exists(url: str) -> bool:
+    return url in existing_urls([url])
 
-    return len(rows) > 0
 
-def parse_article_from_url(url: str) -> Dict[str, Any]:
+def fetch_url(url: str) -> str:
 
-    resp = requests.get(url, headers=HEADERS, timeout=15)
+    resp = get_http_session().get(url, timeout=15)
     resp.raise_for_status()
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    return resp.text
+
+
+def parse_article_from_url(url: str) -> Dict[str, Any]:
+    return parse_article_html(url, fetch_url(url))
+
+
+def parse_article_html(url: str, html: str) -> Dict[str, Any]:
+
+    soup = BeautifulSoup(html, "html.parser")
 
     # --------------------------------------------------
     # TITLE (robuste mais sans fallback artificiel)
@@ -467,132 +512,247 @@ def parse_article_from_url(url: str) -> Dict[str, Any]:
         "SOURCE_URL": url
     }
 
-def import_urls_batch(
-    urls_text: str,
-    id_source: str,
-    content_type: str = "ANALYSIS",
-    id_primary_company: Optional[str] = None,
+# ============================================================
+# URL IMPORT PIPELINE
+# ============================================================
+# dedup en une requête → crawl par domaine (délai par hôte) →
+# parsing en pool → inserts par paquets au fil de l'eau
+
+def _host(url: str) -> str:
+    return (urlparse(url).netloc or url).lower()
+
+
+def _crawl_host(
+    items: List[Dict],
+    parse_pool,
+    outcomes: "queue.Queue",
+    log_prefix: str,
+    stop: Optional[threading.Event] = None,
 ):
+    """
+    Une file séquentielle par domaine : même rythme qu'avant pour le site,
+    mais les domaines avancent en parallèle.
+    Chaque URL produit exactement une issue dans outcomes.
+    stop : import abandonné (timeout) → arrêt avant l'URL suivante.
+    """
 
-    import time
-    import random
+    stop = stop or threading.Event()
 
-    urls = clean_urls(urls_text)
+    for i, item in enumerate(items):
 
-    inserted_rows = []
+        url = item["url"]
 
-    imported_count = 0
-    skipped_count = 0
-    error_count = 0
+        # délai interrompu immédiatement par stop
+        if i and stop.wait(random.uniform(*URL_IMPORT_HOST_DELAY)):
+            return
 
-    print(f"[RAW_IMPORT_URL] URLs reçues : {len(urls)}")
+        if stop.is_set():
+            return
+
+        try:
+            print(f"{log_prefix} fetch {url}")
+            html = fetch_url(url)
 
-    for i, url in enumerate(urls, start=1):
+        except Exception as e:
+            outcomes.put((item, None, e))
+            continue
+
+        def parse_one(item=item, html=html):
+            try:
+                parsed = parse_article_html(item["url"], html)
+
+                if not parsed.get("RAW_TEXT", "").strip():
+                    raise Exception("RAW_TEXT vide après parsing")
+
+                outcomes.put((item, parsed, None))
+
+            except Exception as e:
+                outcomes.put((item, None, e))
 
         try:
+            parse_pool.submit(parse_one)
 
-            print(f"[RAW_IMPORT_URL] ({i}/{len(urls)}) {url}")
+        except Exception as e:
+            outcomes.put((item, None, e))
 
-            # --------------------------------------------------
-            # SKIP si déjà existant
-            # --------------------------------------------------
 
-            if url_already_exists(url):
+def _import_urls(
+    items: List[Dict],
+    id_source: str,
+    content_type: str,
+    id_primary_company: Optional[str],
+    log_prefix: str,
+) -> Dict[str, int]:
+    """
+    items : [{"url": ..., "row": {champs additionnels de la ligne RAW}}]
+    """
 
-                skipped_count += 1
-                continue
+    stats = {"inserted": 0, "skipped": 0, "errors": 0}
 
-            # --------------------------------------------------
-            # PARSE
-            # --------------------------------------------------
+    # --------------------------------------------------
+    # DEDUP (liste + base, une seule requête)
+    # --------------------------------------------------
 
-            parsed = parse_article_from_url(url)
+    unique = {}
 
-            title = parsed.get("TITLE")
+    for item in items:
+        if item["url"] in unique:
+            stats["skipped"] += 1
+        else:
+            unique[item["url"]] = item
 
-            date_source = parsed.get("DATE_SOURCE")
+    existing = existing_urls(list(unique.keys()))
 
-            raw_text = parsed.get("RAW_TEXT", "")
+    todo = [
+        item for url, item in unique.items()
+        if url not in existing
+    ]
 
-            if not raw_text.strip():
-                raise Exception("RAW_TEXT vide après parsing")
+    stats["skipped"] += len(unique) - len(todo)
 
-            # --------------------------------------------------
-            # Prépare insertion BQ
-            # --------------------------------------------------
+    print(f"{log_prefix} à importer : {len(todo)} / déjà existantes : {len(unique) - len(todo)}")
 
-            inserted_rows.append(
-                {
-                    "TITLE": title,
-                    "DATE_SOURCE": date_source,
-                    "RAW_TEXT": raw_text,
-                    "SOURCE_URL": parsed.get("SOURCE_URL"),
+    if not todo:
+        return stats
 
-                    # 🔥 NEW
-                    "CONTENT_TYPE": content_type,
-                }
+    # --------------------------------------------------
+    # CRAWL PAR DOMAINE + PARSING EN POOL
+    # --------------------------------------------------
+
+    by_host: Dict[str, List[Dict]] = {}
+
+    for item in todo:
+        by_host.setdefault(_host(item["url"]), []).append(item)
+
+    outcomes: "queue.Queue" = queue.Queue()
+    buffer: List[Dict] = []
+
+    def flush():
+        if buffer:
+            insert_raw_rows(
+                list(buffer),
+                id_source=id_source,
+                import_type="URL",
+                content_type=content_type,
+                id_primary_company=id_primary_company,
             )
+            buffer.clear()
 
-            imported_count += 1
+    # pools gérés sans "with" : en cas de timeout on rend la main
+    # sans attendre les crawls en cours (shutdown(wait=False))
+    parse_pool = ThreadPoolExecutor(
+        max_workers=URL_IMPORT_PARSE_WORKERS,
+        thread_name_prefix="url-parse",
+    )
+    fetch_pool = ThreadPoolExecutor(
+        max_workers=min(URL_IMPORT_FETCH_WORKERS, len(by_host)),
+        thread_name_prefix="url-fetch",
+    )
 
-            # --------------------------------------------------
-            # Délai sécurisé (anti-bot)
-            # --------------------------------------------------
+    stop = threading.Event()
+    timed_out = False
 
-            time.sleep(random.uniform(7, 12))
+    try:
+        for host_items in by_host.values():
+            fetch_pool.submit(_crawl_host, host_items, parse_pool, outcomes, log_prefix, stop)
 
-        except Exception as e:
+        # une issue (ligne ou erreur) par URL
+        for done in range(len(todo)):
 
-            print("[RAW_IMPORT_URL] erreur:", e)
+            try:
+                item, parsed, error = outcomes.get(
+                    timeout=URL_IMPORT_OUTCOME_TIMEOUT
+                )
 
-            error_count += 1
+            except queue.Empty:
+                # URLs restantes en erreur : non insérées, donc
+                # réimportables au prochain lancement
+                missing = len(todo) - done
+                print(f"{log_prefix} ⏱️ timeout : {missing} URL(s) sans réponse")
+                stats["errors"] += missing
+                timed_out = True
+                break
+
+            if error is not None:
+                print(f"{log_prefix} erreur:", item["url"], error)
+                stats["errors"] += 1
+                continue
 
-    # ----------------------------------------------------------
-    # INSERTION GROUPÉE
-    # ----------------------------------------------------------
+            buffer.append({
+                "TITLE": parsed.get("TITLE"),
+                "DATE_SOURCE": parsed.get("DATE_SOURCE"),
+                "RAW_TEXT": parsed.get("RAW_TEXT", ""),
+                "SOURCE_URL": parsed.get("SOURCE_URL"),
+                **item.get("row", {}),
+            })
 
-    if inserted_rows:
+            stats["inserted"] += 1
 
-        insert_raw_rows(
-            inserted_rows,
-            id_source=id_source,
-            import_type="URL",
+            if len(buffer) >= URL_IMPORT_INSERT_CHUNK:
+                flush()
 
-            # 🔥 NEW
-            content_type=content_type,
-            id_primary_company=id_primary_company,
-        )
+    finally:
 
-    # ----------------------------------------------------------
-    # MESSAGE SIMPLE POUR FRONT
-    # ----------------------------------------------------------
+        stop.set()
+
+        fetch_pool.shutdown(wait=not timed_out, cancel_futures=True)
+        parse_pool.shutdown(wait=not timed_out, cancel_futures=True)
+
+        flush()
+
+    return stats
+
+
+def _import_message(stats: Dict[str, int]) -> str:
 
     message_parts = []
 
-    if imported_count:
-        message_parts.append(f"{imported_count} importée(s)")
+    if stats["inserted"]:
+        message_parts.append(f"{stats['inserted']} importée(s)")
 
-    if skipped_count:
-        message_parts.append(f"{skipped_count} déjà existante(s)")
+    if stats["skipped"]:
+        message_parts.append(f"{stats['skipped']} déjà existante(s)")
 
-    if error_count:
-        message_parts.append(f"{error_count} erreur(s)")
+    if stats["errors"]:
+        message_parts.append(f"{stats['errors']} erreur(s)")
 
-    message = (
+    return (
         " / ".join(message_parts)
         if message_parts
         else "Aucune URL traitée"
     )
 
+
+def import_urls_batch(
+    urls_text: str,
+    id_source: str,
+    content_type: str = "ANALYSIS",
+    id_primary_company: Optional[str] = None,
+):
+
+    urls = clean_urls(urls_text)
+
+    print(f"[RAW_IMPORT_URL] URLs reçues : {len(urls)}")
+
+    stats = _import_urls(
+        [
+            {"url": url, "row": {"CONTENT_TYPE": content_type}}
+            for url in urls
+        ],
+        id_source=id_source,
+        content_type=content_type,
+        id_primary_company=id_primary_company,
+        log_prefix="[RAW_IMPORT_URL]",
+    )
+
     return {
         "status": "ok",
         "total": len(urls),
-        "inserted": imported_count,
-        "skipped": skipped_count,
-        "errors": error_count,
-        "message": message,
+        **stats,
+        "message": _import_message(stats),
     }
 
+
 def import_urls_csv(
     csv_text: str,
     id_source: str,
@@ -601,8 +761,6 @@ def import_urls_csv(
 
     import csv
     import io
-    import time
-    import random
 
     reader = csv.DictReader(
         io.StringIO(csv_text)
@@ -610,164 +768,44 @@ def import_urls_csv(
 
     rows = list(reader)
 
-    inserted_rows = []
-
-    imported_count = 0
-    skipped_count = 0
-    error_count = 0
-
     print(
         f"[RAW_IMPORT_CSV] lignes reçues : {len(rows)}"
     )
 
-    for i, row in enumerate(rows, start=1):
+    items = []
 
-        try:
-
-            url = (
-                row.get("URL", "")
-                .strip()
-            )
-
-            id_primary_company = (
-                row.get(
-                    "ID_PRIMARY_COMPANY",
-                    ""
-                ).strip()
-                or None
-            )
-
-            if not url:
-                continue
+    for row in rows:
 
-            print(
-                f"[RAW_IMPORT_CSV] ({i}/{len(rows)}) {url}"
-            )
-
-            # --------------------------------------------------
-            # SKIP SI DÉJÀ EXISTANT
-            # --------------------------------------------------
-
-            if url_already_exists(url):
-
-                skipped_count += 1
-                continue
-
-            # --------------------------------------------------
-            # PARSE
-            # --------------------------------------------------
-
-            parsed = parse_article_from_url(
-                url
-            )
-
-            title = parsed.get(
-                "TITLE"
-            )
-
-            date_source = parsed.get(
-                "DATE_SOURCE"
-            )
-
-            raw_text = parsed.get(
-                "RAW_TEXT",
-                ""
-            )
-
-            if not raw_text.strip():
-                raise Exception(
-                    "RAW_TEXT vide après parsing"
-                )
-
-            # --------------------------------------------------
-            # PRÉPARE INSERTION BQ
-            # --------------------------------------------------
-
-            inserted_rows.append(
-                {
-                    "TITLE": title,
-
-                    "DATE_SOURCE":
-                        date_source,
-
-                    "RAW_TEXT":
-                        raw_text,
-
-                    "SOURCE_URL":
-                        parsed.get(
-                            "SOURCE_URL"
-                        ),
-
-                    # 🔥 CSV
-                    "ID_PRIMARY_COMPANY":
-                        id_primary_company,
-                }
-            )
-
-            imported_count += 1
-
-            # --------------------------------------------------
-            # DÉLAI SÉCURISÉ
-            # --------------------------------------------------
-
-            time.sleep(
-                random.uniform(7, 12)
-            )
-
-        except Exception as e:
-
-            print(
-                "[RAW_IMPORT_CSV] erreur:",
-                e
-            )
-
-            error_count += 1
-
-    # ----------------------------------------------------------
-    # INSERTION GROUPÉE
-    # ----------------------------------------------------------
-
-    if inserted_rows:
-
-        insert_raw_rows(
-            inserted_rows,
-            id_source=id_source,
-            import_type="URL",
-            content_type=content_type,
-        )
-
-    # ----------------------------------------------------------
-    # MESSAGE SIMPLE POUR FRONT
-    # ----------------------------------------------------------
-
-    message_parts = []
-
-    if imported_count:
-        message_parts.append(
-            f"{imported_count} importée(s)"
+        url = (
+            row.get("URL", "")
+            .strip()
         )
 
-    if skipped_count:
-        message_parts.append(
-            f"{skipped_count} déjà existante(s)"
-        )
+        if not url:
+            continue
 
-    if error_count:
-        message_parts.append(
-            f"{error_count} erreur(s)"
-        )
+        items.append({
+            "url": url,
+            "row": {
+                # 🔥 CSV
+                "ID_PRIMARY_COMPANY": (
+                    row.get("ID_PRIMARY_COMPANY", "").strip()
+                    or None
+                ),
+            },
+        })
 
-    message = (
-        " / ".join(message_parts)
-        if message_parts
-        else "Aucune URL traitée"
+    stats = _import_urls(
+        items,
+        id_source=id_source,
+        content_type=content_type,
+        id_primary_company=None,
+        log_prefix="[RAW_IMPORT_CSV]",
     )
 
     return {
         "status": "ok",
         "total": len(rows),
-        "inserted": imported_count,
-        "skipped": skipped_count,
-        "errors": error_count,
-        "message": message,
+        **stats,
+        "message": _import_message(stats),
     }
@@ -1,10 +1,14 @@
+import os
 import re
+import time
 import uuid
+import threading
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timezone, date
 from typing import Optional, Dict, Any, List
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from google.cloud import bigquery
 
@@ -12,16 +16,24 @@ from config import BQ_PROJECT, BQ_DATASET
 from api.content.models import ContentCreate, ContentUpdate
 from core.content.ai import generate_summary
 from core.content.news_ai import generate_news
+from utils.llm import llm_caller, get_llm_caller_stats
+from utils.timing import timing_summary
+from utils.http_cache import invalidate_http_cache
 from utils.bigquery_utils import (
     query_bq,
+    iter_bq,
     insert_bq,
     update_bq,
+    bulk_update_bq,
     get_bigquery_client,
 )
 
-from core.numbers.service import get_numbers_from_content
-from core.numbers.backlog_llm import process_backlog_row
-from core.numbers.backlog_insert_service import insert_backlog_batch
+from core.numbers.backlog_jobs import (
+    NUMBERS_BACKLOG_ASYNC,
+    enqueue_content_backlog,
+    run_content_backlog,
+)
+from core.news.stats_service import schedule_public_stats_refresh
 from core.content.publish_sync_service import (
     after_publish_sync,
 )
@@ -225,28 +237,15 @@ def create_content(data: ContentCreate) -> str:
 
         elif chiffres:
 
-            backlog_rows = get_numbers_from_content(content_id)
-
-            processed_results = []
-
-            for backlog_row in backlog_rows:
+            # Opt-in : file en mémoire, perdue au redémarrage
+            if NUMBERS_BACKLOG_ASYNC:
 
-                result = process_backlog_row(backlog_row)
+                job_id = enqueue_content_backlog(content_id)
 
-                if result.get("status") == "ok":
-                    processed_results.append(result)
-
-            if processed_results:
-
-                insert_backlog_batch(processed_results)
-
-                print(
-                    "✔ NUMBERS BACKLOG INSERTED:",
-                    len(processed_results)
-                )
+                print("⏳ NUMBERS BACKLOG QUEUED:", job_id)
 
             else:
-                print("ℹ️ NO VALID NUMBERS:", content_id)
+                run_content_backlog(content_id)
 
         else:
             print("ℹ️ NO CHIFFRES TO PROCESS:", content_id)
@@ -702,7 +701,12 @@ def list_active_sources():
 
 def list_contents_admin():
 
-    rows = query_bq(
+    return list(iter_contents_admin())
+
+
+def iter_contents_admin():
+
+    rows = iter_bq(
         f"""
         SELECT
           c.ID_CONTENT,
@@ -741,9 +745,9 @@ def list_contents_admin():
         """
     )
 
-    return [
+    for r in rows:
 
-        {
+        yield {
             "id_content": r["ID_CONTENT"],
 
             # 🔥 NEW
@@ -805,9 +809,6 @@ def list_contents_admin():
             ),
         }
 
-        for r in rows
-    ]
-
 # ============================================================
 # STORE RAW CONTENT
 # ============================================================
@@ -1038,11 +1039,19 @@ def list_raw_stock(
 
         "total": total,
     }
-def destock_all_raw_contents(batch_size: int = 50):
+def destock_all_raw_contents(batch_size: int = 50, workers: int = 1):
+
+    if workers and workers > 1:
+        return destock_raw_contents_concurrent(
+            workers=workers,
+            batch_size=batch_size,
+        )
 
     total_processed = 0
     total_errors = 0
 
+    reclaim_stale_raw_contents()
+
     while True:
 
         result = destock_raw_contents(limit=batch_size)
@@ -1069,103 +1078,378 @@ def destock_all_raw_contents(batch_size: int = 50):
 
 
 # ============================================================
-# DESTOCK RAW CONTENTS
+# DESTOCK — CONFIG CONCURRENCE
 # ============================================================
 
-def destock_raw_contents(
+DESTOCK_WORKERS = int(os.getenv("DESTOCK_WORKERS", "4"))
+
+# Appels LLM simultanés / par minute : budget "destock" de la
+# passerelle (LLM_CALLER_BUDGETS, utils/llm.py)
+DESTOCK_LLM_CALLER = "destock"
+
+DESTOCK_CLAIM_RETRIES = 3
+
+# Un raw resté PROCESSING au-delà (worker tué en plein lot) est repris
+DESTOCK_STALE_MINUTES = int(os.getenv("DESTOCK_STALE_MINUTES", "30"))
+
+_CLAIMED_AT_READY = False
+_CLAIMED_AT_LOCK = threading.Lock()
+
+
+# ============================================================
+# CLAIM RAW(S) — STORED → PROCESSING ATOMIQUE
+# ============================================================
+
+def _ensure_claimed_at_column() -> None:
+    """
+    CLAIMED_AT (date de réservation) : ajoutée une fois par process.
+    """
+    global _CLAIMED_AT_READY
+
+    with _CLAIMED_AT_LOCK:
+
+        if _CLAIMED_AT_READY:
+            return
+
+        query_bq(f"""
+            ALTER TABLE `{TABLE_CONTENT_RAW}`
+            ADD COLUMN IF NOT EXISTS CLAIMED_AT TIMESTAMP
+        """)
+
+        _CLAIMED_AT_READY = True
+
+
+def reclaim_stale_raw_contents(
+    stale_minutes: int = DESTOCK_STALE_MINUTES,
+) -> int:
+    """
+    Raws restés PROCESSING (process arrêté en cours de lot) :
+    - CONTENT déjà créé (ID_RAW) → PROCESSED avec GENERATED_CONTENT_ID
+    - sinon → STORED, repris par le prochain claim
+    """
+
+    _ensure_claimed_at_column()
+
+    rows = query_bq(
+        f"""
+        MERGE `{TABLE_CONTENT_RAW}` T
+        USING (
+            SELECT
+                r.ID_RAW,
+                MAX(c.ID_CONTENT) AS ID_CONTENT
+            FROM `{TABLE_CONTENT_RAW}` r
+            LEFT JOIN `{TABLE_CONTENT}` c
+              ON c.ID_RAW = r.ID_RAW
+            WHERE r.STATUS = 'PROCESSING'
+              AND (
+                r.CLAIMED_AT IS NULL
+                OR r.CLAIMED_AT < TIMESTAMP_SUB(
+                    CURRENT_TIMESTAMP(),
+                    INTERVAL @stale_minutes MINUTE
+                )
+              )
+            GROUP BY r.ID_RAW
+        ) S
+        ON T.ID_RAW = S.ID_RAW
+        WHEN MATCHED AND T.STATUS = 'PROCESSING' THEN UPDATE SET
+            STATUS = IF(S.ID_CONTENT IS NULL, 'STORED', 'PROCESSED'),
+            GENERATED_CONTENT_ID = IFNULL(S.ID_CONTENT, T.GENERATED_CONTENT_ID),
+            PROCESSED_AT = IF(S.ID_CONTENT IS NULL, T.PROCESSED_AT, CURRENT_TIMESTAMP());
+
+        SELECT @@row_count AS reclaimed;
+        """,
+        {"stale_minutes": int(stale_minutes)},
+    )
+
+    reclaimed = rows[0]["reclaimed"] if rows else 0
+
+    if reclaimed:
+        print("♻️ RAW PROCESSING REPRIS:", reclaimed)
+
+    return reclaimed
+
+
+def _write_raw_status(
+    row: Dict[str, Any],
+    timings: Optional[Dict[str, List[float]]] = None,
+) -> None:
+    """
+    Statut final écrit dès qu'il est connu (un raw n'attend pas la
+    fin du lot) ; une erreur d'écriture n'interrompt pas le lot,
+    le raw sera repris par reclaim_stale_raw_contents.
+    """
+
+    t0 = time.monotonic()
+
+    try:
+        bulk_update_bq(TABLE_CONTENT_RAW, "ID_RAW", [row])
+
+    except Exception as e:
+        print("❌ RAW STATUS WRITE FAILED:", row["ID_RAW"], str(e))
+
+    if timings is not None:
+        timings["flush"].append(time.monotonic() - t0)
+
+def claim_raw_contents(
     limit: int = 5,
-    specific_id: Optional[str] = None
-) -> Dict[str, Any]:
+    specific_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Sélection + passage en PROCESSING dans une transaction BigQuery
+    (un seul MERGE) : deux workers ne peuvent jamais prendre le même ID_RAW,
+    la transaction concurrente est annulée puis rejouée.
 
-    # ====================================================
-    # 1️⃣ SELECT RAW(S)
-    # ====================================================
+    Retourne les lignes effectivement réservées.
+    """
 
     if specific_id:
-
-        raws = query_bq(
-            f"""
-            SELECT *
+        candidates = f"""
+            SELECT ID_RAW
             FROM `{TABLE_CONTENT_RAW}`
             WHERE ID_RAW = @id_raw
-            """,
-            {"id_raw": specific_id}
-        )
+            AND STATUS IN ('STORED', 'ERROR')
+        """
+        params = {"id_raw": specific_id}
 
     else:
-
-        raws = query_bq(
-            f"""
-            SELECT *
+        candidates = f"""
+            SELECT ID_RAW
             FROM `{TABLE_CONTENT_RAW}`
             WHERE STATUS = 'STORED'
             ORDER BY CREATED_AT DESC
-            LIMIT {limit}
-            """
-        )
+            LIMIT {int(limit)}
+        """
+        params = None
+
+    sql = f"""
+        BEGIN TRANSACTION;
+
+        CREATE TEMP TABLE claimed AS
+        {candidates};
+
+        MERGE `{TABLE_CONTENT_RAW}` T
+        USING claimed S
+        ON T.ID_RAW = S.ID_RAW
+        WHEN MATCHED AND T.STATUS IN ('STORED', 'ERROR') THEN UPDATE SET
+            STATUS = 'PROCESSING',
+            ERROR_MESSAGE = NULL,
+            CLAIMED_AT = CURRENT_TIMESTAMP();
+
+        COMMIT TRANSACTION;
+
+        SELECT r.*
+        FROM `{TABLE_CONTENT_RAW}` r
+        JOIN claimed c
+        ON r.ID_RAW = c.ID_RAW;
+    """
 
-    processed = 0
-    errors = 0
+    _ensure_claimed_at_column()
+
+    for attempt in range(DESTOCK_CLAIM_RETRIES):
+
+        try:
+            return query_bq(sql, params)
+
+        except Exception as e:
+
+            # Conflit de transaction : un autre worker a réservé en même temps
+            if attempt == DESTOCK_CLAIM_RETRIES - 1:
+                raise
+
+            print("⚠️ CLAIM CONFLICT, RETRY:", str(e))
+            time.sleep(0.5 * (attempt + 1))
+
+    return []
+
+
+# ============================================================
+# DESTOCK RAW CONTENTS
+# ============================================================
+
+def destock_raw_contents(
+    limit: int = 5,
+    specific_id: Optional[str] = None
+) -> Dict[str, Any]:
+
+    # ====================================================
+    # 1️⃣ CLAIM RAW(S) (SELECT + PROCESSING en une transaction)
+    # ====================================================
+
+    raws = claim_raw_contents(limit=limit, specific_id=specific_id)
+
+    # Statut final écrit par raw, dès qu'il est connu
+    processed_rows = []
+    error_rows = []
 
     # ====================================================
     # 2️⃣ PROCESS LOOP
     # ====================================================
 
     for raw in raws:
+        _destock_one_raw(raw, processed_rows, error_rows)
 
-        raw_id = raw["ID_RAW"]
+    return {
+        "processed": len(processed_rows),
+        "errors": len(error_rows),
+        "total_selected": len(raws),
+    }
 
-        try:
 
-            print("\n==============================")
-            print("RAW ID:", raw_id)
-            print("SOURCE_ID:", raw.get("SOURCE_ID"))
+# ============================================================
+# DESTOCK RAW CONTENTS — WORKER POOL
+# ============================================================
 
-            # 🔥 NEW
-            print("CONTENT_TYPE:", raw.get("CONTENT_TYPE"))
+def destock_raw_contents_concurrent(
+    workers: int = DESTOCK_WORKERS,
+    batch_size: int = 50,
+    max_items: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Vidage du stock par un pool de workers :
+    - réservation atomique par lots (claim_raw_contents)
+    - LLM borné par le budget passerelle "destock" (concurrence + débit)
+    - statut final écrit par raw dès qu'il est connu
+    - raws PROCESSING orphelins (run précédent tué) repris au départ
+    - temps par étape (claim, llm, create_content, flush)
+    """
+
+    workers = max(1, int(workers))
+    batch_size = max(workers, int(batch_size))
+
+    timings: Dict[str, List[float]] = {
+        "claim": [],
+        "llm": [],
+        "create_content": [],
+        "item": [],
+        "flush": [],
+    }
+
+    total_processed = 0
+    total_errors = 0
+    total_selected = 0
+
+    started = time.monotonic()
+
+    reclaim_stale_raw_contents()
+
+    with ThreadPoolExecutor(
+        max_workers=workers,
+        thread_name_prefix="destock",
+    ) as pool:
+
+        while True:
+
+            limit = batch_size
+            if max_items is not None:
+                limit = min(limit, max_items - total_selected)
+                if limit <= 0:
+                    break
+
+            t0 = time.monotonic()
+            raws = claim_raw_contents(limit=limit)
+            timings["claim"].append(time.monotonic() - t0)
+
+            if not raws:
+                break
+
+            total_selected += len(raws)
+
+            processed_rows = []
+            error_rows = []
+
+            futures = [
+                pool.submit(
+                    _destock_one_raw,
+                    raw,
+                    processed_rows,
+                    error_rows,
+                    timings,
+                )
+                for raw in raws
+            ]
+
+            for future in as_completed(futures):
+                future.result()
+
+            total_processed += len(processed_rows)
+            total_errors += len(error_rows)
 
-            # 🔥 NEW
             print(
-                "ID_PRIMARY_COMPANY:",
-                raw.get("ID_PRIMARY_COMPANY")
+                f"Batch terminé → processed: {len(processed_rows)} | errors: {len(error_rows)}"
             )
 
-            print("RAW LENGTH:", len(raw.get("RAW_TEXT", "") or ""))
-            print("------------------------------")
+            # 🔐 Sécurité anti-boucle infinie
+            if not processed_rows:
+                print("Aucun traitement réussi dans ce batch → arrêt de sécurité")
+                break
 
-            if raw["STATUS"] not in ["STORED", "ERROR"]:
-                raise ValueError("RAW non traitable (status invalide)")
+    return {
+        "total_processed": total_processed,
+        "total_errors": total_errors,
+        "total_selected": total_selected,
+        "workers": workers,
+        "elapsed_s": round(time.monotonic() - started, 3),
+        "timings": timing_summary(timings),
+        "llm": get_llm_caller_stats(DESTOCK_LLM_CALLER),
+    }
 
-            # ====================================================
-            # PASS TO PROCESSING
-            # ====================================================
 
-            update_bq(
-                TABLE_CONTENT_RAW,
-                {
-                    "STATUS": "PROCESSING",
-                    "ERROR_MESSAGE": None,
-                },
-                where={"ID_RAW": raw_id}
-            )
+def _destock_one_raw(
+    raw: Dict[str, Any],
+    processed_rows: List[Dict[str, Any]],
+    error_rows: List[Dict[str, Any]],
+    timings: Optional[Dict[str, List[float]]] = None,
+):
 
-            # ====================================================
-            # CONTENT TYPE
-            # ====================================================
+    raw_id = raw["ID_RAW"]
 
-            content_type = (
-                raw.get("CONTENT_TYPE")
-                or "ANALYSIS"
-            )
+    started = time.monotonic()
 
-            # 🔥 NEW
-            id_primary_company = raw.get(
-                "ID_PRIMARY_COMPANY"
-            )
+    final_row = None
+
+    try:
+
+        print("\n==============================")
+        print("RAW ID:", raw_id)
+        print("SOURCE_ID:", raw.get("SOURCE_ID"))
+
+        # 🔥 NEW
+        print("CONTENT_TYPE:", raw.get("CONTENT_TYPE"))
+
+        # 🔥 NEW
+        print(
+            "ID_PRIMARY_COMPANY:",
+            raw.get("ID_PRIMARY_COMPANY")
+        )
+
+        print("RAW LENGTH:", len(raw.get("RAW_TEXT", "") or ""))
+        print("------------------------------")
+
+        # Les raws sont réservés par claim_raw_contents
+        if raw["STATUS"] not in ["STORED", "ERROR", "PROCESSING"]:
+            raise ValueError("RAW non traitable (status invalide)")
 
-            # ====================================================
-            # GENERATE CONTENT
-            # ====================================================
+        # ====================================================
+        # CONTENT TYPE
+        # ====================================================
+
+        content_type = (
+            raw.get("CONTENT_TYPE")
+            or "ANALYSIS"
+        )
+
+        # 🔥 NEW
+        id_primary_company = raw.get(
+            "ID_PRIMARY_COMPANY"
+        )
+
+        # ====================================================
+        # GENERATE CONTENT
+        # ====================================================
+
+        t0 = time.monotonic()
+
+        with llm_caller(DESTOCK_LLM_CALLER):
 
             if content_type == "NEWS":
 
@@ -1178,146 +1462,152 @@ def destock_raw_contents(
 
                 summary = generate_summary(
                     source_id=raw.get("SOURCE_ID"),
-                    source_text=raw.get("RAW_TEXT", "")
+                    source_text=raw.get("RAW_TEXT", ""),
+                    cache=True,
                 )
 
-            concepts_llm = normalize_llm_list(
-                summary.get("concepts", [])
-            )
+        if timings is not None:
+            timings["llm"].append(time.monotonic() - t0)
 
-            solutions_llm = normalize_llm_list(
-                summary.get("solutions", [])
-            )
+        concepts_llm = normalize_llm_list(
+            summary.get("concepts", [])
+        )
 
-            topics_llm = normalize_llm_list(
-                summary.get("topics", [])
-            )
+        solutions_llm = normalize_llm_list(
+            summary.get("solutions", [])
+        )
 
-            acteurs_clean = normalize_llm_list(
-                summary.get("acteurs_cites", [])
-            )
+        topics_llm = normalize_llm_list(
+            summary.get("topics", [])
+        )
 
-            # ====================================================
-            # CLEAN SOURCE_DATE
-            # ====================================================
+        acteurs_clean = normalize_llm_list(
+            summary.get("acteurs_cites", [])
+        )
 
-            raw_source_date = raw.get("DATE_SOURCE")
+        # ====================================================
+        # CLEAN SOURCE_DATE
+        # ====================================================
 
-            source_date_clean = None
+        raw_source_date = raw.get("DATE_SOURCE")
 
-            if raw_source_date:
+        source_date_clean = None
 
-                if (
-                    isinstance(raw_source_date, date)
-                    and not isinstance(raw_source_date, datetime)
-                ):
+        if raw_source_date:
 
-                    source_date_clean = raw_source_date
+            if (
+                isinstance(raw_source_date, date)
+                and not isinstance(raw_source_date, datetime)
+            ):
 
-                elif isinstance(raw_source_date, datetime):
+                source_date_clean = raw_source_date
 
-                    source_date_clean = raw_source_date.date()
+            elif isinstance(raw_source_date, datetime):
 
-                elif isinstance(raw_source_date, str):
+                source_date_clean = raw_source_date.date()
 
-                    try:
+            elif isinstance(raw_source_date, str):
 
-                        source_date_clean = datetime.strptime(
-                            raw_source_date.split("T")[0],
-                            "%Y-%m-%d"
-                        )
+                try:
 
-                    except Exception:
+                    source_date_clean = datetime.strptime(
+                        raw_source_date.split("T")[0],
+                        "%Y-%m-%d"
+                    )
 
-                        source_date_clean = None
+                except Exception:
 
-            # ====================================================
-            # BUILD CONTENT MODEL
-            # ====================================================
+                    source_date_clean = None
 
-            content_payload = ContentCreate(
+        # ====================================================
+        # BUILD CONTENT MODEL
+        # ====================================================
 
-                # 🔥 NEW
-                content_type=content_type,
+        content_payload = ContentCreate(
 
-                # 🔥 NEW
-                id_primary_company=id_primary_company,
+            # 🔥 NEW
+            content_type=content_type,
 
-                title=summary.get("title"),
-                id_raw=raw.get("ID_RAW"),
+            # 🔥 NEW
+            id_primary_company=id_primary_company,
 
-                source_url=raw.get("SOURCE_URL"),
+            title=summary.get("title"),
+            id_raw=raw.get("ID_RAW"),
 
-                source_title=raw.get("SOURCE_TITLE"),
+            source_url=raw.get("SOURCE_URL"),
 
-                excerpt=summary.get("excerpt"),
+            source_title=raw.get("SOURCE_TITLE"),
 
-                content_body=summary.get("content_body"),
+            excerpt=summary.get("excerpt"),
 
-                chiffres=summary.get("chiffres", []),
+            content_body=summary.get("content_body"),
 
-                acteurs_cites=summary.get("acteurs_cites", []),
+            chiffres=summary.get("chiffres", []),
 
-                concepts_llm=concepts_llm,
+            acteurs_cites=summary.get("acteurs_cites", []),
 
-                solutions_llm=solutions_llm,
+            concepts_llm=concepts_llm,
 
-                topics_llm=topics_llm,
+            solutions_llm=solutions_llm,
 
-                mecanique_expliquee=summary.get("mecanique_expliquee"),
+            topics_llm=topics_llm,
 
-                enjeu_strategique=summary.get("enjeu_strategique"),
+            mecanique_expliquee=summary.get("mecanique_expliquee"),
 
-                point_de_friction=summary.get("point_de_friction"),
+            enjeu_strategique=summary.get("enjeu_strategique"),
 
-                signal_analytique=summary.get("signal_analytique"),
+            point_de_friction=summary.get("point_de_friction"),
 
-                source_id=raw.get("SOURCE_ID"),
+            signal_analytique=summary.get("signal_analytique"),
 
-                source_date=source_date_clean,
+            source_id=raw.get("SOURCE_ID"),
 
-                author=None,
-            )
+            source_date=source_date_clean,
+
+            author=None,
+        )
 
-            content_id = create_content(content_payload)
+        t0 = time.monotonic()
 
-            # ====================================================
-            # MARK RAW AS PROCESSED
-            # ====================================================
+        content_id = create_content(content_payload)
 
-            update_bq(
-                TABLE_CONTENT_RAW,
-                {
-                    "STATUS": "PROCESSED",
-                    "PROCESSED_AT": datetime.utcnow(),
-                    "GENERATED_CONTENT_ID": content_id,
-                    "ERROR_MESSAGE": None,
-                },
-                where={"ID_RAW": raw_id}
-            )
+        if timings is not None:
+            timings["create_content"].append(time.monotonic() - t0)
 
-            processed += 1
+        # ====================================================
+        # MARK RAW AS PROCESSED
+        # ====================================================
 
-        except Exception as e:
+        final_row = {
+            "ID_RAW": raw_id,
+            "STATUS": "PROCESSED",
+            "PROCESSED_AT": datetime.utcnow(),
+            "GENERATED_CONTENT_ID": content_id,
+            "ERROR_MESSAGE": None,
+        }
 
-            print("\n❌ ERROR DURING DESTOCK:", str(e))
+        processed_rows.append(final_row)
 
-            update_bq(
-                TABLE_CONTENT_RAW,
-                {
-                    "STATUS": "ERROR",
-                    "ERROR_MESSAGE": str(e),
-                },
-                where={"ID_RAW": raw_id}
-            )
+    except Exception as e:
 
-            errors += 1
+        print("\n❌ ERROR DURING DESTOCK:", str(e))
+
+        final_row = {
+            "ID_RAW": raw_id,
+            "STATUS": "ERROR",
+            "ERROR_MESSAGE": str(e),
+        }
+
+        error_rows.append(final_row)
+
+    finally:
+
+        if final_row is not None:
+            _write_raw_status(final_row, timings)
+
+        if timings is not None:
+            timings["item"].append(time.monotonic() - started)
 
-    return {
-        "processed": processed,
-        "errors": errors,
-        "total_selected": len(raws),
-    }
 
 def delete_raw_content(id_raw: str) -> None:
 
@@ -1627,7 +1917,10 @@ def raw_url_exists(url: str) -> bool:
 
 def get_source_monitoring():
 
-    from utils.bigquery_utils import query_bq
+    return list(iter_source_monitoring())
+
+
+def iter_source_monitoring():
 
     query = """
     WITH ranked AS (
@@ -1724,9 +2017,7 @@ def get_source_monitoring():
     ORDER BY agg.LAST_IMPORT_AT DESC
     """
 
-    rows = query_bq(query)
-
-    return rows
+    return iter_bq(query)
 
 # ============================================================
 # RESET RELATIONS
@@ -1973,6 +2264,8 @@ def update_content(id_content: str, data: ContentUpdate):
             ],
         )
 
+    invalidate_http_cache("content")
+
     return True
 
 # ============================================================
@@ -1987,6 +2280,8 @@ def archive_content(id_content: str):
         where={"ID_CONTENT": id_content},
     )
 
+    invalidate_http_cache("content")
+
     return True
 
 
@@ -1994,6 +2289,45 @@ def archive_content(id_content: str):
 # PUBLISH CONTENT
 # ============================================================
 
+def _normalize_published_at(published_at):
+
+    # ========================================================
+    # DATE → DATETIME
+    # ========================================================
+
+    if (
+        isinstance(published_at, date)
+        and not isinstance(
+            published_at,
+            datetime
+        )
+    ):
+
+        return datetime.combine(
+            published_at,
+            datetime.min.time(),
+            tzinfo=timezone.utc
+        )
+
+    # ========================================================
+    # NAIVE DATETIME → UTC
+    # ========================================================
+
+    if (
+        isinstance(
+            published_at,
+            datetime
+        )
+        and published_at.tzinfo is None
+    ):
+
+        return published_at.replace(
+            tzinfo=timezone.utc
+        )
+
+    return published_at
+
+
 def publish_content(
     id_content: str,
     published_at: Optional[datetime] = None,
@@ -2047,39 +2381,9 @@ def publish_content(
             or now_dt
         )
 
-    # ========================================================
-    # DATE → DATETIME
-    # ========================================================
-
-    if (
-        isinstance(published_at, date)
-        and not isinstance(
-            published_at,
-            datetime
-        )
-    ):
-
-        published_at = datetime.combine(
-            published_at,
-            datetime.min.time(),
-            tzinfo=timezone.utc
-        )
-
-    # ========================================================
-    # NAIVE DATETIME → UTC
-    # ========================================================
-
-    elif (
-        isinstance(
-            published_at,
-            datetime
-        )
-        and published_at.tzinfo is None
-    ):
-
-        published_at = published_at.replace(
-            tzinfo=timezone.utc
-        )
+    published_at = _normalize_published_at(
+        published_at
+    )
 
     # ========================================================
     # 3️⃣ STATUS
@@ -2118,6 +2422,12 @@ def publish_content(
         }
     )
 
+    # stats publiques (V_CONTENT_STATS_COMPANY) recalculées hors requête
+    if status == "PUBLISHED":
+        schedule_public_stats_refresh("publish_content")
+
+    invalidate_http_cache("content")
+
     return status
 
 
@@ -2160,25 +2470,22 @@ def bulk_ready(ids: list[str]) -> int:
 
     now = datetime.now(timezone.utc)
 
-    query = f"""
-        UPDATE `{TABLE_CONTENT}`
-        SET
-            STATUS = 'READY',
-            UPDATED_AT = @now
-        WHERE
-            STATUS = 'DRAFT'
-            AND ID_CONTENT IN UNNEST(@ids)
-    """
-
-    query_bq(
-        query,
-        {
-            "ids": ids,
-            "now": now,
-        },
+    # Un seul MERGE pour tout le lot (DRAFT → READY)
+    result = bulk_update_bq(
+        TABLE_CONTENT,
+        "ID_CONTENT",
+        [
+            {
+                "ID_CONTENT": id_content,
+                "STATUS": "READY",
+                "UPDATED_AT": now,
+            }
+            for id_content in ids
+        ],
+        condition="T.STATUS = 'DRAFT'",
     )
 
-    return len(ids)
+    return result["affected"]
 
 
 def bulk_publish(ids: List[str]) -> Dict[str, int]:
@@ -2186,19 +2493,70 @@ def bulk_publish(ids: List[str]) -> Dict[str, int]:
     if not ids:
         return {"updated": 0, "skipped": 0}
 
-    updated = 0
-    skipped = 0
+    now_dt = datetime.now(
+        timezone.utc
+    )
 
-    for id_content in ids:
-        try:
-            publish_content(id_content)
-            updated += 1
-        except Exception:
-            skipped += 1
+    # ========================================================
+    # 1️⃣ CHECK (une requête pour tout le lot)
+    # ========================================================
+
+    rows = query_bq(
+        f"""
+        SELECT
+            ID_CONTENT,
+            STATUS,
+            SOURCE_DATE
+        FROM `{TABLE_CONTENT}`
+        WHERE ID_CONTENT IN UNNEST(@ids)
+        """,
+        {
+            "ids": ids,
+        }
+    )
+
+    updates = []
+
+    for r in rows:
+
+        if r["STATUS"] != "READY":
+            continue
+
+        published_at = _normalize_published_at(
+            r["SOURCE_DATE"] or now_dt
+        )
+
+        updates.append({
+            "ID_CONTENT": r["ID_CONTENT"],
+            "STATUS": (
+                "PUBLISHED"
+                if published_at <= now_dt
+                else "SCHEDULED"
+            ),
+            "PUBLISHED_AT": published_at,
+            "UPDATED_AT": now_dt,
+        })
+
+    # ========================================================
+    # 2️⃣ UPDATE (un seul MERGE)
+    # ========================================================
+
+    result = bulk_update_bq(
+        TABLE_CONTENT,
+        "ID_CONTENT",
+        updates,
+        condition="T.STATUS = 'READY'",
+    )
+
+    updated = result["affected"]
+
+    if updated:
+        schedule_public_stats_refresh("bulk_publish")
+        invalidate_http_cache("content")
 
     return {
         "updated": updated,
-        "skipped": skipped,
+        "skipped": len(set(ids)) - updated,
     }
 
 # ============================================================
@@ -2342,3 +2700,5 @@ def delete_content(id_content: str):
             ]
         ),
     ).result()
+
+    invalidate_http_cache("content")
@@ -1,3 +1,7 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import List, Dict, Optional
 
@@ -5,25 +9,31 @@ from config import BQ_PROJECT, BQ_DATASET
 
 from utils.bigquery_utils import (
     query_bq,
+    iter_bq,
     insert_bq,
 )
 
-from core.numbers.service import (
-    get_numbers_from_content,
-)
+from utils.timing import timing_summary
 
-from core.numbers.backlog_llm import (
-    process_backlog_row,
+from core.numbers.backlog_jobs import (
+    run_content_backlog,
 )
 
-from core.numbers.backlog_insert_service import (
-    insert_backlog_batch,
+from core.content.enriched_service import (
+    get_enriched_watermark,
+    set_enriched_watermark,
+    list_changed_contents,
+    list_sync_retries,
+    set_sync_retries,
+    refresh_content_enriched,
 )
 
 from core.matching.resolver import (
     normalize,
+    resolve_entities,
     resolve_company_alias,
     resolve_solution_alias,
+    get_alias_index,
 )
 
 # ============================================================
@@ -53,62 +63,45 @@ TABLE_SOLUTION_ALIAS = (
 )
 
 # ============================================================
-# ENTITY MATCHING (🔥 NEW CORE)
+# CONFIG
 # ============================================================
+# Synchro par lots : liens entités et lignes enrichies en requêtes
+# ensemblistes par lot, lots traités en parallèle.
+#
+# Seules les lectures et les numbers (LLM) tournent en parallèle :
+# les DML ensemblistes sur une même table (DELETE / INSERT des liens,
+# MERGE enrichi) sont sérialisés dans le process, sinon BigQuery
+# annule les DML concurrents (conflits de sérialisation).
 
-def sync_content_entities(id_content: str):
+SYNC_BATCH_SIZE = int(os.getenv("SYNC_BATCH_SIZE", "200"))
+SYNC_WORKERS = int(os.getenv("SYNC_WORKERS", "4"))
 
-    # ========================================================
-    # CLEAN EXISTING LINKS
-    # ========================================================
-
-    query_bq(
-        f"""
-        DELETE FROM `{TABLE_CONTENT_COMPANY}`
-        WHERE ID_CONTENT = @id_content
-        """,
-        {
-            "id_content": id_content,
-        }
-    )
+_ENTITY_LINKS_DML_LOCK = threading.Lock()
 
-    query_bq(
-        f"""
-        DELETE FROM `{TABLE_CONTENT_SOLUTION}`
-        WHERE ID_CONTENT = @id_content
-        """,
-        {
-            "id_content": id_content,
-        }
-    )
+# ============================================================
+# ENTITY MATCHING (🔥 NEW CORE)
+# ============================================================
 
-    # ========================================================
-    # LOAD CONTENT
-    # ========================================================
+def load_alias_maps() -> Dict:
+    """
+    Instantané de l'index d'alias, figé pour tout le run.
+    """
 
-    rows = query_bq(
-        f"""
-        SELECT
-            ID_CONTENT,
-            ID_PRIMARY_COMPANY,
-            ACTEURS_CITES,
-            SOLUTIONS_LLM
-
-        FROM `{TABLE_CONTENT}`
+    index = get_alias_index()
 
-        WHERE ID_CONTENT = @id_content
+    return {
+        "company_map": index["company"],
+        "solution_map": index["solution"],
+        "rejected_set": index["rejected"],
+    }
 
-        LIMIT 1
-        """,
-        {
-            "id_content": id_content,
-        }
-    )
 
-    if not rows:
-        return
+def _build_entity_links(
+    row: Dict,
+    alias_maps: Dict,
+):
 
-    row = rows[0]
+    id_content = row["ID_CONTENT"]
 
     # ========================================================
     # RAW VALUES
@@ -125,7 +118,8 @@ def sync_content_entities(id_content: str):
     # ========================================================
 
     resolved = resolve_entities(
-        raw_values
+        raw_values,
+        **alias_maps,
     )
 
     company_inserts = []
@@ -199,111 +193,203 @@ def sync_content_entities(id_content: str):
             "ID_SOLUTION": solution_id,
         })
 
+    return (
+        company_inserts,
+        solution_inserts,
+        len(resolved["unmatched"]),
+    )
+
+
+def sync_entities_batch(
+    ids: List[str],
+    alias_maps: Optional[Dict] = None,
+) -> Dict[str, Dict]:
+    """
+    Liens contenu ↔ sociétés / solutions pour un lot :
+    1 SELECT, 2 DELETE, 2 INSERT quel que soit le nombre de contenus.
+    """
+
+    if not ids:
+        return {}
+
+    alias_maps = alias_maps or load_alias_maps()
+
     # ========================================================
-    # INSERT COMPANIES
+    # LOAD CONTENTS
     # ========================================================
 
-    if company_inserts:
+    rows = query_bq(
+        f"""
+        SELECT
+            ID_CONTENT,
+            ID_PRIMARY_COMPANY,
+            ACTEURS_CITES,
+            SOLUTIONS_LLM
+
+        FROM `{TABLE_CONTENT}`
 
-        insert_bq(
-            TABLE_CONTENT_COMPANY,
-            company_inserts,
+        WHERE ID_CONTENT IN UNNEST(@ids)
+        """,
+        {
+            "ids": ids,
+        }
+    )
+
+    company_inserts = []
+    solution_inserts = []
+
+    stats = {}
+
+    for row in rows:
+
+        companies, solutions, unmatched = _build_entity_links(
+            row,
+            alias_maps,
         )
 
+        company_inserts.extend(companies)
+        solution_inserts.extend(solutions)
+
+        stats[row["ID_CONTENT"]] = {
+            "companies": len(companies),
+            "solutions": len(solutions),
+            "unmatched": unmatched,
+        }
+
     # ========================================================
-    # INSERT SOLUTIONS
+    # CLEAN + INSERT LINKS (DML sérialisés, cf. CONFIG)
     # ========================================================
 
-    if solution_inserts:
+    with _ENTITY_LINKS_DML_LOCK:
 
-        insert_bq(
-            TABLE_CONTENT_SOLUTION,
-            solution_inserts,
+        query_bq(
+            f"""
+            DELETE FROM `{TABLE_CONTENT_COMPANY}`
+            WHERE ID_CONTENT IN UNNEST(@ids)
+            """,
+            {
+                "ids": ids,
+            }
         )
 
+        query_bq(
+            f"""
+            DELETE FROM `{TABLE_CONTENT_SOLUTION}`
+            WHERE ID_CONTENT IN UNNEST(@ids)
+            """,
+            {
+                "ids": ids,
+            }
+        )
+
+        if company_inserts:
+
+            insert_bq(
+                TABLE_CONTENT_COMPANY,
+                company_inserts,
+            )
+
+        if solution_inserts:
+
+            insert_bq(
+                TABLE_CONTENT_SOLUTION,
+                solution_inserts,
+            )
+
+    return stats
+
+
+def sync_content_entities(id_content: str):
+
+    stats = sync_entities_batch(
+        [id_content]
+    )
+
+    if id_content not in stats:
+        return
+
     print(
         "✅ ENTITY SYNC DONE:",
         {
             "id_content": id_content,
-            "companies": len(company_inserts),
-            "solutions": len(solution_inserts),
-            "unmatched": len(
-                resolved["unmatched"]
-            ),
+            **stats[id_content],
         }
     )
 
 
 # ============================================================
-# SYNC ALL NUMBERS
+# SYNC CONTENT NUMBERS
 # ============================================================
 
-def sync_all_numbers():
+def sync_content_numbers(id_content: str):
 
-    print(
-        "🚀 GLOBAL NUMBERS SYNC START"
+    return run_content_backlog(
+        id_content
     )
 
-    rows = query_bq(
-        f"""
-        SELECT ID_CONTENT
 
-        FROM `{TABLE_CONTENT}`
+# ============================================================
+# SYNC ALL NUMBERS
+# ============================================================
+
+# Erreurs détaillées conservées dans le rapport (compteurs complets)
+SYNC_NUMBERS_ERROR_SAMPLES = 20
 
-        WHERE STATUS = 'PUBLISHED'
-        """
+
+def sync_all_numbers():
+    """
+    Rapport agrégé (total / synced / errors + échantillon d'erreurs) :
+    la mémoire ne grossit pas avec le nombre de contenus traités.
+    """
+
+    print(
+        "🚀 GLOBAL NUMBERS SYNC START"
     )
 
-    if not rows:
+    # IDs seuls, lus avant les appels LLM (itérateur BigQuery
+    # refermé avant le traitement)
+    ids = [
+        row["ID_CONTENT"]
+        for row in iter_bq(
+            f"""
+            SELECT ID_CONTENT
 
-        return {
-            "total": 0,
-            "synced": 0,
-            "errors": 0,
-            "results": [],
-        }
+            FROM `{TABLE_CONTENT}`
 
-    results = []
+            WHERE STATUS = 'PUBLISHED'
+            """
+        )
+    ]
 
-    for row in rows:
+    synced_count = 0
+    error_count = 0
+    error_samples = []
 
-        id_content = row["ID_CONTENT"]
+    for id_content in ids:
 
         try:
 
-            result = sync_content_numbers(
+            sync_content_numbers(
                 id_content=id_content,
             )
 
-            results.append({
-                "id_content": id_content,
-                "status": "ok",
-                **result,
-            })
+            synced_count += 1
 
         except Exception as e:
 
-            results.append({
-                "id_content": id_content,
-                "status": "error",
-                "error": str(e),
-            })
-
-    synced_count = len([
-        r for r in results
-        if r["status"] == "ok"
-    ])
+            error_count += 1
 
-    error_count = len([
-        r for r in results
-        if r["status"] == "error"
-    ])
+            if len(error_samples) < SYNC_NUMBERS_ERROR_SAMPLES:
+                error_samples.append({
+                    "id_content": id_content,
+                    "error": str(e),
+                })
 
     output = {
-        "total": len(rows),
+        "total": len(ids),
         "synced": synced_count,
         "errors": error_count,
-        "results": results,
+        "error_samples": error_samples,
     }
 
     print(
@@ -320,164 +406,9 @@ def sync_all_numbers():
 
 def rebuild_content_enriched_row(id_content: str):
 
-    query_bq(
-        f"""
-        DELETE FROM `{TABLE_CONTENT_ENRICHED}`
-        WHERE id_content = @id_content
-        """,
-        {
-            "id_content": id_content,
-        }
-    )
-
-    query_bq(
-        f"""
-        INSERT INTO `{TABLE_CONTENT_ENRICHED}` (
-            id_content,
-            source_id,
-            title,
-            title_en,
-            excerpt,
-            excerpt_en,
-            content_body,
-            signal_analytique,
-            mecanique_expliquee,
-            enjeu_strategique,
-            point_de_friction,
-            chiffres,
-            acteurs_cites,
-            concepts_llm,
-            solutions_llm,
-            topics_llm,
-            status,
-            is_active,
-            source_date,
-            published_at,
-            created_at,
-            updated_at,
-            universes,
-            topics,
-            companies,
-            solutions,
-            concepts,
-            content_type,
-            id_primary_company
-        )
-
-        SELECT
-            c.ID_CONTENT AS id_content,
-            c.SOURCE_ID AS source_id,
-            c.TITLE AS title,
-            c.TITLE_EN AS title_en,
-            c.EXCERPT AS excerpt,
-            c.EXCERPT_EN AS excerpt_en,
-            c.CONTENT_BODY AS content_body,
-            c.SIGNAL_ANALYTIQUE AS signal_analytique,
-            c.MECANIQUE_EXPLIQUEE AS mecanique_expliquee,
-            c.ENJEU_STRATEGIQUE AS enjeu_strategique,
-            c.POINT_DE_FRICTION AS point_de_friction,
-            c.CHIFFRES AS chiffres,
-            c.ACTEURS_CITES AS acteurs_cites,
-            c.CONCEPTS_LLM AS concepts_llm,
-            c.SOLUTIONS_LLM AS solutions_llm,
-            c.TOPICS_LLM AS topics_llm,
-            c.STATUS AS status,
-            c.IS_ACTIVE AS is_active,
-            c.SOURCE_DATE AS source_date,
-            c.PUBLISHED_AT AS published_at,
-            c.CREATED_AT AS created_at,
-            c.UPDATED_AT AS updated_at,
-
-            ARRAY(
-                SELECT DISTINCT AS STRUCT
-                    u.ID_UNIVERSE AS id_universe,
-                    u.LABEL AS label
-
-                FROM `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_SOURCE_UNIVERSE` su
-
-                JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_UNIVERSE` u
-                    ON su.ID_UNIVERSE = u.ID_UNIVERSE
-
-                WHERE su.ID_SOURCE = c.SOURCE_ID
-            ) AS universes,
-
-            ARRAY(
-                SELECT DISTINCT AS STRUCT
-                    t.ID_TOPIC AS id_topic,
-                    t.LABEL AS label,
-                    t.TOPIC_AXIS AS topic_axis
-
-                FROM `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONTENT_TOPIC` ct
-
-                JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_TOPIC` t
-                    ON ct.ID_TOPIC = t.ID_TOPIC
-
-                WHERE ct.ID_CONTENT = c.ID_CONTENT
-            ) AS topics,
-
-            ARRAY(
-                SELECT DISTINCT AS STRUCT
-                    co.ID_COMPANY AS id_company,
-                    co.NAME AS name,
-                    co.MEDIA_LOGO_RECTANGLE_ID AS media_logo_rectangle_id
-
-                FROM `{TABLE_CONTENT_COMPANY}` cc
-
-                JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_COMPANY` co
-                    ON cc.ID_COMPANY = co.ID_COMPANY
-
-                WHERE cc.ID_CONTENT = c.ID_CONTENT
-            ) AS companies,
-
-            ARRAY(
-                SELECT DISTINCT AS STRUCT
-                    s.ID_SOLUTION AS id_solution,
-                    s.NAME AS name
-
-                FROM `{TABLE_CONTENT_SOLUTION}` cs
-
-                JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_SOLUTION` s
-                    ON cs.ID_SOLUTION = s.ID_SOLUTION
-
-                WHERE cs.ID_CONTENT = c.ID_CONTENT
-            ) AS solutions,
-
-            ARRAY(
-                SELECT DISTINCT AS STRUCT
-                    cp.ID_CONCEPT AS id_concept,
-                    cpt.LABEL AS label
-
-                FROM `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONTENT_CONCEPT` cp
-
-                JOIN `{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONCEPT` cpt
-                    ON cp.ID_CONCEPT = cpt.ID_CONCEPT
-
-                WHERE cp.ID_CONTENT = c.ID_CONTENT
-            ) AS concepts,
-
-            LOWER(
-                COALESCE(
-                    c.CONTENT_TYPE,
-                    'ANALYSIS'
-                )
-            ) AS content_type,
-
-            c.ID_PRIMARY_COMPANY AS id_primary_company
-
-        FROM `{TABLE_CONTENT}` c
-
-        WHERE
-            c.ID_CONTENT = @id_content
-            AND c.STATUS = 'PUBLISHED'
-        """,
-        {
-            "id_content": id_content,
-        }
-    )
-
-    print(
-        "✅ CONTENT_ENRICHED REBUILT:",
-        id_content,
+    refresh_content_enriched(
+        [id_content],
+        universes_from="source",
     )
 
 # ============================================================
@@ -536,35 +467,258 @@ def sync_content(
     return result
 
 # ============================================================
-# BULK SYNC CONTENTS
+# BATCH SYNC (orchestrateur)
 # ============================================================
 
-def bulk_sync_contents(ids: list[str]):
+def _run_stage(
+    ids: List[str],
+    stage,
+    errors: Dict[str, str],
+):
+    """
+    Étape ensembliste sur le lot ; en cas d'échec, rejouée contenu
+    par contenu pour isoler le ou les contenus fautifs.
+    """
 
-    results = []
+    try:
+        return stage(ids)
+
+    except Exception:
+
+        if len(ids) == 1:
+            raise
+
+    output = {}
 
     for id_content in ids:
 
         try:
+            result = stage([id_content])
 
-            result = sync_content(
-                id_content=id_content,
-            )
+            if isinstance(result, dict):
+                output.update(result)
 
-            results.append({
-                "id_content": id_content,
-                "status": "ok",
-                **result,
-            })
+        except Exception as e:
+            errors[id_content] = str(e)
+
+    return output
+
+
+def _sync_batch(
+    ids: List[str],
+    sync_numbers: bool,
+    alias_maps: Dict,
+) -> Dict:
+
+    started = time.monotonic()
+
+    errors: Dict[str, str] = {}
+    timings = {
+        "entities": [],
+        "enriched": [],
+        "numbers": [],
+    }
+    content_seconds = {i: 0.0 for i in ids}
+
+    def spread(stage: str, elapsed: float, stage_ids: List[str]):
+        timings[stage].append(elapsed)
+        for i in stage_ids:
+            content_seconds[i] += elapsed / max(1, len(stage_ids))
+
+    # ========================================================
+    # ENTITIES (lot)
+    # ========================================================
+
+    t0 = time.monotonic()
+
+    try:
+        entity_stats = _run_stage(
+            ids,
+            lambda batch: sync_entities_batch(batch, alias_maps),
+            errors,
+        )
+
+    except Exception as e:
+        entity_stats = {}
+        errors.update({i: str(e) for i in ids})
+
+    spread("entities", time.monotonic() - t0, ids)
+
+    # ========================================================
+    # ENRICHED (lot, un MERGE)
+    # ========================================================
+
+    ok_ids = [i for i in ids if i not in errors]
+
+    if ok_ids:
+
+        t0 = time.monotonic()
+
+        try:
+            _run_stage(
+                ok_ids,
+                lambda batch: refresh_content_enriched(
+                    batch,
+                    universes_from="source",
+                ),
+                errors,
+            )
 
         except Exception as e:
+            errors.update({i: str(e) for i in ok_ids})
+
+        spread("enriched", time.monotonic() - t0, ok_ids)
+
+    # ========================================================
+    # NUMBERS (par contenu : appels LLM)
+    # ========================================================
+
+    numbers_results = {}
+
+    if sync_numbers:
+
+        for id_content in ids:
+
+            if id_content in errors:
+                continue
+
+            t0 = time.monotonic()
+
+            try:
+                numbers_results[id_content] = sync_content_numbers(
+                    id_content=id_content,
+                )
+
+            except Exception as e:
+                errors[id_content] = str(e)
+
+            elapsed = time.monotonic() - t0
+            timings["numbers"].append(elapsed)
+            content_seconds[id_content] += elapsed
+
+    # ========================================================
+    # RESULTS
+    # ========================================================
+
+    results = []
+
+    for id_content in ids:
+
+        if id_content in errors:
 
             results.append({
                 "id_content": id_content,
                 "status": "error",
-                "error": str(e),
+                "error": errors[id_content],
             })
 
+            continue
+
+        results.append({
+            "id_content": id_content,
+            "status": "ok",
+            **entity_stats.get(id_content, {}),
+            "numbers_result": numbers_results.get(id_content),
+            "duration_seconds": round(content_seconds[id_content], 3),
+        })
+
+    return {
+        "results": results,
+        "timings": {
+            **timings,
+            "batch": [time.monotonic() - started],
+            "content": [
+                r["duration_seconds"]
+                for r in results
+                if r["status"] == "ok"
+            ],
+        },
+    }
+
+
+def sync_contents(
+    ids: List[str],
+    sync_numbers: bool = False,
+    batch_size: int = SYNC_BATCH_SIZE,
+    workers: int = SYNC_WORKERS,
+) -> Dict:
+    """
+    Synchro d'un ensemble arbitraire de contenus :
+    lots de batch_size traités par un pool borné, étapes ensemblistes
+    par lot, erreurs isolées par contenu, timings p50/p95 par étape.
+    """
+
+    started_at = datetime.now(
+        timezone.utc
+    )
+
+    ids = list(dict.fromkeys(i for i in ids if i))
+
+    batch_size = max(1, batch_size)
+
+    batches = [
+        ids[i:i + batch_size]
+        for i in range(0, len(ids), batch_size)
+    ]
+
+    results = []
+    timings: Dict[str, List[float]] = {}
+
+    if batches:
+
+        alias_maps = load_alias_maps()
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(workers, len(batches))),
+            thread_name_prefix="content-sync",
+        ) as pool:
+
+            futures = {
+                pool.submit(
+                    _sync_batch,
+                    batch,
+                    sync_numbers,
+                    alias_maps,
+                ): batch
+                for batch in batches
+            }
+
+            for future in as_completed(futures):
+
+                try:
+                    output = future.result()
+
+                except Exception as e:
+
+                    output = {
+                        "results": [
+                            {
+                                "id_content": id_content,
+                                "status": "error",
+                                "error": str(e),
+                            }
+                            for id_content in futures[future]
+                        ],
+                        "timings": {},
+                    }
+
+                results.extend(output["results"])
+
+                for stage, values in output["timings"].items():
+                    timings.setdefault(stage, []).extend(values)
+
+                print(
+                    "🔁 SYNC BATCH DONE:",
+                    len(results),
+                    "/",
+                    len(ids),
+                )
+
+    duration = (
+        datetime.now(timezone.utc)
+        - started_at
+    ).total_seconds()
+
     return {
         "total": len(ids),
         "synced": len([
@@ -575,16 +729,34 @@ def bulk_sync_contents(ids: list[str]):
             r for r in results
             if r["status"] == "error"
         ]),
+        "batches": len(batches),
+        "batch_size": batch_size,
+        "workers": workers,
+        "duration_seconds": duration,
+        "timings": timing_summary(timings),
         "results": results,
     }
 
+# ============================================================
+# BULK SYNC CONTENTS
+# ============================================================
+
+def bulk_sync_contents(ids: list[str]):
+
+    return sync_contents(ids)
+
 # ============================================================
 # FULL SYNC — ALL PUBLISHED CONTENTS
 # ============================================================
 
 def sync_all_published_contents(
     sync_numbers: bool = False,
+    full: bool = False,
 ):
+    """
+    Par défaut : contenus modifiés depuis le dernier run (watermark).
+    full=True : tout le catalogue publié.
+    """
 
     started_at = datetime.now(
         timezone.utc
@@ -595,66 +767,79 @@ def sync_all_published_contents(
     )
 
     # ========================================================
-    # GET PUBLISHED CONTENTS
+    # CHANGED CONTENTS (watermark)
     # ========================================================
 
-    rows = query_bq(
-        f"""
-        SELECT ID_CONTENT
-        FROM `{TABLE_CONTENT}`
-        WHERE STATUS = 'PUBLISHED'
-        ORDER BY PUBLISHED_AT DESC
-        LIMIT 20
-        """
-    )
+    since = None if full else get_enriched_watermark()
 
-    ids = [
+    changed = list_changed_contents(since)
+
+    # échecs du run précédent : repris même s'ils sont sous le watermark
+    retry_ids = [] if full else list_sync_retries()
+
+    unpublished = [
         r["ID_CONTENT"]
-        for r in rows
+        for r in changed
+        if r.get("STATUS") != "PUBLISHED"
     ]
 
-    results = []
+    ids = list(dict.fromkeys(
+        [
+            r["ID_CONTENT"]
+            for r in changed
+            if r.get("STATUS") == "PUBLISHED"
+        ]
+        + [i for i in retry_ids if i not in set(unpublished)]
+    ))
 
     # ========================================================
-    # LOOP
+    # SYNC (lots parallèles)
     # ========================================================
 
-    for id_content in ids:
-
-        try:
-
-            result = sync_content(
-                id_content=id_content,
-                sync_numbers=sync_numbers,
-            )
+    result = sync_contents(
+        ids,
+        sync_numbers=sync_numbers,
+    )
 
-            results.append({
-                "id_content": id_content,
-                "status": "ok",
-                **result,
-            })
+    # ========================================================
+    # DÉPUBLIÉS → sortis de la table enrichie
+    # ========================================================
 
-        except Exception as e:
+    if unpublished:
 
-            results.append({
-                "id_content": id_content,
-                "status": "error",
-                "error": str(e),
-            })
+        refresh_content_enriched(
+            unpublished,
+            universes_from="source",
+        )
 
     # ========================================================
-    # STATS
+    # WATERMARK
     # ========================================================
 
-    synced = len([
-        r for r in results
-        if r["status"] == "ok"
-    ])
-
-    errors = len([
-        r for r in results
+    # les contenus en échec passent dans l'ensemble de reprise
+    # (écrit avant le watermark) : un échec persistant ne bloque
+    # plus l'avancée du watermark pour tous les autres
+    failed = [
+        r for r in result["results"]
         if r["status"] == "error"
-    ])
+    ]
+
+    if failed or retry_ids or full:
+
+        set_sync_retries(
+            failed
+        )
+
+    watermark = max(
+        (r["UPDATED_AT"] for r in changed if r.get("UPDATED_AT")),
+        default=None,
+    )
+
+    if watermark:
+
+        set_enriched_watermark(
+            watermark
+        )
 
     duration = (
         datetime.now(timezone.utc)
@@ -662,18 +847,23 @@ def sync_all_published_contents(
     ).total_seconds()
 
     final_result = {
-        "total": len(ids),
-        "synced": synced,
-        "errors": errors,
+        **result,
+        "since": since.isoformat() if since else None,
+        "changed": len(changed),
+        "unpublished": len(unpublished),
+        "retried": len(retry_ids),
+        "watermark": watermark.isoformat() if watermark else None,
         "sync_numbers": sync_numbers,
         "duration_seconds": duration,
-        "results": results,
     }
 
     print(
         "✅ FULL CONTENT SYNC DONE:",
-        final_result,
+        {
+            k: v
+            for k, v in final_result.items()
+            if k != "results"
+        },
     )
 
     return final_result
-
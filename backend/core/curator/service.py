@@ -2,7 +2,8 @@ from typing import List, Dict, Optional
 
 from config import BQ_PROJECT, BQ_DATASET
 
-from utils.bigquery_utils import query_bq
+from utils.bigquery_utils import query_bq, aquery_bq, arun_bq, gather_bq
+from utils.pagination import seek_clause
 
 from core.user.user_keyword_service import (
     get_user_keywords,
@@ -112,40 +113,63 @@ def load_user_preferences(
 
 
 # ============================================================
-# SEARCH
+# FEED QUERY (SEARCH / LATEST)
 # ============================================================
 
-def search(
-    q: str,
-    limit: int = 20,
-    offset: int = 0,
-    user_id: Optional[str] = None,
-    universe_id: Optional[str] = None,
-    content_type: Optional[str] = None,
-    feed_mode: Optional[str] = None,
-) -> List[Dict]:
+SEARCH_WHERE = """
+    WHERE (
 
-    q = (q or "").strip()
+        LOWER(c.title)
+            LIKE LOWER(CONCAT('%', @query, '%'))
 
-    (
-        fav_companies,
-        fav_topics,
-        fav_solutions,
-    ) = load_user_preferences(user_id)
+        OR LOWER(c.title_en)
+            LIKE LOWER(CONCAT('%', @query, '%'))
+
+        OR LOWER(c.excerpt)
+            LIKE LOWER(CONCAT('%', @query, '%'))
+
+        OR LOWER(c.excerpt_en)
+            LIKE LOWER(CONCAT('%', @query, '%'))
+    )
+"""
 
-    keywords = []
+LATEST_WHERE = """
+    WHERE c.published_at IS NOT NULL
+"""
+
+
+def load_feed_keywords(
+    user_id: Optional[str],
+    feed_mode: Optional[str],
+) -> List[str]:
 
     if (
         feed_mode == "keywords"
         and user_id
     ):
-        keywords = get_user_keywords(user_id)
+        return get_user_keywords(user_id)
+
+    return []
+
+
+def _build_feed_query(
+    where_sql: str,
+    limit: int,
+    offset: int,
+    user_id: Optional[str],
+    universe_id: Optional[str],
+    content_type: Optional[str],
+    feed_mode: Optional[str],
+    preferences,
+    keywords: List[str],
+    cursor: Optional[str] = None,
+):
 
-    if (
-        feed_mode == "keywords"
-        and not keywords
-    ):
-        return []
+    (
+        fav_companies,
+        fav_topics,
+        fav_solutions,
+    ) = preferences
 
     universe_filter = ""
 
@@ -187,6 +211,19 @@ def search(
             )
         )
 
+    # =====================================================
+    # CURSEUR (KEYSET) : (published_at, id) < dernier servi
+    # =====================================================
+
+    params: Dict = {}
+
+    cursor_filter = seek_clause(
+        "c.published_at",
+        "c.id_content",
+        cursor,
+        params,
+    )
+
     sql = f"""
     SELECT
         c.id_content AS id,
@@ -220,38 +257,25 @@ def search(
 
     FROM `{TABLE_CONTENT_ENRICHED}` c
 
-    WHERE (
-
-        LOWER(c.title)
-            LIKE LOWER(CONCAT('%', @query, '%'))
-
-        OR LOWER(c.title_en)
-            LIKE LOWER(CONCAT('%', @query, '%'))
-
-        OR LOWER(c.excerpt)
-            LIKE LOWER(CONCAT('%', @query, '%'))
-
-        OR LOWER(c.excerpt_en)
-            LIKE LOWER(CONCAT('%', @query, '%'))
-    )
+    {where_sql}
 
     {build_content_type_filter()}
     {build_user_filter("c")}
     {universe_filter}
     {preferences_filter}
     {keywords_filter}
+    {cursor_filter}
 
-    ORDER BY published_at DESC
+    ORDER BY published_at DESC, id DESC
 
     LIMIT @limit
     OFFSET @offset
     """
 
-    params = {
-        "query": q,
-
+    params.update({
         "limit": limit,
-        "offset": offset,
+        # avec un curseur, la position est portée par le seek
+        "offset": 0 if cursor else offset,
 
         "user_id": user_id,
 
@@ -262,7 +286,7 @@ def search(
         "fav_companies": fav_companies,
         "fav_topics": fav_topics,
         "fav_solutions": fav_solutions,
-    }
+    })
 
     # =====================================================
     # KEYWORDS PARAMS
@@ -279,25 +303,19 @@ def search(
                 f"keyword_{i}"
             ] = keyword
 
-    rows = query_bq(
-        sql,
-        params
-    )
+    return sql, params
+
+
+def _map_feed_rows(
+    rows: List[Dict],
+    context: Optional[Dict],
+) -> List[Dict]:
 
     mapped = [
         _map_feed_row(r)
         for r in rows
     ]
 
-    from core.user.user_service import (
-        get_user_context
-    )
-
-    context = (
-        get_user_context(user_id)
-        if user_id else None
-    )
-
     lang = (
         context["lang"]
         if context else "fr"
@@ -319,32 +337,26 @@ def search(
 
     return mapped
 
-# ============================================================
-# LATEST
-# ============================================================
 
-def latest(
-    limit: int = 20,
-    offset: int = 0,
-    user_id: Optional[str] = None,
-    universe_id: Optional[str] = None,
-    content_type: Optional[str] = None,
-    feed_mode: Optional[str] = None,
+def _run_feed(
+    where_sql: str,
+    extra_params: Dict,
+    limit: int,
+    offset: int,
+    user_id: Optional[str],
+    universe_id: Optional[str],
+    content_type: Optional[str],
+    feed_mode: Optional[str],
+    cursor: Optional[str] = None,
 ) -> List[Dict]:
 
-    (
-        fav_companies,
-        fav_topics,
-        fav_solutions,
-    ) = load_user_preferences(user_id)
+    from core.user.user_service import (
+        get_user_context
+    )
 
-    keywords = []
+    preferences = load_user_preferences(user_id)
 
-    if (
-        feed_mode == "keywords"
-        and user_id
-    ):
-        keywords = get_user_keywords(user_id)
+    keywords = load_feed_keywords(user_id, feed_mode)
 
     if (
         feed_mode == "keywords"
@@ -352,162 +364,185 @@ def latest(
     ):
         return []
 
-    universe_filter = ""
+    sql, params = _build_feed_query(
+        where_sql,
+        limit,
+        offset,
+        user_id,
+        universe_id,
+        content_type,
+        feed_mode,
+        preferences,
+        keywords,
+        cursor,
+    )
 
-    if universe_id:
+    rows = query_bq(
+        sql,
+        {**params, **extra_params}
+    )
 
-        universe_filter = """
-        AND EXISTS (
-            SELECT 1
-            FROM UNNEST(c.universes) u
-            WHERE u.id_universe = @universe_id
-        )
-        """
+    context = (
+        get_user_context(user_id)
+        if user_id else None
+    )
 
-    preferences_filter = ""
+    return _map_feed_rows(rows, context)
 
-    if (
-        feed_mode == "mine"
-        and (
-            fav_companies
-            or fav_topics
-            or fav_solutions
-        )
-    ):
 
-        preferences_filter = (
-            build_preferences_filter()
-        )
+async def _arun_feed(
+    where_sql: str,
+    extra_params: Dict,
+    limit: int,
+    offset: int,
+    user_id: Optional[str],
+    universe_id: Optional[str],
+    content_type: Optional[str],
+    feed_mode: Optional[str],
+    cursor: Optional[str] = None,
+) -> List[Dict]:
 
-    keywords_filter = ""
+    from core.user.user_service import (
+        aget_user_context
+    )
+
+    # Préférences, keywords et contexte (langue) sont indépendants
+    preferences, keywords, context = await gather_bq(
+        arun_bq(load_user_preferences, user_id),
+        arun_bq(load_feed_keywords, user_id, feed_mode),
+        aget_user_context(user_id),
+    )
 
     if (
         feed_mode == "keywords"
-        and keywords
+        and not keywords
     ):
+        return []
 
-        keywords_filter = (
-            build_keywords_filter(
-                keywords
-            )
-        )
-
-    sql = f"""
-    SELECT
-        c.id_content AS id,
-
-        LOWER(
-            COALESCE(
-                c.content_type,
-                'ANALYSIS'
-            )
-        ) AS type,
-
-        c.id_primary_company,
-
-        c.title,
-        c.title_en,
-
-        c.excerpt,
-        c.excerpt_en,
-
-        c.content_body,
-
-        c.published_at,
-
-        c.topics,
-        c.universes,
-        c.companies,
-        c.solutions,
-        c.concepts,
-
-        c.source_id
-
-    FROM `{TABLE_CONTENT_ENRICHED}` c
-
-    WHERE c.published_at IS NOT NULL
-
-    {build_content_type_filter()}
-    {build_user_filter("c")}
-    {universe_filter}
-    {preferences_filter}
-    {keywords_filter}
-
-    ORDER BY published_at DESC
+    sql, params = _build_feed_query(
+        where_sql,
+        limit,
+        offset,
+        user_id,
+        universe_id,
+        content_type,
+        feed_mode,
+        preferences,
+        keywords,
+        cursor,
+    )
 
-    LIMIT @limit
-    OFFSET @offset
-    """
+    rows = await aquery_bq(
+        sql,
+        {**params, **extra_params}
+    )
 
-    params = {
-        "limit": limit,
-        "offset": offset,
+    return _map_feed_rows(rows, context)
 
-        "user_id": user_id,
 
-        "universe_id": universe_id,
+# ============================================================
+# SEARCH
+# ============================================================
 
-        "content_type": content_type,
+def search(
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+    user_id: Optional[str] = None,
+    universe_id: Optional[str] = None,
+    content_type: Optional[str] = None,
+    feed_mode: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> List[Dict]:
 
-        "fav_companies": fav_companies,
-        "fav_topics": fav_topics,
-        "fav_solutions": fav_solutions,
-    }
+    q = (q or "").strip()
 
-    # =====================================================
-    # KEYWORDS PARAMS
-    # =====================================================
+    return _run_feed(
+        SEARCH_WHERE,
+        {"query": q},
+        limit,
+        offset,
+        user_id,
+        universe_id,
+        content_type,
+        feed_mode,
+        cursor,
+    )
 
-    if (
-        feed_mode == "keywords"
-        and keywords
-    ):
 
-        for i, keyword in enumerate(keywords):
+async def asearch(
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+    user_id: Optional[str] = None,
+    universe_id: Optional[str] = None,
+    content_type: Optional[str] = None,
+    feed_mode: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> List[Dict]:
 
-            params[
-                f"keyword_{i}"
-            ] = keyword
+    q = (q or "").strip()
 
-    rows = query_bq(
-        sql,
-        params
+    return await _arun_feed(
+        SEARCH_WHERE,
+        {"query": q},
+        limit,
+        offset,
+        user_id,
+        universe_id,
+        content_type,
+        feed_mode,
+        cursor,
     )
 
-    mapped = [
-        _map_feed_row(r)
-        for r in rows
-    ]
-
-    from core.user.user_service import (
-        get_user_context
-    )
+# ============================================================
+# LATEST
+# ============================================================
 
-    context = (
-        get_user_context(user_id)
-        if user_id else None
-    )
+def latest(
+    limit: int = 20,
+    offset: int = 0,
+    user_id: Optional[str] = None,
+    universe_id: Optional[str] = None,
+    content_type: Optional[str] = None,
+    feed_mode: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> List[Dict]:
 
-    lang = (
-        context["lang"]
-        if context else "fr"
+    return _run_feed(
+        LATEST_WHERE,
+        {},
+        limit,
+        offset,
+        user_id,
+        universe_id,
+        content_type,
+        feed_mode,
+        cursor,
     )
 
-    if lang == "en":
-
-        for item in mapped:
 
-            item["title"] = (
-                item.get("title_en")
-                or item.get("title")
-            )
-
-            item["excerpt"] = (
-                item.get("excerpt_en")
-                or item.get("excerpt")
-            )
+async def alatest(
+    limit: int = 20,
+    offset: int = 0,
+    user_id: Optional[str] = None,
+    universe_id: Optional[str] = None,
+    content_type: Optional[str] = None,
+    feed_mode: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> List[Dict]:
 
-    return mapped
+    return await _arun_feed(
+        LATEST_WHERE,
+        {},
+        limit,
+        offset,
+        user_id,
+        universe_id,
+        content_type,
+        feed_mode,
+        cursor,
+    )
 
 
 # ============================================================
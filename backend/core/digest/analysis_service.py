@@ -39,6 +39,7 @@ def generate_digest_summary(
     result = run_llm(
         prompt=prompt,
         temperature=0.2,
+        cache=True,
     )
 
     return result or ""
@@ -71,6 +72,7 @@ def generate_digest_implications(
     result = run_llm(
         prompt=prompt,
         temperature=0.2,
+        cache=True,
     )
 
     return result or ""
@@ -13,14 +13,6 @@ from config import (
     BQ_DATASET,
 )
 
-from core.user.user_keyword_service import (
-    get_user_keywords,
-)
-
-from core.user.user_profile_service import (
-    get_user_profile,
-)
-
 # ============================================================
 # TABLES
 # ============================================================
@@ -189,27 +181,60 @@ def load_user_context(
     user_id: str,
 ) -> Dict[str, Any]:
 
-    user = load_user(
-        user_id
+    # Contexte et préférences servis par le cache utilisateur
+    # (une seule lecture BigQuery par TTL, invalidée à l'écriture)
+    from core.user.user_service import (
+        get_user_context,
+    )
+
+    from core.user.user_preferences_service import (
+        get_user_preferences_grouped,
     )
 
-    preferences = (
-        load_user_preferences(
+    context = (
+        get_user_context(
             user_id
         )
+        or {}
     )
 
-    keywords = (
-        get_user_keywords(
+    grouped = (
+        get_user_preferences_grouped(
             user_id
         )
+        or {}
+    )
+
+    user = (
+        {
+            "ID_USER": context.get("user_id"),
+            "EMAIL": context.get("email"),
+            "NAME": context.get("name"),
+            "COMPANY": context.get("company"),
+            "LANGUAGE": context.get("lang"),
+        }
+        if context
+        else {}
+    )
+
+    preferences = {
+        "companies":
+            grouped.get("COMPANY", []),
+
+        "solutions":
+            grouped.get("SOLUTION", []),
+
+        "topics":
+            grouped.get("TOPIC", []),
+    }
+
+    keywords = (
+        context.get("keywords")
         or []
     )
 
     profile = (
-        get_user_profile(
-            user_id
-        )
+        context.get("profile")
         or {}
     )
 
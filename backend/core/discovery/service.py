@@ -1,8 +1,14 @@
 from typing import List, Dict
 from datetime import datetime
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 
+import os
+import time
 import uuid
+import asyncio
+import hashlib
+import threading
 import requests
 
 from bs4 import BeautifulSoup
@@ -11,12 +17,17 @@ from config import BQ_PROJECT, BQ_DATASET
 
 from utils.bigquery_utils import (
     query_bq,
+    insert_bq,
+    aquery_bq,
+    arun_bq,
+    gather_bq,
     get_bigquery_client,
 )
 
 from core.content.raw_import_service import (
     parse_article_from_url,
     insert_raw_rows,
+    get_http_session,
 )
 
 from google.cloud import bigquery
@@ -52,6 +63,36 @@ HEADERS = {
     )
 }
 
+# Pages sources téléchargées en parallèle (toutes sources confondues)
+DISCOVERY_FETCH_CONCURRENCY = int(os.getenv("DISCOVERY_FETCH_CONCURRENCY", "16"))
+
+# Requêtes simultanées max vers un même hôte
+DISCOVERY_PER_HOST_LIMIT = int(os.getenv("DISCOVERY_PER_HOST_LIMIT", "2"))
+
+DISCOVERY_FETCH_TIMEOUT = 20
+
+# Validateurs HTTP (ETag / Last-Modified) par page source, pour les
+# requêtes conditionnelles du scan suivant (304 → rien à parser)
+_PAGE_VALIDATORS: Dict[str, Dict[str, str]] = {}
+_PAGE_VALIDATORS_LOCK = threading.Lock()
+
+_FETCH_EXECUTOR = None
+_FETCH_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_fetch_executor() -> ThreadPoolExecutor:
+
+    global _FETCH_EXECUTOR
+
+    with _FETCH_EXECUTOR_LOCK:
+        if _FETCH_EXECUTOR is None:
+            _FETCH_EXECUTOR = ThreadPoolExecutor(
+                max_workers=DISCOVERY_FETCH_CONCURRENCY,
+                thread_name_prefix="discovery-fetch",
+            )
+
+    return _FETCH_EXECUTOR
+
 
 # ============================================================
 # INSERT DISCOVERY
@@ -84,6 +125,39 @@ def insert_discovery_url(
     ).result()
 
 
+def insert_discovery_urls(
+    items: List[Dict],
+) -> int:
+    """
+    Insert groupé : un seul load job pour toutes les découvertes.
+    items : [{"source_id", "url", "title"}]
+    """
+
+    if not items:
+        return 0
+
+    now = datetime.utcnow().isoformat()
+
+    insert_bq(
+        TABLE_DISCOVERY,
+        [
+            {
+                "ID_DISCOVERY": str(uuid.uuid4()),
+                "SOURCE_ID": item["source_id"],
+                "URL": item["url"],
+                "TITLE": item["title"],
+                "STATUS": "NEW",
+                "DATE_FOUND": now,
+                "CREATED_AT": now,
+            }
+            for item in items
+        ],
+        mode="load",
+    )
+
+    return len(items)
+
+
 def get_existing_discovery_urls():
 
     sql = f"""
@@ -128,13 +202,24 @@ def extract_urls_from_page(
     response = requests.get(
         page_url,
         headers=HEADERS,
-        timeout=20,
+        timeout=DISCOVERY_FETCH_TIMEOUT,
     )
 
     response.raise_for_status()
 
-    soup = BeautifulSoup(
+    return extract_urls_from_html(
+        page_url,
         response.text,
+    )
+
+
+def extract_urls_from_html(
+    page_url: str,
+    html: str,
+) -> List[Dict]:
+
+    soup = BeautifulSoup(
+        html,
         "html.parser",
     )
 
@@ -243,77 +328,272 @@ def get_source_for_scan(
 
 
 # ============================================================
-# SCAN SOURCE
+# KNOWN URLS (set compact, chargé une fois par run)
 # ============================================================
 
-def scan_source(
-    source_id: str,
-):
+def url_key(url: str) -> bytes:
+    """
+    Empreinte 8 octets d'une URL : le set des URLs connues
+    tient en mémoire sans garder les chaînes complètes.
+    """
+    return hashlib.blake2b(
+        url.encode("utf-8"),
+        digest_size=8,
+    ).digest()
+
+
+async def load_known_url_keys() -> set:
+
+    discovery_rows, raw_rows = await gather_bq(
+        aquery_bq(f"""
+            SELECT DISTINCT URL
+            FROM `{TABLE_DISCOVERY}`
+            WHERE URL IS NOT NULL
+        """),
+        aquery_bq(f"""
+            SELECT DISTINCT SOURCE_URL AS URL
+            FROM `{TABLE_RAW}`
+            WHERE SOURCE_URL IS NOT NULL
+        """),
+    )
 
-    source = get_source_for_scan(
-        source_id
+    return {
+        url_key(r["URL"])
+        for r in (*discovery_rows, *raw_rows)
+        if r.get("URL")
+    }
+
+
+# ============================================================
+# ASYNC CRAWLER
+# ============================================================
+
+def _fetch_page(page_url: str) -> Dict:
+    """
+    GET conditionnel (If-None-Match / If-Modified-Since) sur la
+    session HTTP partagée. Retourne {"status": 200|304, "html", "validators"}.
+    """
+
+    with _PAGE_VALIDATORS_LOCK:
+        validators = dict(_PAGE_VALIDATORS.get(page_url, {}))
+
+    headers = {}
+
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = get_http_session().get(
+        page_url,
+        headers=headers,
+        timeout=DISCOVERY_FETCH_TIMEOUT,
     )
 
-    if not source:
-        raise Exception(
-            "Source introuvable"
+    if response.status_code == 304:
+        return {"status": 304, "html": None, "validators": None}
+
+    response.raise_for_status()
+
+    return {
+        "status": 200,
+        "html": response.text,
+        "validators": {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        },
+    }
+
+
+async def _scan_one(
+    source: Dict,
+    known_task: "asyncio.Future",
+    global_limit: asyncio.Semaphore,
+    host_limits: Dict[str, asyncio.Semaphore],
+    discoveries: List[Dict],
+    validators: Dict[str, Dict],
+) -> Dict:
+
+    source_id = source["SOURCE_ID"]
+    page_url = source.get("DOMAIN")
+
+    started = time.monotonic()
+
+    report = {
+        "source_id": source_id,
+        "name": source.get("NAME"),
+        "status": "ok",
+        "links": 0,
+        "discovered_urls": 0,
+    }
+
+    try:
+
+        if not page_url:
+            raise Exception("DOMAIN manquant")
+
+        host = urlparse(page_url).netloc.lower()
+        host_limit = host_limits.setdefault(
+            host,
+            asyncio.Semaphore(max(1, DISCOVERY_PER_HOST_LIMIT)),
         )
 
-    domain = source.get(
-        "DOMAIN"
-    )
+        loop = asyncio.get_running_loop()
 
-    if not domain:
-        raise Exception(
-            "DOMAIN manquant"
+        async with global_limit, host_limit:
+            page = await loop.run_in_executor(
+                _get_fetch_executor(),
+                _fetch_page,
+                page_url,
+            )
+
+        report["fetch_ms"] = round((time.monotonic() - started) * 1000)
+
+        if page["status"] == 304:
+            report["status"] = "not_modified"
+            return report
+
+        # parsing hors de la boucle d'événements
+        urls = await loop.run_in_executor(
+            _get_fetch_executor(),
+            extract_urls_from_html,
+            page_url,
+            page["html"],
         )
 
-    urls = extract_urls_from_page(
-        domain
-    )
+        report["links"] = len(urls)
 
-    # ============================================================
-    # 🔥 PERFORMANCE
-    # Charge une seule fois les URLs existantes
-    # ============================================================
+        known = await known_task
 
-    existing_discovery = (
-        get_existing_discovery_urls()
-    )
+        for item in urls:
 
-    existing_raw = (
-        get_existing_raw_urls()
-    )
+            key = url_key(item["url"])
 
-    discovered = 0
+            # le set est partagé : évite aussi les doublons entre sources
+            if key in known:
+                continue
 
-    for item in urls:
+            known.add(key)
 
-        url = item["url"]
+            discoveries.append({
+                "source_id": source_id,
+                "url": item["url"],
+                "title": item["title"],
+            })
 
-        if url in existing_discovery:
-            continue
+            report["discovered_urls"] += 1
+
+        if any(page["validators"].values()):
+            validators[page_url] = page["validators"]
+
+    except Exception as e:
+
+        print("[DISCOVERY]", source_id, e)
+
+        report["status"] = "error"
+        report["error"] = str(e)
+
+    finally:
+        report["elapsed_ms"] = round((time.monotonic() - started) * 1000)
+
+    return report
 
-        if url in existing_raw:
-            continue
 
-        insert_discovery_url(
-            source_id=source_id,
-            url=url,
-            title=item["title"],
+async def crawl_sources(
+    sources: List[Dict],
+) -> Dict:
+    """
+    Scan concurrent des pages sources :
+    - URLs connues (discovery + raw) chargées une fois, en parallèle
+    - téléchargements concurrents bornés globalement et par hôte
+    - toutes les découvertes écrites en un seul insert
+    """
+
+    started = time.monotonic()
+
+    # le chargement des URLs connues se fait pendant les téléchargements
+    known_task = asyncio.ensure_future(load_known_url_keys())
+
+    global_limit = asyncio.Semaphore(max(1, DISCOVERY_FETCH_CONCURRENCY))
+    host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    discoveries: List[Dict] = []
+    validators: Dict[str, Dict] = {}
+
+    reports = await asyncio.gather(*(
+        _scan_one(
+            source,
+            known_task,
+            global_limit,
+            host_limits,
+            discoveries,
+            validators,
         )
+        for source in sources
+    ))
+
+    # remonte l'erreur de chargement : sans set, pas d'insert
+    known = await known_task
 
-        # évite les doublons dans le même scan
-        existing_discovery.add(url)
+    insert_ms = None
 
-        discovered += 1
+    if discoveries:
+        insert_started = time.monotonic()
+        await arun_bq(insert_discovery_urls, discoveries)
+        insert_ms = round((time.monotonic() - insert_started) * 1000)
+
+    # validateurs enregistrés seulement une fois les découvertes écrites :
+    # un run en échec ne masque pas les liens au scan suivant (304)
+    with _PAGE_VALIDATORS_LOCK:
+        _PAGE_VALIDATORS.update(validators)
 
     return {
         "status": "ok",
-        "scanned_sources": 1,
-        "discovered_urls": discovered,
+        "scanned_sources": len(sources),
+        "discovered_urls": len(discoveries),
+        "errors": sum(1 for r in reports if r["status"] == "error"),
+        "not_modified": sum(1 for r in reports if r["status"] == "not_modified"),
+        "known_urls": len(known),
+        "insert_ms": insert_ms,
+        "elapsed_ms": round((time.monotonic() - started) * 1000),
+        "sources": reports,
     }
 
+
+# ============================================================
+# SCAN SOURCE
+# ============================================================
+
+def scan_source(
+    source_id: str,
+):
+
+    source = get_source_for_scan(
+        source_id
+    )
+
+    if not source:
+        raise Exception(
+            "Source introuvable"
+        )
+
+    if not source.get("DOMAIN"):
+        raise Exception(
+            "DOMAIN manquant"
+        )
+
+    result = asyncio.run(
+        crawl_sources([source])
+    )
+
+    report = result["sources"][0]
+
+    if report["status"] == "error":
+        raise Exception(report["error"])
+
+    return result
+
 # ============================================================
 # SCAN ALL SOURCES
 # ============================================================
@@ -322,7 +602,9 @@ def scan_all_sources():
 
     sql = f"""
         SELECT
-            SOURCE_ID
+            SOURCE_ID,
+            NAME,
+            DOMAIN
         FROM `{TABLE_SOURCE}`
         WHERE DOMAIN IS NOT NULL
           AND DOMAIN != ''
@@ -331,33 +613,9 @@ def scan_all_sources():
 
     rows = query_bq(sql)
 
-    total_discovered = 0
-
-    for row in rows:
-
-        try:
-
-            result = scan_source(
-                row["SOURCE_ID"]
-            )
-
-            total_discovered += result[
-                "discovered_urls"
-            ]
-
-        except Exception as e:
-
-            print(
-                "[DISCOVERY]",
-                row["SOURCE_ID"],
-                e,
-            )
-
-    return {
-        "status": "ok",
-        "scanned_sources": len(rows),
-        "discovered_urls": total_discovered,
-    }
+    return asyncio.run(
+        crawl_sources(rows)
+    )
 
 # ============================================================
 # LIST DISCOVERY
@@ -2,6 +2,7 @@ from typing import List, Dict, Optional
 
 from config import BQ_PROJECT, BQ_DATASET
 from utils.bigquery_utils import query_bq
+from utils.pagination import seek_clause
 
 from core.user.user_service import get_user_context
 from core.user.user_preferences_service import get_user_preferences_grouped
@@ -30,10 +31,24 @@ def search_text(
     query: str,
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = None,
 ) -> List[Dict]:
+    """
+    cursor : next_cursor de la page précédente (utils.pagination,
+    sur PUBLISHED_AT / id) ; remplace l'offset pour le scroll infini.
+    """
 
     query = query.strip()
 
+    params = {
+        "query": query,
+        "limit": limit,
+        "offset": 0 if cursor else offset,
+    }
+
+    news_seek = seek_clause("n.PUBLISHED_AT", "n.ID_NEWS", cursor, params)
+    content_seek = seek_clause("c.PUBLISHED_AT", "c.ID_CONTENT", cursor, params)
+
     sql = f"""
     SELECT
         n.ID_NEWS as id,
@@ -46,6 +61,7 @@ def search_text(
     FROM `{TABLE_NEWS}` n
     WHERE n.STATUS = 'PUBLISHED'
       AND SEARCH(n, @query)
+      {news_seek}
 
     UNION ALL
 
@@ -61,17 +77,14 @@ def search_text(
     WHERE c.STATUS = 'PUBLISHED'
       AND c.IS_ACTIVE = TRUE
       AND SEARCH(c, @query)
+      {content_seek}
 
-    ORDER BY PUBLISHED_AT DESC
+    ORDER BY PUBLISHED_AT DESC, id DESC
     LIMIT @limit
     OFFSET @offset
     """
 
-    return query_bq(sql, {
-        "query": query,
-        "limit": limit,
-        "offset": offset,
-    })
+    return query_bq(sql, params)
 
 
 # ============================================================
@@ -85,6 +98,7 @@ def search_filters(
     news_types: Optional[List[str]] = None,
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = None,
 ) -> List[Dict]:
 
     # 🔥 NORMALISATION SIMPLE ET SAFE
@@ -109,6 +123,18 @@ def search_filters(
     solution_ids = clean(solution_ids)
     news_types = clean(news_types)
 
+    params = {
+        "topic_ids": topic_ids,
+        "company_ids": company_ids,
+        "solution_ids": solution_ids,
+        "news_types": news_types,
+        "limit": limit,
+        "offset": 0 if cursor else offset,
+    }
+
+    news_seek = seek_clause("n.PUBLISHED_AT", "n.ID_NEWS", cursor, params)
+    content_seek = seek_clause("c.PUBLISHED_AT", "c.ID_CONTENT", cursor, params)
+
     sql = f"""
     SELECT
         n.ID_NEWS as id,
@@ -123,6 +149,7 @@ def search_filters(
 
     AND (@news_types IS NULL OR n.NEWS_TYPE IN UNNEST(@news_types))
     AND (@company_ids IS NULL OR n.ID_COMPANY IN UNNEST(@company_ids))
+    {news_seek}
 
     AND (
         @topic_ids IS NULL OR EXISTS (
@@ -155,6 +182,7 @@ def search_filters(
     FROM `{TABLE_CONTENT}` c
     WHERE c.STATUS = 'PUBLISHED'
       AND c.IS_ACTIVE = TRUE
+      {content_seek}
 
     AND (
         @company_ids IS NULL OR EXISTS (
@@ -183,19 +211,12 @@ def search_filters(
         )
     )
 
-    ORDER BY PUBLISHED_AT DESC
+    ORDER BY PUBLISHED_AT DESC, id DESC
     LIMIT @limit
     OFFSET @offset
     """
 
-    return query_bq(sql, {
-        "topic_ids": topic_ids,
-        "company_ids": company_ids,
-        "solution_ids": solution_ids,
-        "news_types": news_types,
-        "limit": limit,
-        "offset": offset,
-    })
+    return query_bq(sql, params)
 
 
 # ============================================================
@@ -296,6 +317,7 @@ def get_feed_for_user(
     solution_ids=None,
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = None,
 ):
 
     # --------------------------------------------------------
@@ -325,6 +347,7 @@ def get_feed_for_user(
         solution_ids=final_solution_ids,
         limit=limit,
         offset=offset,
+        cursor=cursor,
     )
 
     # --------------------------------------------------------
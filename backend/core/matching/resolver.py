@@ -1,3 +1,4 @@
+import os
 import re
 from typing import Dict, List, Optional
 
@@ -6,6 +7,7 @@ from config import BQ_PROJECT, BQ_DATASET
 from utils.bigquery_utils import (
     query_bq,
 )
+from utils.ttl_cache import CachedValue
 
 # ============================================================
 # TABLES
@@ -23,6 +25,15 @@ TABLE_ALIAS_REJECTED = (
     f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_ALIAS_REJECTED"
 )
 
+# ============================================================
+# CONFIG
+# ============================================================
+# Index d'alias en mémoire (alias normalisé → entité) partagé par
+# les résolutions : rechargé au TTL ou après invalidation par les
+# chemins d'écriture (match, ajout / suppression d'alias, rejet).
+
+ALIAS_INDEX_TTL_SECONDS = float(os.getenv("ALIAS_INDEX_TTL_SECONDS", "600"))
+
 # ============================================================
 # NORMALIZE
 # ============================================================
@@ -65,7 +76,7 @@ def normalize(
 # COMPANY ALIAS MAP
 # ============================================================
 
-def get_company_alias_map() -> Dict:
+def load_company_alias_map() -> Dict:
 
     rows = query_bq(
         f"""
@@ -105,7 +116,7 @@ def get_company_alias_map() -> Dict:
 # SOLUTION ALIAS MAP
 # ============================================================
 
-def get_solution_alias_map() -> Dict:
+def load_solution_alias_map() -> Dict:
 
     rows = query_bq(
         f"""
@@ -145,7 +156,7 @@ def get_solution_alias_map() -> Dict:
 # REJECTED ALIAS SET
 # ============================================================
 
-def get_rejected_alias_set():
+def load_rejected_alias_set() -> set:
 
     rows = query_bq(
         f"""
@@ -164,6 +175,75 @@ def get_rejected_alias_set():
         if row.get("ALIAS")
     }
 # ============================================================
+# ALIAS INDEX (in-process, versionné)
+# ============================================================
+
+def _load_alias_index() -> Dict:
+    return {
+        "company": load_company_alias_map(),
+        "solution": load_solution_alias_map(),
+        "rejected": frozenset(load_rejected_alias_set()),
+    }
+
+
+# index précédent servi tant que BigQuery est indisponible
+_INDEX = CachedValue(
+    _load_alias_index,
+    ALIAS_INDEX_TTL_SECONDS,
+    name="ALIAS INDEX",
+)
+
+
+def get_alias_index() -> Dict:
+    """
+    Instantané cohérent de l'index :
+    {"company", "solution", "rejected"}.
+    Les structures sont partagées : ne pas les modifier.
+    """
+    return dict(_INDEX.get())
+
+
+def invalidate_alias_index() -> None:
+    """
+    À appeler par tout chemin d'écriture sur les alias / rejets.
+    """
+    _INDEX.invalidate()
+
+
+def _index_add_rejected(normalized: str) -> None:
+
+    _INDEX.update(
+        lambda index: index and {
+            **index,
+            "rejected": index["rejected"] | {normalized},
+        }
+    )
+
+
+def get_alias_index_stats() -> Dict:
+
+    index = _INDEX.peek() or {}
+
+    return {
+        **_INDEX.stats(),
+        "companies": len(index.get("company") or {}),
+        "solutions": len(index.get("solution") or {}),
+        "rejected": len(index.get("rejected") or ()),
+    }
+
+
+def get_company_alias_map() -> Dict:
+    return get_alias_index()["company"]
+
+
+def get_solution_alias_map() -> Dict:
+    return get_alias_index()["solution"]
+
+
+def get_rejected_alias_set():
+    return get_alias_index()["rejected"]
+
+# ============================================================
 # IS REJECTED
 # ============================================================
 
@@ -255,28 +335,8 @@ def insert_rejected_alias(
         alias
     )
 
-    existing = query_bq(
-        f"""
-        SELECT 1
-
-        FROM `{TABLE_ALIAS_REJECTED}`
-
-        WHERE UPPER(
-            REGEXP_REPLACE(
-                REPLACE(ALIAS, '+', ' PLUS '),
-                r'[^A-Z0-9 ]',
-                ' '
-            )
-        ) = @normalized
-
-        LIMIT 1
-        """,
-        {
-            "normalized": normalized,
-        }
-    )
-
-    if existing:
+    # existence vérifiée dans l'index (plus de scan REGEXP de la table)
+    if normalized in get_rejected_alias_set():
         return
 
     query_bq(
@@ -305,25 +365,48 @@ def insert_rejected_alias(
         }
     )
 
+    _index_add_rejected(
+        normalized
+    )
+
 # ============================================================
 # RESOLVE ENTITIES
 # ============================================================
 
 def resolve_entities(
     raw_values: List[str],
+    company_map: Optional[Dict] = None,
+    solution_map: Optional[Dict] = None,
+    rejected_set: Optional[set] = None,
 ):
 
-    company_map = (
-        get_company_alias_map()
-    )
+    # un seul instantané de l'index pour toute la résolution
 
-    solution_map = (
-        get_solution_alias_map()
-    )
+    if (
+        company_map is None
+        or solution_map is None
+        or rejected_set is None
+    ):
 
-    rejected_set = (
-        get_rejected_alias_set()
-    )
+        index = get_alias_index()
+
+        company_map = (
+            index["company"]
+            if company_map is None
+            else company_map
+        )
+
+        solution_map = (
+            index["solution"]
+            if solution_map is None
+            else solution_map
+        )
+
+        rejected_set = (
+            index["rejected"]
+            if rejected_set is None
+            else rejected_set
+        )
 
     companies = []
     solutions = []
@@ -437,3 +520,56 @@ def resolve_entities(
         "solutions": solutions,
         "unmatched": unmatched,
     }
+
+# ============================================================
+# BATCH RESOLVE
+# ============================================================
+
+def resolve_entities_batch(
+    raw_lists: List[List[str]],
+) -> List[Dict]:
+    """
+    Résolution d'un lot (ex. acteurs de tout un batch de destock) :
+    un seul instantané de l'index, aucune requête BigQuery s'il est chaud.
+    """
+
+    index = get_alias_index()
+
+    return [
+        resolve_entities(
+            raw_values or [],
+            company_map=index["company"],
+            solution_map=index["solution"],
+            rejected_set=index["rejected"],
+        )
+        for raw_values in raw_lists
+    ]
+
+
+def lookup_aliases(
+    raw_values: List[str],
+) -> Dict[str, Dict]:
+    """
+    Lookup groupé : raw → {"normalized", "rejected", "company", "solution"}.
+    """
+
+    index = get_alias_index()
+
+    output = {}
+
+    for raw in raw_values:
+
+        if not raw or raw in output:
+            continue
+
+        normalized = normalize(raw)
+
+        output[raw] = {
+            "normalized": normalized,
+            "rejected": normalized in index["rejected"],
+            "company": index["company"].get(normalized),
+            "solution": index["solution"].get(normalized),
+        }
+
+    return output
+
@@ -12,6 +12,7 @@ from utils.bigquery_utils import (
 from core.matching.resolver import (
     normalize,
     insert_rejected_alias,
+    invalidate_alias_index,
     TABLE_ALIAS_REJECTED,
 )
 
@@ -344,6 +345,8 @@ def match_entity(
             ),
         ).result()
 
+        invalidate_alias_index()
+
         print(
             "✅ ENTITY MATCHED TO COMPANY:",
             {
@@ -411,6 +414,8 @@ def match_entity(
             ),
         ).result()
 
+        invalidate_alias_index()
+
         print(
             "✅ ENTITY MATCHED TO SOLUTION:",
             {
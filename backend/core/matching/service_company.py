@@ -15,6 +15,7 @@ from core.matching.service_solution import (
 from core.matching.resolver import (
     normalize,
     insert_rejected_alias,
+    invalidate_alias_index,
     TABLE_ALIAS_REJECTED,
 )
 
@@ -347,6 +348,8 @@ def match_company(data: CompanyMatch):
         ),
     ).result()
 
+    invalidate_alias_index()
+
     print(
         "✅ COMPANY MATCHED:",
         {
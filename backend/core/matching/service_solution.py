@@ -14,6 +14,7 @@ from api.matching.models import (
 from core.matching.resolver import (
     normalize,
     insert_rejected_alias,
+    invalidate_alias_index,
     TABLE_ALIAS_REJECTED,
 )
 
@@ -308,6 +309,8 @@ def match_solution(data: SolutionMatch):
         ),
     ).result()
 
+    invalidate_alias_index()
+
     print(
         "✅ SOLUTION MATCHED:",
         {
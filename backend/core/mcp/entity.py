@@ -1,8 +1,35 @@
 # core/mcp/entity.py
 
+import os
+import re
 import unicodedata
-from functools import lru_cache
+from collections import defaultdict
+from typing import Dict, List, Optional
+
 from utils.bigquery_utils import query_bq
+from utils.ttl_cache import CachedValue
+
+
+# ============================================================
+# CONFIG
+# ============================================================
+# Index construit une fois par TTL (et non à chaque requête MCP) :
+# - index inversé token → noms (match strict historique)
+# - index de trigrammes → noms (candidats approchés, scorés)
+
+# même dataset que les handlers MCP (core/mcp/handlers/*)
+TABLE_TOPIC = "adex-5555.RATECARD_PROD.RATECARD_TOPIC"
+TABLE_COMPANY = "adex-5555.RATECARD_PROD.RATECARD_COMPANY"
+
+MCP_ENTITY_INDEX_TTL_SECONDS = float(os.getenv("MCP_ENTITY_INDEX_TTL_SECONDS", "900"))
+
+# Similarité minimale du fallback approché (Dice sur trigrammes,
+# token à token). 0.75 : pluriels / doubles lettres des noms de 6+
+# caractères acceptés ; "orangeade" ≠ "Orange" (0.67), "havasu" ≠
+# "Havas" (0.73), "range" ≠ "Orange" (0.73).
+MCP_ENTITY_FUZZY_THRESHOLD = float(os.getenv("MCP_ENTITY_FUZZY_THRESHOLD", "0.75"))
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
 
 
 # ============================================================
@@ -16,51 +43,222 @@ def normalize(text: str) -> str:
         .lower()
 
 
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def _trigrams(tokens: List[str]) -> set:
+
+    grams = set()
+
+    for token in tokens:
+        padded = f" {token} "
+        grams.update(
+            padded[i:i + 3]
+            for i in range(len(padded) - 2)
+        )
+
+    return grams
+
+
+def _dice(a: set, b: set) -> float:
+
+    if not a or not b:
+        return 0.0
+
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
 # ============================================================
-# CACHE (CRITIQUE)
+# INDEX
 # ============================================================
 
-@lru_cache(maxsize=1)
-def _get_topics():
-    rows = query_bq("""
-        SELECT LABEL
-        FROM `adex-5555.RATECARD_PROD.RATECARD_TOPIC`
-    """)
-    return [r["LABEL"] for r in rows if r.get("LABEL")]
+class EntityIndex:
 
+    def __init__(self, labels: List[str]):
 
-@lru_cache(maxsize=1)
-def _get_companies():
-    rows = query_bq("""
-        SELECT NAME
-        FROM `adex-5555.RATECARD_PROD.RATECARD_COMPANY`
-    """)
-    return [r["NAME"] for r in rows if r.get("NAME")]
+        self.labels: List[str] = []
+        self.token_counts: List[int] = []
+        self.token_grams: List[List[set]] = []
+
+        self.tokens: Dict[str, List[int]] = defaultdict(list)
+        self.grams: Dict[str, List[int]] = defaultdict(list)
+
+        seen = set()
+
+        for label in labels:
+
+            tokens = set(tokenize(label))
+
+            if not tokens or label in seen:
+                continue
+
+            seen.add(label)
+
+            entry_id = len(self.labels)
+            token_grams = [_trigrams([t]) for t in sorted(tokens)]
+
+            self.labels.append(label)
+            self.token_counts.append(len(tokens))
+            self.token_grams.append(token_grams)
+
+            for token in tokens:
+                self.tokens[token].append(entry_id)
+
+            for gram in set().union(*token_grams):
+                self.grams[gram].append(entry_id)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def match_tokens(self, q_tokens: set) -> Optional[str]:
+        """
+        Match strict : tous les tokens du nom sont dans la requête ;
+        le nom le plus long l'emporte (à égalité, le premier chargé).
+        """
+
+        hits: Dict[int, int] = defaultdict(int)
+
+        for token in q_tokens:
+            for entry_id in self.tokens.get(token, ()):
+                hits[entry_id] += 1
+
+        best_id = None
+        best_score = 0
+
+        for entry_id, score in hits.items():
+
+            if score < self.token_counts[entry_id]:
+                continue
+
+            if (
+                score > best_score
+                or (score == best_score and entry_id < best_id)
+            ):
+                best_id = entry_id
+                best_score = score
+
+        return self.labels[best_id] if best_id is not None else None
+
+    def _score(self, entry_id: int, q_grams: List[set]) -> float:
+        """
+        Chaque token du nom est comparé (Dice) au token de la requête
+        le plus proche ; moyenne pondérée par la taille des tokens.
+        Symétrique : un token plus long ("orangeade") est pénalisé
+        autant qu'un token tronqué.
+        """
+
+        total = 0
+        score = 0.0
+
+        for grams in self.token_grams[entry_id]:
+            total += len(grams)
+            score += len(grams) * max(
+                (_dice(grams, q) for q in q_grams),
+                default=0.0,
+            )
+
+        return score / total if total else 0.0
+
+    def search(self, q_tokens: List[str], limit: int = 5) -> List[Dict]:
+        """
+        Candidats (au moins un trigramme commun) classés par similarité
+        token à token (1.0 = tous les tokens du nom présents à l'identique).
+        """
+
+        q_grams = [_trigrams([t]) for t in set(q_tokens)]
+
+        candidates = {
+            entry_id
+            for grams in q_grams
+            for gram in grams
+            for entry_id in self.grams.get(gram, ())
+        }
+
+        ranked = sorted(
+            (
+                (self._score(entry_id, q_grams), self.token_counts[entry_id], -entry_id)
+                for entry_id in candidates
+            ),
+            reverse=True,
+        )
+
+        return [
+            {
+                "label": self.labels[-neg_id],
+                "score": round(score, 3),
+            }
+            for score, _, neg_id in ranked[:limit]
+        ]
 
 
 # ============================================================
-# TOKEN MATCH (AMÉLIORÉ)
+# CACHE (TTL)
 # ============================================================
 
-def _token_match(q: str, candidates):
+def _load_labels(table: str, column: str) -> List[str]:
+
+    rows = query_bq(f"""
+        SELECT {column}
+        FROM `{table}`
+        WHERE {column} IS NOT NULL
+    """)
+
+    return [r[column] for r in rows if r.get(column)]
+
+
+def _load_entity_indexes() -> Dict:
+    return {
+        "company": EntityIndex(_load_labels(TABLE_COMPANY, "NAME")),
+        "topic": EntityIndex(_load_labels(TABLE_TOPIC, "LABEL")),
+    }
 
-    q_tokens = set(q.split())
 
-    best_match = None
-    best_score = 0
+# index précédent conservé si BigQuery est indisponible
+_INDEXES = CachedValue(
+    _load_entity_indexes,
+    MCP_ENTITY_INDEX_TTL_SECONDS,
+    name="MCP ENTITY INDEX",
+)
 
-    for c in candidates:
-        c_norm = normalize(c)
-        c_tokens = set(c_norm.split())
 
-        score = len(q_tokens & c_tokens)
+def get_entity_indexes() -> Dict:
+    return dict(_INDEXES.get())
 
-        # 🔥 score strict → évite faux positifs
-        if score > best_score and score >= len(c_tokens):
-            best_score = score
-            best_match = c
 
-    return best_match if best_score > 0 else None
+def invalidate_entity_indexes() -> None:
+    _INDEXES.invalidate()
+
+
+def _get_topics():
+    return get_entity_indexes()["topic"].labels
+
+
+def _get_companies():
+    return get_entity_indexes()["company"].labels
+
+
+# ============================================================
+# CANDIDATES
+# ============================================================
+
+def search_entities(query: str, limit: int = 5) -> List[Dict]:
+    """
+    Candidats sociétés + topics classés par score.
+    """
+
+    q_tokens = tokenize(query)
+    indexes = get_entity_indexes()
+
+    candidates = [
+        {"type": entity_type, **c}
+        for entity_type in ("company", "topic")
+        for c in indexes[entity_type].search(q_tokens, limit)
+    ]
+
+    candidates.sort(key=lambda c: c["score"], reverse=True)
+
+    return candidates[:limit]
 
 
 # ============================================================
@@ -84,32 +282,50 @@ def resolve_entity(query: str):
     if "dooh" in q:
         return {"type": "topic", "label": "DOOH"}
 
+    q_tokens = tokenize(query)
+    indexes = get_entity_indexes()
+
     # --------------------------------------------------
     # 🟢 COMPANY FIRST (FIX CRITIQUE)
     # --------------------------------------------------
 
-    companies = _get_companies()
-    company_match = _token_match(q, companies)
+    company_match = indexes["company"].match_tokens(set(q_tokens))
 
     if company_match:
         return {
             "type": "company",
-            "label": company_match
+            "label": company_match,
+            "score": 1.0,
         }
 
     # --------------------------------------------------
     # 🔵 TOPIC MATCH
     # --------------------------------------------------
 
-    topics = _get_topics()
-    topic_match = _token_match(q, topics)
+    topic_match = indexes["topic"].match_tokens(set(q_tokens))
 
     if topic_match:
         return {
             "type": "topic",
-            "label": topic_match
+            "label": topic_match,
+            "score": 1.0,
         }
 
+    # --------------------------------------------------
+    # 🟡 FUZZY (fautes de frappe, pluriels…)
+    # --------------------------------------------------
+
+    for entity_type in ("company", "topic"):
+
+        candidates = indexes[entity_type].search(q_tokens, limit=1)
+
+        if candidates and candidates[0]["score"] >= MCP_ENTITY_FUZZY_THRESHOLD:
+            return {
+                "type": entity_type,
+                "label": candidates[0]["label"],
+                "score": candidates[0]["score"],
+            }
+
     # --------------------------------------------------
     # 🔴 FALLBACK
     # --------------------------------------------------
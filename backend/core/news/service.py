@@ -12,6 +12,11 @@ from utils.bigquery_utils import (
 )
 
 from api.news.models import NewsCreate, NewsUpdate
+from utils.http_cache import invalidate_http_cache
+from core.news.stats_service import (
+    get_public_stats_snapshot,
+    schedule_public_stats_refresh,
+)
 
 
 # ============================================================
@@ -556,6 +561,8 @@ def update_news(id_news: str, data: NewsUpdate):
                 [{"ID_NEWS": id_news, "ID_SOLUTION": sid} for sid in data.solutions],
             )
 
+    invalidate_http_cache("news")
+
     return True
 
 
@@ -568,6 +575,7 @@ def archive_news(id_news: str):
         fields={"STATUS": "ARCHIVED"},
         where={"ID_NEWS": id_news},
     )
+    invalidate_http_cache("news")
     return True
 
 
@@ -589,6 +597,10 @@ def delete_news(news_id: str):
 
     for q in queries:
         client.query(q, job_config=job_config).result()
+
+    invalidate_http_cache("news")
+
+
 # ============================================================
 # PUBLISH
 # ============================================================
@@ -722,11 +734,37 @@ def publish_news(id_news: str, published_at: Optional[str] = None):
         except Exception as e:
             print("❌ VECTORISATION ERROR:", str(e))
 
+        # stats publiques recalculées hors requête
+        schedule_public_stats_refresh("publish_news")
+
+    invalidate_http_cache("news")
+
     return status
 # ============================================================
 # SEARCH SIGNAUX — FLUX UNIQUEMENT
 # ============================================================
 
+# Emplacement sponsorisé : partenaires les plus récents du même flux
+BREVES_SPONSORISED_LIMIT = 3
+
+
+def _map_breve_row(r: dict) -> dict:
+    return {
+        "id": r.get("id_news"),
+        "title": r.get("title"),
+        "excerpt": r.get("excerpt"),
+        "published_at": r.get("published_at"),
+        "news_type": r.get("news_type"),
+        "news_kind": r.get("news_kind"),  # 🔑 IMPORTANT
+        "company": {
+            "id_company": r.get("id_company"),
+            "name": r.get("company_name"),
+            "is_partner": bool(r.get("is_partner")),
+        },
+        "topics": r.get("topics", []) or [],
+    }
+
+
 def search_breves_public(
     topics: Optional[List[str]] = None,
     news_types: Optional[List[str]] = None,
@@ -740,9 +778,13 @@ def search_breves_public(
     - les actualités partenaires (sponsorised)
 
     Aucun calcul de stats ici.
+    Mise en cache : au niveau HTTP (route /breves/search, tag "news").
     """
 
-    params = {"limit": limit}
+    params = {
+        "limit": limit,
+        "sponsor_limit": BREVES_SPONSORISED_LIMIT,
+    }
     where_clauses = ["status = 'PUBLISHED'"]
 
     # =====================================================
@@ -776,88 +818,70 @@ def search_breves_public(
     where_sql = " AND ".join(where_clauses)
 
     # =====================================================
-    # ITEMS
+    # ITEMS + SPONSORISED (1 SCAN)
     # =====================================================
+    # feed_rank    : rang dans le flux principal
+    # partner_rank : rang parmi les partenaires (is_partner = TRUE)
 
-    sql_items = f"""
-        SELECT
-            id_news,
-            title,
-            excerpt,
-            published_at,
-            news_type,
-            news_kind,
-            id_company,
-            company_name,
-            is_partner,
-            topics
-        FROM `{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_ENRICHED`
-        WHERE {where_sql}
-        ORDER BY published_at DESC
-        LIMIT @limit
+    sql = f"""
+        WITH filtered AS (
+            SELECT
+                id_news,
+                title,
+                excerpt,
+                published_at,
+                news_type,
+                news_kind,
+                id_company,
+                company_name,
+                is_partner,
+                topics
+            FROM `{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_ENRICHED`
+            WHERE {where_sql}
+        ),
+
+        ranked AS (
+            SELECT
+                *,
+                ROW_NUMBER() OVER (
+                    ORDER BY published_at DESC, id_news DESC
+                ) AS feed_rank,
+                ROW_NUMBER() OVER (
+                    PARTITION BY is_partner
+                    ORDER BY published_at DESC, id_news DESC
+                ) AS partner_rank
+            FROM filtered
+        )
+
+        SELECT *
+        FROM ranked
+        WHERE feed_rank <= @limit
+           OR (is_partner = TRUE AND partner_rank <= @sponsor_limit)
+        ORDER BY feed_rank
     """
 
-    rows = query_bq(sql_items, params)
+    rows = query_bq(sql, params)
 
     items = [
-        {
-            "id": r.get("id_news"),
-            "title": r.get("title"),
-            "excerpt": r.get("excerpt"),
-            "published_at": r.get("published_at"),
-            "news_type": r.get("news_type"),
-            "news_kind": r.get("news_kind"),  # 🔑 IMPORTANT
-            "company": {
-                "id_company": r.get("id_company"),
-                "name": r.get("company_name"),
-                "is_partner": bool(r.get("is_partner")),
-            },
-            "topics": r.get("topics", []) or [],
-        }
+        _map_breve_row(r)
         for r in rows
+        if r["feed_rank"] <= limit
     ]
 
     # =====================================================
     # SPONSORISED (PARTENAIRES UNIQUEMENT)
     # =====================================================
 
-    sql_sponsorised = f"""
-        SELECT
-            id_news,
-            title,
-            excerpt,
-            published_at,
-            news_type,
-            news_kind,
-            id_company,
-            company_name,
-            is_partner,
-            topics
-        FROM `{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_ENRICHED`
-        WHERE {where_sql}
-          AND is_partner = TRUE
-        ORDER BY published_at DESC
-        LIMIT 3
-    """
-
-    sponsor_rows = query_bq(sql_sponsorised, params)
-
     sponsorised = [
-        {
-            "id": r.get("id_news"),
-            "title": r.get("title"),
-            "excerpt": r.get("excerpt"),
-            "published_at": r.get("published_at"),
-            "news_type": r.get("news_type"),
-            "news_kind": r.get("news_kind"),  # 🔑 IMPORTANT
-            "company": {
-                "id_company": r.get("id_company"),
-                "name": r.get("company_name"),
-                "is_partner": True,
-            },
-            "topics": r.get("topics", []) or [],
-        }
-        for r in sponsor_rows
+        _map_breve_row(r)
+        for r in sorted(
+            (
+                r for r in rows
+                if r.get("is_partner") is True
+                and r["partner_rank"] <= BREVES_SPONSORISED_LIMIT
+            ),
+            key=lambda r: r["partner_rank"],
+        )
     ]
 
     return {
@@ -872,154 +896,11 @@ def search_breves_public(
 # ============================================================
 
 def get_breves_stats_public():
+    """
+    Stats publiques servies depuis le snapshot (core.news.stats_service).
+    """
 
-    # =====================================================
-    # GLOBAL
-    # =====================================================
-
-    global_rows = query_bq(f"""
-        SELECT *
-        FROM `{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_STATS_GLOBAL`
-    """)
-
-    if global_rows:
-        g = global_rows[0]
-        total_count = g.get("TOTAL", 0) or 0
-        last_7 = g.get("LAST_7_DAYS", 0) or 0
-        last_30 = g.get("LAST_30_DAYS", 0) or 0
-    else:
-        total_count = 0
-        last_7 = 0
-        last_30 = 0
-
-    # =====================================================
-    # TYPES
-    # =====================================================
-
-    types_rows = query_bq(f"""
-        SELECT *
-        FROM `{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_STATS_TYPE`
-        ORDER BY TOTAL DESC
-    """)
-
-    types_stats = [
-        {
-            "news_type": r.get("NEWS_TYPE"),
-            "total": r.get("TOTAL", 0) or 0,
-            "last_7_days": r.get("LAST_7_DAYS", 0) or 0,
-            "last_30_days": r.get("LAST_30_DAYS", 0) or 0,
-        }
-        for r in types_rows
-    ]
-
-    # =====================================================
-    # TOPICS
-    # =====================================================
-
-    topics_rows = query_bq(f"""
-        SELECT *
-        FROM `{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_STATS_TOPIC`
-        ORDER BY TOTAL DESC
-    """)
-
-    topics_stats = [
-        {
-            "id_topic": r.get("ID_TOPIC"),
-            "label": r.get("LABEL"),
-            "total": r.get("TOTAL", 0) or 0,
-            "last_7_days": r.get("LAST_7_DAYS", 0) or 0,
-            "last_30_days": r.get("LAST_30_DAYS", 0) or 0,
-        }
-        for r in topics_rows
-        if r.get("ID_TOPIC") and r.get("LABEL")
-    ]
-
-    # =====================================================
-    # COMPANIES (NEWS + CONTENT MERGE)
-    # =====================================================
-
-    # --- NEWS ---
-    news_rows = query_bq(f"""
-        SELECT *
-        FROM `{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_STATS_COMPANY`
-    """)
-
-    # --- CONTENT (analyses) ---
-    content_rows = query_bq(f"""
-        SELECT *
-        FROM `{BQ_PROJECT}.{BQ_DATASET}.V_CONTENT_STATS_COMPANY`
-    """)
-
-    # --- index ---
-    news_map = {
-        r.get("ID_COMPANY"): r
-        for r in news_rows
-        if r.get("ID_COMPANY")
-    }
-
-    content_map = {
-        r.get("ID_COMPANY"): r
-        for r in content_rows
-        if r.get("ID_COMPANY")
-    }
-
-    # --- union des companies ---
-    all_company_ids = set(news_map.keys()) | set(content_map.keys())
-
-    top_companies = []
-
-    for company_id in all_company_ids:
-
-        news = news_map.get(company_id, {})
-        content = content_map.get(company_id, {})
-
-        name = news.get("NAME") or content.get("NAME")
-
-        if not name:
-            continue
-
-        total_news = news.get("TOTAL", 0) or 0
-        total_content = content.get("TOTAL", 0) or 0
-
-        last7_news = news.get("LAST_7_DAYS", 0) or 0
-        last7_content = content.get("LAST_7_DAYS", 0) or 0
-
-        last30_news = news.get("LAST_30_DAYS", 0) or 0
-        last30_content = content.get("LAST_30_DAYS", 0) or 0
-
-        top_companies.append({
-            "id_company": company_id,
-            "name": name,
-            "is_partner": bool(news.get("IS_PARTNER")),
-
-            # 🔹 SPLIT (pour ton front)
-            "total_news": total_news,
-            "total_analyses": total_content,
-
-            # 🔹 AGRÉGÉ
-            "total": total_news + total_content,
-            "last_7_days": last7_news + last7_content,
-            "last_30_days": last30_news + last30_content,
-        })
-
-    # --- tri final ---
-    top_companies.sort(
-        key=lambda x: x["total"],
-        reverse=True
-    )
-
-    # =====================================================
-    # RETURN
-    # =====================================================
-
-    return {
-        "total_count": total_count,
-        "last_7_days": last_7,
-        "last_30_days": last_30,
-        "topics_stats": topics_stats,
-        "types_stats": types_stats,
-        "top_companies": top_companies,
-    }
+    return get_public_stats_snapshot()["payload"]
 
 
 # ============================================================
@@ -0,0 +1,395 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from config import BQ_PROJECT, BQ_DATASET
+
+from utils.bigquery_utils import query_bq
+from utils.jobs import JobRegistry
+from utils.ttl_cache import CachedValue
+
+
+# ============================================================
+# TABLES
+# ============================================================
+
+VIEW_NEWS_STATS_GLOBAL = f"{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_STATS_GLOBAL"
+VIEW_NEWS_STATS_TYPE = f"{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_STATS_TYPE"
+VIEW_NEWS_STATS_TOPIC = f"{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_STATS_TOPIC"
+VIEW_NEWS_STATS_COMPANY = f"{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_STATS_COMPANY"
+VIEW_CONTENT_STATS_COMPANY = f"{BQ_PROJECT}.{BQ_DATASET}.V_CONTENT_STATS_COMPANY"
+
+# Une ligne : les cinq blocs de stats publiques figés à COMPUTED_AT
+TABLE_PUBLIC_STATS_SNAPSHOT = (
+    f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_PUBLIC_STATS_SNAPSHOT"
+)
+
+
+# ============================================================
+# CONFIG
+# ============================================================
+# Les stats publiques ne bougent qu'à la publication : elles sont
+# calculées par un seul script dans la table snapshot (publish_news,
+# publish_content, ou POST /news/breves/stats/refresh planifié),
+# puis servies depuis la mémoire du process.
+#
+# - PUBLIC_STATS_TTL_SECONDS : relecture de la ligne snapshot
+#   (propage un refresh fait par une autre instance)
+# - PUBLIC_STATS_MAX_AGE_SECONDS : au-delà, recalcul en tâche de
+#   fond (fenêtres LAST_7_DAYS / LAST_30_DAYS glissantes)
+
+PUBLIC_STATS_TTL_SECONDS = float(os.getenv("PUBLIC_STATS_TTL_SECONDS", "300"))
+PUBLIC_STATS_MAX_AGE_SECONDS = float(os.getenv("PUBLIC_STATS_MAX_AGE_SECONDS", "21600"))
+
+_LOCK = threading.Lock()
+
+_STATS = {
+    "refreshes": 0,
+    "refresh_errors": 0,
+    "scheduled": 0,
+}
+
+_JOBS = JobRegistry("public-stats", max_workers=1, max_jobs=50)
+
+
+# ============================================================
+# SNAPSHOT SQL
+# ============================================================
+
+_SELECT_SNAPSHOT_SQL = f"""
+    SELECT *
+    FROM `{TABLE_PUBLIC_STATS_SNAPSHOT}`
+    ORDER BY COMPUTED_AT DESC
+    LIMIT 1
+"""
+
+_REFRESH_SNAPSHOT_SQL = f"""
+    CREATE OR REPLACE TABLE `{TABLE_PUBLIC_STATS_SNAPSHOT}` AS
+    SELECT
+        CURRENT_TIMESTAMP() AS COMPUTED_AT,
+
+        (
+            SELECT AS STRUCT *
+            FROM `{VIEW_NEWS_STATS_GLOBAL}`
+            LIMIT 1
+        ) AS GLOBAL_STATS,
+
+        ARRAY(
+            SELECT AS STRUCT *
+            FROM `{VIEW_NEWS_STATS_TYPE}`
+            ORDER BY TOTAL DESC
+        ) AS TYPES_STATS,
+
+        ARRAY(
+            SELECT AS STRUCT *
+            FROM `{VIEW_NEWS_STATS_TOPIC}`
+            ORDER BY TOTAL DESC
+        ) AS TOPICS_STATS,
+
+        ARRAY(
+            SELECT AS STRUCT *
+            FROM `{VIEW_NEWS_STATS_COMPANY}`
+        ) AS NEWS_COMPANY_STATS,
+
+        ARRAY(
+            SELECT AS STRUCT *
+            FROM `{VIEW_CONTENT_STATS_COMPANY}`
+        ) AS CONTENT_COMPANY_STATS;
+
+    {_SELECT_SNAPSHOT_SQL};
+"""
+
+
+# ============================================================
+# PAYLOAD (FORMAT /news/breves/stats)
+# ============================================================
+
+def build_stats_payload(
+    global_row: Optional[Dict],
+    types_rows: List[Dict],
+    topics_rows: List[Dict],
+    news_rows: List[Dict],
+    content_rows: List[Dict],
+) -> Dict:
+
+    # =====================================================
+    # GLOBAL
+    # =====================================================
+
+    g = global_row or {}
+
+    total_count = g.get("TOTAL", 0) or 0
+    last_7 = g.get("LAST_7_DAYS", 0) or 0
+    last_30 = g.get("LAST_30_DAYS", 0) or 0
+
+    # =====================================================
+    # TYPES
+    # =====================================================
+
+    types_stats = [
+        {
+            "news_type": r.get("NEWS_TYPE"),
+            "total": r.get("TOTAL", 0) or 0,
+            "last_7_days": r.get("LAST_7_DAYS", 0) or 0,
+            "last_30_days": r.get("LAST_30_DAYS", 0) or 0,
+        }
+        for r in types_rows
+    ]
+
+    # =====================================================
+    # TOPICS
+    # =====================================================
+
+    topics_stats = [
+        {
+            "id_topic": r.get("ID_TOPIC"),
+            "label": r.get("LABEL"),
+            "total": r.get("TOTAL", 0) or 0,
+            "last_7_days": r.get("LAST_7_DAYS", 0) or 0,
+            "last_30_days": r.get("LAST_30_DAYS", 0) or 0,
+        }
+        for r in topics_rows
+        if r.get("ID_TOPIC") and r.get("LABEL")
+    ]
+
+    # =====================================================
+    # COMPANIES (NEWS + CONTENT MERGE)
+    # =====================================================
+
+    # --- index ---
+    news_map = {
+        r.get("ID_COMPANY"): r
+        for r in news_rows
+        if r.get("ID_COMPANY")
+    }
+
+    content_map = {
+        r.get("ID_COMPANY"): r
+        for r in content_rows
+        if r.get("ID_COMPANY")
+    }
+
+    # --- union des companies ---
+    all_company_ids = set(news_map.keys()) | set(content_map.keys())
+
+    top_companies = []
+
+    for company_id in all_company_ids:
+
+        news = news_map.get(company_id, {})
+        content = content_map.get(company_id, {})
+
+        name = news.get("NAME") or content.get("NAME")
+
+        if not name:
+            continue
+
+        total_news = news.get("TOTAL", 0) or 0
+        total_content = content.get("TOTAL", 0) or 0
+
+        last7_news = news.get("LAST_7_DAYS", 0) or 0
+        last7_content = content.get("LAST_7_DAYS", 0) or 0
+
+        last30_news = news.get("LAST_30_DAYS", 0) or 0
+        last30_content = content.get("LAST_30_DAYS", 0) or 0
+
+        top_companies.append({
+            "id_company": company_id,
+            "name": name,
+            "is_partner": bool(news.get("IS_PARTNER")),
+
+            # 🔹 SPLIT (pour ton front)
+            "total_news": total_news,
+            "total_analyses": total_content,
+
+            # 🔹 AGRÉGÉ
+            "total": total_news + total_content,
+            "last_7_days": last7_news + last7_content,
+            "last_30_days": last30_news + last30_content,
+        })
+
+    # --- tri final (stable : total puis nom) ---
+    top_companies.sort(
+        key=lambda x: (-x["total"], x["name"])
+    )
+
+    # =====================================================
+    # RETURN
+    # =====================================================
+
+    return {
+        "total_count": total_count,
+        "last_7_days": last_7,
+        "last_30_days": last_30,
+        "topics_stats": topics_stats,
+        "types_stats": types_stats,
+        "top_companies": top_companies,
+    }
+
+
+def _snapshot_from_row(row: Dict) -> Dict:
+
+    payload = build_stats_payload(
+        row.get("GLOBAL_STATS"),
+        row.get("TYPES_STATS") or [],
+        row.get("TOPICS_STATS") or [],
+        row.get("NEWS_COMPANY_STATS") or [],
+        row.get("CONTENT_COMPANY_STATS") or [],
+    )
+
+    etag = hashlib.sha1(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+    computed_at = row.get("COMPUTED_AT") or datetime.now(timezone.utc)
+
+    return {
+        "payload": payload,
+        "etag": f'"{etag}"',
+        "last_modified": computed_at.replace(microsecond=0),
+    }
+
+
+def _is_stale(snapshot: Dict) -> bool:
+
+    last_modified = snapshot.get("last_modified")
+
+    if not last_modified:
+        return True
+
+    age = (datetime.now(timezone.utc) - last_modified).total_seconds()
+
+    return age > PUBLIC_STATS_MAX_AGE_SECONDS
+
+
+# ============================================================
+# REFRESH (1 SCRIPT BIGQUERY)
+# ============================================================
+
+def refresh_public_stats() -> Dict:
+    """
+    Recalcule les cinq blocs dans la table snapshot et remplace
+    le cache du process.
+    """
+
+    started = time.monotonic()
+
+    try:
+        rows = query_bq(_REFRESH_SNAPSHOT_SQL)
+
+    except Exception:
+        with _LOCK:
+            _STATS["refresh_errors"] += 1
+        raise
+
+    snapshot = _snapshot_from_row(rows[0])
+    _PUBLIC_STATS.set(snapshot)
+
+    with _LOCK:
+        _STATS["refreshes"] += 1
+
+    print("📊 PUBLIC STATS SNAPSHOT REFRESHED:", snapshot["etag"])
+
+    return {
+        "etag": snapshot["etag"],
+        "computed_at": snapshot["last_modified"].isoformat(),
+        "elapsed_s": round(time.monotonic() - started, 3),
+    }
+
+
+def schedule_public_stats_refresh(reason: str = "manual") -> Optional[str]:
+    """
+    Recalcul en tâche de fond. Un seul job en attente suffit :
+    il verra toutes les publications faites avant son démarrage.
+    """
+
+    if any(
+        j["status"] == "queued"
+        for j in _JOBS.active()
+    ):
+        return None
+
+    with _LOCK:
+        _STATS["scheduled"] += 1
+
+    return _JOBS.submit(
+        lambda update: refresh_public_stats(),
+        reason=reason,
+    )
+
+
+def get_public_stats_job(job_id: str) -> Optional[Dict]:
+    return _JOBS.get(job_id)
+
+
+# ============================================================
+# READ (CACHE → SNAPSHOT → REFRESH)
+# ============================================================
+
+def _load_snapshot() -> Dict:
+
+    try:
+        rows = query_bq(_SELECT_SNAPSHOT_SQL)
+
+    except Exception as e:
+        # table absente (premier déploiement)
+        print("⚠️ PUBLIC STATS SNAPSHOT UNAVAILABLE:", e)
+        rows = []
+
+    if not rows:
+        refresh_public_stats()
+        return _PUBLIC_STATS.peek()
+
+    snapshot = _snapshot_from_row(rows[0])
+
+    if _is_stale(snapshot):
+        schedule_public_stats_refresh("max_age")
+
+    return snapshot
+
+
+# Ligne snapshot relue au TTL (propage un refresh fait par une autre
+# instance) ; snapshot précédent conservé un TTL si BigQuery est
+# indisponible
+_PUBLIC_STATS = CachedValue(
+    _load_snapshot,
+    PUBLIC_STATS_TTL_SECONDS,
+    name="PUBLIC STATS",
+    retry_after=PUBLIC_STATS_TTL_SECONDS,
+)
+
+
+def get_public_stats_snapshot() -> Dict:
+    """
+    {"payload", "etag", "last_modified"} — 0 requête BigQuery
+    tant que le cache du process est frais.
+    """
+    return dict(_PUBLIC_STATS.get())
+
+
+# ============================================================
+# METRICS
+# ============================================================
+
+def get_public_stats_cache_stats() -> Dict[str, Any]:
+
+    snapshot = _PUBLIC_STATS.peek() or {}
+    last_modified = snapshot.get("last_modified")
+
+    with _LOCK:
+        stats = dict(_STATS)
+
+    return {
+        **stats,
+        **_PUBLIC_STATS.stats(),
+        "etag": snapshot.get("etag"),
+        "computed_at": (
+            last_modified.isoformat()
+            if last_modified else None
+        ),
+        "max_age_seconds": PUBLIC_STATS_MAX_AGE_SECONDS,
+    }
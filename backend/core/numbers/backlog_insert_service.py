@@ -3,8 +3,7 @@ from datetime import datetime, timezone
 from typing import List
 
 from config import BQ_PROJECT, BQ_DATASET
-from utils.bigquery_utils import get_bigquery_client
-from google.cloud import bigquery
+from utils.bigquery_utils import insert_bq
 
 
 TABLE = f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_NUMBERS_BACKLOG"
@@ -69,15 +68,11 @@ def insert_backlog_result(result: dict):
 
     row = _build_backlog_row(result)
 
-    client = get_bigquery_client()
-
-    client.load_table_from_json(
-        [row],
+    insert_bq(
         TABLE,
-        job_config=bigquery.LoadJobConfig(
-            write_disposition="WRITE_APPEND"
-        ),
-    ).result()
+        [row],
+        mode="load",
+    )
 
 
 # ============================================================
@@ -125,12 +120,8 @@ def insert_backlog_batch(results: List[dict]):
     # INSERT
     # ============================================================
 
-    client = get_bigquery_client()
-
-    client.load_table_from_json(
-        deduped_rows,
+    insert_bq(
         TABLE,
-        job_config=bigquery.LoadJobConfig(
-            write_disposition="WRITE_APPEND"
-        ),
-    ).result()
+        deduped_rows,
+        mode="load",
+    )
@@ -0,0 +1,91 @@
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from utils.jobs import JobRegistry
+from core.numbers.service import get_numbers_from_content
+from core.numbers.backlog_llm import process_backlog_rows
+from core.numbers.backlog_insert_service import insert_backlog_batch
+
+
+# ============================================================
+# CONFIG
+# ============================================================
+# Par défaut, create_content extrait le backlog de façon synchrone
+# (LLM en paquets parallèles).
+#
+# NUMBERS_BACKLOG_ASYNC=1 : create_content met un job en file et rend
+# la main, statut via /numbers/backlog/jobs/{job_id}. La file est en
+# mémoire : un redémarrage perd les jobs en attente (à relancer par
+# contenu via POST /numbers/backlog/from-content/{id_content}).
+# À n'activer que si cette perte est acceptable.
+
+NUMBERS_BACKLOG_ASYNC = os.getenv("NUMBERS_BACKLOG_ASYNC", "0") == "1"
+NUMBERS_BACKLOG_JOB_WORKERS = int(os.getenv("NUMBERS_BACKLOG_JOB_WORKERS", "2"))
+
+_JOBS = JobRegistry(
+    "numbers-backlog",
+    max_workers=NUMBERS_BACKLOG_JOB_WORKERS,
+)
+
+
+# ============================================================
+# RUN (synchrone)
+# ============================================================
+
+def run_content_backlog(content_id: str) -> Dict[str, Any]:
+    """
+    Chiffres du contenu -> LLM (paquets parallèles) -> insert backlog.
+    """
+
+    started = time.monotonic()
+
+    backlog_rows = get_numbers_from_content(content_id)
+
+    results = process_backlog_rows(backlog_rows)
+
+    processed_results = [
+        r for r in results
+        if r.get("status") == "ok"
+    ]
+
+    if processed_results:
+
+        insert_backlog_batch(processed_results)
+
+        print(
+            "✔ NUMBERS BACKLOG INSERTED:",
+            len(processed_results)
+        )
+
+    else:
+        print("ℹ️ NO VALID NUMBERS:", content_id)
+
+    return {
+        "numbers": len(backlog_rows),
+        "inserted": len(processed_results),
+        "errors": len(results) - len(processed_results),
+        "elapsed_s": round(time.monotonic() - started, 3),
+    }
+
+
+# ============================================================
+# QUEUE
+# ============================================================
+
+def enqueue_content_backlog(content_id: str) -> str:
+    return _JOBS.submit(
+        lambda update: run_content_backlog(content_id),
+        id_content=content_id,
+    )
+
+
+def get_backlog_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return _JOBS.get(job_id)
+
+
+def list_backlog_jobs(
+    id_content: Optional[str] = None,
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    return _JOBS.list(limit=limit, id_content=id_content)
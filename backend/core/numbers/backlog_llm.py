@@ -1,9 +1,11 @@
+import os
 import json
 import re
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
 
-from utils.llm import run_llm
-from core.numbers.backlog_service import build_prompt
+from utils.llm import run_llm, forget_llm_response
+from core.numbers.backlog_service import build_prompt, build_batch_prompt
 
 
 # ============================================================
@@ -24,6 +26,13 @@ REQUIRED_FIELDS = [
     "unit",
 ]
 
+# Chiffres par prompt / prompts simultanés (par traitement ; le
+# plafond global est le budget "numbers.backlog" de la passerelle)
+NUMBERS_LLM_BATCH_SIZE = int(os.getenv("NUMBERS_LLM_BATCH_SIZE", "8"))
+NUMBERS_LLM_CONCURRENCY = int(os.getenv("NUMBERS_LLM_CONCURRENCY", "4"))
+
+NUMBERS_LLM_CALLER = "numbers.backlog"
+
 
 # ============================================================
 # SAFE JSON PARSE
@@ -109,7 +118,9 @@ def process_backlog_row(row: Dict[str, Any]) -> Dict[str, Any]:
 
         response = run_llm(
             prompt=prompt,
-            temperature=0
+            temperature=0,
+            caller=NUMBERS_LLM_CALLER,
+            cache=True,
         )
 
         # ========================================================
@@ -126,6 +137,7 @@ def process_backlog_row(row: Dict[str, Any]) -> Dict[str, Any]:
         parsed = safe_parse_json(response)
 
         if not parsed:
+            forget_llm_response(prompt, temperature=0)
             raise ValueError("Invalid JSON from LLM")
 
         # ========================================================
@@ -151,3 +163,108 @@ def process_backlog_row(row: Dict[str, Any]) -> Dict[str, Any]:
             "input": row,
             "error": str(e),
         }
+
+
+# ============================================================
+# PROCESS BATCH (plusieurs chiffres, un seul prompt)
+# ============================================================
+
+def process_backlog_batch(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Un appel LLM pour tout le paquet ; un résultat par ligne, dans l'ordre.
+    Les lignes absentes ou invalides dans la réponse sont rejouées
+    individuellement via process_backlog_row.
+    """
+
+    if not rows:
+        return []
+
+    if len(rows) == 1:
+        return [process_backlog_row(rows[0])]
+
+    outputs: Dict[int, Any] = {}
+
+    batch_prompt = build_batch_prompt(rows)
+
+    try:
+
+        response = run_llm(
+            prompt=batch_prompt,
+            temperature=0,
+            caller=NUMBERS_LLM_CALLER,
+            cache=True,
+        )
+
+        if DEBUG_LLM:
+            print("RAW LLM BATCH:", response)
+
+        parsed = safe_parse_json(response)
+
+        items = (parsed or {}).get("results") if isinstance(parsed, dict) else None
+
+        if not isinstance(items, list):
+            forget_llm_response(batch_prompt, temperature=0)
+            raise ValueError("Invalid JSON from LLM")
+
+        for item in items:
+            if isinstance(item, dict) and isinstance(item.get("index"), int):
+                outputs[item.pop("index")] = item
+
+    except Exception as e:
+        print("⚠️ NUMBERS BATCH FALLBACK:", str(e))
+
+    results = []
+
+    for i, row in enumerate(rows):
+
+        output = outputs.get(i)
+
+        if output is None:
+            results.append(process_backlog_row(row))
+            continue
+
+        try:
+            results.append({
+                "status": "ok",
+                "input": row,
+                "output": validate_output(output),
+            })
+
+        except Exception:
+            results.append(process_backlog_row(row))
+
+    return results
+
+
+def process_backlog_rows(
+    rows: List[Dict[str, Any]],
+    batch_size: int = None,
+    concurrency: int = None,
+) -> List[Dict[str, Any]]:
+    """
+    Découpe en paquets de NUMBERS_LLM_BATCH_SIZE chiffres et les traite
+    en parallèle (NUMBERS_LLM_CONCURRENCY). L'ordre des résultats suit rows.
+    """
+
+    if not rows:
+        return []
+
+    batch_size = max(1, batch_size or NUMBERS_LLM_BATCH_SIZE)
+    concurrency = max(1, concurrency or NUMBERS_LLM_CONCURRENCY)
+
+    batches = [
+        rows[i:i + batch_size]
+        for i in range(0, len(rows), batch_size)
+    ]
+
+    if len(batches) == 1:
+        return process_backlog_batch(batches[0])
+
+    with ThreadPoolExecutor(
+        max_workers=min(concurrency, len(batches)),
+        thread_name_prefix="numbers-llm",
+    ) as pool:
+
+        batch_results = list(pool.map(process_backlog_batch, batches))
+
+    return [r for batch in batch_results for r in batch]
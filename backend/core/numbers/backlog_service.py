@@ -90,10 +90,7 @@ def get_numbers_backlog(
 # PROMPT
 # ============================================================
 
-def build_prompt(row: dict) -> str:
-
-    return f"""
-Tu es un expert data marketing senior.
+_PROMPT_RULES = """Tu es un expert data marketing senior.
 
 Ta mission est de décider si un chiffre peut être intégré dans un dashboard professionnel.
 
@@ -179,7 +176,13 @@ si elles sont clairement quantifiées et datées
 
 --------------------------------------------------
 
-7. FORMAT
+"""
+
+
+def build_prompt(row: dict) -> str:
+
+    return f"""
+{_PROMPT_RULES}7. FORMAT
 
 Retourne UNIQUEMENT un JSON valide :
 
@@ -204,3 +207,50 @@ Topics : {row.get("topics")}
 Companies : {row.get("companies")}
 Solutions : {row.get("solutions")}
 """
+
+
+def build_batch_prompt(rows: List[dict]) -> str:
+    """
+    Même grille que build_prompt, plusieurs chiffres évalués
+    indépendamment en un seul appel (réponse indexée).
+    """
+
+    items = "\n\n".join(
+        f"""[{i}]
+Chiffre : {row.get("chiffre")}
+Date : {row.get("date")}
+Topics : {row.get("topics")}
+Companies : {row.get("companies")}
+Solutions : {row.get("solutions")}"""
+        for i, row in enumerate(rows)
+    )
+
+    return f"""
+{_PROMPT_RULES}7. FORMAT
+
+Chaque chiffre ci-dessous est évalué INDÉPENDAMMENT des autres.
+
+Retourne UNIQUEMENT un JSON valide, avec exactement un résultat par chiffre :
+
+{{
+  "results": [
+    {{
+      "index": 0,
+      "decision": "...",
+      "label": "...",
+      "value": ...,
+      "unit": "...",
+      "actor": "...",
+      "market": "...",
+      "period": "...",
+      "confidence": "..."
+    }}
+  ]
+}}
+
+--------------------------------------------------
+
+DONNÉES ({len(rows)} chiffres) :
+
+{items}
+"""
@@ -0,0 +1,421 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import BQ_PROJECT, BQ_DATASET
+from utils.bigquery_utils import query_bq, insert_bq
+from utils.jobs import JobRegistry
+from utils.llm import llm_caller, get_llm_caller_stats
+from core.radar.service import (
+    TABLE,
+    VIEW_NEWS,
+    VIEW_CONTENT,
+    _build_radar_row,
+    _generate_key_points,
+    radar_period_bounds,
+)
+
+
+# ============================================================
+# CONFIG
+# ============================================================
+# Back-fill des radars MISSING de V_RADAR_STATUS :
+# - contenus de toutes les cibles en une requête par fréquence
+# - appels LLM en pool borné, avec retries
+# - inserts par paquets (un run interrompu reprend là où il s'est
+#   arrêté : les radars déjà écrits ne sont plus MISSING)
+
+VIEW_STATUS = f"{BQ_PROJECT}.{BQ_DATASET}.V_RADAR_STATUS"
+
+RADAR_BULK_CONCURRENCY = int(os.getenv("RADAR_BULK_CONCURRENCY", "4"))
+RADAR_BULK_RETRIES = int(os.getenv("RADAR_BULK_RETRIES", "3"))
+RADAR_BULK_FLUSH_SIZE = int(os.getenv("RADAR_BULK_FLUSH_SIZE", "50"))
+
+# Débit LLM : budget "radar.bulk" de la passerelle (LLM_CALLER_BUDGETS)
+RADAR_BULK_LLM_CALLER = "radar.bulk"
+
+_JOBS = JobRegistry("radar-bulk", max_workers=1)
+
+Key = Tuple[str, str, int, int]
+
+
+def _key(r: Dict) -> Key:
+    return (r["entity_type"], r["entity_id"], int(r["year"]), int(r["period"]))
+
+
+# ============================================================
+# MISSING SET
+# ============================================================
+
+def list_missing_radars(
+    frequency: str,
+    entity_type: Optional[str] = None,
+    year: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[Dict]:
+
+    conditions = [
+        'radar_status = "MISSING"',
+        "frequency = @frequency",
+        "nb_contents > 0",
+    ]
+    params = {"frequency": frequency}
+
+    if entity_type:
+        conditions.append("entity_type = @entity_type")
+        params["entity_type"] = entity_type
+
+    if year:
+        conditions.append("year = @year")
+        params["year"] = year
+
+    limit_sql = f"LIMIT {int(limit)}" if limit else ""
+
+    return query_bq(f"""
+        SELECT
+            entity_type,
+            entity_id,
+            year,
+            period,
+            frequency,
+            nb_contents
+        FROM `{VIEW_STATUS}`
+        WHERE {" AND ".join(conditions)}
+        ORDER BY nb_contents DESC
+        {limit_sql}
+    """, params)
+
+
+def _existing_keys(frequency: str, targets: List[Dict]) -> set:
+    """
+    Garde-fou : radars écrits entre la lecture de la vue et la génération.
+    """
+
+    rows = query_bq(f"""
+        SELECT r.ENTITY_TYPE, r.ENTITY_ID, r.YEAR, r.PERIOD
+        FROM `{TABLE}` r
+        JOIN UNNEST(@targets) t
+        ON r.ENTITY_TYPE = t.entity_type
+        AND r.ENTITY_ID = t.entity_id
+        AND r.YEAR = t.year
+        AND r.PERIOD = t.period
+        WHERE r.FREQUENCY = @frequency
+    """, {
+        "frequency": frequency,
+        "targets": targets,
+    })
+
+    return {
+        (r["ENTITY_TYPE"], r["ENTITY_ID"], int(r["YEAR"]), int(r["PERIOD"]))
+        for r in rows
+    }
+
+
+# ============================================================
+# CONTENTS (une requête pour toutes les cibles)
+# ============================================================
+
+def fetch_radar_contents(frequency: str, targets: List[Dict]) -> Dict[Key, List[Dict]]:
+    """
+    Même périmètre que _get_radar_content, pour toutes les cibles
+    (entité × année × période) d'une fréquence en une seule requête.
+    """
+
+    if not targets:
+        return {}
+
+    # Bornes [start, end) par cible + fenêtre globale : plages sargables
+    windows = []
+
+    for t in targets:
+        start_at, end_at = radar_period_bounds(frequency, t["year"], t["period"])
+        windows.append({**t, "start_at": start_at, "end_at": end_at})
+
+    rows = query_bq(f"""
+        WITH targets AS (
+            SELECT * FROM UNNEST(@targets)
+        ),
+
+        news AS (
+            SELECT
+                n.title,
+                n.excerpt,
+                n.id_company,
+                ARRAY(SELECT t.id_topic FROM UNNEST(n.topics) t) AS topic_ids,
+                n.published_at
+            FROM `{VIEW_NEWS}` n
+            WHERE n.published_at >= @window_start
+            AND n.published_at < @window_end
+        ),
+
+        content AS (
+            SELECT
+                c.title,
+                c.excerpt,
+                ARRAY(SELECT t.id_topic FROM UNNEST(c.topics) t) AS topic_ids,
+                ARRAY(SELECT comp.id_company FROM UNNEST(c.companies) comp) AS company_ids,
+                ARRAY(SELECT s.id_solution FROM UNNEST(c.solutions) s) AS solution_ids,
+                c.published_at
+            FROM `{VIEW_CONTENT}` c
+            WHERE c.published_at >= @window_start
+            AND c.published_at < @window_end
+        )
+
+        SELECT t.entity_type, t.entity_id, t.year, t.period, x.title, x.excerpt
+        FROM targets t
+        JOIN news x
+        ON x.published_at >= t.start_at AND x.published_at < t.end_at
+        WHERE (t.entity_type = 'topic' AND t.entity_id IN UNNEST(x.topic_ids))
+        OR (t.entity_type = 'company' AND x.id_company = t.entity_id)
+
+        UNION ALL
+
+        SELECT t.entity_type, t.entity_id, t.year, t.period, x.title, x.excerpt
+        FROM targets t
+        JOIN content x
+        ON x.published_at >= t.start_at AND x.published_at < t.end_at
+        WHERE (t.entity_type = 'topic' AND t.entity_id IN UNNEST(x.topic_ids))
+        OR (t.entity_type = 'company' AND t.entity_id IN UNNEST(x.company_ids))
+        OR (t.entity_type = 'solution' AND t.entity_id IN UNNEST(x.solution_ids))
+    """, {
+        "targets": windows,
+        "window_start": min(w["start_at"] for w in windows),
+        "window_end": max(w["end_at"] for w in windows),
+    })
+
+    contents: Dict[Key, List[Dict]] = {}
+
+    for r in rows:
+        contents.setdefault(_key(r), []).append({
+            "title": r.get("title"),
+            "excerpt": r.get("excerpt"),
+        })
+
+    return contents
+
+
+# ============================================================
+# LLM (retries)
+# ============================================================
+
+def _generate_with_retries(contents, frequency, year, period, retries: int):
+
+    last_error = None
+
+    for attempt in range(max(1, retries)):
+
+        try:
+            with llm_caller(RADAR_BULK_LLM_CALLER):
+                key_points, raw = _generate_key_points(
+                    contents, frequency, year, period
+                )
+
+            if key_points is not None:
+                return key_points
+
+            last_error = "Invalid JSON from LLM"
+
+        except Exception as e:
+            last_error = str(e)
+
+        if attempt < retries - 1:
+            time.sleep(min(2 ** attempt, 10))
+
+    raise RuntimeError(last_error)
+
+
+# ============================================================
+# ENGINE
+# ============================================================
+
+def run_bulk_radar(
+    frequency: str,
+    entity_type: Optional[str] = None,
+    year: Optional[int] = None,
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    retries: int = RADAR_BULK_RETRIES,
+    update: Optional[Callable] = None,
+) -> Dict:
+
+    update = update or (lambda **fields: None)
+
+    concurrency = max(1, concurrency or RADAR_BULK_CONCURRENCY)
+
+    started = time.monotonic()
+
+    # ----------------------------------------
+    # MISSING + CONTENTS
+    # ----------------------------------------
+
+    missing = list_missing_radars(
+        frequency=frequency,
+        entity_type=entity_type,
+        year=year,
+        limit=limit,
+    )
+
+    targets = [
+        {
+            "entity_type": r["entity_type"],
+            "entity_id": r["entity_id"],
+            "year": int(r["year"]),
+            "period": int(r["period"]),
+        }
+        for r in missing
+    ]
+
+    stats = {
+        "total": len(targets),
+        "done": 0,
+        "generated": 0,
+        "no_content": 0,
+        "exists": 0,
+        "errors": 0,
+        "inserted": 0,
+    }
+
+    update(**stats)
+
+    if not targets:
+        return {**stats, "elapsed_s": 0.0}
+
+    existing = _existing_keys(frequency, targets)
+    contents = fetch_radar_contents(frequency, targets)
+
+    fetch_s = time.monotonic() - started
+
+    # ----------------------------------------
+    # LLM POOL + INSERTS PAR PAQUETS
+    # ----------------------------------------
+
+    pending_rows: List[Dict] = []
+    errors: List[Dict] = []
+
+    def flush():
+        if pending_rows:
+            insert_bq(TABLE, list(pending_rows), mode="load")
+            stats["inserted"] += len(pending_rows)
+            pending_rows.clear()
+
+    with ThreadPoolExecutor(
+        max_workers=concurrency,
+        thread_name_prefix="radar-bulk",
+    ) as pool:
+
+        futures = {}
+
+        for t in targets:
+
+            key = _key(t)
+
+            if key in existing:
+                stats["exists"] += 1
+                stats["done"] += 1
+                continue
+
+            if not contents.get(key):
+                stats["no_content"] += 1
+                stats["done"] += 1
+                continue
+
+            future = pool.submit(
+                _generate_with_retries,
+                contents[key],
+                frequency,
+                t["year"],
+                t["period"],
+                retries,
+            )
+            futures[future] = t
+
+        try:
+            for future in as_completed(futures):
+
+                t = futures[future]
+
+                try:
+                    key_points = future.result()
+
+                    pending_rows.append(_build_radar_row({
+                        **t,
+                        "frequency": frequency,
+                        "key_points": key_points,
+                        "status": "GENERATED",
+                    }))
+
+                    stats["generated"] += 1
+
+                except Exception as e:
+                    stats["errors"] += 1
+                    errors.append({**t, "error": str(e)})
+
+                stats["done"] += 1
+
+                if len(pending_rows) >= RADAR_BULK_FLUSH_SIZE:
+                    flush()
+
+                elapsed = time.monotonic() - started
+                update(
+                    **stats,
+                    per_minute=round(stats["generated"] * 60 / elapsed, 2) if elapsed else None,
+                )
+
+        finally:
+            # ce qui est généré est toujours persisté (reprise possible)
+            flush()
+
+    elapsed = time.monotonic() - started
+
+    return {
+        **stats,
+        "elapsed_s": round(elapsed, 3),
+        "fetch_s": round(fetch_s, 3),
+        "per_minute": round(stats["generated"] * 60 / elapsed, 2) if elapsed else None,
+        "llm": get_llm_caller_stats(RADAR_BULK_LLM_CALLER),
+        "error_samples": errors[:20],
+    }
+
+
+# ============================================================
+# JOBS
+# ============================================================
+
+def enqueue_bulk_radar(
+    frequency: str,
+    entity_type: Optional[str] = None,
+    year: Optional[int] = None,
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> str:
+    """
+    Un seul back-fill à la fois : si un job tourne déjà, on le renvoie.
+    """
+
+    active = _JOBS.active()
+
+    if active:
+        return active[0]["job_id"]
+
+    return _JOBS.submit(
+        lambda update: run_bulk_radar(
+            frequency=frequency,
+            entity_type=entity_type,
+            year=year,
+            limit=limit,
+            concurrency=concurrency,
+            update=update,
+        ),
+        frequency=frequency,
+        entity_type=entity_type,
+        year=year,
+    )
+
+
+def get_bulk_radar_job(job_id: str) -> Optional[Dict]:
+    return _JOBS.get(job_id)
+
+
+def list_bulk_radar_jobs(limit: int = 20) -> List[Dict]:
+    return _JOBS.list(limit=limit)
@@ -1,15 +1,13 @@
 import uuid
 import json
 
-from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from datetime import datetime, timezone, timedelta
+from typing import List, Dict, Optional, Tuple
 from google.cloud import bigquery
-from openai import OpenAI
 
 from config import BQ_PROJECT, BQ_DATASET
 from utils.bigquery_utils import query_bq, insert_bq, get_bigquery_client
-
-client = OpenAI()
+from utils.llm import chat_completion
 
 TABLE = f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_RADAR"
 VIEW_NEWS = f"{BQ_PROJECT}.{BQ_DATASET}.V_NEWS_ENRICHED"
@@ -50,13 +48,12 @@ def _map_row(r: Dict) -> Dict:
 # CREATE
 # ============================================================
 
-def create_radar_insight(data: dict) -> str:
+def _build_radar_row(data: dict, insight_id: str = None, now: str = None) -> Dict:
 
-    insight_id = str(uuid.uuid4())
-    now = _now()
+    now = now or _now()
 
-    row = [{
-        "ID_INSIGHT": insight_id,
+    return {
+        "ID_INSIGHT": insight_id or str(uuid.uuid4()),
         "ENTITY_TYPE": data.get("entity_type"),
         "ENTITY_ID": data.get("entity_id"),
         "YEAR": data.get("year"),
@@ -67,7 +64,14 @@ def create_radar_insight(data: dict) -> str:
         "STATUS": data.get("status", "DRAFT"),
         "CREATED_AT": now,
         "UPDATED_AT": now,
-    }]
+    }
+
+
+def create_radar_insight(data: dict) -> str:
+
+    row = [_build_radar_row(data)]
+
+    insight_id = row[0]["ID_INSIGHT"]
 
     client = get_bigquery_client()
 
@@ -178,11 +182,54 @@ def radar_exists(entity_type, entity_id, year, period, frequency):
     return len(rows) > 0
 
 
+# ============================================================
+# PERIOD BOUNDS
+# ============================================================
+
+def radar_period_bounds(frequency, year, period) -> Tuple[datetime, datetime]:
+    """
+    (year, period) → [start, end) en UTC.
+
+    WEEKLY    : semaine ISO de l'année ISO `year` (la semaine 1 peut
+                commencer fin décembre, la semaine 52/53 finir en janvier)
+    QUARTERLY : trimestre 1-4
+    MONTHLY   : mois 1-12
+    """
+
+    year = int(year)
+    period = int(period)
+
+    if frequency == "WEEKLY":
+        start = datetime.fromisocalendar(year, period, 1)
+        end = start + timedelta(days=7)
+
+    elif frequency == "QUARTERLY":
+        start = datetime(year, (period - 1) * 3 + 1, 1)
+        end = (
+            datetime(year + 1, 1, 1)
+            if period == 4
+            else datetime(year, period * 3 + 1, 1)
+        )
+
+    else:
+        start = datetime(year, period, 1)
+        end = (
+            datetime(year + 1, 1, 1)
+            if period == 12
+            else datetime(year, period + 1, 1)
+        )
+
+    return (
+        start.replace(tzinfo=timezone.utc),
+        end.replace(tzinfo=timezone.utc),
+    )
+
+
 # ============================================================
 # FETCH CONTENT
 # ============================================================
 
-def _get_radar_content(entity_type, entity_id, year, period, frequency):
+def _build_radar_content_query(entity_type, entity_id, year, period, frequency):
 
     where_news = "FALSE"
     where_content = "FALSE"
@@ -198,39 +245,39 @@ def _get_radar_content(entity_type, entity_id, year, period, frequency):
     elif entity_type == "solution":
         where_content = "EXISTS (SELECT 1 FROM UNNEST(c.solutions) s WHERE s.id_solution = @entity_id)"
 
-    if frequency == "WEEKLY":
-        date_filter_news = "EXTRACT(ISOWEEK FROM n.published_at) = @period"
-        date_filter_content = "EXTRACT(ISOWEEK FROM c.published_at) = @period"
-
-    elif frequency == "QUARTERLY":
-        date_filter_news = "EXTRACT(QUARTER FROM n.published_at) = @period"
-        date_filter_content = "EXTRACT(QUARTER FROM c.published_at) = @period"
+    start_at, end_at = radar_period_bounds(frequency, year, period)
 
-    else:
-        date_filter_news = "EXTRACT(MONTH FROM n.published_at) = @period"
-        date_filter_content = "EXTRACT(MONTH FROM c.published_at) = @period"
-
-    rows = query_bq(f"""
+    # Bornes [start, end) : prédicats de plage → partition pruning
+    sql = f"""
         SELECT title, excerpt
         FROM `{VIEW_NEWS}` n
         WHERE {where_news}
-        AND EXTRACT(YEAR FROM n.published_at) = @year
-        AND {date_filter_news}
+        AND n.published_at >= @start_at
+        AND n.published_at < @end_at
 
         UNION ALL
 
         SELECT title, excerpt
         FROM `{VIEW_CONTENT}` c
         WHERE {where_content}
-        AND EXTRACT(YEAR FROM c.published_at) = @year
-        AND {date_filter_content}
-    """, {
+        AND c.published_at >= @start_at
+        AND c.published_at < @end_at
+    """
+
+    return sql, {
         "entity_id": entity_id,
-        "year": year,
-        "period": period,
-    })
+        "start_at": start_at,
+        "end_at": end_at,
+    }
+
 
-    return rows
+def _get_radar_content(entity_type, entity_id, year, period, frequency):
+
+    sql, params = _build_radar_content_query(
+        entity_type, entity_id, year, period, frequency
+    )
+
+    return query_bq(sql, params)
 
 
 # ============================================================
@@ -335,29 +382,45 @@ FORMAT DE SORTIE (JSON STRICT)
 # GENERATE
 # ============================================================
 
-def generate_radar(entity_type, entity_id, year, period, frequency, force=False):
+RADAR_LLM_MODEL = "gpt-4o-mini"
 
-    if not force and radar_exists(entity_type, entity_id, year, period, frequency):
-        return {"status": "exists"}
-
-    contents = _get_radar_content(entity_type, entity_id, year, period, frequency)
 
-    if not contents:
-        return {"status": "no_content"}
+def _generate_key_points(contents, frequency, year, period):
+    """
+    Un appel LLM → (key_points, raw). key_points vaut None si le JSON
+    retourné est invalide ; les erreurs d'API remontent à l'appelant.
+    """
 
     prompt = _build_prompt(contents, frequency, year, period)
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
+    response = chat_completion(
         messages=[{"role": "user", "content": prompt}],
+        model=RADAR_LLM_MODEL,
+        caller="radar",
         temperature=0.2,
     )
 
     raw = response.choices[0].message.content
 
     try:
-        key_points = json.loads(raw).get("key_points", [])
+        return json.loads(raw).get("key_points", []), raw
     except Exception:
+        return None, raw
+
+
+def generate_radar(entity_type, entity_id, year, period, frequency, force=False):
+
+    if not force and radar_exists(entity_type, entity_id, year, period, frequency):
+        return {"status": "exists"}
+
+    contents = _get_radar_content(entity_type, entity_id, year, period, frequency)
+
+    if not contents:
+        return {"status": "no_content"}
+
+    key_points, raw = _generate_key_points(contents, frequency, year, period)
+
+    if key_points is None:
         return {"status": "error", "raw": raw}
 
     insight_id = create_radar_insight({
@@ -2,6 +2,7 @@ from typing import List, Dict, Optional
 
 from config import BQ_PROJECT, BQ_DATASET
 from utils.bigquery_utils import query_bq
+from utils.pagination import seek_clause, next_cursor
 
 
 # ============================================================
@@ -21,6 +22,7 @@ def search(
     limit: int = 20,
     offset: int = 0,
     type: Optional[str] = None,  # 🔥 NEW
+    cursor: Optional[str] = None,
 ) -> Dict:
     """
     Recherche full-text sur NEWS + ANALYSES
@@ -28,7 +30,8 @@ def search(
 
     Ajouts :
     - filtrage par type (news / analysis)
-    - pagination (offset)
+    - pagination (offset, ou cursor opaque (published_at, id) :
+      seek dans chaque branche, coût constant en profondeur)
     - format aligné FeedItem
     """
 
@@ -44,6 +47,19 @@ def search(
     elif type == "analysis":
         news_filter = "AND FALSE"  # bloque news
 
+    # ============================================================
+    # CURSOR (KEYSET)
+    # ============================================================
+
+    params = {
+        "query": q,
+        "limit": limit,
+        "offset": 0 if cursor else offset,
+    }
+
+    news_filter += seek_clause("n.PUBLISHED_AT", "n.ID_NEWS", cursor, params)
+    content_filter += seek_clause("c.PUBLISHED_AT", "c.ID_CONTENT", cursor, params)
+
     # ============================================================
     # SQL
     # ============================================================
@@ -75,19 +91,12 @@ def search(
       AND SEARCH(c, @query)
       {content_filter}
 
-    ORDER BY published_at DESC
+    ORDER BY published_at DESC, id DESC
     LIMIT @limit
     OFFSET @offset
     """
 
-    rows = query_bq(
-        sql,
-        {
-            "query": q,
-            "limit": limit,
-            "offset": offset,
-        }
-    )
+    rows = query_bq(sql, params)
 
     # ============================================================
     # FORMAT (ALIGN FRONT)
@@ -107,4 +116,5 @@ def search(
     return {
         "items": items,
         "count": len(items),  # simple pour V1
+        "next_cursor": next_cursor(items, limit=limit),
     }
@@ -32,6 +32,7 @@ from api.solution.models import (
 
 from core.matching.resolver import (
     normalize,
+    invalidate_alias_index,
 )
 
 # ============================================================
@@ -762,6 +763,8 @@ def create_solution_alias(
         }
     )
 
+    invalidate_alias_index()
+
     return True
 
 def add_solution_alias(
@@ -833,6 +836,8 @@ def add_solution_alias(
         }
     )
 
+    invalidate_alias_index()
+
     return True
 
 def delete_solution_alias(
@@ -893,4 +898,6 @@ def delete_solution_alias(
         }
     )
 
+    invalidate_alias_index()
+
     return True
@@ -6,7 +6,7 @@ from typing import (
     Dict,
 )
 
-from utils.llm import run_llm
+from utils.llm import run_llm, forget_llm_response
 
 logger = logging.getLogger(__name__)
 
@@ -93,7 +93,7 @@ JSON:
         # LLM
         # =====================================================
 
-        raw = run_llm(prompt)
+        raw = run_llm(prompt, cache=True)
 
         if not raw:
             return cleaned_fields
@@ -113,9 +113,14 @@ JSON:
         # PARSE JSON
         # =====================================================
 
-        translated_payload = json.loads(
-            cleaned_raw
-        )
+        # JSON invalide : retiré du cache, sinon rejoué à chaque appel
+        try:
+            translated_payload = json.loads(
+                cleaned_raw
+            )
+        except ValueError:
+            forget_llm_response(prompt)
+            raise
 
         # =====================================================
         # SAFETY
@@ -125,6 +130,7 @@ JSON:
             translated_payload,
             dict
         ):
+            forget_llm_response(prompt)
             return cleaned_fields
 
         # =====================================================
@@ -184,7 +184,7 @@ OUTPUT:
 Return ONLY the translated text.
 """
 
-        raw = run_llm(prompt)
+        raw = run_llm(prompt, cache=True)
 
         if not raw:
             return text
@@ -0,0 +1,115 @@
+import os
+import copy
+from typing import Any, Callable, Dict, Optional
+
+from utils.http_cache import invalidate_http_cache
+from utils.ttl_cache import TTLCache
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+# Cache process-wide des contextes utilisateur assemblés
+# (user + univers + keywords + profil, préférences groupées).
+# TTL court : les écritures passent par invalidate_user_context().
+
+USER_CONTEXT_TTL_SECONDS = float(os.getenv("USER_CONTEXT_TTL_SECONDS", "300"))
+USER_CONTEXT_MAX_ENTRIES = int(os.getenv("USER_CONTEXT_MAX_ENTRIES", "2000"))
+
+KIND_CONTEXT = "context"
+KIND_PREFERENCES = "preferences"
+
+_CACHE = TTLCache(USER_CONTEXT_TTL_SECONDS, USER_CONTEXT_MAX_ENTRIES)
+
+
+# =========================================================
+# READ
+# =========================================================
+
+def get_cached(user_id: str, kind: str = KIND_CONTEXT):
+    """
+    Retourne (trouvé, valeur). La valeur est une copie : les appelants
+    peuvent la modifier sans polluer le cache.
+    """
+    found, value = _CACHE.get((user_id, kind))
+
+    if not found:
+        return False, None
+
+    return True, copy.deepcopy(value)
+
+
+def cache_generation() -> int:
+    """
+    À lire avant le chargement, puis à passer à set_cached().
+    """
+    return _CACHE.generation()
+
+
+def set_cached(
+    user_id: str,
+    value: Any,
+    kind: str = KIND_CONTEXT,
+    generation: Optional[int] = None,
+) -> None:
+
+    # Un utilisateur inexistant n'est jamais mis en cache
+    if not user_id or value is None:
+        return
+
+    # invalidé pendant le chargement : valeur potentiellement périmée
+    _CACHE.set((user_id, kind), copy.deepcopy(value), generation)
+
+
+def cached_user_value(
+    user_id: str,
+    loader: Callable[[], Any],
+    kind: str = KIND_CONTEXT,
+):
+    """
+    Lecture via cache, sinon loader() puis mise en cache.
+    """
+    if not user_id:
+        return loader()
+
+    found, value = get_cached(user_id, kind)
+
+    if found:
+        return value
+
+    generation = cache_generation()
+
+    value = loader()
+    set_cached(user_id, value, kind, generation)
+
+    return value
+
+
+# =========================================================
+# INVALIDATION
+# =========================================================
+
+def invalidate_user_context(user_id: Optional[str]) -> None:
+    """
+    À appeler par tout chemin d'écriture user / univers / keywords /
+    profil / préférences.
+    """
+    if not user_id:
+        return
+
+    _CACHE.invalidate(lambda key, _: key[0] == user_id)
+
+    # réponses HTTP personnalisées (flux curator) de cet utilisateur
+    invalidate_http_cache("user", user_id=user_id)
+
+
+def clear_user_context_cache() -> None:
+    _CACHE.invalidate()
+
+
+# =========================================================
+# METRICS
+# =========================================================
+
+def get_user_context_cache_stats() -> Dict[str, Any]:
+    return _CACHE.stats()
@@ -10,6 +10,10 @@ from utils.bigquery_utils import (
     insert_bq,
 )
 
+from core.user.user_context_cache import (
+    invalidate_user_context,
+)
+
 TABLE_USER_KEYWORD = (
     f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_USER_KEYWORD"
 )
@@ -84,6 +88,8 @@ def add_user_keyword(
         ]
     )
 
+    invalidate_user_context(user_id)
+
 # =========================================================
 # REMOVE USER KEYWORD
 # =========================================================
@@ -105,3 +111,5 @@ def remove_user_keyword(
             "keyword": keyword,
         }
     )
+
+    invalidate_user_context(user_id)
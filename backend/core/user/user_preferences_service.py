@@ -16,6 +16,12 @@ from utils.bigquery_utils import (
     query_bq,
 )
 
+from core.user.user_context_cache import (
+    KIND_PREFERENCES,
+    cached_user_value,
+    invalidate_user_context,
+)
+
 
 # ============================================================
 # TABLE
@@ -114,6 +120,8 @@ def add_user_preference(
         }
     )
 
+    invalidate_user_context(user_id)
+
 
 # ============================================================
 # REMOVE PREFERENCE
@@ -149,6 +157,8 @@ def remove_user_preference(
         }
     )
 
+    invalidate_user_context(user_id)
+
 
 # ============================================================
 # GET FORMATTED (GROUPED)
@@ -158,6 +168,17 @@ def get_user_preferences_grouped(
     user_id: str
 ) -> Dict[str, List[str]]:
 
+    return cached_user_value(
+        user_id,
+        lambda: _load_user_preferences_grouped(user_id),
+        kind=KIND_PREFERENCES,
+    )
+
+
+def _load_user_preferences_grouped(
+    user_id: str
+) -> Dict[str, List[str]]:
+
     rows = get_user_preferences(user_id)
 
     result = {
@@ -168,7 +189,10 @@ def get_user_preferences_grouped(
 
     for row in rows:
 
-        pref_type = row.get("TYPE")
+        pref_type = (
+            row.get("TYPE")
+            or ""
+        ).upper()
 
         value_id = row.get("VALUE_ID")
 
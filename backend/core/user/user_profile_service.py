@@ -12,6 +12,10 @@ from utils.bigquery_utils import (
     update_bq,
 )
 
+from core.user.user_context_cache import (
+    invalidate_user_context,
+)
+
 TABLE_USER_PROFILE = (
     f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_USER_PROFILE"
 )
@@ -98,6 +102,8 @@ def update_user_profile(
             }
         )
 
+        invalidate_user_context(user_id)
+
         return
 
     # =====================================================
@@ -121,3 +127,5 @@ def update_user_profile(
             }
         ]
     )
+
+    invalidate_user_context(user_id)
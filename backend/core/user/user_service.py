@@ -1,7 +1,7 @@
 import uuid
 
 from config import BQ_PROJECT, BQ_DATASET
-from utils.bigquery_utils import query_bq
+from utils.bigquery_utils import query_bq, aquery_bq, arun_bq, gather_bq
 from typing import Optional, Dict, Any, List
 
 from core.user.user_keyword_service import (
@@ -12,6 +12,14 @@ from core.user.user_profile_service import (
     get_user_profile,
 )
 
+from core.user.user_context_cache import (
+    cached_user_value,
+    get_cached,
+    set_cached,
+    cache_generation,
+    invalidate_user_context,
+)
+
 
 # =========================================================
 # TABLES
@@ -86,34 +94,46 @@ def get_sources_from_universes(universes: list[str]):
 # USER CONTEXT
 # =========================================================
 
-# =========================================================
-# USER CONTEXT
-# =========================================================
+SQL_CONTEXT_USER = f"""
+    SELECT
+        ID_USER,
+        EMAIL,
+        NAME,
+        COMPANY,
+        LANGUAGE,
+        ROLE
+    FROM `{TABLE_USER}`
+    WHERE ID_USER = @user_id
+    LIMIT 1
+"""
 
-def get_user_context(user_id: str) -> Optional[Dict]:
+SQL_CONTEXT_UNIVERSES = f"""
+    SELECT ID_UNIVERSE
+    FROM `{TABLE_USER_UNIVERSE}`
+    WHERE ID_USER = @user_id
+"""
 
-    if not user_id:
+
+def _safe_user_keywords(user_id: str) -> List[str]:
+    try:
+        return get_user_keywords(user_id)
+    except Exception:
+        return []
+
+
+def _safe_user_profile(user_id: str) -> Optional[Dict]:
+    try:
+        return get_user_profile(user_id)
+    except Exception:
         return None
 
-    # ============================================================
-    # USER
-    # ============================================================
 
-    rows = query_bq(
-        f"""
-        SELECT
-            ID_USER,
-            EMAIL,
-            NAME,
-            COMPANY,
-            LANGUAGE,
-            ROLE
-        FROM `{TABLE_USER}`
-        WHERE ID_USER = @user_id
-        LIMIT 1
-        """,
-        {"user_id": user_id}
-    )
+def _assemble_user_context(
+    rows: List[Dict],
+    universes: List[Dict],
+    keywords: List[str],
+    profile: Optional[Dict],
+) -> Optional[Dict]:
 
     if not rows:
         # 🔥 USER INEXISTANT → on ne casse pas
@@ -125,39 +145,12 @@ def get_user_context(user_id: str) -> Optional[Dict]:
     # UNIVERS (OPTIONNEL)
     # ============================================================
 
-    universes = query_bq(
-        f"""
-        SELECT ID_UNIVERSE
-        FROM `{TABLE_USER_UNIVERSE}`
-        WHERE ID_USER = @user_id
-        """,
-        {"user_id": user_id}
-    )
-
     universe_ids = (
         [u["ID_UNIVERSE"] for u in universes]
         if universes
         else []
     )
 
-    # ============================================================
-    # KEYWORDS
-    # ============================================================
-
-    try:
-        keywords = get_user_keywords(user_id)
-    except Exception:
-        keywords = []
-
-    # ============================================================
-    # PROFILE
-    # ============================================================
-
-    try:
-        profile = get_user_profile(user_id)
-    except Exception:
-        profile = None
-
     # ============================================================
     # RETURN SAFE
     # ============================================================
@@ -186,6 +179,70 @@ def get_user_context(user_id: str) -> Optional[Dict]:
     }
 
 
+def get_user_context(user_id: str) -> Optional[Dict]:
+
+    if not user_id:
+        return None
+
+    return cached_user_value(
+        user_id,
+        lambda: _load_user_context(user_id),
+    )
+
+
+def _load_user_context(user_id: str) -> Optional[Dict]:
+
+    params = {"user_id": user_id}
+
+    rows = query_bq(SQL_CONTEXT_USER, params)
+
+    if not rows:
+        return None
+
+    return _assemble_user_context(
+        rows,
+        query_bq(SQL_CONTEXT_UNIVERSES, params),
+        _safe_user_keywords(user_id),
+        _safe_user_profile(user_id),
+    )
+
+
+async def aget_user_context(user_id: str) -> Optional[Dict]:
+    """
+    Version async : user, univers, keywords et profil en parallèle.
+    """
+
+    if not user_id:
+        return None
+
+    found, context = get_cached(user_id)
+
+    if found:
+        return context
+
+    generation = cache_generation()
+
+    params = {"user_id": user_id}
+
+    rows, universes, keywords, profile = await gather_bq(
+        aquery_bq(SQL_CONTEXT_USER, params),
+        aquery_bq(SQL_CONTEXT_UNIVERSES, params),
+        arun_bq(_safe_user_keywords, user_id),
+        arun_bq(_safe_user_profile, user_id),
+    )
+
+    context = _assemble_user_context(
+        rows,
+        universes,
+        keywords,
+        profile,
+    )
+
+    set_cached(user_id, context, generation=generation)
+
+    return context
+
+
 # =========================================================
 # CREATE USER (SIMPLE)
 # =========================================================
@@ -313,6 +370,8 @@ def update_user(payload):
             payload.universes
         )
 
+    invalidate_user_context(payload.user_id)
+
 
 # =========================================================
 # LIST USERS
@@ -496,3 +555,5 @@ def assign_universes(user_id: str, universes: list[str]):
                 "universe": u,
             },
         )
+
+    invalidate_user_context(user_id)
@@ -1,21 +1,22 @@
-import os
 from typing import List, Dict, Any
 
 from config import BQ_PROJECT, BQ_DATASET
-from utils.bigquery_utils import get_bigquery_client, query_bq, update_bq
+from utils.bigquery_utils import get_bigquery_client, query_bq, update_bq, bulk_update_bq
 from utils.pinecone_utils import get_pinecone_index, is_pinecone_enabled
 
-from openai import OpenAI
+from core.vectorization.embedding_service import (
+    chunked,
+    clean_html,
+    embed_texts,
+    embed_vector_specs,
+    upsert_vectors,
+)
 
 
 # --------------------------------------------------
 # CONFIG
 # --------------------------------------------------
 
-OPENAI_MODEL = "text-embedding-3-small"
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 # Tables BigQuery
 TABLE_CONTENT = f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONTENT"
 TABLE_CONTENT_TOPIC = f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_CONTENT_TOPIC"
@@ -30,20 +31,8 @@ TABLE_COMPANY = f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_COMPANY"
 # HELPERS
 # --------------------------------------------------
 
-def clean_html(text: str) -> str:
-    import re
-    if not text:
-        return ""
-    clean = re.sub(r"<[^>]+>", "", text)
-    return clean.strip()
-
-
 def embed_text(text: str) -> List[float]:
-    response = client.embeddings.create(
-        model=OPENAI_MODEL,
-        input=text
-    )
-    return response.data[0].embedding
+    return embed_texts([text])[0]
 
 
 # --------------------------------------------------
@@ -55,11 +44,11 @@ def load_content(content_id: str) -> Dict[str, Any]:
     query = f"""
         SELECT *
         FROM `{TABLE_CONTENT}`
-        WHERE ID_CONTENT = '{content_id}'
+        WHERE ID_CONTENT = @content_id
         LIMIT 1
     """
 
-    rows = query_bq(query)
+    rows = query_bq(query, {"content_id": content_id})
 
     if not rows:
         raise ValueError(f"Content not found: {content_id}")
@@ -68,48 +57,78 @@ def load_content(content_id: str) -> Dict[str, Any]:
 
 
 def load_topics(content_id: str) -> List[str]:
+    return load_topics_map([content_id]).get(content_id, [])
+
+
+def load_solutions(content_id: str) -> List[str]:
+    return load_solutions_map([content_id]).get(content_id, [])
+
+
+def load_companies(content_id: str) -> List[str]:
+    return load_companies_map([content_id]).get(content_id, [])
+
+
+# --------------------------------------------------
+# LOAD DATA (BATCH — une requête par relation)
+# --------------------------------------------------
+
+def load_contents_map(content_ids: List[str]) -> Dict[str, Dict[str, Any]]:
 
     query = f"""
-        SELECT t.LABEL
-        FROM `{TABLE_CONTENT_TOPIC}` ct
-        JOIN `{TABLE_TOPIC}` t
-        ON ct.ID_TOPIC = t.ID_TOPIC
-        WHERE ct.ID_CONTENT = '{content_id}'
+        SELECT *
+        FROM `{TABLE_CONTENT}`
+        WHERE ID_CONTENT IN UNNEST(@ids)
     """
 
-    rows = query_bq(query)
+    rows = query_bq(query, {"ids": content_ids})
 
-    return [r["LABEL"] for r in rows if r.get("LABEL")]
+    return {r["ID_CONTENT"]: r for r in rows}
 
 
-def load_solutions(content_id: str) -> List[str]:
+def _load_labels_map(query: str, content_ids: List[str]) -> Dict[str, List[str]]:
 
-    query = f"""
-        SELECT s.NAME
+    rows = query_bq(query, {"ids": content_ids})
+
+    labels: Dict[str, List[str]] = {}
+
+    for r in rows:
+        if r.get("LABEL"):
+            labels.setdefault(r["ID_CONTENT"], []).append(r["LABEL"])
+
+    return labels
+
+
+def load_topics_map(content_ids: List[str]) -> Dict[str, List[str]]:
+
+    return _load_labels_map(f"""
+        SELECT ct.ID_CONTENT, t.LABEL
+        FROM `{TABLE_CONTENT_TOPIC}` ct
+        JOIN `{TABLE_TOPIC}` t
+        ON ct.ID_TOPIC = t.ID_TOPIC
+        WHERE ct.ID_CONTENT IN UNNEST(@ids)
+    """, content_ids)
+
+
+def load_solutions_map(content_ids: List[str]) -> Dict[str, List[str]]:
+
+    return _load_labels_map(f"""
+        SELECT cs.ID_CONTENT, s.NAME AS LABEL
         FROM `{TABLE_CONTENT_SOLUTION}` cs
         JOIN `{TABLE_SOLUTION}` s
         ON cs.ID_SOLUTION = s.ID_SOLUTION
-        WHERE cs.ID_CONTENT = '{content_id}'
-    """
-
-    rows = query_bq(query)
+        WHERE cs.ID_CONTENT IN UNNEST(@ids)
+    """, content_ids)
 
-    return [r["NAME"] for r in rows if r.get("NAME")]
 
+def load_companies_map(content_ids: List[str]) -> Dict[str, List[str]]:
 
-def load_companies(content_id: str) -> List[str]:
-
-    query = f"""
-        SELECT c.NAME
+    return _load_labels_map(f"""
+        SELECT cc.ID_CONTENT, c.NAME AS LABEL
         FROM `{TABLE_CONTENT_COMPANY}` cc
         JOIN `{TABLE_COMPANY}` c
         ON cc.ID_COMPANY = c.ID_COMPANY
-        WHERE cc.ID_CONTENT = '{content_id}'
-    """
-
-    rows = query_bq(query)
-
-    return [r["NAME"] for r in rows if r.get("NAME")]
+        WHERE cc.ID_CONTENT IN UNNEST(@ids)
+    """, content_ids)
 
 
 # --------------------------------------------------
@@ -129,11 +148,84 @@ def build_content_blocks(content: Dict[str, Any]) -> Dict[str, str]:
     return blocs
 
 
+def build_content_vector_specs(
+    content_id: str,
+    content: Dict[str, Any],
+    topics: List[str],
+    solutions: List[str],
+    companies: List[str],
+) -> List[Dict[str, Any]]:
+    """
+    Un spec par bloc non vide : id Pinecone, texte enrichi à embedder, metadata.
+    """
+
+    concepts_llm = [
+        str(c) for c in (content.get("CONCEPTS_LLM") or [])
+        if c
+    ]
+
+    specs = []
+
+    for bloc_type, text in build_content_blocks(content).items():
+
+        if not text or str(text).strip() == "":
+            print(f"⚠️ EMPTY BLOCK SKIPPED: {bloc_type}")
+            continue
+
+        enriched_text = f"""
+TYPE: content
+BLOC: {bloc_type}
+
+TITLE:
+{content.get("TITLE")}
+
+CONTENT:
+{text}
+
+TOPICS:
+{", ".join(topics)}
+
+SOLUTIONS:
+{", ".join(solutions)}
+
+COMPANIES:
+{", ".join(companies)}
+
+CONCEPTS:
+{", ".join(concepts_llm)}
+        """.strip()
+
+        specs.append({
+            "id": f"content_{content_id}_{bloc_type}",
+            "text": enriched_text,
+            "metadata": {
+                "type": "content",
+                "id_content": content_id,
+                "bloc_type": bloc_type,
+
+                "title": content.get("TITLE"),
+                "excerpt": content.get("EXCERPT"),
+
+                "content": str(text)[:500],
+
+                "topics": topics,
+                "solutions": solutions,
+                "companies": companies,
+                "concepts_llm": concepts_llm,
+
+                "status": content.get("STATUS"),
+                "published_at": str(content.get("PUBLISHED_AT")),
+            },
+        })
+
+    return specs
+
+
 # --------------------------------------------------
 # MAIN
 # --------------------------------------------------
 
-def vectorize_content(content_id: str) -> Dict[str, Any]:
+def vectorize_content(content_id: str, mark_vectorized: bool = True) -> Dict[str, Any]:
 
     print("=== VECTORIZE CONTENT START ===", content_id)
 
@@ -162,125 +254,194 @@ def vectorize_content(content_id: str) -> Dict[str, Any]:
     companies = load_companies(content_id)
     print("✅ COMPANIES:", companies)
 
-    concepts_llm = [
-        str(c) for c in (content.get("CONCEPTS_LLM") or [])
-        if c
-    ]
-    print("✅ CONCEPTS_LLM:", concepts_llm)
+    # ----------------------------------------
+    # BUILD VECTORS (un seul appel embeddings)
+    # ----------------------------------------
+
+    specs = build_content_vector_specs(
+        content_id,
+        content,
+        topics,
+        solutions,
+        companies,
+    )
+    print("✅ BLOCS:", [s["metadata"]["bloc_type"] for s in specs])
 
-    blocs = build_content_blocks(content)
-    print("✅ BLOCS:", list(blocs.keys()))
+    vectors = embed_vector_specs(specs) if specs else []
 
-    vectors = []
+    print("📦 TOTAL VECTORS:", len(vectors))
 
     # ----------------------------------------
-    # BUILD VECTORS
+    # UPSERT + UPDATE BQ
     # ----------------------------------------
 
-    for bloc_type, text in blocs.items():
+    if vectors:
+        print("🚀 UPSERT START")
 
-        if not text or str(text).strip() == "":
-            print(f"⚠️ EMPTY BLOCK SKIPPED: {bloc_type}")
-            continue
+        upserted = upsert_vectors(index, vectors)
 
-        print(f"➡️ PROCESS BLOCK: {bloc_type}")
+        print("✅ UPSERT DONE:", upserted)
 
-        enriched_text = f"""
-TYPE: content
-BLOC: {bloc_type}
+        # En batch, le flag est posé en une fois par l'appelant
+        if mark_vectorized:
 
-TITLE:
-{content.get("TITLE")}
+            print("📝 UPDATE BQ START")
 
-CONTENT:
-{text}
+            update_bq(
+                table=TABLE_CONTENT,
+                fields={
+                    "IS_VECTORIZED": True
+                },
+                where={
+                    "ID_CONTENT": content_id
+                }
+            )
 
-TOPICS:
-{", ".join(topics)}
+            print("✅ UPDATE BQ DONE")
 
-SOLUTIONS:
-{", ".join(solutions)}
+    else:
+        print("⚠️ NO VECTORS TO UPSERT")
 
-COMPANIES:
-{", ".join(companies)}
+    print("=== VECTORIZE CONTENT END ===")
 
-CONCEPTS:
-{", ".join(concepts_llm)}
-        """.strip()
+    return {
+        "status": "ok",
+        "type": "content",
+        "content_id": content_id,
+        "nb_vectors": len(vectors)
+    }
 
-        print("🧠 EMBEDDING START")
 
-        embedding = embed_text(enriched_text)
+# --------------------------------------------------
+# BATCH PIPELINE
+# --------------------------------------------------
 
-        print("✅ EMBEDDING DONE - size:", len(embedding))
+def vectorize_contents_batch(
+    content_ids: List[str],
+    items_per_batch: int = 20,
+) -> Dict[str, Any]:
+    """
+    Vectorisation par lots :
+    - 1 requête BigQuery par relation pour tout le lot
+    - 1 appel embeddings.create par paquet d'items (tous blocs confondus)
+    - upsert Pinecone par paquets, puis IS_VECTORIZED en un seul MERGE
 
-        vector_id = f"content_{content_id}_{bloc_type}"
+    Un échec isole uniquement le paquet d'items concerné.
+    """
 
-        metadata = {
-            "type": "content",
-            "id_content": content_id,
-            "bloc_type": bloc_type,
+    print("=== VECTORIZE CONTENT BATCH START ===", len(content_ids))
 
-            "title": content.get("TITLE"),
-            "excerpt": content.get("EXCERPT"),
+    if not is_pinecone_enabled():
+        print("❌ Pinecone disabled")
+        return {
+            "status": "disabled",
+            "results": [
+                {"content_id": content_id, "status": "disabled"}
+                for content_id in dict.fromkeys(content_ids)
+            ],
+        }
 
-            "content": str(text)[:500],
+    index = get_pinecone_index()
 
-            "topics": topics,
-            "solutions": solutions,
-            "companies": companies,
-            "concepts_llm": concepts_llm,
+    content_ids = list(dict.fromkeys(content_ids))
 
-            "status": content.get("STATUS"),
-            "published_at": str(content.get("PUBLISHED_AT")),
-        }
+    results: Dict[str, Dict[str, Any]] = {}
+    vectorized_ids: List[str] = []
 
-        vectors.append({
-            "id": vector_id,
-            "values": embedding,
-            "metadata": metadata
-        })
+    for batch_ids in chunked(content_ids, max(1, items_per_batch)):
 
-    print("📦 TOTAL VECTORS:", len(vectors))
+        try:
 
-    # ----------------------------------------
-    # UPSERT + UPDATE BQ
-    # ----------------------------------------
+            contents = load_contents_map(batch_ids)
+            topics = load_topics_map(batch_ids)
+            solutions = load_solutions_map(batch_ids)
+            companies = load_companies_map(batch_ids)
 
-    if vectors:
-        print("🚀 UPSERT START")
+            specs = []
 
-        index.upsert(vectors)
+            for content_id in batch_ids:
 
-        print("✅ UPSERT DONE")
+                content = contents.get(content_id)
 
-        print("📝 UPDATE BQ START")
+                if not content:
+                    results[content_id] = {
+                        "status": "error",
+                        "error": f"Content not found: {content_id}",
+                    }
+                    continue
 
-        update_bq(
-            table=TABLE_CONTENT,
-            fields={
-                "IS_VECTORIZED": True
-            },
-            where={
-                "ID_CONTENT": content_id
-            }
-        )
+                item_specs = build_content_vector_specs(
+                    content_id,
+                    content,
+                    topics.get(content_id, []),
+                    solutions.get(content_id, []),
+                    companies.get(content_id, []),
+                )
 
-        print("✅ UPDATE BQ DONE")
+                specs.extend(item_specs)
 
-    else:
-        print("⚠️ NO VECTORS TO UPSERT")
+                results[content_id] = {
+                    "status": "ok",
+                    "nb_vectors": len(item_specs),
+                }
 
-    print("=== VECTORIZE CONTENT END ===")
+            vectors = embed_vector_specs(specs) if specs else []
+
+            upsert_vectors(index, vectors)
+
+            vectorized_ids.extend(
+                content_id
+                for content_id in batch_ids
+                if results[content_id].get("nb_vectors")
+            )
+
+        except Exception as e:
+
+            print("❌ BATCH ERROR:", str(e))
+
+            for content_id in batch_ids:
+                results[content_id] = {
+                    "status": "error",
+                    "error": str(e),
+                }
+
+    mark_contents_vectorized(vectorized_ids)
+
+    print("=== VECTORIZE CONTENT BATCH END ===", len(vectorized_ids))
 
     return {
         "status": "ok",
-        "type": "content",
-        "content_id": content_id,
-        "nb_vectors": len(vectors)
+        "results": [
+            {"content_id": content_id, **results[content_id]}
+            for content_id in content_ids
+        ],
     }
 
 
+# --------------------------------------------------
+# BULK FLAG
+# --------------------------------------------------
+
+def mark_contents_vectorized(ids: List[str]) -> int:
+    """
+    Pose IS_VECTORIZED = TRUE sur tout un lot en un seul MERGE.
+    """
+
+    if not ids:
+        return 0
+
+    result = bulk_update_bq(
+        TABLE_CONTENT,
+        "ID_CONTENT",
+        [
+            {"ID_CONTENT": i, "IS_VECTORIZED": True}
+            for i in ids
+        ],
+    )
+
+    return result["affected"]
+
+
 # --------------------------------------------------
 # STATUS
 # --------------------------------------------------
@@ -0,0 +1,239 @@
+import os
+import array
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+# Cache persistant des embeddings, clé = sha256(modèle + texte enrichi).
+# - store local SQLite (toujours actif sauf EMBEDDING_CACHE_ENABLED=0)
+# - table BigQuery optionnelle (EMBEDDING_CACHE_BQ_TABLE) partagée
+#   entre instances / redéploiements
+#
+# Seul l'embedding est mis en cache : l'upsert Pinecone est toujours
+# rejoué (idempotent), l'index fait foi même après un reset.
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "1") == "1"
+
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "ratecard_embedding_cache.sqlite"),
+)
+
+# ex: adex-5555.RATECARD.RATECARD_EMBEDDING_CACHE
+#   HASH STRING, MODEL STRING, EMBEDDING ARRAY<FLOAT64>, CREATED_AT TIMESTAMP
+EMBEDDING_CACHE_BQ_TABLE = os.getenv("EMBEDDING_CACHE_BQ_TABLE") or None
+
+_CONN: Optional[sqlite3.Connection] = None
+_LOCK = threading.Lock()
+
+_STATS = {
+    "hits": 0,
+    "bq_hits": 0,
+    "misses": 0,
+}
+
+
+# =========================================================
+# STORE
+# =========================================================
+
+def _get_conn() -> sqlite3.Connection:
+    """
+    Connexion SQLite unique, partagée entre threads sous _LOCK.
+    """
+    global _CONN
+
+    if _CONN is None:
+
+        conn = sqlite3.connect(EMBEDDING_CACHE_PATH, check_same_thread=False)
+
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                hash TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                embedding BLOB NOT NULL
+            )
+        """)
+        conn.commit()
+
+        _CONN = conn
+
+    return _CONN
+
+
+def _pack(embedding: List[float]) -> bytes:
+    return array.array("f", embedding).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    values = array.array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+def text_hash(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+
+def _placeholders(n: int) -> str:
+    return ",".join("?" * n)
+
+
+# =========================================================
+# EMBEDDINGS
+# =========================================================
+
+def get_embeddings(hashes: List[str]) -> Dict[str, List[float]]:
+    """
+    Retourne {hash: embedding} pour les hashes connus
+    (SQLite puis, pour le reste, table BigQuery si configurée).
+    """
+    if not EMBEDDING_CACHE_ENABLED or not hashes:
+        return {}
+
+    found: Dict[str, List[float]] = {}
+
+    with _LOCK:
+
+        conn = _get_conn()
+
+        # SQLite limite le nombre de paramètres par requête
+        for i in range(0, len(hashes), 500):
+
+            batch = hashes[i:i + 500]
+
+            rows = conn.execute(
+                f"SELECT hash, embedding FROM embeddings "
+                f"WHERE hash IN ({_placeholders(len(batch))})",
+                batch,
+            ).fetchall()
+
+            for h, blob in rows:
+                found[h] = _unpack(blob)
+
+        _STATS["hits"] += len(found)
+
+    missing = [h for h in hashes if h not in found]
+
+    if missing and EMBEDDING_CACHE_BQ_TABLE:
+
+        remote = _get_embeddings_bq(missing)
+
+        if remote:
+            _put_local(remote)
+            found.update(remote)
+
+            with _LOCK:
+                _STATS["bq_hits"] += len(remote)
+
+    with _LOCK:
+        _STATS["misses"] += len(hashes) - len(found)
+
+    return found
+
+
+def put_embeddings(model: str, embeddings: Dict[str, List[float]]) -> None:
+
+    if not EMBEDDING_CACHE_ENABLED or not embeddings:
+        return
+
+    _put_local(embeddings, model)
+
+    if EMBEDDING_CACHE_BQ_TABLE:
+        _put_embeddings_bq(model, embeddings)
+
+
+def _put_local(embeddings: Dict[str, List[float]], model: str = "") -> None:
+
+    with _LOCK:
+
+        conn = _get_conn()
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (hash, model, embedding) "
+            "VALUES (?, ?, ?)",
+            [
+                (h, model, _pack(e))
+                for h, e in embeddings.items()
+            ],
+        )
+        conn.commit()
+
+
+def _get_embeddings_bq(hashes: List[str]) -> Dict[str, List[float]]:
+
+    from utils.bigquery_utils import query_bq
+
+    try:
+        rows = query_bq(f"""
+            SELECT HASH, EMBEDDING
+            FROM `{EMBEDDING_CACHE_BQ_TABLE}`
+            WHERE HASH IN UNNEST(@hashes)
+        """, {"hashes": hashes})
+
+    except Exception as e:
+        # Le cache distant est optionnel : on ré-embedde plutôt que d'échouer
+        print("⚠️ EMBEDDING CACHE BQ READ ERROR:", str(e))
+        return {}
+
+    return {
+        r["HASH"]: list(r["EMBEDDING"])
+        for r in rows
+        if r.get("EMBEDDING")
+    }
+
+
+def _put_embeddings_bq(model: str, embeddings: Dict[str, List[float]]) -> None:
+
+    from utils.bigquery_utils import insert_bq
+
+    now = datetime.now(timezone.utc).isoformat()
+
+    try:
+        insert_bq(
+            EMBEDDING_CACHE_BQ_TABLE,
+            [
+                {
+                    "HASH": h,
+                    "MODEL": model,
+                    "EMBEDDING": e,
+                    "CREATED_AT": now,
+                }
+                for h, e in embeddings.items()
+            ],
+            mode="load",
+        )
+
+    except Exception as e:
+        print("⚠️ EMBEDDING CACHE BQ WRITE ERROR:", str(e))
+
+
+# =========================================================
+# STATS
+# =========================================================
+
+def get_embedding_cache_stats() -> Dict[str, Any]:
+
+    with _LOCK:
+
+        stats = dict(_STATS)
+
+        stats["enabled"] = EMBEDDING_CACHE_ENABLED
+        stats["path"] = EMBEDDING_CACHE_PATH
+        stats["bq_table"] = EMBEDDING_CACHE_BQ_TABLE
+
+        if EMBEDDING_CACHE_ENABLED:
+            conn = _get_conn()
+            stats["entries"] = conn.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()[0]
+
+        return stats
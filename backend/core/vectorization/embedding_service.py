@@ -0,0 +1,114 @@
+import os
+import re
+from typing import List, Dict, Any, Iterable
+
+from utils.llm import create_embeddings
+
+from core.vectorization.embedding_cache import (
+    text_hash,
+    get_embeddings,
+    put_embeddings,
+)
+
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+
+OPENAI_MODEL = "text-embedding-3-small"
+
+# Nombre de textes par appel embeddings.create (limite API : 2048)
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "96"))
+
+# Nombre de vecteurs par upsert Pinecone (recommandé : ~100)
+PINECONE_UPSERT_BATCH_SIZE = int(os.getenv("PINECONE_UPSERT_BATCH_SIZE", "100"))
+
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+
+def clean_html(text: str) -> str:
+    if not text:
+        return ""
+    clean = re.sub(r"<[^>]+>", "", text)
+    return clean.strip()
+
+
+def chunked(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# --------------------------------------------------
+# EMBEDDINGS (BATCH)
+# --------------------------------------------------
+
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Embeddings via le cache (sha256 modèle + texte) ; seuls les textes
+    inconnus partent à OpenAI, un appel embeddings.create par paquet
+    de EMBED_BATCH_SIZE. L'ordre des vecteurs suit celui des textes.
+    """
+    hashes = [text_hash(OPENAI_MODEL, t) for t in texts]
+
+    cached = get_embeddings(list(dict.fromkeys(hashes)))
+
+    # textes à embedder (dédoublonnés)
+    todo: Dict[str, str] = {}
+    for h, t in zip(hashes, texts):
+        if h not in cached and h not in todo:
+            todo[h] = t
+
+    todo_hashes = list(todo.keys())
+    fresh: Dict[str, List[float]] = {}
+
+    for batch in chunked(todo_hashes, EMBED_BATCH_SIZE):
+
+        response = create_embeddings(
+            model=OPENAI_MODEL,
+            input=[todo[h] for h in batch],
+            caller="embeddings",
+        )
+
+        ordered = sorted(response.data, key=lambda d: d.index)
+
+        for h, d in zip(batch, ordered):
+            fresh[h] = d.embedding
+
+    put_embeddings(OPENAI_MODEL, fresh)
+
+    cached.update(fresh)
+
+    return [cached[h] for h in hashes]
+
+
+def embed_vector_specs(specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    specs : [{"id", "text", "metadata"}] -> vecteurs Pinecone prêts à upserter.
+    """
+    embeddings = embed_texts([s["text"] for s in specs])
+
+    return [
+        {
+            "id": spec["id"],
+            "values": embedding,
+            "metadata": spec["metadata"],
+        }
+        for spec, embedding in zip(specs, embeddings)
+    ]
+
+
+# --------------------------------------------------
+# PINECONE (BATCH)
+# --------------------------------------------------
+
+def upsert_vectors(index, vectors: List[Dict[str, Any]]) -> int:
+    """
+    Upsert Pinecone par paquets de PINECONE_UPSERT_BATCH_SIZE vecteurs.
+    Retourne le nombre de vecteurs upsertés.
+    """
+    for batch in chunked(vectors, PINECONE_UPSERT_BATCH_SIZE):
+        index.upsert(vectors=batch)
+
+    return len(vectors)
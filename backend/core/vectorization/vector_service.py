@@ -1,21 +1,22 @@
-import os
 from typing import List, Dict, Any
 
 from config import BQ_PROJECT, BQ_DATASET
-from utils.bigquery_utils import get_bigquery_client, query_bq, update_bq
+from utils.bigquery_utils import get_bigquery_client, query_bq, update_bq, bulk_update_bq
 from utils.pinecone_utils import get_pinecone_index, is_pinecone_enabled
 
-from openai import OpenAI
+from core.vectorization.embedding_service import (
+    chunked,
+    clean_html,
+    embed_texts,
+    embed_vector_specs,
+    upsert_vectors,
+)
 
 
 # --------------------------------------------------
 # CONFIG
 # --------------------------------------------------
 
-OPENAI_MODEL = "text-embedding-3-small"
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 # Tables BigQuery (alignées avec ton standard)
 TABLE_NEWS = f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_NEWS"
 TABLE_NEWS_TOPIC = f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_NEWS_TOPIC"
@@ -29,20 +30,8 @@ TABLE_COMPANY = f"{BQ_PROJECT}.{BQ_DATASET}.RATECARD_COMPANY"
 # HELPERS
 # --------------------------------------------------
 
-def clean_html(text: str) -> str:
-    import re
-    if not text:
-        return ""
-    clean = re.sub(r"<[^>]+>", "", text)
-    return clean.strip()
-
-
 def embed_text(text: str) -> List[float]:
-    response = client.embeddings.create(
-        model=OPENAI_MODEL,
-        input=text
-    )
-    return response.data[0].embedding
+    return embed_texts([text])[0]
 
 
 # --------------------------------------------------
@@ -54,11 +43,11 @@ def load_news(news_id: str) -> Dict[str, Any]:
     query = f"""
         SELECT *
         FROM `{TABLE_NEWS}`
-        WHERE ID_NEWS = '{news_id}'
+        WHERE ID_NEWS = @news_id
         LIMIT 1
     """
 
-    rows = query_bq(query)
+    rows = query_bq(query, {"news_id": news_id})
 
     if not rows:
         raise ValueError(f"News not found: {news_id}")
@@ -66,60 +55,88 @@ def load_news(news_id: str) -> Dict[str, Any]:
     return rows[0]
 
 def load_news_topics(news_id: str) -> List[str]:
+    return load_news_topics_map([news_id]).get(news_id, [])
+
+def load_news_solutions(news_id: str) -> List[str]:
+    return load_news_solutions_map([news_id]).get(news_id, [])
+
+
+def load_company(company_id: str) -> str:
+
+    if not company_id:
+        return ""
+
+    return load_companies_map([company_id]).get(company_id, "")
+
+
+# --------------------------------------------------
+# LOAD DATA (BATCH — une requête par relation)
+# --------------------------------------------------
+
+def load_news_map(news_ids: List[str]) -> Dict[str, Dict[str, Any]]:
 
     query = f"""
-        SELECT t.LABEL
+        SELECT *
+        FROM `{TABLE_NEWS}`
+        WHERE ID_NEWS IN UNNEST(@ids)
+    """
+
+    rows = query_bq(query, {"ids": news_ids})
+
+    return {r["ID_NEWS"]: r for r in rows}
+
+
+def _load_labels_map(query: str, news_ids: List[str]) -> Dict[str, List[str]]:
+
+    rows = query_bq(query, {"ids": news_ids})
+
+    labels: Dict[str, List[str]] = {}
+
+    for r in rows:
+        if r.get("LABEL"):
+            labels.setdefault(r["ID_NEWS"], []).append(str(r["LABEL"]))
+
+    return labels
+
+
+def load_news_topics_map(news_ids: List[str]) -> Dict[str, List[str]]:
+
+    return _load_labels_map(f"""
+        SELECT nt.ID_NEWS, t.LABEL
         FROM `{TABLE_NEWS_TOPIC}` nt
         JOIN `{TABLE_TOPIC}` t
         ON nt.ID_TOPIC = t.ID_TOPIC
-        WHERE nt.ID_NEWS = '{news_id}'
-    """
+        WHERE nt.ID_NEWS IN UNNEST(@ids)
+    """, news_ids)
 
-    rows = query_bq(query)
 
-    return [
-        str(r["LABEL"])
-        for r in rows
-        if r.get("LABEL")
-    ]
-
-def load_news_solutions(news_id: str) -> List[str]:
+def load_news_solutions_map(news_ids: List[str]) -> Dict[str, List[str]]:
 
-    query = f"""
-        SELECT s.NAME
+    return _load_labels_map(f"""
+        SELECT ns.ID_NEWS, s.NAME AS LABEL
         FROM `{TABLE_NEWS_SOLUTION}` ns
         JOIN `{TABLE_SOLUTION}` s
         ON ns.ID_SOLUTION = s.ID_SOLUTION
-        WHERE ns.ID_NEWS = '{news_id}'
-    """
+        WHERE ns.ID_NEWS IN UNNEST(@ids)
+    """, news_ids)
 
-    rows = query_bq(query)
-
-    return [
-        str(r["NAME"])
-        for r in rows
-        if r.get("NAME")
-    ]
 
+def load_companies_map(company_ids: List[str]) -> Dict[str, str]:
 
-def load_company(company_id: str) -> str:
+    company_ids = [c for c in company_ids if c]
 
-    if not company_id:
-        return ""
+    if not company_ids:
+        return {}
 
     query = f"""
-        SELECT NAME
+        SELECT ID_COMPANY, NAME
         FROM `{TABLE_COMPANY}`
-        WHERE ID_COMPANY = '{company_id}'
-        LIMIT 1
+        WHERE ID_COMPANY IN UNNEST(@ids)
     """
 
-    rows = query_bq(query)
+    rows = query_bq(query, {"ids": company_ids})
 
-    if not rows:
-        return ""
-
-    return rows[0]["NAME"]
+    return {r["ID_COMPANY"]: r["NAME"] for r in rows}
 
 
 # --------------------------------------------------
@@ -143,11 +160,76 @@ def build_news_blocks(news: Dict[str, Any]) -> Dict[str, str]:
     return blocs
 
 
+def build_news_vector_specs(
+    news_id: str,
+    news: Dict[str, Any],
+    topics: List[str],
+    solutions: List[str],
+    company_name: str,
+) -> List[Dict[str, Any]]:
+    """
+    Un spec par bloc non vide : id Pinecone, texte enrichi à embedder, metadata.
+    """
+
+    specs = []
+
+    for bloc_type, text in build_news_blocks(news).items():
+
+        if not text or text.strip() == "":
+            print(f"⚠️ EMPTY BLOCK SKIPPED: {bloc_type}")
+            continue
+
+        enriched_text = f"""
+TYPE: news
+BLOC: {bloc_type}
+
+TITLE:
+{news.get("TITLE")}
+
+CONTENT:
+{text}
+
+COMPANY:
+{company_name}
+
+TOPICS:
+{", ".join(topics)}
+
+SOLUTIONS:
+{", ".join(solutions)}
+        """.strip()
+
+        specs.append({
+            "id": f"news_{news_id}_{bloc_type}",
+            "text": enriched_text,
+            "metadata": {
+                "type": "news",
+                "id_news": news_id,
+                "bloc_type": bloc_type,
+
+                "title": news.get("TITLE"),
+                "excerpt": news.get("EXCERPT"),  # 🔥 AJOUT
+
+                "content": text[:500],  # 🔥 CRUCIAL (preview bloc)
+
+                "company": company_name,
+                "topics": topics,
+                "solutions": solutions,
+
+                "news_type": news.get("NEWS_TYPE"),
+                "news_kind": news.get("NEWS_KIND"),
+                "published_at": str(news.get("PUBLISHED_AT")),
+            },
+        })
+
+    return specs
+
+
 # --------------------------------------------------
 # MAIN
 # --------------------------------------------------
 
-def vectorize_news(news_id: str) -> Dict[str, Any]:
+def vectorize_news(news_id: str, mark_vectorized: bool = True) -> Dict[str, Any]:
 
     print("=== VECTORIZE START ===", news_id)
 
@@ -180,114 +262,194 @@ def vectorize_news(news_id: str) -> Dict[str, Any]:
     company_name = load_company(news.get("ID_COMPANY"))
     print("✅ COMPANY:", company_name)
 
-    blocs = build_news_blocks(news)
-    print("✅ BLOCS:", list(blocs.keys()))
+    # ----------------------------------------
+    # BUILD VECTORS (un seul appel embeddings)
+    # ----------------------------------------
 
-    vectors = []
+    specs = build_news_vector_specs(
+        news_id,
+        news,
+        topics,
+        solutions,
+        company_name,
+    )
+    print("✅ BLOCS:", [s["metadata"]["bloc_type"] for s in specs])
+
+    vectors = embed_vector_specs(specs) if specs else []
+
+    print("📦 TOTAL VECTORS:", len(vectors))
 
     # ----------------------------------------
-    # BUILD VECTORS
+    # UPSERT + UPDATE BQ
     # ----------------------------------------
 
-    for bloc_type, text in blocs.items():
+    if vectors:
+        print("🚀 UPSERT START")
 
-        if not text or text.strip() == "":
-            print(f"⚠️ EMPTY BLOCK SKIPPED: {bloc_type}")
-            continue
+        upserted = upsert_vectors(index, vectors)
 
-        print(f"➡️ PROCESS BLOCK: {bloc_type}")
+        print("✅ UPSERT DONE:", upserted)
 
-        enriched_text = f"""
-TYPE: news
-BLOC: {bloc_type}
+        # En batch, le flag est posé en une fois par l'appelant
+        if mark_vectorized:
 
-TITLE:
-{news.get("TITLE")}
+            print("📝 UPDATE BQ START")
 
-CONTENT:
-{text}
+            update_bq(
+                table=TABLE_NEWS,
+                fields={
+                    "IS_VECTORIZED": True
+                },
+                where={
+                    "ID_NEWS": news_id
+                }
+            )
 
-COMPANY:
-{company_name}
+            print("✅ UPDATE BQ DONE")
 
-TOPICS:
-{", ".join(topics)}
+    else:
+        print("⚠️ NO VECTORS TO UPSERT")
 
-SOLUTIONS:
-{", ".join(solutions)}
-        """.strip()
+    print("=== VECTORIZE END ===")
 
-        print("🧠 EMBEDDING START")
+    return {
+        "status": "ok",
+        "news_id": news_id,
+        "nb_vectors": len(vectors)
+    }
 
-        embedding = embed_text(enriched_text)
 
-        print("✅ EMBEDDING DONE - size:", len(embedding))
+# --------------------------------------------------
+# BATCH PIPELINE
+# --------------------------------------------------
 
-        vector_id = f"news_{news_id}_{bloc_type}"
+def vectorize_news_batch(
+    news_ids: List[str],
+    items_per_batch: int = 30,
+) -> Dict[str, Any]:
+    """
+    Vectorisation par lots :
+    - 1 requête BigQuery par relation pour tout le lot
+    - 1 appel embeddings.create par paquet d'items (tous blocs confondus)
+    - upsert Pinecone par paquets, puis IS_VECTORIZED en un seul MERGE
 
-        metadata = {
-            "type": "news",
-            "id_news": news_id,
-            "bloc_type": bloc_type,
+    Un échec isole uniquement le paquet d'items concerné.
+    """
 
-            "title": news.get("TITLE"),
-            "excerpt": news.get("EXCERPT"),  # 🔥 AJOUT
+    print("=== VECTORIZE NEWS BATCH START ===", len(news_ids))
 
-            "content": text[:500],  # 🔥 CRUCIAL (preview bloc)
+    if not is_pinecone_enabled():
+        print("❌ Pinecone disabled")
+        return {
+            "status": "disabled",
+            "results": [
+                {"news_id": news_id, "status": "disabled"}
+                for news_id in dict.fromkeys(news_ids)
+            ],
+        }
 
-            "company": company_name,
-            "topics": topics,
-            "solutions": solutions,
+    index = get_pinecone_index()
 
-            "news_type": news.get("NEWS_TYPE"),
-            "news_kind": news.get("NEWS_KIND"),
-            "published_at": str(news.get("PUBLISHED_AT")),
-        }
+    news_ids = list(dict.fromkeys(news_ids))
 
-        vectors.append({
-            "id": vector_id,
-            "values": embedding,
-            "metadata": metadata
-        })
+    results: Dict[str, Dict[str, Any]] = {}
+    vectorized_ids: List[str] = []
 
-    print("📦 TOTAL VECTORS:", len(vectors))
+    for batch_ids in chunked(news_ids, max(1, items_per_batch)):
 
-    # ----------------------------------------
-    # UPSERT + UPDATE BQ
-    # ----------------------------------------
+        try:
 
-    if vectors:
-        print("🚀 UPSERT START")
+            news_map = load_news_map(batch_ids)
+            topics = load_news_topics_map(batch_ids)
+            solutions = load_news_solutions_map(batch_ids)
+            companies = load_companies_map([
+                n.get("ID_COMPANY") for n in news_map.values()
+            ])
 
-        index.upsert(vectors)
+            specs = []
 
-        print("✅ UPSERT DONE")
+            for news_id in batch_ids:
 
-        print("📝 UPDATE BQ START")
+                news = news_map.get(news_id)
 
-        update_bq(
-            table=TABLE_NEWS,
-            fields={
-                "IS_VECTORIZED": True
-            },
-            where={
-                "ID_NEWS": news_id
-            }
-        )
+                if not news:
+                    results[news_id] = {
+                        "status": "error",
+                        "error": f"News not found: {news_id}",
+                    }
+                    continue
 
-        print("✅ UPDATE BQ DONE")
+                item_specs = build_news_vector_specs(
+                    news_id,
+                    news,
+                    topics.get(news_id, []),
+                    solutions.get(news_id, []),
+                    companies.get(news.get("ID_COMPANY"), ""),
+                )
 
-    else:
-        print("⚠️ NO VECTORS TO UPSERT")
+                specs.extend(item_specs)
 
-    print("=== VECTORIZE END ===")
+                results[news_id] = {
+                    "status": "ok",
+                    "nb_vectors": len(item_specs),
+                }
+
+            vectors = embed_vector_specs(specs) if specs else []
+
+            upsert_vectors(index, vectors)
+
+            vectorized_ids.extend(
+                news_id
+                for news_id in batch_ids
+                if results[news_id].get("nb_vectors")
+            )
+
+        except Exception as e:
+
+            print("❌ BATCH ERROR:", str(e))
+
+            for news_id in batch_ids:
+                results[news_id] = {
+                    "status": "error",
+                    "error": str(e),
+                }
+
+    mark_news_vectorized(vectorized_ids)
+
+    print("=== VECTORIZE NEWS BATCH END ===", len(vectorized_ids))
 
     return {
         "status": "ok",
-        "news_id": news_id,
-        "nb_vectors": len(vectors)
+        "results": [
+            {"news_id": news_id, **results[news_id]}
+            for news_id in news_ids
+        ],
     }
 
+# --------------------------------------------------
+# BULK FLAG
+# --------------------------------------------------
+
+def mark_news_vectorized(ids: List[str]) -> int:
+    """
+    Pose IS_VECTORIZED = TRUE sur tout un lot en un seul MERGE.
+    """
+
+    if not ids:
+        return 0
+
+    result = bulk_update_bq(
+        TABLE_NEWS,
+        "ID_NEWS",
+        [
+            {"ID_NEWS": i, "IS_VECTORIZED": True}
+            for i in ids
+        ],
+    )
+
+    return result["affected"]
+
+
 def get_news_vector_status(limit: int = 50, offset: int = 0):
 
     # ----------------------------------------
@@ -149,6 +149,7 @@ def generate_workspace_output(
     result = run_llm(
         prompt=prompt,
         temperature=0.2,
+        cache=True,
     )
 
     # ========================================================
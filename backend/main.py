@@ -10,6 +10,8 @@ from fastapi.middleware.cors import CORSMiddleware
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE_DIR)
 
+from utils.http_cache import HTTPCacheMiddleware
+
 # -------------------------------------------------------
 # APP
 # -------------------------------------------------------
@@ -19,6 +21,10 @@ app = FastAPI(
     description="Ratecard backend API"
 )
 
+# Cache des routes de lecture (@http_cache) : ajouté avant CORS,
+# donc exécuté à l'intérieur (les réponses en cache gardent les en-têtes CORS)
+app.add_middleware(HTTPCacheMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
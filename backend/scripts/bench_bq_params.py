@@ -0,0 +1,89 @@
+import sys
+import os
+import timeit
+
+# ------------------------------------------------------------
+# Permet d'importer utils / config
+# ------------------------------------------------------------
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+# ------------------------------------------------------------
+# Imports
+# ------------------------------------------------------------
+from google.cloud import bigquery
+
+from utils.bigquery_utils import build_query_params
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+N_IDS = 10_000
+REPEAT = 20
+
+
+# ------------------------------------------------------------
+# Ancien encodage de query_bq (référence)
+# ------------------------------------------------------------
+def legacy_query_params(params: dict) -> list:
+
+    query_parameters = []
+
+    for name, value in params.items():
+
+        if isinstance(value, list):
+
+            if len(value) == 0:
+                value = ["__EMPTY__"]
+
+            query_parameters.append(
+                bigquery.ArrayQueryParameter(name, "STRING", value)
+            )
+
+        elif isinstance(value, int):
+            query_parameters.append(
+                bigquery.ScalarQueryParameter(name, "INT64", value)
+            )
+
+        else:
+            query_parameters.append(
+                bigquery.ScalarQueryParameter(name, "STRING", value)
+            )
+
+    return query_parameters
+
+
+def bench(label: str, builder, params: dict):
+
+    # build + sérialisation API (ce que paie réellement chaque requête)
+    def run():
+        for p in builder(params):
+            p.to_api_repr()
+
+    seconds = min(timeit.repeat(run, number=1, repeat=REPEAT))
+
+    print(f"{label:<32} {seconds * 1000:8.2f} ms")
+
+
+# ------------------------------------------------------------
+# RUN
+# ------------------------------------------------------------
+string_ids = {"ids": [f"id_{i:06d}" for i in range(N_IDS)], "limit": 50}
+int_ids = {"ids": list(range(N_IDS)), "limit": 50}
+
+print(f"IN UNNEST(@ids) — {N_IDS} ids, meilleur de {REPEAT}")
+print("--------------------------------------------------")
+
+bench("legacy   ARRAY<STRING> (str)", legacy_query_params, string_ids)
+bench("typed    ARRAY<STRING> (str)", build_query_params, string_ids)
+bench("legacy   ARRAY<STRING> (int)*", legacy_query_params, int_ids)
+bench("typed    ARRAY<INT64>  (int)", build_query_params, int_ids)
+
+print("--------------------------------------------------")
+print("* l'ancien encodage envoie des int comme STRING : requête invalide")
+print("  sur une colonne INT64 sans CAST côté SQL.")
+print("Surcoût attendu du typage sur les str : une passe sur les types des")
+print("éléments (~0.15 ms / 10k ids), négligeable devant l'aller-retour")
+print("BigQuery. Les int coûtent plus cher à sérialiser en INT64 (client")
+print("bigquery), mais c'est le seul encodage correct.")
@@ -0,0 +1,169 @@
+import sys
+import os
+
+# ------------------------------------------------------------
+# Permet d'importer utils / config
+# ------------------------------------------------------------
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+# ------------------------------------------------------------
+# Imports
+# ------------------------------------------------------------
+from utils.bigquery_utils import get_bigquery_client
+from config import BQ_PROJECT, BQ_DATASET
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+# Partitionnement par jour de publication + clustering sur les
+# colonnes filtrées par le radar / les feeds. BigQuery ne permet pas
+# d'ajouter un partitionnement à une table existante : on recrée la
+# table puis on échange les noms, l'ancienne est conservée en
+# *_LEGACY.
+#
+# - CREATE TABLE ... LIKE : schéma complet conservé (descriptions,
+#   modes REQUIRED), contrairement à un CTAS
+# - INSERT ... SELECT * : copie des lignes
+#
+# ⚠️ GEL DES ÉCRITURES OBLIGATOIRE : couper les workers / crons qui
+# écrivent dans ces tables (destock, sync, publication) avant --apply.
+# Les renommages ne sont pas atomiques avec la copie : une écriture
+# entre la copie et le renommage resterait dans *_LEGACY. Le script
+# le vérifie (nombre de lignes + date de dernière modification de la
+# table source avant / après la copie) et abandonne la table, sans
+# renommer, si elle a bougé. Entre les deux ALTER, la table est
+# absente quelques instants : les écritures échouent (pas de perte
+# silencieuse).
+#
+# Usage :
+#   python scripts/partition_enriched_tables.py           → affiche le DDL
+#   python scripts/partition_enriched_tables.py --apply   → exécute
+
+TABLES = [
+    {
+        # base de V_NEWS_ENRICHED
+        "table": "RATECARD_NEWS",
+        "partition": "DATE(PUBLISHED_AT)",
+        "cluster": ["STATUS", "ID_COMPANY"],
+    },
+    {
+        # base de V_CONTENT_ENRICHED
+        "table": "RATECARD_CONTENT",
+        "partition": "DATE(PUBLISHED_AT)",
+        "cluster": ["STATUS", "CONTENT_TYPE", "ID_PRIMARY_COMPANY"],
+    },
+    {
+        "table": "RATECARD_CONTENT_ENRICHED",
+        "partition": "DATE(published_at)",
+        "cluster": ["status", "content_type", "id_primary_company"],
+    },
+]
+
+
+def build_ddl(spec: dict) -> dict:
+
+    table = f"{BQ_PROJECT}.{BQ_DATASET}.{spec['table']}"
+    tmp = f"{table}__PARTITIONED"
+
+    return {
+        "table": table,
+        "tmp": tmp,
+        "create": f"""
+CREATE TABLE `{tmp}`
+LIKE `{table}`
+PARTITION BY {spec["partition"]}
+CLUSTER BY {", ".join(spec["cluster"])}
+""".strip(),
+        "copy": f"INSERT INTO `{tmp}` SELECT * FROM `{table}`",
+        "renames": [
+            f"ALTER TABLE `{table}` RENAME TO `{spec['table']}_LEGACY`",
+            f"ALTER TABLE `{tmp}` RENAME TO `{spec['table']}`",
+        ],
+        "drop_tmp": f"DROP TABLE IF EXISTS `{tmp}`",
+    }
+
+
+def table_state(client, table: str) -> tuple:
+    """
+    (nombre de lignes, dernière modification) : COUNT(*) voit aussi
+    le streaming buffer, modified couvre les DML.
+    """
+
+    rows = list(client.query(f"SELECT COUNT(*) AS n FROM `{table}`").result())
+
+    return rows[0]["n"], client.get_table(table).modified
+
+
+def migrate(client, spec: dict) -> bool:
+
+    ddl = build_ddl(spec)
+
+    client.query(ddl["create"]).result()
+    print("✅ CREATE LIKE")
+
+    before = table_state(client, ddl["table"])
+
+    client.query(ddl["copy"]).result()
+
+    after = table_state(client, ddl["table"])
+    copied, _ = table_state(client, ddl["tmp"])
+
+    print(f"   source {before[0]} → {after[0]} lignes, copie {copied}")
+
+    if after != before or copied != before[0]:
+        print("❌ TABLE MODIFIÉE PENDANT LA COPIE (écritures non gelées) : abandon")
+        client.query(ddl["drop_tmp"]).result()
+        return False
+
+    for statement in ddl["renames"]:
+        client.query(statement).result()
+
+    print("✅ RENAMED")
+
+    return True
+
+
+def main():
+
+    apply = "--apply" in sys.argv
+
+    print("Project:", BQ_PROJECT)
+    print("Dataset:", BQ_DATASET)
+    print("Mode:", "APPLY" if apply else "DRY (affichage)")
+    print("--------------------------------------------------")
+
+    if not apply:
+
+        for spec in TABLES:
+
+            ddl = build_ddl(spec)
+
+            print(f"\n-- {spec['table']}")
+
+            for statement in [ddl["create"], ddl["copy"], *ddl["renames"]]:
+                print(statement + ";")
+
+        return
+
+    print("⚠️ Les écritures sur ces tables doivent être gelées.")
+
+    client = get_bigquery_client()
+
+    failed = []
+
+    for spec in TABLES:
+
+        print(f"\n-- {spec['table']}")
+
+        if not migrate(client, spec):
+            failed.append(spec["table"])
+
+    if failed:
+        print("\n❌ NON MIGRÉES :", ", ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import sys
+import os
+
+# ------------------------------------------------------------
+# Permet d'importer utils / config
+# ------------------------------------------------------------
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+# ------------------------------------------------------------
+# Imports
+# ------------------------------------------------------------
+from utils.bigquery_utils import dry_run_bq
+from core.radar.service import (
+    VIEW_NEWS,
+    VIEW_CONTENT,
+    _build_radar_content_query,
+)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+# Octets scannés par un appel radar (dry run, sans coût) :
+# ancien filtre EXTRACT(...) vs bornes [start, end).
+#
+# Usage :
+#   python scripts/radar_scan_report.py topic <ID_TOPIC> MONTHLY 2025 3
+
+SAMPLES = [
+    ("WEEKLY", 1),
+    ("MONTHLY", 3),
+    ("QUARTERLY", 2),
+]
+
+
+# ------------------------------------------------------------
+# Ancien filtre de _get_radar_content (référence)
+# ------------------------------------------------------------
+def legacy_query(entity_type, entity_id, year, period, frequency):
+
+    sql, params = _build_radar_content_query(
+        entity_type, entity_id, year, period, frequency
+    )
+
+    extract = {
+        "WEEKLY": "ISOWEEK",
+        "QUARTERLY": "QUARTER",
+    }.get(frequency, "MONTH")
+
+    for alias in ("n", "c"):
+        sql = sql.replace(
+            f"AND {alias}.published_at >= @start_at\n"
+            f"        AND {alias}.published_at < @end_at",
+            f"AND EXTRACT(YEAR FROM {alias}.published_at) = @year\n"
+            f"        AND EXTRACT({extract} FROM {alias}.published_at) = @period",
+        )
+
+    return sql, {
+        "entity_id": entity_id,
+        "year": year,
+        "period": period,
+    }
+
+
+def fmt(n: int) -> str:
+    return f"{n / 1024 / 1024:,.1f} MB"
+
+
+def report(entity_type, entity_id, frequency, year, period):
+
+    old_sql, old_params = legacy_query(
+        entity_type, entity_id, year, period, frequency
+    )
+    new_sql, new_params = _build_radar_content_query(
+        entity_type, entity_id, year, period, frequency
+    )
+
+    old_bytes = dry_run_bq(old_sql, old_params)
+    new_bytes = dry_run_bq(new_sql, new_params)
+
+    ratio = (1 - new_bytes / old_bytes) * 100 if old_bytes else 0
+
+    print(
+        f"{frequency:<10} {year}-{period:<3} "
+        f"legacy {fmt(old_bytes):>12} | range {fmt(new_bytes):>12} "
+        f"| -{ratio:.0f}%"
+    )
+
+
+def main():
+
+    args = sys.argv[1:]
+
+    print("Views:", VIEW_NEWS, "/", VIEW_CONTENT)
+    print("--------------------------------------------------")
+
+    if len(args) == 5:
+        entity_type, entity_id, frequency, year, period = args
+        report(entity_type, entity_id, frequency, int(year), int(period))
+        return
+
+    if len(args) != 3:
+        print("Usage: radar_scan_report.py <entity_type> <entity_id> <year>")
+        print("       radar_scan_report.py <entity_type> <entity_id> <frequency> <year> <period>")
+        return
+
+    entity_type, entity_id, year = args
+
+    for frequency, period in SAMPLES:
+        report(entity_type, entity_id, frequency, int(year), period)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import asyncio
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+
+# ============================================================
+# ASGI CLIENT (sans httpx)
+# ============================================================
+
+class ASGIResponse:
+
+    def __init__(self, status, headers, body):
+        self.status_code = status
+        self.headers = {k.decode().lower(): v.decode() for k, v in headers}
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+def asgi_request(app, method, path, headers=None, body=None, query=""):
+    """
+    Appel complet à travers l'app ASGI (routing, validation,
+    response_model, middlewares), sans serveur ni httpx.
+    """
+
+    raw_body = b""
+
+    if body is not None:
+        raw_body = json.dumps(body).encode()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [
+            (k.lower().encode(), v.encode())
+            for k, v in {
+                "content-type": "application/json",
+                **(headers or {}),
+            }.items()
+        ],
+        "client": ("test", 0),
+        "server": ("test", 80),
+        "app": app,
+    }
+
+    messages = [{"type": "http.request", "body": raw_body, "more_body": False}]
+    sent = []
+
+    async def run():
+
+        # déconnexion signalée seulement une fois la réponse envoyée
+        # (sinon StreamingResponse annule son corps)
+        done = asyncio.Event()
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if (
+                message["type"] == "http.response.body"
+                and not message.get("more_body")
+            ):
+                done.set()
+
+        await app(scope, receive, send)
+
+    asyncio.run(run())
+
+    start = next(m for m in sent if m["type"] == "http.response.start")
+    body_out = b"".join(
+        m.get("body", b"") for m in sent
+        if m["type"] == "http.response.body"
+    )
+
+    return ASGIResponse(start["status"], start.get("headers", []), body_out)
+
+
+@pytest.fixture
+def call():
+    return asgi_request
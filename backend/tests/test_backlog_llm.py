@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+import core.numbers.backlog_llm as backlog_llm
+
+
+ROWS = [{"chiffre": f"{i} M€"} for i in range(3)]
+
+KEEP = {"decision": "KEEP", "label": "CA", "value": "12", "unit": "M€"}
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """
+    Réponses par prompt : "BATCH" pour le paquet, l'index de la ligne
+    pour les appels unitaires.
+    """
+
+    calls = {"prompts": [], "forgotten": [], "responses": {}}
+
+    monkeypatch.setattr(backlog_llm, "build_batch_prompt", lambda rows: "BATCH")
+    monkeypatch.setattr(
+        backlog_llm,
+        "build_prompt",
+        lambda row: f"ROW {row['chiffre'].split()[0]}",
+    )
+
+    def fake_run_llm(prompt, **kwargs):
+        calls["prompts"].append(prompt)
+        return calls["responses"].get(prompt, json.dumps(KEEP))
+
+    monkeypatch.setattr(backlog_llm, "run_llm", fake_run_llm)
+    monkeypatch.setattr(
+        backlog_llm,
+        "forget_llm_response",
+        lambda prompt, **kwargs: calls["forgotten"].append(prompt),
+    )
+
+    return calls
+
+
+def test_batch_answer_used_for_every_row(llm):
+
+    llm["responses"]["BATCH"] = json.dumps({
+        "results": [{"index": i, **KEEP} for i in range(3)]
+    })
+
+    results = backlog_llm.process_backlog_batch(ROWS)
+
+    assert llm["prompts"] == ["BATCH"]
+    assert [r["status"] for r in results] == ["ok"] * 3
+    assert results[0]["output"]["value"] == 12.0
+    assert [r["input"] for r in results] == ROWS
+
+
+def test_invalid_batch_json_falls_back_to_rows_and_forgets_cache(llm):
+
+    llm["responses"]["BATCH"] = "not json"
+
+    results = backlog_llm.process_backlog_batch(ROWS)
+
+    assert llm["forgotten"] == ["BATCH"]
+    assert llm["prompts"] == ["BATCH", "ROW 0", "ROW 1", "ROW 2"]
+    assert [r["status"] for r in results] == ["ok"] * 3
+
+
+def test_missing_or_invalid_items_replayed_individually(llm):
+
+    llm["responses"]["BATCH"] = json.dumps({
+        "results": [
+            {"index": 0, **KEEP},
+            {"index": 2, "decision": "MAYBE"},
+        ]
+    })
+    llm["responses"]["ROW 2"] = "{}"
+
+    results = backlog_llm.process_backlog_batch(ROWS)
+
+    assert llm["prompts"] == ["BATCH", "ROW 1", "ROW 2"]
+    assert [r["status"] for r in results] == ["ok", "ok", "error"]
+    assert llm["forgotten"] == ["ROW 2"]
+
+
+def test_single_row_skips_batch_prompt(llm):
+
+    results = backlog_llm.process_backlog_batch(ROWS[:1])
+
+    assert llm["prompts"] == ["ROW 0"]
+    assert results[0]["status"] == "ok"
+
+
+def test_process_backlog_rows_keeps_input_order(llm):
+
+    rows = [{"chiffre": f"{i} M€"} for i in range(7)]
+
+    results = backlog_llm.process_backlog_rows(rows, batch_size=1, concurrency=3)
+
+    assert [r["input"] for r in results] == rows
@@ -0,0 +1,81 @@
+from datetime import date, datetime, timezone
+
+from google.cloud import bigquery
+
+from utils.bigquery_utils import bq_typed, build_query_param, build_query_params
+
+
+def test_scalars_are_typed_from_python_values():
+
+    assert build_query_param("n", 3).type_ == "INT64"
+    assert build_query_param("b", True).type_ == "BOOL"
+    assert build_query_param("f", 1.5).type_ == "FLOAT64"
+    assert build_query_param("d", date(2025, 1, 1)).type_ == "DATE"
+    assert build_query_param("ts", datetime(2025, 1, 1, tzinfo=timezone.utc)).type_ == "TIMESTAMP"
+    assert build_query_param("s", "x").type_ == "STRING"
+
+
+def test_none_is_a_null_string():
+
+    param = build_query_param("x", None)
+
+    assert (param.type_, param.value) == ("STRING", None)
+
+
+def test_arrays_use_element_type():
+
+    assert build_query_param("ids", ["a", "b"]).array_type == "STRING"
+    assert build_query_param("ids", [1, 2, None]).array_type == "INT64"
+    assert build_query_param("ids", (1, 2.5)).array_type == "FLOAT64"
+    assert build_query_param("ids", [1, "a"]).array_type == "STRING"
+
+
+def test_empty_array_is_allowed():
+
+    param = build_query_param("ids", [])
+
+    assert (param.array_type, param.values) == ("STRING", [])
+
+
+def test_list_of_dicts_becomes_struct_array():
+
+    param = build_query_param(
+        "rows",
+        [{"id": "a", "n": 1, "tags": ["x"]}, {"id": "b", "n": None, "tags": []}],
+    )
+
+    api = param.to_api_repr()
+    fields = {
+        f["name"]: f["type"]
+        for f in api["parameterType"]["arrayType"]["structTypes"]
+    }
+
+    assert fields["id"]["type"] == "STRING"
+    assert fields["n"]["type"] == "INT64"
+    assert fields["tags"] == {"type": "ARRAY", "arrayType": {"type": "STRING"}}
+    assert len(api["parameterValue"]["arrayValues"]) == 2
+
+
+def test_dict_becomes_struct():
+
+    param = build_query_param("s", {"a": 1, "b": "x"})
+
+    assert isinstance(param, bigquery.StructQueryParameter)
+    assert param.struct_types == {"a": "INT64", "b": "STRING"}
+
+
+def test_explicit_types():
+
+    assert build_query_param("x", bq_typed(None, "INT64")).type_ == "INT64"
+
+    array = build_query_param("ids", bq_typed([], "ARRAY<INT64>"))
+
+    assert (array.array_type, array.values) == ("INT64", [])
+
+
+def test_prebuilt_parameter_is_passed_through():
+
+    prebuilt = bigquery.ScalarQueryParameter("x", "STRING", "v")
+
+    assert build_query_param("x", prebuilt) is prebuilt
+    assert build_query_params(None) == []
@@ -0,0 +1,193 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+
+import api.news.routes as routes
+import core.news.stats_service as stats_service
+
+
+COMPUTED_AT = datetime(2024, 5, 2, 10, 30, 15, 123, tzinfo=timezone.utc)
+
+SNAPSHOT = {
+    "payload": {"total_count": 12, "top_companies": []},
+    "etag": '"abc"',
+    "last_modified": COMPUTED_AT.replace(microsecond=0),
+}
+
+
+def _app():
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api/news")
+    return app
+
+
+@pytest.fixture
+def snapshot(monkeypatch):
+    monkeypatch.setattr(routes, "get_public_stats_snapshot", lambda: dict(SNAPSHOT))
+
+
+# ============================================================
+# ROUTE /breves/stats
+# ============================================================
+
+def test_breves_stats_payload_and_validators(call, snapshot):
+
+    r = call(_app(), "GET", "/api/news/breves/stats")
+
+    assert r.status_code == 200
+    assert r.json() == {"status": "ok", "total_count": 12, "top_companies": []}
+
+    assert r.headers["etag"] == '"abc"'
+    assert r.headers["last-modified"] == "Thu, 02 May 2024 10:30:15 GMT"
+    assert r.headers["cache-control"].startswith("public, max-age=")
+
+
+@pytest.mark.parametrize("headers", [
+    {"If-None-Match": '"abc"'},
+    {"If-None-Match": 'W/"abc", "other"'},
+    {"If-None-Match": "*"},
+    {"If-Modified-Since": "Thu, 02 May 2024 10:30:15 GMT"},
+])
+def test_breves_stats_not_modified(call, snapshot, headers):
+
+    r = call(_app(), "GET", "/api/news/breves/stats", headers=headers)
+
+    assert r.status_code == 304
+    assert r.body == b""
+    assert r.headers["etag"] == '"abc"'
+
+
+@pytest.mark.parametrize("headers", [
+    {"If-None-Match": '"other"'},
+    {"If-Modified-Since": "Wed, 01 May 2024 00:00:00 GMT"},
+    {"If-Modified-Since": "not a date"},
+    # If-None-Match prioritaire sur If-Modified-Since
+    {
+        "If-None-Match": '"other"',
+        "If-Modified-Since": "Thu, 02 May 2024 10:30:15 GMT",
+    },
+])
+def test_breves_stats_modified(call, snapshot, headers):
+
+    r = call(_app(), "GET", "/api/news/breves/stats", headers=headers)
+
+    assert r.status_code == 200
+    assert r.json()["total_count"] == 12
+
+
+# ============================================================
+# ROUTES /breves/stats/refresh
+# ============================================================
+
+def test_breves_stats_refresh_routes(call, monkeypatch):
+
+    monkeypatch.setattr(routes, "schedule_public_stats_refresh", lambda reason: "j1")
+    monkeypatch.setattr(
+        routes, "get_public_stats_job",
+        lambda job_id: {"job_id": job_id, "status": "done"} if job_id == "j1" else None,
+    )
+
+    app = _app()
+
+    r = call(app, "POST", "/api/news/breves/stats/refresh")
+
+    assert r.json() == {"status": "ok", "job_id": "j1", "queued": True}
+
+    r = call(app, "GET", "/api/news/breves/stats/refresh/j1")
+
+    assert r.json() == {"status": "ok", "job": {"job_id": "j1", "status": "done"}}
+
+    r = call(app, "GET", "/api/news/breves/stats/refresh/nope")
+
+    assert r.status_code == 404
+
+
+def test_breves_stats_refresh_already_queued(call, monkeypatch):
+
+    monkeypatch.setattr(routes, "schedule_public_stats_refresh", lambda reason: None)
+
+    r = call(_app(), "POST", "/api/news/breves/stats/refresh")
+
+    assert r.json() == {"status": "ok", "job_id": None, "queued": False}
+
+
+# ============================================================
+# SNAPSHOT (SERVICE)
+# ============================================================
+
+@pytest.fixture
+def snapshot_rows(monkeypatch):
+
+    queries = []
+    scheduled = []
+    rows = []
+
+    def fake_query_bq(sql, params=None):
+        queries.append(sql)
+        return list(rows)
+
+    monkeypatch.setattr(stats_service, "query_bq", fake_query_bq)
+    monkeypatch.setattr(
+        stats_service, "schedule_public_stats_refresh", scheduled.append,
+    )
+
+    stats_service._PUBLIC_STATS.invalidate()
+
+    yield rows, queries, scheduled
+
+    stats_service._PUBLIC_STATS.invalidate()
+
+
+def _row(computed_at):
+    return {
+        "GLOBAL_STATS": {"TOTAL": 3, "LAST_7_DAYS": 1, "LAST_30_DAYS": 2},
+        "TYPES_STATS": [],
+        "TOPICS_STATS": [],
+        "NEWS_COMPANY_STATS": [{"ID_COMPANY": "c1", "NAME": "Havas", "TOTAL": 2}],
+        "CONTENT_COMPANY_STATS": [{"ID_COMPANY": "c1", "NAME": "Havas", "TOTAL": 1}],
+        "COMPUTED_AT": computed_at,
+    }
+
+
+def test_snapshot_read_once_per_ttl(snapshot_rows):
+
+    rows, queries, scheduled = snapshot_rows
+    rows.append(_row(datetime.now(timezone.utc)))
+
+    first = stats_service.get_public_stats_snapshot()
+    second = stats_service.get_public_stats_snapshot()
+
+    assert len(queries) == 1
+    assert first == second
+    assert first["etag"].startswith('"')
+    assert first["last_modified"].microsecond == 0
+    assert first["payload"]["total_count"] == 3
+    assert first["payload"]["top_companies"][0]["total"] == 3
+    assert scheduled == []
+
+
+def test_stale_snapshot_served_and_refresh_scheduled(snapshot_rows):
+
+    rows, _, scheduled = snapshot_rows
+    rows.append(_row(datetime.now(timezone.utc) - timedelta(days=2)))
+
+    snapshot = stats_service.get_public_stats_snapshot()
+
+    assert snapshot["payload"]["total_count"] == 3
+    assert scheduled == ["max_age"]
+
+
+def test_etag_depends_on_payload_only():
+
+    now = datetime.now(timezone.utc)
+
+    a = stats_service._snapshot_from_row(_row(now))
+    b = stats_service._snapshot_from_row(_row(now - timedelta(hours=1)))
+
+    assert a["etag"] == b["etag"]
+
+    changed = _row(now)
+    changed["GLOBAL_STATS"] = {"TOTAL": 4}
+
+    assert stats_service._snapshot_from_row(changed)["etag"] != a["etag"]
@@ -0,0 +1,220 @@
+import json
+import asyncio
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+
+import api.content.routes as routes
+import core.content.service as content_service
+from utils.streaming import stream_json_list
+
+
+def _app():
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api/content")
+    return app
+
+
+# ============================================================
+# STREAMING
+# ============================================================
+
+def _body(response) -> str:
+
+    async def collect():
+        return "".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect())
+
+
+def test_stream_json_list_matches_plain_dict():
+
+    items = [
+        {"id": "c1", "published_at": datetime(2024, 5, 2, tzinfo=timezone.utc)},
+        {"id": "c2", "title": "Étude"},
+    ]
+
+    body = json.loads(_body(stream_json_list("contents", iter(items), status="ok")))
+
+    assert body == {
+        "status": "ok",
+        "contents": [
+            {"id": "c1", "published_at": "2024-05-02T00:00:00+00:00"},
+            {"id": "c2", "title": "Étude"},
+        ],
+    }
+
+
+def test_stream_json_list_empty_and_without_extra():
+
+    assert json.loads(_body(stream_json_list("items", iter([])))) == {"items": []}
+
+
+def test_list_route_streams_contents(call, monkeypatch):
+
+    monkeypatch.setattr(
+        routes, "iter_contents_admin",
+        lambda: iter([{"id_content": "c1"}, {"id_content": "c2"}]),
+    )
+
+    r = call(_app(), "GET", "/api/content/list")
+
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/json"
+    assert r.json() == {
+        "status": "ok",
+        "contents": [{"id_content": "c1"}, {"id_content": "c2"}],
+    }
+
+
+def test_source_monitoring_route_streams_sources(call, monkeypatch):
+
+    monkeypatch.setattr(
+        routes, "iter_source_monitoring",
+        lambda: iter([{"source_id": "s1", "total": 3}]),
+    )
+
+    r = call(_app(), "GET", "/api/content/source/monitoring")
+
+    assert r.status_code == 200
+    assert r.json() == {"status": "ok", "sources": [{"source_id": "s1", "total": 3}]}
+
+
+def test_stream_query_error_is_400(call, monkeypatch):
+
+    def failing():
+        raise RuntimeError("bq down")
+        yield
+
+    monkeypatch.setattr(routes, "iter_contents_admin", failing)
+
+    r = call(_app(), "GET", "/api/content/list")
+
+    assert r.status_code == 400
+    assert r.json()["detail"] == "bq down"
+
+
+# ============================================================
+# DESTOCK
+# ============================================================
+
+def test_destock_route_passes_workers(call, monkeypatch):
+
+    calls = []
+
+    def fake_destock(batch_size, workers):
+        calls.append((batch_size, workers))
+        return {"total_processed": 2, "total_errors": 0, "workers": workers}
+
+    monkeypatch.setattr(routes, "destock_all_raw_contents", fake_destock)
+
+    app = _app()
+
+    r = call(app, "POST", "/api/content/raw/destock", body={"limit": 10, "workers": 4})
+
+    assert r.status_code == 200
+    assert r.json() == {
+        "status": "ok",
+        "processed": {"total_processed": 2, "total_errors": 0, "workers": 4},
+    }
+
+    call(app, "POST", "/api/content/raw/destock", body={})
+
+    assert calls == [(10, 4), (20, 1)]
+
+
+def test_destock_route_rejects_unknown_fields(call):
+
+    r = call(_app(), "POST", "/api/content/raw/destock", body={"worker": 4})
+
+    assert r.status_code == 422
+
+
+def _fake_claims(monkeypatch, batches, outcome):
+
+    claims = []
+
+    def fake_claim(limit):
+        claims.append(limit)
+        return batches.pop(0) if batches else []
+
+    def fake_destock_one(raw, processed_rows, error_rows, timings):
+        if outcome(raw):
+            processed_rows.append(raw)
+        else:
+            error_rows.append(raw)
+
+    monkeypatch.setattr(content_service, "reclaim_stale_raw_contents", lambda: 0)
+    monkeypatch.setattr(content_service, "claim_raw_contents", fake_claim)
+    monkeypatch.setattr(content_service, "_destock_one_raw", fake_destock_one)
+
+    return claims
+
+
+def test_destock_concurrent_drains_claimed_batches(monkeypatch):
+
+    batches = [
+        [{"ID_RAW": f"r{i}"} for i in range(4)],
+        [{"ID_RAW": "r4"}, {"ID_RAW": "r5"}],
+    ]
+
+    claims = _fake_claims(monkeypatch, batches, lambda raw: raw["ID_RAW"] != "r5")
+
+    result = content_service.destock_all_raw_contents(batch_size=4, workers=3)
+
+    assert claims == [4, 4, 4]
+    assert result["total_selected"] == 6
+    assert result["total_processed"] == 5
+    assert result["total_errors"] == 1
+    assert result["workers"] == 3
+    assert set(result["timings"]) >= {"claim"}
+    assert "llm" in result
+
+
+def test_destock_concurrent_stops_on_failed_batch_and_max_items(monkeypatch):
+
+    batches = [[{"ID_RAW": "r1"}, {"ID_RAW": "r2"}], [{"ID_RAW": "r3"}]]
+
+    claims = _fake_claims(monkeypatch, batches, lambda raw: False)
+
+    result = content_service.destock_raw_contents_concurrent(workers=2, batch_size=2)
+
+    # aucun succès dans le lot : arrêt de sécurité
+    assert claims == [2]
+    assert result["total_errors"] == 2
+
+    batches = [[{"ID_RAW": "r1"}, {"ID_RAW": "r2"}], [{"ID_RAW": "r3"}]]
+
+    claims = _fake_claims(monkeypatch, batches, lambda raw: True)
+
+    result = content_service.destock_raw_contents_concurrent(
+        workers=2, batch_size=2, max_items=3,
+    )
+
+    assert claims == [2, 1]
+    assert result["total_processed"] == 3
+
+
+# ============================================================
+# SYNC ALL PUBLISHED
+# ============================================================
+
+def test_sync_all_published_route_full_flag(call, monkeypatch):
+
+    calls = []
+
+    def fake_sync(full):
+        calls.append(full)
+        return {"total": 1, "synced": 1, "errors": 0, "since": None}
+
+    monkeypatch.setattr(routes, "sync_all_published_contents", fake_sync)
+
+    app = _app()
+
+    r = call(app, "POST", "/api/content/sync-all-published")
+
+    assert r.json() == {"status": "ok", "total": 1, "synced": 1, "errors": 0, "since": None}
+
+    call(app, "POST", "/api/content/sync-all-published", query="full=true")
+
+    assert calls == [False, True]
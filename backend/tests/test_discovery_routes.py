@@ -0,0 +1,76 @@
+from fastapi import FastAPI
+
+import api.discovery.routes as routes
+
+
+def _app():
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api/discovery")
+    return app
+
+
+SCAN_REPORT = {
+    "status": "ok",
+    "scanned_sources": 2,
+    "discovered_urls": 3,
+    "errors": 1,
+    "not_modified": 0,
+    "known_urls": 120,
+    "insert_ms": 45,
+    "elapsed_ms": 812,
+    "sources": [
+        {
+            "source_id": "s1",
+            "name": "Source 1",
+            "status": "ok",
+            "links": 10,
+            "discovered_urls": 3,
+            "fetch_ms": 300,
+            "elapsed_ms": 410,
+        },
+        {
+            "source_id": "s2",
+            "name": None,
+            "status": "error",
+            "links": 0,
+            "discovered_urls": 0,
+            "error": "timeout",
+            "elapsed_ms": 800,
+        },
+    ],
+}
+
+
+def test_scan_all_returns_full_report(call, monkeypatch):
+
+    monkeypatch.setattr(routes, "scan_all_sources", lambda: SCAN_REPORT)
+
+    response = call(_app(), "POST", "/api/discovery/scan-all")
+
+    assert response.status_code == 200
+    assert response.json()["errors"] == 1
+    assert response.json()["sources"][1]["error"] == "timeout"
+
+
+def test_scan_source_returns_full_report(call, monkeypatch):
+
+    monkeypatch.setattr(routes, "scan_source", lambda source_id: SCAN_REPORT)
+
+    response = call(_app(), "POST", "/api/discovery/scan/s1")
+
+    assert response.status_code == 200
+    assert response.json()["discovered_urls"] == 3
+
+
+def test_scan_legacy_shape_still_valid(call, monkeypatch):
+
+    monkeypatch.setattr(
+        routes,
+        "scan_all_sources",
+        lambda: {"status": "ok", "scanned_sources": 0, "discovered_urls": 0},
+    )
+
+    response = call(_app(), "POST", "/api/discovery/scan-all")
+
+    assert response.status_code == 200
+    assert response.json()["sources"] == []
@@ -0,0 +1,44 @@
+import pytest
+
+import core.content.enriched_service as enriched_service
+
+
+@pytest.fixture
+def scripts(monkeypatch):
+
+    sent = []
+
+    def fake_query_bq(sql, params=None):
+        sent.append((sql, params or {}))
+        return [{"changed": 1, "merged": 1, "watermark": None}]
+
+    monkeypatch.setattr(enriched_service, "query_bq", fake_query_bq)
+
+    return sent
+
+
+def test_refresh_without_watermark_has_no_state_ddl(scripts):
+
+    enriched_service.refresh_content_enriched(["c1", "c1", ""])
+
+    sql, params = scripts[0]
+    assert "RATECARD_SYNC_STATE" not in sql
+    assert params == {"ids": ["c1"]}
+
+
+def test_refresh_with_watermark_creates_state_table(scripts):
+
+    enriched_service.refresh_content_enriched(["c1"], record_watermark="enriched")
+
+    sql, params = scripts[0]
+    assert sql.count("CREATE TABLE IF NOT EXISTS") == 1
+    assert sql.index("CREATE TABLE IF NOT EXISTS") < sql.index("IF new_watermark")
+    assert params["state_name"] == "enriched"
+
+
+def test_refresh_empty_ids_skips_bigquery(scripts):
+
+    result = enriched_service.refresh_content_enriched([])
+
+    assert result["changed"] == 0
+    assert scripts == []
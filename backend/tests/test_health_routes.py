@@ -0,0 +1,65 @@
+from fastapi import FastAPI
+
+import api.health.routes as routes
+
+
+def _app():
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api/health")
+    return app
+
+
+def test_health_bigquery_reports_client_stats(call):
+
+    r = call(_app(), "GET", "/api/health/bigquery")
+
+    assert r.status_code == 200
+
+    body = r.json()
+
+    assert body["status"] == "ok"
+    assert {"initialized", "http_pool_size"} <= set(body["client"])
+
+
+def test_health_cache_reports_every_cache(call, monkeypatch):
+
+    # pas de base SQLite d'embeddings ouverte par le test
+    monkeypatch.setattr(routes, "get_embedding_cache_stats", lambda: {"enabled": False})
+
+    r = call(_app(), "GET", "/api/health/cache")
+
+    assert r.status_code == 200
+
+    body = r.json()
+
+    assert set(body) == {
+        "status",
+        "user_context",
+        "embeddings",
+        "alias_index",
+        "public_stats",
+        "http",
+    }
+    assert {"hits", "misses", "size", "hit_ratio"} <= set(body["user_context"])
+    assert {"loads", "version", "ttl_seconds"} <= set(body["alias_index"])
+    assert {"refreshes", "etag", "computed_at", "max_age_seconds"} <= set(body["public_stats"])
+    assert {"enabled", "size", "routes"} <= set(body["http"])
+
+
+def test_health_llm_reports_gateway_budgets(call):
+
+    r = call(_app(), "GET", "/api/health/llm")
+
+    assert r.status_code == 200
+
+    llm = r.json()["llm"]
+
+    assert {
+        "rpm_limit",
+        "tpm_limit",
+        "rpm_available",
+        "tpm_available",
+        "callers",
+        "budgets",
+        "cache",
+    } <= set(llm)
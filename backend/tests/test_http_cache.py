@@ -0,0 +1,168 @@
+import importlib
+
+import pytest
+from fastapi import FastAPI
+
+from utils.http_cache import (
+    HTTPCacheMiddleware,
+    _cache_key,
+    get_http_cache_stats,
+    invalidate_http_cache,
+)
+
+# ordre d'import de main.py (cycles core.news / core.content ↔ api)
+for _module in ("api.content.routes", "api.news.routes"):
+    importlib.import_module(_module)
+
+public_routes = importlib.import_module("api.public.routes")
+
+
+MEMBERS = [
+    {
+        "ID_COMPANY": "c1",
+        "NAME": "Havas",
+        "DESCRIPTION": None,
+        "MEDIA_LOGO_RECTANGLE_ID": "logo.png",
+        "INTERNAL": "non exposé",
+    },
+]
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(HTTPCacheMiddleware)
+    app.include_router(public_routes.router, prefix="/api/public")
+    return app
+
+
+@pytest.fixture
+def loads(monkeypatch):
+
+    calls = []
+
+    def fake_query_bq(sql, params=None):
+        calls.append(sql)
+        return MEMBERS
+
+    monkeypatch.setattr(public_routes, "query_bq", fake_query_bq)
+
+    invalidate_http_cache()
+    yield calls
+    invalidate_http_cache()
+
+
+# ============================================================
+# RESPONSE_MODEL + CACHE
+# ============================================================
+
+def test_cached_response_keeps_response_model_shape(call, loads):
+
+    app = _app()
+
+    first = call(app, "GET", "/api/public/members")
+    second = call(app, "GET", "/api/public/members")
+
+    expected = {
+        "items": [
+            {
+                "id_company": "c1",
+                "name": "Havas",
+                "description": None,
+                "media_logo_rectangle_id": "logo.png",
+            },
+        ],
+    }
+
+    assert first.json() == second.json() == expected
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    assert first.headers["etag"] == second.headers["etag"]
+    assert second.headers["content-type"] == "application/json"
+    assert second.headers["cache-control"].startswith("private, max-age=")
+    assert len(loads) == 1
+
+
+def test_if_none_match_returns_304(call, loads):
+
+    app = _app()
+
+    etag = call(app, "GET", "/api/public/members").headers["etag"]
+
+    r = call(app, "GET", "/api/public/members", headers={"If-None-Match": etag})
+
+    assert r.status_code == 304
+    assert r.body == b""
+    assert r.headers["etag"] == etag
+
+    r = call(app, "GET", "/api/public/members", headers={"If-None-Match": '"other"'})
+
+    assert r.status_code == 200
+
+    stats = get_http_cache_stats()["routes"]["/api/public/members"]
+
+    assert stats["not_modified"] == 1
+
+
+def test_invalidation_by_tag(call, loads):
+
+    app = _app()
+
+    call(app, "GET", "/api/public/members")
+
+    assert invalidate_http_cache("news") == 0
+    assert call(app, "GET", "/api/public/members").headers["x-cache"] == "HIT"
+
+    assert invalidate_http_cache("company") == 1
+    assert call(app, "GET", "/api/public/members").headers["x-cache"] == "MISS"
+    assert len(loads) == 2
+
+
+def test_errors_are_not_cached(call, monkeypatch):
+
+    calls = []
+
+    def failing(sql, params=None):
+        calls.append(sql)
+        raise RuntimeError("bq down")
+
+    monkeypatch.setattr(public_routes, "query_bq", failing)
+    invalidate_http_cache()
+
+    app = _app()
+
+    assert call(app, "GET", "/api/public/members").status_code == 500
+    assert call(app, "GET", "/api/public/members").status_code == 500
+    assert len(calls) == 2
+
+
+# ============================================================
+# CLÉ
+# ============================================================
+
+def _scope(method="GET", query=b"", headers=()):
+    return {
+        "method": method,
+        "path": "/api/newsletter/search",
+        "query_string": query,
+        "headers": list(headers),
+    }
+
+
+def test_cache_key_normalizes_query_and_json_body():
+
+    assert _cache_key(_scope(query=b"b=2&a=1"), b"") == _cache_key(_scope(query=b"a=1&b=2"), b"")
+
+    assert _cache_key(_scope("POST"), b'{"topics": ["t1"], "limit": 5}') == _cache_key(
+        _scope("POST"), b'{"limit":5,"topics":["t1"]}'
+    )
+    assert _cache_key(_scope("POST"), b'{"topics": ["t1"]}') != _cache_key(
+        _scope("POST"), b'{"topics": ["t2"]}'
+    )
+
+
+def test_cache_key_is_per_user():
+
+    anonymous = _cache_key(_scope(), b"")
+    user = _cache_key(_scope(headers=[(b"x-user-id", b"u1")]), b"")
+
+    assert anonymous != user
+    assert user[3] == "u1"
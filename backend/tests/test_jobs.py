@@ -0,0 +1,85 @@
+import threading
+import time
+
+from utils.jobs import JobRegistry
+
+
+def _wait(registry, job_id, timeout=2.0):
+
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        job = registry.get(job_id)
+        if job["status"] in ("done", "error"):
+            return job
+        time.sleep(0.01)
+
+    raise AssertionError(f"job {job_id} not finished")
+
+
+def test_job_result_and_progress_merged_into_status():
+
+    registry = JobRegistry("test-ok", max_workers=1)
+
+    def target(update):
+        update(progress=1)
+        return {"inserted": 3}
+
+    job = _wait(registry, registry.submit(target, id_content="c1"))
+
+    assert job["status"] == "done"
+    assert job["progress"] == 1
+    assert job["inserted"] == 3
+    assert job["id_content"] == "c1"
+    assert job["finished_at"]
+
+
+def test_job_error_is_recorded():
+
+    registry = JobRegistry("test-error", max_workers=1)
+
+    def target(update):
+        raise RuntimeError("boom")
+
+    job = _wait(registry, registry.submit(target))
+
+    assert job["status"] == "error"
+    assert job["error"] == "boom"
+
+
+def test_list_filters_and_active_jobs():
+
+    registry = JobRegistry("test-list", max_workers=1)
+    release = threading.Event()
+
+    running = registry.submit(lambda update: release.wait(2) and None, id_content="a")
+    queued = registry.submit(lambda update: None, id_content="b")
+
+    assert [j["job_id"] for j in registry.list(id_content="b")] == [queued]
+    assert {j["job_id"] for j in registry.active()} == {running, queued}
+
+    release.set()
+    _wait(registry, queued)
+
+    assert registry.active() == []
+
+
+def test_purge_keeps_unfinished_jobs():
+
+    registry = JobRegistry("test-purge", max_workers=1, max_jobs=2)
+    release = threading.Event()
+
+    blocking = registry.submit(lambda update: release.wait(2) and None)
+    registry.submit(lambda update: None)
+    registry.submit(lambda update: None)
+
+    # le plus ancien est encore en cours : rien n'est purgé
+    assert registry.get(blocking) is not None
+
+    release.set()
+    _wait(registry, blocking)
+
+    latest = registry.submit(lambda update: None)
+    _wait(registry, latest)
+
+    assert registry.get(blocking) is None
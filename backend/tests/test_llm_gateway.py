@@ -0,0 +1,68 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import utils.llm as llm
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+
+    monkeypatch.setattr(llm, "get_openai_client", lambda: object())
+    monkeypatch.setattr(llm, "_CALLER_BUDGETS", {})
+
+    return llm
+
+
+def test_parse_caller_budgets_skips_invalid_entries(gateway):
+
+    budgets = gateway._parse_caller_budgets("destock=4:60, bad=x:1,empty=,radar.bulk=2")
+
+    assert sorted(budgets) == ["destock", "radar.bulk"]
+    assert budgets["destock"].stats()["max_concurrency"] == 4
+    assert budgets["destock"].stats()["rpm_limit"] == 60
+    assert budgets["radar.bulk"].stats()["rpm_limit"] == 0
+
+
+def test_caller_budget_caps_concurrency(gateway):
+
+    gateway._CALLER_BUDGETS["capped"] = gateway.CallerBudget(max_concurrency=2)
+
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def request(client):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return None
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(lambda _: gateway._call_openai("capped", 1, request), range(6)))
+
+    assert peak == 2
+
+
+def test_llm_caller_scope_overrides_explicit_caller(gateway, monkeypatch):
+
+    seen = []
+
+    monkeypatch.setattr(
+        gateway,
+        "_call_openai",
+        lambda caller, estimated, request: seen.append(caller),
+    )
+
+    with gateway.llm_caller("radar.bulk"):
+        gateway.chat_completion([{"role": "user", "content": "x"}], caller="radar")
+
+    gateway.chat_completion([{"role": "user", "content": "x"}], caller="radar")
+
+    assert seen == ["radar.bulk", "radar"]
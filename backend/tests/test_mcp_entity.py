@@ -0,0 +1,143 @@
+import pytest
+
+import core.mcp.entity as entity
+from core.mcp.entity import EntityIndex, tokenize
+
+
+COMPANIES = ["Havas", "Havas Media", "Orange", "Publicis Groupe", "Criteo"]
+TOPICS = ["Programmatic", "Retail Media", "Identity"]
+
+
+@pytest.fixture
+def labels(monkeypatch):
+
+    loads = []
+
+    def fake_load_labels(table, column):
+        loads.append(table)
+        return COMPANIES if table == entity.TABLE_COMPANY else TOPICS
+
+    monkeypatch.setattr(entity, "_load_labels", fake_load_labels)
+    entity.invalidate_entity_indexes()
+
+    yield loads
+
+    entity.invalidate_entity_indexes()
+
+
+# ============================================================
+# ENTITY INDEX
+# ============================================================
+
+def test_tokenize_strips_accents_and_punctuation():
+
+    assert tokenize("Société Générale, l'Oréal!") == [
+        "societe", "generale", "l", "oreal",
+    ]
+
+
+def test_index_skips_duplicates_and_empty_labels():
+
+    index = EntityIndex(["Havas", "Havas", "---", "Orange"])
+
+    assert index.labels == ["Havas", "Orange"]
+    assert len(index) == 2
+
+
+def test_match_tokens_prefers_longest_label():
+
+    index = EntityIndex(COMPANIES)
+
+    assert index.match_tokens(set(tokenize("budget havas media 2024"))) == "Havas Media"
+    assert index.match_tokens(set(tokenize("havas résultats"))) == "Havas"
+
+
+def test_match_tokens_requires_every_label_token():
+
+    index = EntityIndex(COMPANIES)
+
+    assert index.match_tokens(set(tokenize("publicis"))) is None
+    assert index.match_tokens(set(tokenize("unknown brand"))) is None
+
+
+def test_search_ranks_exact_label_first():
+
+    index = EntityIndex(COMPANIES)
+
+    results = index.search(tokenize("criteo q3"))
+
+    assert results[0] == {"label": "Criteo", "score": 1.0}
+
+
+def test_search_scores_typos_above_threshold():
+
+    index = EntityIndex(COMPANIES)
+
+    best = index.search(tokenize("publicis groupes"), limit=1)[0]
+
+    assert best["label"] == "Publicis Groupe"
+    assert best["score"] >= entity.MCP_ENTITY_FUZZY_THRESHOLD
+
+
+def test_search_longer_token_is_penalised():
+
+    index = EntityIndex(COMPANIES)
+
+    scores = {r["label"]: r["score"] for r in index.search(tokenize("orangeade"))}
+
+    assert scores["Orange"] == pytest.approx(0.667, abs=0.01)
+    assert scores["Orange"] < entity.MCP_ENTITY_FUZZY_THRESHOLD
+
+
+def test_search_without_common_trigram_is_empty():
+
+    assert EntityIndex(COMPANIES).search(tokenize("zzz")) == []
+
+
+# ============================================================
+# RESOLVER
+# ============================================================
+
+def test_resolve_entity_company_before_topic(labels):
+
+    assert entity.resolve_entity("Havas Media programmatic") == {
+        "type": "company",
+        "label": "Havas Media",
+        "score": 1.0,
+    }
+
+
+def test_resolve_entity_topic_and_overrides(labels):
+
+    assert entity.resolve_entity("identity graph")["label"] == "Identity"
+    assert entity.resolve_entity("retail media europe") == {
+        "type": "topic",
+        "label": "Retail Media",
+    }
+
+
+def test_resolve_entity_fuzzy_threshold(labels):
+
+    fuzzy = entity.resolve_entity("criteos")
+
+    assert fuzzy["type"] == "company"
+    assert fuzzy["label"] == "Criteo"
+    assert fuzzy["score"] >= entity.MCP_ENTITY_FUZZY_THRESHOLD
+
+    assert entity.resolve_entity("orangeade") == {
+        "type": "unknown",
+        "label": None,
+    }
+
+
+def test_indexes_loaded_once_until_invalidated(labels):
+
+    entity.resolve_entity("havas")
+    entity.search_entities("orange")
+
+    assert len(labels) == 2
+
+    entity.invalidate_entity_indexes()
+    entity.resolve_entity("havas")
+
+    assert len(labels) == 4
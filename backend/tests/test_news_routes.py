@@ -0,0 +1,49 @@
+from fastapi import FastAPI
+
+import api.news.routes as routes
+import core.news.service as news_service
+from utils.http_cache import HTTPCacheMiddleware, invalidate_http_cache
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(HTTPCacheMiddleware)
+    app.include_router(routes.router, prefix="/api/news")
+    return app
+
+
+PAGE = {
+    "total_count": 1,
+    "sponsorised": [],
+    "items": [{"id": "n1", "title": "Brève", "topics": []}],
+}
+
+
+def test_breves_search_cached_once_and_invalidated_by_news_writes(call, monkeypatch):
+
+    loads = []
+
+    def fake_search(**kwargs):
+        loads.append(kwargs)
+        return PAGE
+
+    monkeypatch.setattr(routes, "search_breves_public", fake_search)
+    monkeypatch.setattr(news_service, "update_bq", lambda **kwargs: None)
+
+    invalidate_http_cache()
+    app = _app()
+
+    first = call(app, "GET", "/api/news/breves/search", query="topics=t1&limit=5")
+    second = call(app, "GET", "/api/news/breves/search", query="limit=5&topics=t1")
+
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json()["items"] == PAGE["items"]
+    assert len(loads) == 1
+
+    news_service.archive_news("n1")
+
+    third = call(app, "GET", "/api/news/breves/search", query="topics=t1&limit=5")
+
+    assert third.headers["x-cache"] == "MISS"
+    assert len(loads) == 2
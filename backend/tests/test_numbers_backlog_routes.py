@@ -0,0 +1,95 @@
+import time
+
+from fastapi import FastAPI
+
+import api.numbers.routes as routes
+import core.numbers.backlog_jobs as backlog_jobs
+
+
+def _app():
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api/numbers")
+    return app
+
+
+def _patch_pipeline(monkeypatch, inserted):
+
+    monkeypatch.setattr(
+        backlog_jobs, "get_numbers_from_content",
+        lambda content_id: [{"ID": "r1"}, {"ID": "r2"}, {"ID": "r3"}],
+    )
+    monkeypatch.setattr(
+        backlog_jobs, "process_backlog_rows",
+        lambda rows: [
+            {"status": "ok", "ID": "r1"},
+            {"status": "ok", "ID": "r2"},
+            {"status": "error", "ID": "r3"},
+        ],
+    )
+    monkeypatch.setattr(backlog_jobs, "insert_backlog_batch", inserted.extend)
+
+
+def _wait(call, app, job_id, timeout=2.0):
+
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+
+        r = call(app, "GET", f"/api/numbers/backlog/jobs/{job_id}")
+        job = r.json()["job"]
+
+        if job["status"] in ("done", "error"):
+            return r
+
+        time.sleep(0.01)
+
+    raise AssertionError(f"job {job_id} not finished")
+
+
+def test_run_content_backlog_inserts_ok_rows_only(monkeypatch):
+
+    inserted = []
+    _patch_pipeline(monkeypatch, inserted)
+
+    result = backlog_jobs.run_content_backlog("c1")
+
+    assert [r["ID"] for r in inserted] == ["r1", "r2"]
+    assert result["numbers"] == 3
+    assert result["inserted"] == 2
+    assert result["errors"] == 1
+    assert "elapsed_s" in result
+
+
+def test_backlog_job_routes(call, monkeypatch):
+
+    inserted = []
+    _patch_pipeline(monkeypatch, inserted)
+
+    app = _app()
+
+    r = call(app, "POST", "/api/numbers/backlog/from-content/c-routes")
+
+    assert r.status_code == 200
+    assert r.json()["status"] == "ok"
+
+    job_id = r.json()["job_id"]
+
+    r = _wait(call, app, job_id)
+    job = r.json()["job"]
+
+    assert r.json()["status"] == "ok"
+    assert job["status"] == "done"
+    assert job["id_content"] == "c-routes"
+    assert job["inserted"] == 2
+
+    r = call(app, "GET", "/api/numbers/backlog/jobs", query="id_content=c-routes")
+
+    assert r.status_code == 200
+    assert [j["job_id"] for j in r.json()["items"]] == [job_id]
+
+
+def test_unknown_backlog_job_is_404(call):
+
+    r = call(_app(), "GET", "/api/numbers/backlog/jobs/nope")
+
+    assert r.status_code == 404
@@ -0,0 +1,250 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+
+import api.curator.routes as curator_routes
+import api.search.routes as search_routes
+import core.feed.service as feed_service
+import core.search.service as search_service
+from utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+    seek_clause,
+)
+
+
+TS = datetime(2024, 5, 2, 10, 30, tzinfo=timezone.utc)
+
+
+# ============================================================
+# CURSEURS
+# ============================================================
+
+def test_cursor_roundtrip():
+
+    cursor = encode_cursor(TS, "c42")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (TS, "c42")
+
+
+def test_cursor_accepts_iso_strings():
+
+    cursor = encode_cursor("2024-05-02T10:30:00Z", "n1")
+
+    assert decode_cursor(cursor) == (TS, "n1")
+
+
+def test_encode_cursor_without_timestamp():
+
+    assert encode_cursor(None, "n1") is None
+
+
+def test_decode_legacy_iso_cursor_has_no_id():
+
+    assert decode_cursor("2024-05-02T10:30:00+00:00") == (TS, None)
+
+
+def test_decode_invalid_cursor_raises_value_error():
+
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_seek_clause_without_cursor():
+
+    params = {}
+
+    assert seek_clause("c.PUBLISHED_AT", "c.ID_CONTENT", None, params) == ""
+    assert params == {}
+
+
+def test_seek_clause_with_cursor():
+
+    params = {}
+    sql = seek_clause(
+        "c.PUBLISHED_AT",
+        "c.ID_CONTENT",
+        encode_cursor(TS, "c42"),
+        params,
+    )
+
+    assert params == {"cursor_ts": TS, "cursor_id": "c42"}
+    assert "c.PUBLISHED_AT < @cursor_ts" in sql
+    assert "c.ID_CONTENT < @cursor_id" in sql
+
+
+def test_seek_clause_legacy_cursor_filters_on_timestamp_only():
+
+    params = {}
+    sql = seek_clause("n.PUBLISHED_AT", "n.ID_NEWS", TS.isoformat(), params)
+
+    assert params == {"cursor_ts": TS}
+    assert "@cursor_id" not in sql
+    assert sql.startswith("\n")
+
+
+def test_next_cursor_points_to_last_item():
+
+    items = [
+        {"id": "a", "published_at": TS},
+        {"id": "b", "published_at": TS},
+    ]
+
+    assert decode_cursor(next_cursor(items, limit=2)) == (TS, "b")
+
+
+def test_next_cursor_none_on_short_or_empty_page():
+
+    assert next_cursor([], limit=2) is None
+    assert next_cursor([{"id": "a", "published_at": TS}], limit=2) is None
+
+
+# ============================================================
+# /search
+# ============================================================
+
+def _search_app():
+    app = FastAPI()
+    app.include_router(search_routes.router, prefix="/api")
+    return app
+
+
+def test_search_route_returns_next_cursor(call, monkeypatch):
+
+    captured = {}
+
+    def fake_query_bq(sql, params):
+        captured["sql"] = sql
+        captured["params"] = params
+        return [
+            {"id": "n2", "type": "news", "title": "t", "excerpt": "e", "published_at": TS},
+        ]
+
+    monkeypatch.setattr(search_service, "query_bq", fake_query_bq)
+
+    cursor = encode_cursor(TS, "n9")
+
+    r = call(
+        _search_app(), "GET", "/api/search",
+        query=f"q=ads&type=news&limit=1&offset=40&cursor={cursor}",
+    )
+
+    assert r.status_code == 200
+
+    body = r.json()["results"]
+
+    assert set(body) == {"items", "count", "next_cursor"}
+    assert body["count"] == 1
+    assert decode_cursor(body["next_cursor"])[1] == "n2"
+
+    # le curseur remplace l'offset
+    assert captured["params"]["offset"] == 0
+    assert captured["params"]["cursor_id"] == "n9"
+
+    # type=news : la branche analyses est bloquée puis seekée
+    assert "AND FALSE\n" in captured["sql"]
+
+
+def test_search_route_rejects_bad_cursor(call, monkeypatch):
+
+    monkeypatch.setattr(search_service, "query_bq", lambda sql, params: [])
+
+    r = call(_search_app(), "GET", "/api/search", query="q=ads&cursor=bad")
+
+    assert r.status_code == 400
+
+
+# ============================================================
+# CURATOR /search, /latest
+# ============================================================
+
+def _curator_app(monkeypatch):
+
+    monkeypatch.setattr(
+        curator_routes, "get_user_id_from_request", lambda request: "u1",
+    )
+
+    app = FastAPI()
+    app.include_router(curator_routes.router, prefix="/api/curator")
+    return app
+
+
+@pytest.mark.parametrize("path, service", [
+    ("/api/curator/search", "asearch"),
+    ("/api/curator/latest", "alatest"),
+])
+def test_curator_feed_routes_shape(call, monkeypatch, path, service):
+
+    calls = []
+
+    async def fake_feed(**kwargs):
+        calls.append(kwargs)
+        return [
+            {"id": "c1", "published_at": TS},
+            {"id": "c2", "published_at": TS},
+        ]
+
+    monkeypatch.setattr(curator_routes, service, fake_feed)
+
+    cursor = encode_cursor(TS, "c0")
+
+    r = call(
+        _curator_app(monkeypatch), "GET", path,
+        query=f"q=ads&limit=2&cursor={cursor}",
+    )
+
+    assert r.status_code == 200
+
+    body = r.json()
+
+    assert set(body) == {"items", "count", "next_cursor"}
+    assert body["count"] == 2
+    assert decode_cursor(body["next_cursor"])[1] == "c2"
+
+    assert calls[0]["cursor"] == cursor
+    assert calls[0]["user_id"] == "u1"
+
+
+@pytest.mark.parametrize("path, service", [
+    ("/api/curator/search", "asearch"),
+    ("/api/curator/latest", "alatest"),
+])
+def test_curator_feed_routes_bad_cursor_is_400(call, monkeypatch, path, service):
+
+    async def fake_feed(**kwargs):
+        raise ValueError("cursor invalide")
+
+    monkeypatch.setattr(curator_routes, service, fake_feed)
+
+    r = call(_curator_app(monkeypatch), "GET", path, query="q=ads&cursor=bad")
+
+    assert r.status_code == 400
+    assert r.json()["detail"] == "cursor invalide"
+
+
+
+# ============================================================
+# FEED (MCP)
+# ============================================================
+
+def test_feed_search_text_seeks_both_branches(monkeypatch):
+
+    captured = {}
+
+    def fake_query_bq(sql, params):
+        captured["sql"] = sql
+        captured["params"] = params
+        return []
+
+    monkeypatch.setattr(feed_service, "query_bq", fake_query_bq)
+
+    feed_service.search_text("ads", limit=10, offset=30, cursor=encode_cursor(TS, "x1"))
+
+    assert captured["params"]["offset"] == 0
+    assert captured["params"]["cursor_id"] == "x1"
+    assert "n.ID_NEWS < @cursor_id" in captured["sql"]
+    assert "c.ID_CONTENT < @cursor_id" in captured["sql"]
+    assert "ORDER BY PUBLISHED_AT DESC, id DESC" in captured["sql"]
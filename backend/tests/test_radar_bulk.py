@@ -0,0 +1,216 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+
+import api.radar.routes as routes
+import core.radar.bulk_service as bulk_service
+
+
+MISSING = [
+    {"entity_type": "topic", "entity_id": "t1", "year": 2024, "period": 1},
+    {"entity_type": "topic", "entity_id": "t2", "year": 2024, "period": 1},
+    {"entity_type": "company", "entity_id": "c1", "year": 2024, "period": 2},
+    {"entity_type": "company", "entity_id": "c2", "year": 2024, "period": 2},
+]
+
+
+@pytest.fixture
+def engine(monkeypatch):
+
+    inserted = []
+    prompts = []
+
+    monkeypatch.setattr(bulk_service, "list_missing_radars", lambda **kwargs: MISSING)
+    monkeypatch.setattr(
+        bulk_service, "_existing_keys",
+        lambda frequency, targets: {("topic", "t2", 2024, 1)},
+    )
+    monkeypatch.setattr(
+        bulk_service, "fetch_radar_contents",
+        lambda frequency, targets: {
+            ("topic", "t1", 2024, 1): [{"title": "ok"}],
+            ("company", "c2", 2024, 2): [{"title": "boom"}],
+        },
+    )
+
+    def fake_key_points(contents, frequency, year, period):
+        prompts.append(contents[0]["title"])
+        if contents[0]["title"] == "boom":
+            raise RuntimeError("api down")
+        return ["point"], "{}"
+
+    monkeypatch.setattr(bulk_service, "_generate_key_points", fake_key_points)
+    monkeypatch.setattr(bulk_service.time, "sleep", lambda s: None)
+    monkeypatch.setattr(
+        bulk_service, "insert_bq",
+        lambda table, rows, mode: inserted.extend(rows),
+    )
+
+    return inserted, prompts
+
+
+# ============================================================
+# ENGINE
+# ============================================================
+
+def test_run_bulk_radar_counts_every_target(engine):
+
+    inserted, prompts = engine
+    progress = []
+
+    report = bulk_service.run_bulk_radar(
+        "MONTHLY",
+        retries=2,
+        update=lambda **fields: progress.append(fields),
+    )
+
+    assert report["total"] == 4
+    assert report["done"] == 4
+    assert report["exists"] == 1
+    assert report["no_content"] == 1
+    assert report["generated"] == 1
+    assert report["errors"] == 1
+    assert report["inserted"] == 1
+
+    assert [(r["ENTITY_ID"], r["STATUS"], r["KEY_POINTS"]) for r in inserted] == [
+        ("t1", "GENERATED", ["point"]),
+    ]
+
+    # l'erreur est retentée puis échantillonnée
+    assert prompts.count("boom") == 2
+    assert report["error_samples"] == [
+        {**MISSING[3], "error": "api down"},
+    ]
+
+    assert progress[0]["total"] == 4
+    assert progress[-1]["done"] == 4
+
+
+def test_run_bulk_radar_without_missing(monkeypatch):
+
+    monkeypatch.setattr(bulk_service, "list_missing_radars", lambda **kwargs: [])
+
+    report = bulk_service.run_bulk_radar("WEEKLY")
+
+    assert report["total"] == 0
+    assert report["elapsed_s"] == 0.0
+
+
+def test_generate_with_retries_invalid_json(monkeypatch):
+
+    calls = []
+
+    def fake_key_points(*args):
+        calls.append(args)
+        return None, "not json"
+
+    monkeypatch.setattr(bulk_service, "_generate_key_points", fake_key_points)
+    monkeypatch.setattr(bulk_service.time, "sleep", lambda s: None)
+
+    with pytest.raises(RuntimeError, match="Invalid JSON"):
+        bulk_service._generate_with_retries([], "MONTHLY", 2024, 1, retries=3)
+
+    assert len(calls) == 3
+
+
+def test_fetch_radar_contents_groups_rows_by_target(monkeypatch):
+
+    captured = {}
+
+    def fake_query_bq(sql, params):
+        captured.update(params)
+        return [
+            {"entity_type": "topic", "entity_id": "t1", "year": 2024, "period": 12, "title": "a", "excerpt": None},
+            {"entity_type": "topic", "entity_id": "t1", "year": 2024, "period": 12, "title": "b", "excerpt": "x"},
+        ]
+
+    monkeypatch.setattr(bulk_service, "query_bq", fake_query_bq)
+
+    contents = bulk_service.fetch_radar_contents("MONTHLY", [
+        {"entity_type": "topic", "entity_id": "t1", "year": 2024, "period": 12},
+        {"entity_type": "topic", "entity_id": "t1", "year": 2024, "period": 3},
+    ])
+
+    assert contents == {
+        ("topic", "t1", 2024, 12): [
+            {"title": "a", "excerpt": None},
+            {"title": "b", "excerpt": "x"},
+        ],
+    }
+
+    # fenêtre globale = union des bornes [start, end)
+    assert captured["window_start"] == datetime(2024, 3, 1, tzinfo=timezone.utc)
+    assert captured["window_end"] == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert captured["targets"][0]["start_at"] == datetime(2024, 12, 1, tzinfo=timezone.utc)
+
+
+def test_fetch_radar_contents_without_targets(monkeypatch):
+
+    monkeypatch.setattr(bulk_service, "query_bq", pytest.fail)
+
+    assert bulk_service.fetch_radar_contents("MONTHLY", []) == {}
+
+
+# ============================================================
+# ROUTES
+# ============================================================
+
+def _app():
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api/radar")
+    return app
+
+
+def test_bulk_route_enqueues_job(call, monkeypatch):
+
+    calls = []
+
+    def fake_enqueue(**kwargs):
+        calls.append(kwargs)
+        return "job-1"
+
+    monkeypatch.setattr(routes, "enqueue_bulk_radar", fake_enqueue)
+
+    r = call(_app(), "POST", "/api/radar/bulk", body={"frequency": "WEEKLY", "year": 2024})
+
+    assert r.status_code == 200
+    assert r.json() == {"status": "ok", "job_id": "job-1"}
+    assert calls == [{
+        "frequency": "WEEKLY",
+        "entity_type": None,
+        "year": 2024,
+        "limit": None,
+        "concurrency": None,
+    }]
+
+
+def test_bulk_route_requires_frequency(call):
+
+    r = call(_app(), "POST", "/api/radar/bulk", body={"year": 2024})
+
+    assert r.status_code == 400
+
+
+def test_bulk_job_routes(call, monkeypatch):
+
+    monkeypatch.setattr(
+        routes, "list_bulk_radar_jobs",
+        lambda limit: [{"job_id": "job-1", "status": "running"}],
+    )
+    monkeypatch.setattr(
+        routes, "get_bulk_radar_job",
+        lambda job_id: {"job_id": job_id} if job_id == "job-1" else None,
+    )
+
+    app = _app()
+
+    assert call(app, "GET", "/api/radar/bulk/jobs").json() == {
+        "status": "ok",
+        "items": [{"job_id": "job-1", "status": "running"}],
+    }
+    assert call(app, "GET", "/api/radar/bulk/jobs/job-1").json() == {
+        "status": "ok",
+        "job": {"job_id": "job-1"},
+    }
+    assert call(app, "GET", "/api/radar/bulk/jobs/nope").status_code == 404
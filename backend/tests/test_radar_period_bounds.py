@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from core.radar.service import radar_period_bounds
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_weekly_is_iso_week():
+
+    start, end = radar_period_bounds("WEEKLY", 2024, 10)
+
+    assert start == _utc(2024, 3, 4)
+    assert end == _utc(2024, 3, 11)
+    assert start.weekday() == 0
+
+
+def test_weekly_week_one_can_start_in_december():
+
+    # semaine ISO 1 de 2025 : lundi 30 décembre 2024
+    start, end = radar_period_bounds("WEEKLY", 2025, 1)
+
+    assert start == _utc(2024, 12, 30)
+    assert end == _utc(2025, 1, 6)
+
+
+def test_weekly_last_week_can_end_in_january():
+
+    # 2020 a 53 semaines ISO
+    start, end = radar_period_bounds("WEEKLY", 2020, 53)
+
+    assert start == _utc(2020, 12, 28)
+    assert end == _utc(2021, 1, 4)
+
+
+@pytest.mark.parametrize("quarter, start, end", [
+    (1, (2024, 1, 1), (2024, 4, 1)),
+    (2, (2024, 4, 1), (2024, 7, 1)),
+    (3, (2024, 7, 1), (2024, 10, 1)),
+    (4, (2024, 10, 1), (2025, 1, 1)),
+])
+def test_quarterly_bounds(quarter, start, end):
+
+    assert radar_period_bounds("QUARTERLY", 2024, quarter) == (
+        _utc(*start),
+        _utc(*end),
+    )
+
+
+def test_monthly_bounds_and_december_rollover():
+
+    assert radar_period_bounds("MONTHLY", 2024, 2) == (
+        _utc(2024, 2, 1),
+        _utc(2024, 3, 1),
+    )
+    assert radar_period_bounds("MONTHLY", 2024, 12) == (
+        _utc(2024, 12, 1),
+        _utc(2025, 1, 1),
+    )
+
+
+def test_bounds_accept_string_inputs_and_are_utc():
+
+    start, end = radar_period_bounds("MONTHLY", "2024", "7")
+
+    assert start.tzinfo is timezone.utc
+    assert end.tzinfo is timezone.utc
+    assert start == _utc(2024, 7, 1)
@@ -0,0 +1,151 @@
+from datetime import datetime, timezone
+
+import core.content.sync_service as sync_service
+
+
+def test_sync_all_numbers_aggregates_and_samples_errors(monkeypatch):
+
+    ids = [f"c{i}" for i in range(30)]
+
+    monkeypatch.setattr(
+        sync_service,
+        "iter_bq",
+        lambda sql, params=None: iter({"ID_CONTENT": i} for i in ids),
+    )
+
+    def fake_sync(id_content):
+        if int(id_content[1:]) % 2:
+            raise RuntimeError(f"boom {id_content}")
+        return {"inserted": 1}
+
+    monkeypatch.setattr(sync_service, "sync_content_numbers", fake_sync)
+    monkeypatch.setattr(sync_service, "SYNC_NUMBERS_ERROR_SAMPLES", 5)
+
+    report = sync_service.sync_all_numbers()
+
+    assert (report["total"], report["synced"], report["errors"]) == (30, 15, 15)
+    assert "results" not in report
+    assert report["error_samples"][0] == {"id_content": "c1", "error": "boom c1"}
+    assert len(report["error_samples"]) == 5
+
+
+# ============================================================
+# SYNC CONTENTS (LOTS PARALLÈLES)
+# ============================================================
+
+def test_sync_contents_isolates_failed_batches(monkeypatch):
+
+    monkeypatch.setattr(sync_service, "load_alias_maps", lambda: {})
+
+    def fake_batch(batch, sync_numbers, alias_maps):
+        if "c3" in batch:
+            raise RuntimeError("batch down")
+        return {
+            "results": [{"id_content": i, "status": "ok"} for i in batch],
+            "timings": {"entities": [0.01] * len(batch)},
+        }
+
+    monkeypatch.setattr(sync_service, "_sync_batch", fake_batch)
+
+    report = sync_service.sync_contents(
+        ["c1", "c2", "c1", None, "c3", "c4"],
+        batch_size=2,
+        workers=2,
+    )
+
+    assert (report["total"], report["synced"], report["errors"]) == (4, 2, 2)
+    assert report["batches"] == 2
+    assert {r["id_content"] for r in report["results"] if r["status"] == "error"} == {"c3", "c4"}
+    assert "entities" in report["timings"]
+
+
+def test_sync_contents_without_ids(monkeypatch):
+
+    monkeypatch.setattr(sync_service, "load_alias_maps", lambda: {})
+
+    report = sync_service.sync_contents([])
+
+    assert (report["total"], report["batches"], report["results"]) == (0, 0, [])
+
+
+# ============================================================
+# SYNC ALL PUBLISHED (WATERMARK)
+# ============================================================
+
+WATERMARK = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def _patch_published_sync(monkeypatch, changed, retries, failed_ids=()):
+
+    calls = {"since": [], "ids": [], "refreshed": [], "retries": [], "watermark": []}
+    monkeypatch.setattr(sync_service, "get_enriched_watermark", lambda: WATERMARK)
+    monkeypatch.setattr(sync_service, "list_sync_retries", lambda: list(retries))
+
+    def fake_changed(since):
+        calls["since"].append(since)
+        return changed
+
+    def fake_sync(ids, sync_numbers=False):
+        calls["ids"].append(ids)
+        results = [
+            {"id_content": i, "status": "error" if i in failed_ids else "ok"}
+            for i in ids
+        ]
+        return {"total": len(ids), "results": results}
+
+    monkeypatch.setattr(sync_service, "list_changed_contents", fake_changed)
+    monkeypatch.setattr(sync_service, "sync_contents", fake_sync)
+    monkeypatch.setattr(
+        sync_service, "refresh_content_enriched",
+        lambda ids, universes_from: calls["refreshed"].append(ids),
+    )
+    monkeypatch.setattr(sync_service, "set_sync_retries", calls["retries"].append)
+    monkeypatch.setattr(sync_service, "set_enriched_watermark", calls["watermark"].append)
+
+    return calls
+
+
+def test_sync_all_published_incremental(monkeypatch):
+
+    updated = datetime(2024, 5, 3, tzinfo=timezone.utc)
+
+    calls = _patch_published_sync(
+        monkeypatch,
+        changed=[
+            {"ID_CONTENT": "c1", "STATUS": "PUBLISHED", "UPDATED_AT": updated},
+            {"ID_CONTENT": "c2", "STATUS": "DRAFT", "UPDATED_AT": WATERMARK},
+        ],
+        # c2 dépublié depuis : pas repris
+        retries=["c9", "c2"],
+        failed_ids={"c9"},
+    )
+
+    report = sync_service.sync_all_published_contents()
+
+    assert calls["since"] == [WATERMARK]
+    assert calls["ids"] == [["c1", "c9"]]
+    assert calls["refreshed"] == [["c2"]]
+    assert calls["retries"] == [[{"id_content": "c9", "status": "error"}]]
+    assert calls["watermark"] == [updated]
+
+    assert report["since"] == WATERMARK.isoformat()
+    assert (report["changed"], report["unpublished"], report["retried"]) == (2, 1, 2)
+    assert report["watermark"] == updated.isoformat()
+
+
+def test_sync_all_published_full_ignores_watermark_and_retries(monkeypatch):
+
+    calls = _patch_published_sync(
+        monkeypatch,
+        changed=[{"ID_CONTENT": "c1", "STATUS": "PUBLISHED"}],
+        retries=["c9"],
+    )
+
+    report = sync_service.sync_all_published_contents(full=True)
+
+    assert calls["since"] == [None]
+    assert calls["ids"] == [["c1"]]
+    # full : ensemble de reprise vidé, watermark inchangé (pas d'UPDATED_AT)
+    assert calls["retries"] == [[]]
+    assert calls["watermark"] == []
+    assert report["since"] is None
@@ -0,0 +1,167 @@
+import threading
+import time
+
+import pytest
+
+from utils.ttl_cache import CachedValue, TTLCache
+
+
+# ============================================================
+# TTLCache
+# ============================================================
+
+def test_ttl_cache_expires_entries(monkeypatch):
+
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+    cache = TTLCache(ttl=10, max_entries=10)
+    cache.set("a", 1)
+
+    assert cache.get("a") == (True, 1)
+
+    now[0] += 11
+
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["expirations"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+
+    evicted = []
+    cache = TTLCache(ttl=60, max_entries=2, on_evict=lambda k, v: evicted.append(k))
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert evicted == ["b"]
+    assert cache.get("a") == (True, 1)
+    assert cache.get("b") == (False, None)
+
+
+def test_ttl_cache_generation_guard_drops_stale_load():
+
+    cache = TTLCache(ttl=60, max_entries=10)
+
+    def loader():
+        # écriture concurrente pendant le chargement
+        cache.invalidate()
+        return "stale"
+
+    assert cache.get_or_load("k", loader) == "stale"
+    assert cache.get("k") == (False, None)
+
+    assert cache.get_or_load("k", lambda: "fresh") == "fresh"
+    assert cache.get("k") == (True, "fresh")
+
+
+def test_ttl_cache_invalidate_with_predicate():
+
+    cache = TTLCache(ttl=60, max_entries=10)
+    cache.set(("u1", "context"), 1)
+    cache.set(("u1", "preferences"), 2)
+    cache.set(("u2", "context"), 3)
+
+    removed = cache.invalidate(lambda key, _: key[0] == "u1")
+
+    assert sorted(v for _, v in removed) == [1, 2]
+    assert cache.get(("u2", "context")) == (True, 3)
+
+
+# ============================================================
+# CachedValue
+# ============================================================
+
+def test_cached_value_loads_once_per_ttl():
+
+    calls = []
+    value = CachedValue(lambda: calls.append(1) or len(calls), ttl=60)
+
+    assert value.get() == 1
+    assert value.get() == 1
+    assert value.stats()["loads"] == 1
+
+    value.invalidate()
+
+    assert value.get() == 2
+
+
+def test_cached_value_single_flight_reload():
+
+    calls = []
+    started = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return "v"
+
+    value = CachedValue(loader, ttl=60)
+
+    threads = [threading.Thread(target=value.get) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+
+
+def test_cached_value_serves_previous_value_on_reload_error():
+
+    outcomes = iter(["v1", RuntimeError("bq down"), "v2"])
+
+    def loader():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    value = CachedValue(loader, ttl=60)
+
+    assert value.get() == "v1"
+
+    value.invalidate()
+
+    assert value.get() == "v1"
+    assert value.stats()["load_errors"] == 1
+
+    assert value.get() == "v2"
+
+
+def test_cached_value_first_load_error_is_raised():
+
+    def loader():
+        raise RuntimeError("bq down")
+
+    with pytest.raises(RuntimeError):
+        CachedValue(loader, ttl=60).get()
+
+
+def test_cached_value_invalidation_during_load_is_not_lost():
+
+    holder = {}
+
+    def loader():
+        holder["value"].invalidate()
+        return "stale"
+
+    value = CachedValue(loader, ttl=60)
+    holder["value"] = value
+
+    assert value.get() == "stale"
+    assert value.peek() is None
+
+
+def test_cached_value_update_keeps_expiry():
+
+    value = CachedValue(lambda: frozenset({"a"}), ttl=60)
+    value.get()
+
+    value.update(lambda v: v | {"b"})
+
+    assert value.get() == frozenset({"a", "b"})
+    assert value.stats()["loads"] == 1
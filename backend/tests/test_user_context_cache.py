@@ -0,0 +1,36 @@
+import core.user.user_context_cache as user_cache
+
+
+def setup_function():
+    user_cache.clear_user_context_cache()
+
+
+def test_cached_user_value_returns_copies():
+
+    value = user_cache.cached_user_value("u1", lambda: {"keywords": ["a"]})
+    value["keywords"].append("mutated")
+
+    assert user_cache.get_cached("u1") == (True, {"keywords": ["a"]})
+
+
+def test_invalidate_user_context_drops_all_kinds_of_one_user():
+
+    user_cache.set_cached("u1", {"c": 1})
+    user_cache.set_cached("u1", {"p": 1}, kind=user_cache.KIND_PREFERENCES)
+    user_cache.set_cached("u2", {"c": 2})
+
+    user_cache.invalidate_user_context("u1")
+
+    assert user_cache.get_cached("u1")[0] is False
+    assert user_cache.get_cached("u1", user_cache.KIND_PREFERENCES)[0] is False
+    assert user_cache.get_cached("u2") == (True, {"c": 2})
+
+
+def test_write_during_load_is_not_overwritten_by_stale_value():
+
+    def loader():
+        user_cache.invalidate_user_context("u1")
+        return {"stale": True}
+
+    assert user_cache.cached_user_value("u1", loader) == {"stale": True}
+    assert user_cache.get_cached("u1") == (False, None)
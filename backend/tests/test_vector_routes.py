@@ -0,0 +1,63 @@
+from fastapi import FastAPI
+
+import api.vector.routes as routes
+import core.vectorization.content_vector_service as content_vector_service
+import core.vectorization.vector_service as vector_service
+
+
+def _app():
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api/vector")
+    return app
+
+
+def _post(call, path, payload):
+    return call(_app(), "POST", path, body=payload)
+
+
+def test_news_batch_disabled_reports_each_id(call, monkeypatch):
+
+    monkeypatch.setattr(vector_service, "is_pinecone_enabled", lambda: False)
+
+    response = _post(call, "/api/vector/news/batch", {"ids": ["n1", "n2", "n1"]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["processed"] == 2
+    assert body["error"] == 0
+    assert [r["news_id"] for r in body["results"]] == ["n1", "n2"]
+    assert {r["status"] for r in body["results"]} == {"disabled"}
+
+
+def test_content_batch_disabled_reports_each_id(call, monkeypatch):
+
+    monkeypatch.setattr(content_vector_service, "is_pinecone_enabled", lambda: False)
+
+    response = _post(call, "/api/vector/content/batch", {"ids": ["c1"]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["processed"] == 1
+    assert body["results"] == [
+        {"content_id": "c1", "status": "disabled", "nb_vectors": None, "error": None}
+    ]
+
+
+def test_news_batch_error_items_are_counted(call, monkeypatch):
+
+    monkeypatch.setattr(
+        routes,
+        "vectorize_news_batch",
+        lambda ids: {
+            "status": "ok",
+            "results": [
+                {"news_id": "n1", "status": "ok", "nb_vectors": 3},
+                {"news_id": "n2", "status": "error", "error": "boom"},
+            ],
+        },
+    )
+
+    response = _post(call, "/api/vector/news/batch", {"ids": ["n1", "n2"]})
+
+    body = response.json()
+    assert (body["processed"], body["success"], body["error"]) == (2, 1, 1)
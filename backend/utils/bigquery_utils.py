@@ -1,14 +1,51 @@
 import os
 import json
-from datetime import datetime, date
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, time
+from decimal import Decimal
+from functools import lru_cache, partial
+from typing import Any, NamedTuple
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
 from google.oauth2 import service_account
+from requests.adapters import HTTPAdapter
 
 
 # ---------------------------------------------------------
-# Client BigQuery (version minimaliste pour Ratecard)
+# Client BigQuery partagé (process-wide, thread-safe)
 # ---------------------------------------------------------
-def get_bigquery_client() -> bigquery.Client:
+# Un seul client par process : credentials lus une fois,
+# session HTTP poolée réutilisée entre les requêtes.
+BQ_HTTP_POOL_SIZE = int(os.getenv("BQ_HTTP_POOL_SIZE", "32"))
+
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+_CLIENT_STATS = {
+    "constructions": 0,
+    "resets": 0,
+    "last_built_at": None,
+}
+
+
+def _build_http_session(credentials) -> AuthorizedSession:
+    """
+    Session HTTP authentifiée avec pool de connexions keep-alive.
+    """
+    session = AuthorizedSession(credentials)
+
+    adapter = HTTPAdapter(
+        pool_connections=BQ_HTTP_POOL_SIZE,
+        pool_maxsize=BQ_HTTP_POOL_SIZE,
+    )
+    session.mount("https://", adapter)
+
+    return session
+
+
+def _build_bigquery_client() -> bigquery.Client:
     """
     Crée un client BigQuery dans la région correcte.
     """
@@ -17,42 +54,278 @@ def get_bigquery_client() -> bigquery.Client:
     if credentials_path:
         with open(credentials_path, "r") as f:
             info = json.load(f)
-        credentials = service_account.Credentials.from_service_account_info(info)
+        credentials = service_account.Credentials.from_service_account_info(
+            info,
+            scopes=bigquery.Client.SCOPE,
+        )
         project_id = info.get("project_id")
-        return bigquery.Client(
-            credentials=credentials,
-            project=project_id,
-            location="EU"   # 🔥 FORCE LA RÉGION CORRECTE
+    else:
+        # Local dev ou ADC
+        credentials, project_id = google.auth.default(
+            scopes=bigquery.Client.SCOPE
         )
 
-    # Local dev ou ADC
-    return bigquery.Client(location="EU")
+    return bigquery.Client(
+        credentials=credentials,
+        project=project_id,
+        location="EU",   # 🔥 FORCE LA RÉGION CORRECTE
+        _http=_build_http_session(credentials),
+    )
+
+
+def get_bigquery_client() -> bigquery.Client:
+    """
+    Retourne le client BigQuery partagé (initialisation paresseuse).
+    """
+    global _CLIENT
+
+    client = _CLIENT
+    if client is not None:
+        return client
+
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = _build_bigquery_client()
+            _CLIENT_STATS["constructions"] += 1
+            _CLIENT_STATS["last_built_at"] = datetime.utcnow().isoformat()
+        return _CLIENT
+
+
+def reset_bigquery_client() -> None:
+    """
+    Ferme et oublie le client partagé (tests, rotation de credentials).
+    Le prochain appel à get_bigquery_client() en reconstruit un.
+    """
+    global _CLIENT, _BQSTORAGE_CLIENT
+
+    with _CLIENT_LOCK:
+        client = _CLIENT
+        _CLIENT = None
+        _BQSTORAGE_CLIENT = None
+        _CLIENT_STATS["resets"] += 1
+
+    if client is not None:
+        try:
+            client.close()
+        except Exception as e:
+            print("[BQ] close client error:", e)
+
+
+def get_bigquery_client_stats() -> dict:
+    """
+    Compteurs du client partagé (exposés par /api/health/bigquery).
+    """
+    with _CLIENT_LOCK:
+        return {
+            **_CLIENT_STATS,
+            "initialized": _CLIENT is not None,
+            "http_pool_size": BQ_HTTP_POOL_SIZE,
+        }
 
 
 # ---------------------------------------------------------
-# Helpers : inférer le type BigQuery standard
+# Paramètres typés (couche d'encodage partagée)
 # ---------------------------------------------------------
+# Ordre important : bool avant int, datetime avant date.
+_PY_TO_BQ_TYPES = (
+    (bool, "BOOL"),
+    (int, "INT64"),
+    (float, "FLOAT64"),
+    (Decimal, "NUMERIC"),
+    (datetime, "TIMESTAMP"),
+    (date, "DATE"),
+    (time, "TIME"),
+    (bytes, "BYTES"),
+)
+
+
+class BqTyped(NamedTuple):
+    """
+    Valeur accompagnée de son type BigQuery explicite.
+
+    bq_typed(None, "INT64")               → NULL typé INT64
+    bq_typed([], "ARRAY<INT64>")          → tableau vide typé
+    bq_typed("2024-01-01", "DATE")        → coercition explicite
+    """
+    value: Any
+    type_: str
+
+
+def bq_typed(value, type_: str) -> BqTyped:
+    return BqTyped(value, type_)
+
+
+@lru_cache(maxsize=256)
+def _type_for_class(cls) -> str:
+    for py_type, bq_type in _PY_TO_BQ_TYPES:
+        if issubclass(cls, py_type):
+            return bq_type
+    return "STRING"
+
+
 def _infer_type(value):
-    if isinstance(value, bool):
-        return "BOOL"
-    if isinstance(value, int):
-        return "INT64"
-    if isinstance(value, float):
+    return _type_for_class(type(value))
+
+
+def _array_element_type(values) -> str:
+    """
+    Type des éléments d'un tableau (une passe sur les classes, pas
+    sur les valeurs : rapide même pour 10k ids).
+    """
+    classes = set(map(type, values))
+    classes.discard(type(None))
+
+    if not classes:
+        return "STRING"
+
+    if len(classes) == 1:
+        return _type_for_class(classes.pop())
+
+    types = {_type_for_class(c) for c in classes}
+
+    if len(types) == 1:
+        return types.pop()
+
+    if types == {"INT64", "FLOAT64"}:
         return "FLOAT64"
-    if isinstance(value, datetime):
-        return "TIMESTAMP"
-    if isinstance(value, date):
-        return "DATE"
+
     return "STRING"
 
 
+def _struct_array_param(
+    name,
+    rows: list[dict],
+    columns: list[str] = None,
+    column_types: dict = None,
+):
+    """
+    ARRAY<STRUCT<...>> : un STRUCT par ligne, types résolus par colonne
+    sur l'ensemble des lignes (NULL typés correctement).
+    column_types : types explicites, ex. {"PUBLISHED_AT": "TIMESTAMP",
+    "IDS": "ARRAY<INT64>"} (colonne entièrement NULL ou vide).
+    """
+    if columns is None:
+        columns = list(dict.fromkeys(k for row in rows for k in row.keys()))
+
+    types = {}
+
+    for col in columns:
+        values = [row.get(col) for row in rows]
+
+        explicit = (column_types or {}).get(col)
+
+        if explicit:
+            explicit = explicit.upper().replace(" ", "")
+            if explicit.startswith("ARRAY<") and explicit.endswith(">"):
+                types[col] = ("ARRAY", explicit[6:-1])
+            else:
+                types[col] = ("SCALAR", explicit)
+
+        elif any(isinstance(v, (list, tuple)) for v in values):
+            elements = [e for v in values if v for e in v]
+            types[col] = ("ARRAY", _array_element_type(elements))
+        else:
+            types[col] = ("SCALAR", _array_element_type(values))
+
+    structs = []
+
+    for row in rows:
+
+        sub_params = []
+
+        for col in columns:
+
+            kind, type_ = types[col]
+            value = row.get(col)
+
+            if kind == "ARRAY":
+                sub_params.append(
+                    bigquery.ArrayQueryParameter(col, type_, list(value or []))
+                )
+            else:
+                sub_params.append(
+                    bigquery.ScalarQueryParameter(col, type_, value)
+                )
+
+        structs.append(bigquery.StructQueryParameter(None, *sub_params))
+
+    return bigquery.ArrayQueryParameter(name, "STRUCT", structs)
+
+
+def build_query_param(name: str, value):
+    """
+    Construit le paramètre BigQuery adapté à la valeur Python.
+
+    - scalaires     → type inféré (None → NULL STRING)
+    - list/tuple/set → ARRAY<type des éléments> (vide autorisé)
+    - list[dict]    → ARRAY<STRUCT<...>>
+    - dict          → STRUCT<...>
+    - bq_typed()    → type explicite
+    - paramètre bigquery déjà construit → inchangé
+    """
+    if isinstance(value, BqTyped):
+
+        type_ = value.type_.upper().replace(" ", "")
+
+        if type_.startswith("ARRAY<") and type_.endswith(">"):
+            return bigquery.ArrayQueryParameter(
+                name,
+                type_[6:-1],
+                list(value.value or []),
+            )
+
+        return bigquery.ScalarQueryParameter(name, type_, value.value)
+
+    if isinstance(value, (list, tuple, set)):
+
+        # pas de copie pour une liste (10k ids : chemin chaud)
+        values = value if isinstance(value, list) else list(value)
+
+        if values and isinstance(values[0], dict):
+            return _struct_array_param(name, values)
+
+        return bigquery.ArrayQueryParameter(
+            name,
+            _array_element_type(values),
+            values,
+        )
+
+    if isinstance(value, dict):
+        return bigquery.StructQueryParameter(
+            name,
+            *[build_query_param(k, v) for k, v in value.items()]
+        )
+
+    if isinstance(
+        value,
+        (
+            bigquery.ScalarQueryParameter,
+            bigquery.ArrayQueryParameter,
+            bigquery.StructQueryParameter,
+        ),
+    ):
+        return value
+
+    return bigquery.ScalarQueryParameter(name, _infer_type(value), value)
+
+
+def build_query_params(params: dict = None) -> list:
+    if not params:
+        return []
+
+    return [
+        build_query_param(name, value)
+        for name, value in params.items()
+    ]
+
+
 # ---------------------------------------------------------
 # Requête BigQuery (SELECT)
 # ---------------------------------------------------------
 def query_bq(sql: str, params: dict = None) -> list[dict]:
     """
     Exécute une requête SELECT sur BigQuery.
-    Supporte automatiquement les paramètres ARRAY.
+    Les paramètres sont typés par build_query_param (ARRAY, STRUCT, NULL typés).
     """
 
     client = get_bigquery_client()
@@ -60,95 +333,311 @@ def query_bq(sql: str, params: dict = None) -> list[dict]:
     job_config = None
 
     if params:
-        query_parameters = []
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=build_query_params(params)
+        )
 
-        for name, value in params.items():
+    job = client.query(sql, job_config=job_config)
 
-            # 🔥 CAS ARRAY (LIST)
-            if isinstance(value, list):
+    return [dict(row) for row in job.result()]
 
-                # 👉 FIX CRITIQUE : array vide sécurisé
-                if len(value) == 0:
-                    value = ["__EMPTY__"]  # valeur impossible
 
-                query_parameters.append(
-                    bigquery.ArrayQueryParameter(
-                        name,
-                        "STRING",
-                        value
-                    )
-                )
+def dry_run_bq(sql: str, params: dict = None) -> int:
+    """
+    Estimation sans exécution : octets qui seraient scannés
+    (tient compte du partition pruning, pas du cache).
+    """
 
-            # 🔥 CAS INT
-            elif isinstance(value, int):
-                query_parameters.append(
-                    bigquery.ScalarQueryParameter(
-                        name,
-                        "INT64",
-                        value
-                    )
-                )
+    client = get_bigquery_client()
 
-            # 🔥 CAS AUTRES
-            else:
-                query_parameters.append(
-                    bigquery.ScalarQueryParameter(
-                        name,
-                        _infer_type(value),
-                        value
-                    )
-                )
+    job_config = bigquery.QueryJobConfig(
+        dry_run=True,
+        use_query_cache=False,
+        query_parameters=build_query_params(params),
+    )
+
+    job = client.query(sql, job_config=job_config)
+
+    return job.total_bytes_processed or 0
+
+
+# ---------------------------------------------------------
+# Lecture en flux (page par page)
+# ---------------------------------------------------------
+# Fast path optionnel via la BigQuery Storage Read API
+# (google-cloud-bigquery-storage + pyarrow, absents par défaut).
+BQ_PAGE_SIZE = int(os.getenv("BQ_PAGE_SIZE", "1000"))
+BQ_USE_STORAGE_API = os.getenv("BQ_USE_STORAGE_API", "0").lower() in {"1", "true", "yes", "on"}
+
+_BQSTORAGE_CLIENT = None
 
+
+def _get_bqstorage_client():
+    """
+    Client Storage Read API partagé, ou None si les dépendances manquent.
+    """
+    global _BQSTORAGE_CLIENT
+
+    if _BQSTORAGE_CLIENT is not None:
+        return _BQSTORAGE_CLIENT
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+
+    client = get_bigquery_client()
+
+    with _CLIENT_LOCK:
+        if _BQSTORAGE_CLIENT is None:
+            _BQSTORAGE_CLIENT = client._ensure_bqstorage_client()
+        return _BQSTORAGE_CLIENT
+
+
+def iter_bq(
+    sql: str,
+    params: dict = None,
+    page_size: int = BQ_PAGE_SIZE,
+    use_storage_api: bool = None,
+):
+    """
+    Variante streaming de query_bq : génère les lignes (dict) page par page
+    sans jamais matérialiser tout le résultat.
+
+    use_storage_api : None → BQ_USE_STORAGE_API
+    (ignoré si google-cloud-bigquery-storage / pyarrow ne sont pas installés).
+    """
+    client = get_bigquery_client()
+
+    job_config = None
+
+    if params:
         job_config = bigquery.QueryJobConfig(
-            query_parameters=query_parameters
+            query_parameters=build_query_params(params)
         )
 
     job = client.query(sql, job_config=job_config)
+    rows = job.result(page_size=page_size)
 
-    return [dict(row) for row in job.result()]
+    if use_storage_api is None:
+        use_storage_api = BQ_USE_STORAGE_API
+
+    bqstorage_client = _get_bqstorage_client() if use_storage_api else None
+
+    if bqstorage_client is not None:
+        for record_batch in rows.to_arrow_iterable(
+            bqstorage_client=bqstorage_client
+        ):
+            yield from record_batch.to_pylist()
+        return
+
+    for page in rows.pages:
+        for row in page:
+            yield dict(row)
 
 
 # ---------------------------------------------------------
-# Insertion BigQuery (INSERT SQL, PAS de streaming)
+# Insertion BigQuery (INSERT SQL multi-lignes, PAS de streaming)
 # ---------------------------------------------------------
-def insert_bq(table: str, rows: list[dict]):
+# Limites BigQuery : 1 MB de SQL non résolu, 10 000 paramètres
+# par requête. On garde une marge confortable.
+INSERT_MAX_QUERY_BYTES = 900_000
+INSERT_MAX_PARAMS = 9_000
+INSERT_MAX_ROWS = 500
+
+# Au-delà de ce volume, un load job (1 job, pas de DML) est préféré
+INSERT_LOAD_THRESHOLD = 2_000
+
+
+def _estimate_value_bytes(value) -> int:
+    if value is None:
+        return 4
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(str(value))
+
+
+def _chunk_insert_rows(
+    rows: list[dict],
+    columns: list[str],
+    max_bytes: int = INSERT_MAX_QUERY_BYTES,
+    max_params: int = INSERT_MAX_PARAMS,
+    max_rows: int = INSERT_MAX_ROWS,
+) -> list[list[dict]]:
     """
-    Insère des lignes dans une table BigQuery via INSERT SQL
-    (évite le streaming buffer pour permettre UPDATE immédiat).
+    Découpe les lignes en paquets respectant la taille de requête,
+    le nombre de paramètres et le nombre de lignes par INSERT.
     """
-    client = get_bigquery_client()
+    chunks = []
+    current = []
+    current_bytes = 0
+    current_params = 0
+
+    # "@r123_c45, " par cellule + parenthèses par ligne
+    placeholder_bytes = 12
 
     for row in rows:
-        columns = []
+
+        row_params = len(columns)
+        row_bytes = sum(
+            _estimate_value_bytes(row.get(c)) + placeholder_bytes
+            for c in columns
+        ) + 4
+
+        if current and (
+            current_bytes + row_bytes > max_bytes
+            or current_params + row_params > max_params
+            or len(current) >= max_rows
+        ):
+            chunks.append(current)
+            current = []
+            current_bytes = 0
+            current_params = 0
+
+        current.append(row)
+        current_bytes += row_bytes
+        current_params += row_params
+
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def _insert_chunk_dml(client, table: str, columns: list[str], chunk: list[dict]) -> dict:
+    """
+    Un seul INSERT ... VALUES (...), (...) paramétré pour le paquet.
+    """
+    values_sql = []
+    params = []
+
+    for i, row in enumerate(chunk):
+
         placeholders = []
-        params = []
 
-        for key, value in row.items():
-            columns.append(key)
-            placeholders.append(f"@{key}")
+        for j, key in enumerate(columns):
+
+            value = row.get(key)
+
+            # NULL littéral : compatible avec tous les types de colonne
+            if value is None:
+                placeholders.append("NULL")
+                continue
+
+            name = f"r{i}_c{j}"
+            placeholders.append(f"@{name}")
 
             # Conversion datetime/date propre
             if hasattr(value, "isoformat"):
                 value = value.isoformat()
 
             params.append(
-                bigquery.ScalarQueryParameter(
-                    key,
-                    _infer_type(value),
-                    value
-                )
+                build_query_param(name, value)
             )
 
-        sql = f"""
-            INSERT INTO `{table}` ({", ".join(columns)})
-            VALUES ({", ".join(placeholders)})
-        """
+        values_sql.append(f"({', '.join(placeholders)})")
 
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=params
-        )
+    sql = f"""
+        INSERT INTO `{table}` ({", ".join(columns)})
+        VALUES {", ".join(values_sql)}
+    """
+
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=params
+    )
+
+    job = client.query(sql, job_config=job_config)
+    job.result()
+
+    return {
+        "job_id": job.job_id,
+        "params": len(params),
+        "query_bytes": len(sql.encode("utf-8")),
+    }
+
+
+def _insert_chunk_load(client, table: str, chunk: list[dict]) -> dict:
+    """
+    Load job JSON (WRITE_APPEND) : pas de quota DML, pas de streaming buffer.
+    """
+    payload = [
+        {
+            k: (v.isoformat() if hasattr(v, "isoformat") else v)
+            for k, v in row.items()
+        }
+        for row in chunk
+    ]
+
+    job = client.load_table_from_json(
+        payload,
+        table,
+        job_config=bigquery.LoadJobConfig(
+            write_disposition="WRITE_APPEND"
+        ),
+    )
+    job.result()
+
+    return {
+        "job_id": job.job_id,
+    }
+
+
+def insert_bq(table: str, rows: list[dict], mode: str = "auto") -> dict:
+    """
+    Insère des lignes dans une table BigQuery via INSERT SQL
+    (évite le streaming buffer pour permettre UPDATE immédiat).
+
+    mode :
+    - "dml"  : un INSERT multi-lignes paramétré par paquet
+    - "load" : un load job JSON pour tout le lot
+    - "auto" : "load" au-delà de INSERT_LOAD_THRESHOLD lignes, sinon "dml"
+
+    Retourne les stats par paquet (lignes, paramètres, job, durée).
+    """
+    if not rows:
+        return {"rows": 0, "jobs": 0, "mode": mode, "chunks": []}
+
+    if mode == "auto":
+        mode = "load" if len(rows) >= INSERT_LOAD_THRESHOLD else "dml"
+
+    if mode not in ("dml", "load"):
+        raise ValueError(f"insert_bq: mode inconnu '{mode}'")
+
+    client = get_bigquery_client()
+
+    # Union ordonnée des colonnes (les lignes peuvent être hétérogènes)
+    columns = list(dict.fromkeys(k for row in rows for k in row.keys()))
+
+    if mode == "load":
+        chunks = [rows]
+    else:
+        chunks = _chunk_insert_rows(rows, columns)
+
+    stats = []
+
+    for chunk in chunks:
+
+        started_at = datetime.now()
 
-        client.query(sql, job_config=job_config).result()
+        if mode == "load":
+            chunk_stats = _insert_chunk_load(client, table, chunk)
+        else:
+            chunk_stats = _insert_chunk_dml(client, table, columns, chunk)
+
+        stats.append({
+            "rows": len(chunk),
+            **chunk_stats,
+            "duration_seconds": (
+                datetime.now() - started_at
+            ).total_seconds(),
+        })
+
+    return {
+        "rows": len(rows),
+        "jobs": len(stats),
+        "mode": mode,
+        "chunks": stats,
+    }
 
 
 # ---------------------------------------------------------
@@ -177,76 +666,7 @@ def update_bq(table: str, fields: dict, where: dict) -> bool:
     for k, v in fields.items():
 
         set_clause.append(f"{k} = @{k}")
-
-        # 🔥 ARRAY<STRING>
-        if isinstance(v, list):
-            params.append(
-                bigquery.ArrayQueryParameter(
-                    k,
-                    "STRING",
-                    v
-                )
-            )
-
-        # 🔥 TIMESTAMP
-        elif isinstance(v, datetime):
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    k,
-                    "TIMESTAMP",
-                    v
-                )
-            )
-
-        # 🔥 DATE
-        elif isinstance(v, date):
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    k,
-                    "DATE",
-                    v
-                )
-            )
-
-        # 🔥 BOOL
-        elif isinstance(v, bool):
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    k,
-                    "BOOL",
-                    v
-                )
-            )
-
-        # 🔥 INT
-        elif isinstance(v, int):
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    k,
-                    "INT64",
-                    v
-                )
-            )
-
-        # 🔥 FLOAT
-        elif isinstance(v, float):
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    k,
-                    "FLOAT64",
-                    v
-                )
-            )
-
-        # 🔥 STRING / fallback
-        else:
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    k,
-                    "STRING",
-                    v
-                )
-            )
+        params.append(build_query_param(k, v))
 
     # ==========================================================
     # WHERE
@@ -255,60 +675,7 @@ def update_bq(table: str, fields: dict, where: dict) -> bool:
 
         where_key = f"where_{k}"
         where_clause.append(f"{k} = @{where_key}")
-
-        if isinstance(v, datetime):
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    where_key,
-                    "TIMESTAMP",
-                    v
-                )
-            )
-
-        elif isinstance(v, date):
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    where_key,
-                    "DATE",
-                    v
-                )
-            )
-
-        elif isinstance(v, bool):
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    where_key,
-                    "BOOL",
-                    v
-                )
-            )
-
-        elif isinstance(v, int):
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    where_key,
-                    "INT64",
-                    v
-                )
-            )
-
-        elif isinstance(v, float):
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    where_key,
-                    "FLOAT64",
-                    v
-                )
-            )
-
-        else:
-            params.append(
-                bigquery.ScalarQueryParameter(
-                    where_key,
-                    "STRING",
-                    v
-                )
-            )
+        params.append(build_query_param(where_key, v))
 
     # ==========================================================
     # EXECUTION
@@ -326,3 +693,226 @@ def update_bq(table: str, fields: dict, where: dict) -> bool:
     client.query(sql, job_config=job_config).result()
 
     return True
+
+
+# ---------------------------------------------------------
+# Mise à jour en masse (MERGE depuis UNNEST(@rows))
+# ---------------------------------------------------------
+BULK_MAX_ROWS = 2_000
+
+
+def merge_bq(
+    table: str,
+    key,
+    rows: list[dict],
+    insert_missing: bool = True,
+    condition: str = None,
+    column_types: dict = None,
+) -> dict:
+    """
+    Upsert en masse : les lignes sont passées dans un seul paramètre
+    ARRAY<STRUCT> puis appliquées par un unique MERGE.
+
+    key            : colonne (ou liste de colonnes) de jointure
+    rows           : [{"ID": ..., "COL": value, ...}]
+    insert_missing : WHEN NOT MATCHED THEN INSERT
+    condition      : filtre additionnel sur la cible (alias T),
+                     ex. "T.STATUS = 'DRAFT'"
+    column_types   : types explicites des colonnes (cf. _struct_array_param)
+
+    Une colonne scalaire entièrement NULL dans un lot est écrite en
+    NULL littéral (typé par la colonne cible), pas en S.col : un STRUCT
+    NULL serait typé STRING et refusé par une colonne TIMESTAMP / INT64.
+
+    Les lignes aux colonnes différentes sont regroupées
+    (un MERGE par jeu de colonnes, jamais de NULL implicite).
+    Les dates doivent être passées en datetime/date (pas en ISO string) :
+    les champs STRUCT ne sont pas coercés comme les littéraux.
+    """
+    if not rows:
+        return {"rows": 0, "statements": 0, "affected": 0}
+
+    keys = [key] if isinstance(key, str) else list(key)
+
+    for row in rows:
+        missing = [k for k in keys if row.get(k) is None]
+        if missing:
+            raise ValueError(f"merge_bq: clé manquante {missing}")
+
+    # MERGE refuse deux lignes source pour une même cible : la dernière gagne
+    deduped = {}
+    for row in rows:
+        deduped[tuple(row[k] for k in keys)] = row
+
+    groups = {}
+    for row in deduped.values():
+        groups.setdefault(tuple(row.keys()), []).append(row)
+
+    client = get_bigquery_client()
+
+    statements = 0
+    affected = 0
+
+    for columns, group_rows in groups.items():
+
+        columns = list(columns)
+        set_columns = [c for c in columns if c not in keys]
+
+        if not set_columns and not insert_missing:
+            continue
+
+        on_clause = " AND ".join(f"T.{k} = S.{k}" for k in keys)
+
+        for i in range(0, len(group_rows), BULK_MAX_ROWS):
+
+            chunk = group_rows[i:i + BULK_MAX_ROWS]
+
+            null_columns = {
+                c for c in set_columns
+                if c not in (column_types or {})
+                and all(row.get(c) is None for row in chunk)
+            }
+
+            def source(c):
+                return "NULL" if c in null_columns else f"S.{c}"
+
+            matched_clause = ""
+            if set_columns:
+                matched_when = "WHEN MATCHED"
+                if condition:
+                    matched_when += f" AND {condition}"
+                matched_clause = f"""
+                {matched_when} THEN UPDATE SET
+                    {", ".join(f"{c} = {source(c)}" for c in set_columns)}
+                """
+
+            insert_clause = ""
+            if insert_missing:
+                insert_clause = f"""
+                WHEN NOT MATCHED THEN INSERT ({", ".join(columns)})
+                VALUES ({", ".join(source(c) for c in columns)})
+                """
+
+            sql = f"""
+                MERGE `{table}` T
+                USING (SELECT * FROM UNNEST(@rows)) S
+                ON {on_clause}
+                {matched_clause}
+                {insert_clause}
+            """
+
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    _struct_array_param("rows", chunk, columns, column_types)
+                ]
+            )
+
+            job = client.query(sql, job_config=job_config)
+            job.result()
+
+            statements += 1
+            affected += job.num_dml_affected_rows or 0
+
+    return {
+        "rows": len(rows),
+        "statements": statements,
+        "affected": affected,
+    }
+
+
+def bulk_update_bq(
+    table: str,
+    key,
+    rows: list[dict],
+    condition: str = None,
+    column_types: dict = None,
+) -> dict:
+    """
+    UPDATE en masse : une ligne par ID, un seul MERGE (sans INSERT).
+
+    bulk_update_bq(
+        TABLE_CONTENT,
+        "ID_CONTENT",
+        [{"ID_CONTENT": "a", "STATUS": "READY"}, ...],
+        condition="T.STATUS = 'DRAFT'",
+    )
+    """
+    return merge_bq(
+        table,
+        key,
+        rows,
+        insert_missing=False,
+        condition=condition,
+        column_types=column_types,
+    )
+
+
+# ---------------------------------------------------------
+# Façade async (routes FastAPI async)
+# ---------------------------------------------------------
+# Le client BigQuery est synchrone : les appels sont délégués à un
+# pool de threads borné pour ne jamais bloquer la boucle d'événements.
+BQ_ASYNC_WORKERS = int(os.getenv("BQ_ASYNC_WORKERS", "16"))
+BQ_REQUEST_CONCURRENCY = int(os.getenv("BQ_REQUEST_CONCURRENCY", "4"))
+
+_BQ_EXECUTOR = None
+_BQ_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_bq_executor() -> ThreadPoolExecutor:
+    global _BQ_EXECUTOR
+
+    if _BQ_EXECUTOR is None:
+        with _BQ_EXECUTOR_LOCK:
+            if _BQ_EXECUTOR is None:
+                _BQ_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=BQ_ASYNC_WORKERS,
+                    thread_name_prefix="bq",
+                )
+
+    return _BQ_EXECUTOR
+
+
+async def arun_bq(fn, *args, **kwargs):
+    """
+    Exécute une fonction synchrone liée à BigQuery dans le pool dédié.
+    """
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(
+        _get_bq_executor(),
+        partial(fn, *args, **kwargs),
+    )
+
+
+async def aquery_bq(sql: str, params: dict = None) -> list[dict]:
+    return await arun_bq(query_bq, sql, params)
+
+
+async def ainsert_bq(table: str, rows: list[dict], mode: str = "auto") -> dict:
+    return await arun_bq(insert_bq, table, rows, mode)
+
+
+async def aupdate_bq(table: str, fields: dict, where: dict) -> bool:
+    return await arun_bq(update_bq, table, fields, where)
+
+
+async def gather_bq(
+    *aws,
+    limit: int = BQ_REQUEST_CONCURRENCY,
+    return_exceptions: bool = False,
+):
+    """
+    asyncio.gather avec au plus `limit` appels BigQuery simultanés
+    pour la requête HTTP courante (le pool global reste partagé).
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def bounded(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(
+        *(bounded(aw) for aw in aws),
+        return_exceptions=return_exceptions,
+    )
@@ -0,0 +1,372 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from starlette.routing import Match
+
+from utils.ttl_cache import TTLCache
+
+
+# ---------------------------------------------------------
+# CACHE DE RÉPONSES HTTP (routes de lecture) + ETAG / 304
+# ---------------------------------------------------------
+# Une route s'inscrit par décorateur (sous @router.get) :
+#
+#   @router.get("/members")
+#   @http_cache(ttl=600, tags=("company",))
+#   def get_members(): ...
+#
+# HTTPCacheMiddleware retrouve la route, construit la clé
+# (méthode, chemin, query params triés, x-user-id, corps JSON
+# normalisé pour un POST), sert la réponse en mémoire si elle
+# est fraîche, et répond 304 si If-None-Match correspond.
+#
+# Les écritures appellent invalidate_http_cache("news", ...) :
+# toutes les entrées des routes portant un de ces tags sautent.
+# Routes personnalisées (tag "user") : invalidate_http_cache("user",
+# user_id=...) ne retire que les entrées de cet utilisateur.
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "1") == "1"
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "2000"))
+
+# Corps de réponse au-delà : non mis en cache
+HTTP_CACHE_MAX_BODY_BYTES = int(os.getenv("HTTP_CACHE_MAX_BODY_BYTES", str(2 * 1024 * 1024)))
+
+_CACHEABLE_METHODS = {"GET", "POST"}
+
+_ROUTE_STATS: Dict[str, Dict[str, int]] = defaultdict(
+    lambda: {
+        "hits": 0,
+        "misses": 0,
+        "not_modified": 0,
+        "stores": 0,
+        "evictions": 0,
+        "invalidations": 0,
+    }
+)
+_STATS_LOCK = threading.Lock()
+
+
+def _count(route: str, field: str) -> None:
+    with _STATS_LOCK:
+        _ROUTE_STATS[route][field] += 1
+
+
+# TTL par entrée (celui de la route) ; une réponse calculée avant
+# une invalidation n'est pas stockée après elle (génération)
+_CACHE = TTLCache(
+    ttl=0,
+    max_entries=HTTP_CACHE_MAX_ENTRIES,
+    on_evict=lambda key, entry: _count(entry["route"], "evictions"),
+)
+
+
+# ---------------------------------------------------------
+# DÉCORATEUR
+# ---------------------------------------------------------
+
+def http_cache(ttl: float, tags: Iterable[str] = ()):
+    """
+    Marque un endpoint comme cacheable (la fonction est inchangée).
+    """
+    def decorator(endpoint):
+        endpoint.__http_cache__ = {
+            "ttl": float(ttl),
+            "tags": frozenset(tags),
+        }
+        return endpoint
+
+    return decorator
+
+
+def _resolve_route(scope) -> Tuple[Optional[str], Optional[Dict]]:
+    """
+    Première route qui matche complètement (même ordre que le routeur).
+    """
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+
+    for route in getattr(router, "routes", ()):
+
+        match, _ = route.matches(scope)
+
+        if match == Match.FULL:
+            endpoint = getattr(route, "endpoint", None)
+            return route.path, getattr(endpoint, "__http_cache__", None)
+
+    return None, None
+
+
+# ---------------------------------------------------------
+# CLÉ
+# ---------------------------------------------------------
+
+def _header(scope, name: bytes) -> Optional[str]:
+
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+
+    return None
+
+
+def _normalize_body(body: bytes) -> str:
+
+    if not body:
+        return ""
+
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return hashlib.sha1(body).hexdigest()
+
+
+def _cache_key(scope, body: bytes) -> tuple:
+
+    query = tuple(sorted(
+        parse_qsl(
+            scope.get("query_string", b"").decode("latin-1"),
+            keep_blank_values=True,
+        )
+    ))
+
+    return (
+        scope["method"],
+        scope["path"],
+        query,
+        _header(scope, b"x-user-id") or "",
+        _normalize_body(body),
+    )
+
+
+def _etag_matches(scope, etag: str) -> bool:
+
+    if_none_match = _header(scope, b"if-none-match")
+
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return etag in [
+        tag.strip().removeprefix("W/")
+        for tag in if_none_match.split(",")
+    ]
+
+
+# ---------------------------------------------------------
+# LECTURE / ÉCRITURE
+# ---------------------------------------------------------
+
+def _get(key: tuple) -> Optional[Dict[str, Any]]:
+
+    found, entry = _CACHE.get(key)
+
+    return entry if found else None
+
+
+def _set(key: tuple, entry: Dict[str, Any], generation: int) -> None:
+
+    if _CACHE.set(key, entry, generation, ttl=entry["ttl"]):
+        _count(entry["route"], "stores")
+
+
+# ---------------------------------------------------------
+# MIDDLEWARE (ASGI)
+# ---------------------------------------------------------
+
+class HTTPCacheMiddleware:
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+
+        if (
+            not HTTP_CACHE_ENABLED
+            or scope["type"] != "http"
+            or scope["method"] not in _CACHEABLE_METHODS
+        ):
+            return await self.app(scope, receive, send)
+
+        route_path, rule = _resolve_route(scope)
+
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        # --------------------------------------------------
+        # Corps (POST) : lu une fois, rejoué pour l'app
+        # --------------------------------------------------
+
+        body = b""
+
+        if scope["method"] == "POST":
+
+            more_body = True
+
+            while more_body:
+                message = await receive()
+                body += message.get("body", b"")
+                more_body = message.get("more_body", False)
+
+        replayed = False
+
+        async def replay_receive():
+            nonlocal replayed
+
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+
+            return await receive()
+
+        key = _cache_key(scope, body)
+        entry = _get(key)
+
+        if entry is not None:
+            _count(route_path, "hits")
+            return await self._send_entry(scope, send, entry, "HIT")
+
+        _count(route_path, "misses")
+
+        generation = _CACHE.generation()
+
+        # --------------------------------------------------
+        # MISS : réponse complète bufferisée (JSON)
+        # --------------------------------------------------
+
+        start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+
+        async def capture(message):
+
+            if message["type"] == "http.response.start":
+                start.update(message)
+
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, replay_receive, capture)
+
+        response_body = b"".join(chunks)
+
+        headers = [
+            (k, v) for k, v in start.get("headers", [])
+            if k.lower() not in (b"etag", b"cache-control")
+        ]
+
+        etag = '"' + hashlib.sha1(response_body).hexdigest() + '"'
+        ttl = rule["ttl"]
+
+        entry = {
+            "route": route_path,
+            "tags": rule["tags"],
+            "status": start.get("status", 500),
+            "headers": headers,
+            "body": response_body,
+            "etag": etag,
+            "ttl": ttl,
+            "expires_at": time.monotonic() + ttl,
+        }
+
+        if (
+            entry["status"] == 200
+            and len(response_body) <= HTTP_CACHE_MAX_BODY_BYTES
+        ):
+            _set(key, entry, generation)
+            return await self._send_entry(scope, send, entry, "MISS")
+
+        await send(start)
+        await send({"type": "http.response.body", "body": response_body})
+
+    async def _send_entry(self, scope, send, entry: Dict[str, Any], state: str):
+
+        remaining = max(0, int(entry["expires_at"] - time.monotonic()))
+
+        cache_headers = [
+            (b"etag", entry["etag"].encode()),
+            (b"cache-control", f"private, max-age={remaining}".encode()),
+            (b"x-cache", state.encode()),
+        ]
+
+        if _etag_matches(scope, entry["etag"]):
+
+            _count(entry["route"], "not_modified")
+
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": cache_headers,
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": entry["status"],
+            "headers": entry["headers"] + cache_headers,
+        })
+        await send({
+            "type": "http.response.body",
+            "body": entry["body"],
+        })
+
+
+# ---------------------------------------------------------
+# INVALIDATION
+# ---------------------------------------------------------
+
+def invalidate_http_cache(*tags: str, user_id: Optional[str] = None) -> int:
+    """
+    Sans tag : vide tout le cache. user_id : seulement les entrées
+    de cet utilisateur (x-user-id). Retourne le nombre d'entrées retirées.
+    """
+    wanted = set(tags)
+
+    removed = _CACHE.invalidate(
+        lambda key, entry: (
+            (not wanted or entry["tags"] & wanted)
+            and (user_id is None or key[3] == user_id)
+        )
+    )
+
+    for _, entry in removed:
+        _count(entry["route"], "invalidations")
+
+    return len(removed)
+
+
+# ---------------------------------------------------------
+# METRICS
+# ---------------------------------------------------------
+
+def get_http_cache_stats() -> Dict[str, Any]:
+
+    with _STATS_LOCK:
+
+        routes = {}
+
+        for route, stats in _ROUTE_STATS.items():
+
+            lookups = stats["hits"] + stats["misses"]
+
+            routes[route] = {
+                **stats,
+                "hit_ratio": (
+                    round(stats["hits"] / lookups, 4)
+                    if lookups else None
+                ),
+            }
+
+    return {
+        "enabled": HTTP_CACHE_ENABLED,
+        "size": len(_CACHE),
+        "max_entries": HTTP_CACHE_MAX_ENTRIES,
+        "routes": routes,
+    }
@@ -0,0 +1,121 @@
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+
+# ---------------------------------------------------------
+# FILE DE JOBS EN MÉMOIRE (tâches de fond + suivi de statut)
+# ---------------------------------------------------------
+# Un registre par type de job. Les jobs tournent dans un pool
+# de threads dédié ; le statut est consultable par job_id.
+#
+# registry = JobRegistry("radar-bulk", max_workers=1)
+# job_id = registry.submit(lambda update: ..., id_content="...")
+# registry.get(job_id) → {"job_id", "status", ...}
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobRegistry:
+
+    def __init__(self, name: str, max_workers: int = 2, max_jobs: int = 500):
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.max_jobs = max_jobs
+
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self.name,
+                )
+        return self._executor
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def _run(self, job_id: str, target: Callable):
+
+        self.update(job_id, status="running", started_at=_now())
+
+        try:
+            result = target(lambda **fields: self.update(job_id, **fields))
+
+            self.update(
+                job_id,
+                status="done",
+                finished_at=_now(),
+                **(result or {}),
+            )
+
+        except Exception as e:
+
+            print(f"❌ JOB {self.name} ERROR:", str(e))
+
+            self.update(
+                job_id,
+                status="error",
+                finished_at=_now(),
+                error=str(e),
+            )
+
+    def submit(self, target: Callable, **meta) -> str:
+        """
+        target(update) : update(**fields) publie la progression du job.
+        Le dict retourné par target est fusionné dans le statut final.
+        """
+        job_id = str(uuid.uuid4())
+
+        with self._lock:
+
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                **meta,
+                "status": "queued",
+                "queued_at": _now(),
+            }
+
+            # purge des plus anciens jobs terminés
+            while len(self._jobs) > self.max_jobs:
+                oldest_id, oldest = next(iter(self._jobs.items()))
+                if oldest["status"] in ("queued", "running"):
+                    break
+                del self._jobs[oldest_id]
+
+        self._get_executor().submit(self._run, job_id, target)
+
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list(self, limit: int = 50, **filters) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = [
+                dict(j) for j in reversed(self._jobs.values())
+                if all(
+                    v is None or j.get(k) == v
+                    for k, v in filters.items()
+                )
+            ]
+        return jobs[:limit]
+
+    def active(self, **filters) -> List[Dict[str, Any]]:
+        return [
+            j for j in self.list(limit=self.max_jobs, **filters)
+            if j["status"] in ("queued", "running")
+        ]
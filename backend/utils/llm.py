@@ -1,20 +1,522 @@
 import os
+import sys
+import time
+import random
+import threading
+from contextvars import ContextVar
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+import openai
 from openai import OpenAI
 
+from utils.timing import percentile
+from utils.llm_cache import (
+    llm_cache_key,
+    get_cached_response,
+    put_cached_response,
+    forget_cached_response,
+    get_llm_cache_stats,
+)
+
 DEFAULT_LLM_MODEL = "gpt-4o"
 
 
 # ---------------------------------------------------------
-# CRÉATION SÉCURISÉE DU CLIENT OPENAI
+# CONFIG PASSERELLE OPENAI
 # ---------------------------------------------------------
-def get_llm(model: str = None, temperature: float = 0.2):
-    api_key = os.getenv("OPENAI_API_KEY")
+# Tous les appels OpenAI (chat, embeddings, images) passent par
+# _call_openai : client partagé (pool HTTP), budget process-wide
+# requêtes / tokens par minute, retries exponentiels sur 429 / 5xx
+# / timeouts, compteurs d'usage et de latence par appelant.
+#
+# LLM_RPM_LIMIT / LLM_TPM_LIMIT : 0 = pas de limite
+#
+# LLM_CALLER_BUDGETS : budgets par appelant, en plus du budget global
+# "appelant=concurrence:rpm,..." (0 = pas de plafond), ex.
+# "destock=4:60,numbers.backlog=4:0,radar.bulk=2:30"
+
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "0"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "0"))
+
+# Tokens de sortie réservés quand max_tokens n'est pas fourni
+LLM_DEFAULT_COMPLETION_TOKENS = int(os.getenv("LLM_DEFAULT_COMPLETION_TOKENS", "1000"))
+
+LLM_CALLER_BUDGETS = os.getenv(
+    "LLM_CALLER_BUDGETS",
+    "destock=4:0,numbers.backlog=4:0,radar.bulk=4:0",
+)
+
+# Latences conservées par appelant (p50 / p95)
+LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "500"))
+
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+# ---------------------------------------------------------
+# BUDGET PAR MINUTE (TOKEN BUCKET)
+# ---------------------------------------------------------
+class TokenBucket:
+    """
+    Capacité `per_minute`, remplie en continu. reserve(n) débite
+    immédiatement (le solde peut devenir négatif) et retourne
+    l'attente nécessaire : les appelants sont servis dans l'ordre.
+    """
+
+    def __init__(self, per_minute: int):
+        self.per_minute = max(0, int(per_minute or 0))
+        self._rate = self.per_minute / 60.0
+        self._tokens = float(self.per_minute)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.per_minute),
+            self._tokens + (now - self._updated_at) * self._rate,
+        )
+        self._updated_at = now
+
+    def reserve(self, amount: float) -> float:
+        if not self.per_minute:
+            return 0.0
+
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+
+            if self._tokens >= 0:
+                return 0.0
+
+            return -self._tokens / self._rate
+
+    def adjust(self, delta: float):
+        """
+        Correction après coup (usage réel - estimation).
+        """
+        if not self.per_minute or not delta:
+            return
+
+        with self._lock:
+            self._refill()
+            self._tokens -= delta
+
+    def available(self) -> Optional[float]:
+        if not self.per_minute:
+            return None
+
+        with self._lock:
+            self._refill()
+            return round(self._tokens, 1)
+
+
+_REQUEST_BUCKET = TokenBucket(LLM_RPM_LIMIT)
+_TOKEN_BUCKET = TokenBucket(LLM_TPM_LIMIT)
+
+
+# ---------------------------------------------------------
+# BUDGETS PAR APPELANT (CONCURRENCE + DÉBIT)
+# ---------------------------------------------------------
+class CallerBudget:
+    """
+    Plafond d'un appelant : appels simultanés (tentatives comprises)
+    et requêtes par minute, appliqués par _call_openai.
+    """
+
+    def __init__(self, max_concurrency: int = 0, per_minute: int = 0):
+        self.max_concurrency = max(0, int(max_concurrency or 0))
+        self.requests = TokenBucket(per_minute)
+
+        self._slots = (
+            threading.BoundedSemaphore(self.max_concurrency)
+            if self.max_concurrency else None
+        )
+
+    @contextmanager
+    def slot(self):
+        if self._slots is None:
+            yield
+            return
+
+        with self._slots:
+            yield
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "rpm_limit": self.requests.per_minute,
+            "rpm_available": self.requests.available(),
+        }
+
+
+def _parse_caller_budgets(spec: str) -> Dict[str, CallerBudget]:
+
+    budgets = {}
+
+    for entry in (spec or "").split(","):
+
+        name, _, limits = entry.strip().partition("=")
+
+        if not name or not limits:
+            continue
+
+        concurrency, _, rpm = limits.partition(":")
+
+        try:
+            budgets[name.strip()] = CallerBudget(
+                int(concurrency or 0),
+                int(rpm or 0),
+            )
+        except ValueError:
+            print("⚠️ LLM_CALLER_BUDGETS entrée ignorée:", entry)
+
+    return budgets
+
+
+_CALLER_BUDGETS = _parse_caller_budgets(LLM_CALLER_BUDGETS)
+_NO_BUDGET = CallerBudget()
+
+# Appelant imposé par un traitement (llm_caller), prioritaire
+# sur le nom passé par les fonctions intermédiaires
+_CALLER_SCOPE: ContextVar[Optional[str]] = ContextVar("llm_caller", default=None)
+
+
+@contextmanager
+def llm_caller(name: str):
+    """
+    Attribue au budget / aux compteurs `name` les appels faits dans
+    le bloc (thread courant), ex. destock via core.content.ai.
+    """
+    token = _CALLER_SCOPE.set(name)
+
+    try:
+        yield
+    finally:
+        _CALLER_SCOPE.reset(token)
+
+
+def estimate_tokens(*texts: Any) -> int:
+    """
+    Estimation grossière (≈ 4 caractères par token).
+    """
+    return sum(len(str(t or "")) for t in texts) // 4 + 1
+
+
+# ---------------------------------------------------------
+# CLIENT OPENAI PARTAGÉ
+# ---------------------------------------------------------
+_CLIENT: Optional[OpenAI] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_openai_client() -> OpenAI:
+    """
+    Client unique du process (pool de connexions HTTP réutilisé).
+    Les retries sont gérés ici, pas par le SDK.
+    """
+    global _CLIENT
+
+    if _CLIENT is not None:
+        return _CLIENT
+
+    with _CLIENT_LOCK:
+
+        if _CLIENT is None:
+
+            api_key = os.getenv("OPENAI_API_KEY")
+
+            if not api_key:
+                raise RuntimeError("OPENAI_API_KEY manquant")
+
+            _CLIENT = OpenAI(
+                api_key=api_key,
+                timeout=LLM_TIMEOUT_SECONDS,
+                max_retries=0,
+            )
+
+    return _CLIENT
+
+
+# ---------------------------------------------------------
+# COMPTEURS PAR APPELANT
+# ---------------------------------------------------------
+_USAGE: Dict[str, Dict[str, Any]] = defaultdict(
+    lambda: {
+        "calls": 0,
+        "errors": 0,
+        "retries": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "throttled_s": 0.0,
+    }
+)
+_LATENCIES: Dict[str, deque] = defaultdict(
+    lambda: deque(maxlen=LLM_LATENCY_WINDOW)
+)
+_USAGE_LOCK = threading.Lock()
+
+
+def _caller_name(depth: int = 2) -> str:
+    """
+    Module appelant (compteurs par défaut sans toucher aux appels).
+    """
+    try:
+        return sys._getframe(depth).f_globals.get("__name__", "unknown")
+    except ValueError:
+        return "unknown"
+
+
+def _record(caller: str, **fields):
+    with _USAGE_LOCK:
+        usage = _USAGE[caller]
+        for key, value in fields.items():
+            usage[key] += value
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
 
-    if not api_key:
-        return None, "OPENAI_API_KEY manquant"
+    response = getattr(error, "response", None)
+    retry_after = (
+        response.headers.get("retry-after")
+        if response is not None else None
+    )
 
     try:
-        client = OpenAI(api_key=api_key)
+        if retry_after:
+            return min(LLM_BACKOFF_MAX_SECONDS, float(retry_after))
+    except ValueError:
+        pass
+
+    delay = min(
+        LLM_BACKOFF_MAX_SECONDS,
+        LLM_BACKOFF_BASE_SECONDS * (2 ** attempt),
+    )
+
+    # jitter : évite que les workers repartent tous ensemble
+    return delay * random.uniform(0.5, 1.0)
+
+
+# ---------------------------------------------------------
+# APPEL OPENAI (BUDGETS + RETRIES + COMPTEURS)
+# ---------------------------------------------------------
+def _call_openai(
+    caller: str,
+    estimated_tokens: int,
+    request: Callable[[OpenAI], Any],
+):
+    client = get_openai_client()
+
+    # appelant sans budget dédié : slot et débit sans plafond
+    budget = _CALLER_BUDGETS.get(caller, _NO_BUDGET)
+
+    with budget.slot():
+
+        throttled = max(
+            _REQUEST_BUCKET.reserve(1),
+            _TOKEN_BUCKET.reserve(estimated_tokens),
+            budget.requests.reserve(1),
+        )
+
+        if throttled:
+            time.sleep(throttled)
+
+        attempt = 0
+
+        while True:
+
+            started = time.monotonic()
+
+            try:
+                response = request(client)
+
+            except _RETRYABLE_ERRORS as e:
+
+                if attempt >= LLM_MAX_RETRIES:
+                    _record(caller, calls=1, errors=1, throttled_s=throttled)
+                    raise
+
+                delay = _retry_delay(e, attempt)
+                attempt += 1
+
+                _record(caller, retries=1)
+                print(f"⏳ LLM {caller} retry {attempt}/{LLM_MAX_RETRIES} in {delay:.1f}s:", type(e).__name__)
+
+                time.sleep(delay)
+
+                # chaque tentative compte dans le débit
+                _REQUEST_BUCKET.reserve(1)
+                budget.requests.reserve(1)
+                continue
+
+            except Exception:
+                _record(caller, calls=1, errors=1, throttled_s=throttled)
+                raise
+
+            latency = time.monotonic() - started
+
+            usage = getattr(response, "usage", None)
+
+            prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+            total_tokens = (
+                getattr(usage, "total_tokens", 0)
+                or prompt_tokens + completion_tokens
+            )
+
+            if usage is not None:
+                _TOKEN_BUCKET.adjust(total_tokens - estimated_tokens)
+
+            _record(
+                caller,
+                calls=1,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=total_tokens,
+                throttled_s=throttled,
+            )
+
+            with _USAGE_LOCK:
+                _LATENCIES[caller].append(latency)
+
+            return response
+
+
+def chat_completion(
+    messages: List[Dict[str, Any]],
+    model: str = None,
+    caller: str = None,
+    **kwargs,
+):
+    """
+    chat.completions.create via la passerelle. Lève l'erreur OpenAI
+    si elle persiste après les retries.
+    """
+    caller = _CALLER_SCOPE.get() or caller or _caller_name()
+
+    estimated = estimate_tokens(
+        *(m.get("content") for m in messages)
+    ) + (kwargs.get("max_tokens") or LLM_DEFAULT_COMPLETION_TOKENS)
+
+    return _call_openai(
+        caller,
+        estimated,
+        lambda client: client.chat.completions.create(
+            model=model or DEFAULT_LLM_MODEL,
+            messages=messages,
+            **kwargs,
+        ),
+    )
+
+
+def create_embeddings(
+    input: List[str],
+    model: str,
+    caller: str = None,
+    **kwargs,
+):
+    caller = _CALLER_SCOPE.get() or caller or _caller_name()
+
+    return _call_openai(
+        caller,
+        estimate_tokens(*input),
+        lambda client: client.embeddings.create(
+            model=model,
+            input=input,
+            **kwargs,
+        ),
+    )
+
+
+def generate_image(
+    prompt: str,
+    model: str,
+    caller: str = None,
+    **kwargs,
+):
+    caller = _CALLER_SCOPE.get() or caller or _caller_name()
+
+    return _call_openai(
+        caller,
+        estimate_tokens(prompt),
+        lambda client: client.images.generate(
+            model=model,
+            prompt=prompt,
+            **kwargs,
+        ),
+    )
+
+
+def get_llm_stats() -> Dict[str, Any]:
+
+    with _USAGE_LOCK:
+
+        callers = {}
+
+        for caller, usage in _USAGE.items():
+
+            latencies = list(_LATENCIES.get(caller, ()))
+
+            callers[caller] = {
+                **usage,
+                "throttled_s": round(usage["throttled_s"], 3),
+                "latency_p50_s": round(percentile(latencies, 50), 3),
+                "latency_p95_s": round(percentile(latencies, 95), 3),
+            }
+
+    return {
+        "client_ready": _CLIENT is not None,
+        "timeout_s": LLM_TIMEOUT_SECONDS,
+        "max_retries": LLM_MAX_RETRIES,
+        "rpm_limit": LLM_RPM_LIMIT,
+        "tpm_limit": LLM_TPM_LIMIT,
+        "rpm_available": _REQUEST_BUCKET.available(),
+        "tpm_available": _TOKEN_BUCKET.available(),
+        "callers": callers,
+        "budgets": {
+            name: budget.stats()
+            for name, budget in _CALLER_BUDGETS.items()
+        },
+        "cache": get_llm_cache_stats(),
+    }
+
+
+def get_llm_caller_stats(caller: str) -> Dict[str, Any]:
+    """
+    Usage et budget d'un seul appelant (rapports des traitements batch).
+    """
+    with _USAGE_LOCK:
+        usage = dict(_USAGE[caller]) if caller in _USAGE else {}
+
+    if usage:
+        usage["throttled_s"] = round(usage["throttled_s"], 3)
+
+    budget = _CALLER_BUDGETS.get(caller)
+
+    return {
+        **usage,
+        "budget": budget.stats() if budget else None,
+    }
+
+
+# ---------------------------------------------------------
+# CRÉATION SÉCURISÉE DU CLIENT OPENAI
+# ---------------------------------------------------------
+def get_llm(model: str = None, temperature: float = 0.2):
+    try:
+        client = get_openai_client()
     except Exception as e:
         return None, str(e)
 
@@ -28,21 +530,72 @@ def get_llm(model: str = None, temperature: float = 0.2):
 # ---------------------------------------------------------
 # RUN LLM — CONTRAT ÉDITORIAL STRICT
 # ---------------------------------------------------------
-def run_llm(prompt: str, model: str = None, temperature: float = 0.2) -> str:
-    cfg, error = get_llm(model=model, temperature=temperature)
+RUN_LLM_SYSTEM_PROMPT = "Tu es un assistant éditorial expert B2B."
 
-    if error:
-        # ⚠️ Toujours une string exploitable
-        return ""
 
+def _run_llm_cache_key(prompt: str, model: str, temperature: float) -> str:
+    return llm_cache_key(
+        model or DEFAULT_LLM_MODEL,
+        temperature,
+        RUN_LLM_SYSTEM_PROMPT,
+        prompt,
+    )
+
+
+def forget_llm_response(
+    prompt: str,
+    model: str = None,
+    temperature: float = 0.2,
+) -> None:
+    """
+    À appeler quand une réponse servie par le cache est inexploitable.
+    """
     try:
-        completion = cfg["client"].chat.completions.create(
-            model=cfg["model"],
+        forget_cached_response(_run_llm_cache_key(prompt, model, temperature))
+    except Exception as e:
+        print("⚠️ LLM CACHE forget error:", str(e))
+
+
+def run_llm(
+    prompt: str,
+    model: str = None,
+    temperature: float = 0.2,
+    caller: str = None,
+    cache: bool = False,
+) -> str:
+    """
+    cache=True : réponse lue / stockée dans utils.llm_cache
+    (générations rejouées à l'identique). Par défaut : pas de cache.
+    """
+    caller = _CALLER_SCOPE.get() or caller or _caller_name()
+
+    cache_key = (
+        _run_llm_cache_key(prompt, model, temperature)
+        if cache else None
+    )
+
+    # Le cache est un accélérateur : une erreur SQLite (disque,
+    # verrou, chemin non inscriptible) ne bloque jamais l'appel
+    if cache_key:
+
+        try:
+            cached = get_cached_response(cache_key)
+        except Exception as e:
+            print("⚠️ LLM CACHE read error:", str(e))
+            cached = None
+
+        if cached is not None:
+            return cached
+
+    try:
+        completion = chat_completion(
             messages=[
-                {"role": "system", "content": "Tu es un assistant éditorial expert B2B."},
+                {"role": "system", "content": RUN_LLM_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
-            temperature=cfg["temperature"]
+            model=model,
+            caller=caller,
+            temperature=temperature,
         )
 
         message = completion.choices[0].message
@@ -51,6 +604,10 @@ def run_llm(prompt: str, model: str = None, temperature: float = 0.2) -> str:
         content = message.content
 
         if isinstance(content, str):
+
+            if cache_key:
+                _store_run_llm_response(cache_key, model, content, completion)
+
             return content
 
         return ""
@@ -58,6 +615,24 @@ def run_llm(prompt: str, model: str = None, temperature: float = 0.2) -> str:
     except Exception as e:
         # ⚠️ JAMAIS de JSON ici
         # ⚠️ JAMAIS d'objet
-        # ⚠️ Toujours du texte vide en cas d’échec
+        # ⚠️ Toujours du texte vide en cas d’échec (après retries),
+        # mais l'échec est tracé et compté par appelant
+        print(f"❌ LLM ERROR ({caller}):", str(e))
         return ""
 
+
+def _store_run_llm_response(cache_key: str, model: str, content: str, completion) -> None:
+    """
+    Écriture cache hors du chemin d'erreur LLM : une complétion déjà
+    payée est retournée même si le stockage échoue.
+    """
+    try:
+        usage = getattr(completion, "usage", None)
+        put_cached_response(
+            cache_key,
+            model or DEFAULT_LLM_MODEL,
+            content,
+            getattr(usage, "total_tokens", 0) or 0,
+        )
+    except Exception as e:
+        print("⚠️ LLM CACHE write error:", str(e))
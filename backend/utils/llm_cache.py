@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+# Cache persistant des réponses LLM (opt-in par appel :
+# run_llm(..., cache=True)). Clé = sha256(modèle, température,
+# prompt système, prompt) : une génération quasi déterministe
+# rejouée à l'identique (retry d'un raw, digest, workspace,
+# traduction) ne repart pas chez OpenAI.
+#
+# - store local SQLite, LRU borné (LLM_CACHE_MAX_ENTRIES)
+# - TTL par entrée (LLM_CACHE_TTL_SECONDS)
+# - LLM_CACHE_ENABLED=0 désactive tout, cache=False contourne
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "ratecard_llm_cache.sqlite"),
+)
+
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+
+_CONN: Optional[sqlite3.Connection] = None
+_LOCK = threading.Lock()
+
+_STATS = {
+    "hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "expirations": 0,
+    "evictions": 0,
+    "saved_tokens": 0,
+}
+
+
+# =========================================================
+# STORE
+# =========================================================
+
+def _get_conn() -> sqlite3.Connection:
+    """
+    Connexion SQLite unique, partagée entre threads sous _LOCK.
+    """
+    global _CONN
+
+    if _CONN is None:
+
+        conn = sqlite3.connect(LLM_CACHE_PATH, check_same_thread=False)
+
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                tokens INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                used_at REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS responses_used_at
+            ON responses (used_at)
+        """)
+        conn.commit()
+
+        _CONN = conn
+
+    return _CONN
+
+
+def llm_cache_key(
+    model: str,
+    temperature: float,
+    system_prompt: str,
+    prompt: str,
+) -> str:
+
+    payload = json.dumps(
+        [model, float(temperature), system_prompt, prompt],
+        ensure_ascii=False,
+    )
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# =========================================================
+# READ / WRITE
+# =========================================================
+
+def get_cached_response(key: str) -> Optional[str]:
+
+    if not LLM_CACHE_ENABLED:
+        return None
+
+    now = time.time()
+
+    with _LOCK:
+
+        conn = _get_conn()
+
+        row = conn.execute(
+            "SELECT response, tokens, created_at FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+
+        if row is None:
+            _STATS["misses"] += 1
+            return None
+
+        response, tokens, created_at = row
+
+        if created_at + LLM_CACHE_TTL_SECONDS <= now:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            conn.commit()
+            _STATS["expirations"] += 1
+            _STATS["misses"] += 1
+            return None
+
+        conn.execute(
+            "UPDATE responses SET used_at = ? WHERE key = ?",
+            (now, key),
+        )
+        conn.commit()
+
+        _STATS["hits"] += 1
+        _STATS["saved_tokens"] += tokens
+
+    return response
+
+
+def put_cached_response(
+    key: str,
+    model: str,
+    response: str,
+    tokens: int = 0,
+) -> None:
+
+    # une réponse vide est un échec : jamais mise en cache
+    if not LLM_CACHE_ENABLED or not response:
+        return
+
+    now = time.time()
+
+    with _LOCK:
+
+        conn = _get_conn()
+
+        conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, model, response, tokens, created_at, used_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, response, int(tokens or 0), now, now),
+        )
+
+        _STATS["stores"] += 1
+
+        # LRU : on retire les moins récemment utilisées par paquet (10 %)
+        count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+        if count > LLM_CACHE_MAX_ENTRIES:
+
+            excess = count - LLM_CACHE_MAX_ENTRIES + max(1, LLM_CACHE_MAX_ENTRIES // 10)
+
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY used_at LIMIT ?)",
+                (excess,),
+            )
+
+            _STATS["evictions"] += excess
+
+        conn.commit()
+
+
+def forget_cached_response(key: str) -> None:
+    """
+    Retire une réponse jugée inexploitable par l'appelant
+    (JSON invalide…) pour que le prochain essai reparte chez OpenAI.
+    """
+    if not LLM_CACHE_ENABLED:
+        return
+
+    with _LOCK:
+        conn = _get_conn()
+        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        conn.commit()
+
+
+# =========================================================
+# METRICS
+# =========================================================
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+
+    with _LOCK:
+
+        lookups = _STATS["hits"] + _STATS["misses"]
+
+        try:
+            size = (
+                _get_conn().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                if LLM_CACHE_ENABLED else 0
+            )
+        except sqlite3.Error:
+            size = None
+
+        return {
+            **_STATS,
+            "enabled": LLM_CACHE_ENABLED,
+            "size": size,
+            "max_entries": LLM_CACHE_MAX_ENTRIES,
+            "ttl_seconds": LLM_CACHE_TTL_SECONDS,
+            "hit_ratio": (
+                round(_STATS["hits"] / lookups, 4)
+                if lookups else None
+            ),
+        }
@@ -0,0 +1,117 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# ---------------------------------------------------------
+# PAGINATION PAR CURSEUR (KEYSET / SEEK)
+# ---------------------------------------------------------
+# Le curseur encode (published_at, id) du dernier élément servi.
+# La page suivante filtre sur ce couple au lieu d'un OFFSET :
+# BigQuery ne relit pas les pages précédentes, le coût reste
+# constant quelle que soit la profondeur du scroll.
+#
+# params = {...}
+# sql += seek_clause("c.published_at", "c.id_content", cursor, params)
+# ... ORDER BY published_at DESC, id DESC LIMIT @limit
+# next_cursor(items, "published_at", "id", limit)
+
+def _to_datetime(value: Any) -> datetime:
+
+    if isinstance(value, datetime):
+        return value
+
+    return datetime.fromisoformat(
+        str(value).replace("Z", "+00:00")
+    )
+
+
+def encode_cursor(published_at: Any, item_id: Any) -> Optional[str]:
+
+    if not published_at:
+        return None
+
+    payload = json.dumps(
+        {
+            "t": _to_datetime(published_at).isoformat(),
+            "id": item_id,
+        },
+        separators=(",", ":"),
+    )
+
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Optional[str]]:
+    """
+    Retourne (published_at, id).
+    Un timestamp ISO brut (ancien format) est accepté : id = None.
+    """
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return _to_datetime(payload["t"]), payload.get("id")
+
+    except Exception:
+        pass
+
+    try:
+        return _to_datetime(cursor), None
+
+    except Exception:
+        raise ValueError("cursor invalide")
+
+
+def seek_clause(
+    ts_col: str,
+    id_col: str,
+    cursor: Optional[str],
+    params: Dict[str, Any],
+) -> str:
+    """
+    Prédicat « après le curseur » pour un tri (ts DESC, id DESC).
+    Ajoute @cursor_ts / @cursor_id dans params.
+    """
+
+    if not cursor:
+        return ""
+
+    cursor_ts, cursor_id = decode_cursor(cursor)
+
+    params["cursor_ts"] = cursor_ts
+
+    # toujours précédé d'un saut de ligne : concaténable à un
+    # filtre existant ("AND FALSE" + seek_clause(...))
+    if cursor_id is None:
+        return f"""
+        AND {ts_col} < @cursor_ts
+    """
+
+    params["cursor_id"] = str(cursor_id)
+
+    return f"""
+        AND (
+            {ts_col} < @cursor_ts
+            OR ({ts_col} = @cursor_ts AND {id_col} < @cursor_id)
+        )
+    """
+
+
+def next_cursor(
+    items: List[Dict],
+    ts_key: str = "published_at",
+    id_key: str = "id",
+    limit: Optional[int] = None,
+) -> Optional[str]:
+
+    if not items:
+        return None
+
+    if limit is not None and len(items) < limit:
+        return None
+
+    last = items[-1]
+
+    return encode_cursor(last.get(ts_key), last.get(id_key))
@@ -0,0 +1,47 @@
+import json
+from typing import Iterable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+
+# ---------------------------------------------------------
+# Réponse JSON streamée (listes volumineuses)
+# ---------------------------------------------------------
+def stream_json_list(key: str, items: Iterable, **extra) -> StreamingResponse:
+    """
+    Sérialise {**extra, key: [...]} au fil de l'eau : même forme de réponse
+    qu'un dict classique, mais la liste n'est jamais entièrement en mémoire.
+
+    Le premier élément est lu avant de répondre, pour que les erreurs
+    de requête remontent encore dans le try/except de la route.
+    """
+    iterator = iter(items)
+
+    try:
+        first = next(iterator)
+        has_first = True
+    except StopIteration:
+        first = None
+        has_first = False
+
+    def generate():
+
+        head = json.dumps(jsonable_encoder(extra), ensure_ascii=False)[:-1]
+        separator = ", " if extra else ""
+
+        yield f'{head}{separator}"{key}": ['
+
+        if has_first:
+
+            yield json.dumps(jsonable_encoder(first), ensure_ascii=False)
+
+            for item in iterator:
+                yield ", " + json.dumps(jsonable_encoder(item), ensure_ascii=False)
+
+        yield "]}"
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/json",
+    )
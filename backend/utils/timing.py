@@ -0,0 +1,41 @@
+import math
+from typing import Dict, List
+
+
+# ---------------------------------------------------------
+# RÉSUMÉ DE TIMINGS PAR ÉTAPE (count / total / avg / p50 / p95 / max)
+# ---------------------------------------------------------
+# timings = {"llm": [0.8, 1.2, ...], "insert": [...]}
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Percentile par rang le plus proche (q entre 0 et 100).
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def timing_summary(timings: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+
+    summary = {}
+
+    for stage, values in timings.items():
+
+        if not values:
+            continue
+
+        summary[stage] = {
+            "count": len(values),
+            "total_s": round(sum(values), 3),
+            "avg_s": round(sum(values) / len(values), 3),
+            "p50_s": round(percentile(values, 50), 3),
+            "p95_s": round(percentile(values, 95), 3),
+            "max_s": round(max(values), 3),
+        }
+
+    return summary
@@ -0,0 +1,329 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+# ---------------------------------------------------------
+# CACHES IN-PROCESS (TTL + LRU + GÉNÉRATION)
+# ---------------------------------------------------------
+# Briques communes des caches du process :
+#
+# - TTLCache : clé → valeur, TTL, éviction LRU au-delà de
+#   max_entries. Chaque invalidation incrémente la génération :
+#   une valeur chargée avant une invalidation n'est pas stockée
+#   après elle (set(..., generation=...)).
+#   Utilisé par : user_context_cache, http_cache.
+#
+# - CachedValue : une seule valeur rechargée par loader() au TTL.
+#   Un seul rechargement à la fois. Si le rechargement échoue, la
+#   valeur précédente reste servie. Après une invalidation pendant
+#   un chargement, la valeur chargée n'est pas stockée.
+#   Utilisé par : index d'alias, index d'entités MCP, stats publiques.
+#
+# Les valeurs sont stockées telles quelles : copie éventuelle à la
+# charge de l'appelant.
+
+
+def _hit_ratio(hits: int, misses: int) -> Optional[float]:
+
+    lookups = hits + misses
+
+    return round(hits / lookups, 4) if lookups else None
+
+
+# ---------------------------------------------------------
+# CLÉ → VALEUR
+# ---------------------------------------------------------
+
+class TTLCache:
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        """
+        on_evict(key, value) : appelé (sous le verrou) pour chaque
+        entrée sortie par la limite LRU.
+        """
+        self.ttl = float(ttl)
+        self.max_entries = max(1, int(max_entries))
+
+        self._on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Retourne (trouvé, valeur).
+        """
+        now = time.monotonic()
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+
+            expires_at, value = entry
+
+            if expires_at <= now:
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+
+            return True, value
+
+    def generation(self) -> int:
+        """
+        À lire avant le chargement, puis à passer à set().
+        """
+        with self._lock:
+            return self._generation
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        generation: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> bool:
+        """
+        False si une invalidation a eu lieu depuis `generation`
+        (valeur potentiellement périmée, non stockée).
+        """
+        with self._lock:
+
+            if generation is not None and generation != self._generation:
+                return False
+
+            self._entries[key] = (
+                time.monotonic() + (self.ttl if ttl is None else ttl),
+                value,
+            )
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+
+                evicted_key, (_, evicted) = self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+                if self._on_evict:
+                    self._on_evict(evicted_key, evicted)
+
+            return True
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Lecture via cache, sinon loader() puis mise en cache.
+        """
+        found, value = self.get(key)
+
+        if found:
+            return value
+
+        generation = self.generation()
+
+        value = loader()
+        self.set(key, value, generation)
+
+        return value
+
+    def invalidate(
+        self,
+        predicate: Optional[Callable[[Hashable, Any], bool]] = None,
+    ) -> List[Tuple[Hashable, Any]]:
+        """
+        Sans predicate : vide tout le cache. Retourne les entrées
+        retirées. Incrémente toujours la génération.
+        """
+        with self._lock:
+
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+            keys = [
+                key for key, (_, value) in self._entries.items()
+                if predicate is None or predicate(key, value)
+            ]
+
+            return [
+                (key, self._entries.pop(key)[1])
+                for key in keys
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+
+        with self._lock:
+
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hit_ratio": _hit_ratio(
+                    self._stats["hits"],
+                    self._stats["misses"],
+                ),
+            }
+
+
+# ---------------------------------------------------------
+# VALEUR UNIQUE RECHARGÉE
+# ---------------------------------------------------------
+
+class CachedValue:
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        ttl: float,
+        name: str = "CACHE",
+        retry_after: float = 0.0,
+    ):
+        """
+        retry_after : après un rechargement en échec, durée pendant
+        laquelle la valeur précédente est servie sans nouvel essai
+        (0 = nouvel essai au prochain appel).
+        """
+        self.ttl = float(ttl)
+        self.retry_after = float(retry_after)
+
+        self._loader = loader
+        self._name = name
+
+        self._value: Any = None
+        self._loaded_at: Optional[float] = None
+        self._expires_at = 0.0
+        self._version = 0
+
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+        self._stats = {
+            "hits": 0,
+            "loads": 0,
+            "load_errors": 0,
+            "invalidations": 0,
+        }
+
+    def _fresh(self) -> bool:
+        return self._expires_at > time.monotonic()
+
+    def get(self) -> Any:
+
+        with self._lock:
+            if self._fresh():
+                self._stats["hits"] += 1
+                return self._value
+
+        # un seul rechargement à la fois ; les autres threads
+        # récupèrent la valeur fraîchement chargée
+        with self._reload_lock:
+
+            with self._lock:
+
+                if self._fresh():
+                    self._stats["hits"] += 1
+                    return self._value
+
+                version = self._version
+                loaded = self._loaded_at is not None
+
+            try:
+                value = self._loader()
+
+            except Exception as e:
+
+                with self._lock:
+                    self._stats["load_errors"] += 1
+
+                if not loaded:
+                    raise
+
+                print(f"⚠️ {self._name} RELOAD FAILED:", e)
+
+                with self._lock:
+
+                    if self.retry_after:
+                        self._expires_at = time.monotonic() + self.retry_after
+
+                    return self._value
+
+            with self._lock:
+
+                self._stats["loads"] += 1
+
+                # invalidé / remplacé pendant le chargement : valeur
+                # servie à cet appel, mais pas stockée
+                if version == self._version:
+                    self._store(value)
+
+                return value
+
+    def _store(self, value: Any) -> None:
+
+        self._value = value
+        self._loaded_at = time.time()
+        self._expires_at = time.monotonic() + self.ttl
+        self._version += 1
+
+    def set(self, value: Any) -> None:
+        """
+        Remplace la valeur (calculée par l'appelant), fraîche pour un TTL.
+        """
+        with self._lock:
+            self._store(value)
+
+    def update(self, fn: Callable[[Any], Any]) -> None:
+        """
+        Remplace la valeur par fn(valeur) sans toucher à son expiration.
+        """
+        with self._lock:
+            self._value = fn(self._value)
+            self._version += 1
+
+    def peek(self) -> Any:
+        """
+        Valeur courante, sans chargement (None si jamais chargée).
+        """
+        with self._lock:
+            return self._value
+
+    def invalidate(self) -> None:
+
+        with self._lock:
+            self._version += 1
+            self._expires_at = 0.0
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+
+        with self._lock:
+
+            return {
+                **self._stats,
+                "version": self._version,
+                "loaded_at": self._loaded_at,
+                "ttl_seconds": self.ttl,
+            }